@@ -25,6 +25,7 @@ import json
 import os
 import pathlib
 import pwd
+from collections.abc import Iterator
 from typing import Any
 
 import birdclient
@@ -33,9 +34,19 @@ import packaging.version
 
 from .bird_config import BirdConfig
 from .bird_config.sections.protocols.bgp.bgp_config_parser import BGPConfigParser
+from .bird_config.sections.protocols.bgp.incremental import peer_protocols, reconfigure_peers
+from .bird_config.sections.protocols.bgp.rib_estimate import rib_table_estimate
 from .bird_config.sections.protocols.ospf.ospf_config_parser import OSPFConfigParser
 from .bird_config.sections.protocols.rip.rip_config_parser import RIPConfigParser
+from .bird_route_stream import BirdRouteStream
+from .cache_refresh import CacheRefresh, cache_refresh_jobs
+from .capacity import capacity_estimate
 from .exceptions import BirdPlanError
+from .peer_index import BGPPeerIndex
+from .plan_shards import load_plan_shards
+from .reload_scheduler import ReloadScheduler, reload_jobs
+from .state_journal import StateJournal, StateJournalEntry
+from .template_cache import template_environment
 from .version import __version__
 from .yaml import YAML, YAMLError
 
@@ -47,8 +58,14 @@ __all__ = [
 # Some types we need
 BirdPlanBGPPeerSummary = dict[str, dict[str, Any]]
 BirdPlanBGPPeerShow = dict[str, Any]
+BirdPlanBGPPeerRoute = dict[str, Any]
 BirdPlanBGPPeerGracefulShutdownStatus = dict[str, dict[str, bool]]
 BirdPlanBGPPeerQuarantineStatus = dict[str, dict[str, bool]]
+BirdPlanBGPPeerOverridesApply = dict[str, Any]
+BirdPlanBGPPeerReload = dict[str, Any]
+BirdPlanBGPTableEstimate = dict[str, dict[str, Any]]
+BirdPlanCacheRefresh = dict[str, Any]
+BirdPlanCapacityEstimate = dict[str, Any]
 BirdPlanOSPFInterfaceStatus = dict[str, dict[str, dict[str, Any]]]
 BirdPlanOSPFSummary = dict[str, dict[str, Any]]
 
@@ -61,16 +78,20 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
     """Main BirdPlan class."""
 
     _birdconf: BirdConfig
+    _bgp_peer_index: tuple[dict[str, Any], dict[str, Any], int, int, BGPPeerIndex] | None
     _config: dict[str, Any]
     _state_file: str | None
+    _state_journal: list[StateJournalEntry] | None
     _yaml: YAML
 
     def __init__(self, test_mode: bool = False) -> None:  # noqa: FBT001,FBT002
         """Initialize object."""
 
         self._birdconf = BirdConfig(test_mode=test_mode)
+        self._bgp_peer_index = None
         self._config = {}
         self._state_file = None
+        self._state_journal = []
         self._yaml = YAML()
 
     def load(self, **kwargs: Any) -> None:  # noqa: ANN401,D417
@@ -80,7 +101,7 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         Parameters
         ----------
         plan_file : str
-            Source plan file to generate configuration from.
+            Source plan file or sharded plan directory to generate configuration from.
 
         state_file : Optional[str]
             Optional state file, used for commands like BGP graceful shutdown.
@@ -94,44 +115,29 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         use_cached : bool
             Optional parameter to use cached values from state during configuration load.
 
+        workers : int
+            Optional number of worker processes to use when constructing and rendering BGP peers.
+
+        plan : Optional[Dict[str, Any]]
+            Optional plan previously returned by load_plan(), to save loading the plan file again.
+
         """
 
         # Grab parameters
         plan_file: str | None = kwargs.get("plan_file")
+        plan: dict[str, Any] | None = kwargs.get("plan")
         state_file: str | None = kwargs.get("state_file")
         ignore_irr_changes: bool = kwargs.get("ignore_irr_changes", False)
         ignore_peeringdb_changes: bool = kwargs.get("ignore_peeringdb_changes", False)
         use_cached: bool = kwargs.get("use_cached", False)
+        workers: int = kwargs.get("workers", 1)
 
         # Make sure we have the parameters we need
         if not plan_file:
             raise BirdPlanError("Required parameter 'plan_file' not found")
 
-        plan_file_path = pathlib.Path(plan_file)
-
-        # Create search paths for Jinja2
-        search_paths = [plan_file_path.parent]
-        # We need to pass Jinja2 our filename, as it is in the search path
-        plan_file_fname = plan_file_path.name
-
-        # Render first with jinja
-        template_env = jinja2.Environment(  # noqa: S701
-            loader=jinja2.FileSystemLoader(searchpath=search_paths),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
-
-        # Check if we can load the configuration
-        try:
-            raw_config = template_env.get_template(plan_file_fname).render()
-        except jinja2.TemplateError as err:
-            raise BirdPlanError(f"Failed to template BirdPlan configuration file '{plan_file}': {err}") from None
-
-        # Load configuration using YAML
-        try:
-            self.config = self.yaml.load(raw_config)
-        except YAMLError as err:  # pragma: no cover
-            raise BirdPlanError(f" Failed to parse BirdPlan configuration in '{plan_file}': {err}") from None
+        # Load the plan, unless it was already loaded for us
+        self.config = plan if plan is not None else self.load_plan(plan_file, workers=workers)
 
         # Set our state file and load state
         self.state_file = state_file
@@ -150,6 +156,7 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         self.birdconf.birdconfig_globals.ignore_irr_changes = ignore_irr_changes
         self.birdconf.birdconfig_globals.ignore_peeringdb_changes = ignore_peeringdb_changes
         self.birdconf.birdconfig_globals.use_cached = use_cached
+        self.birdconf.birdconfig_globals.workers = workers
 
         # Configure sections
         self._config_global()
@@ -166,6 +173,83 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         bgp_parser = BGPConfigParser(self.birdconf)
         bgp_parser.parse(self.config)
 
+    def load_plan(self, plan_file: str, workers: int = 1) -> dict[str, Any]:
+        """
+        Render and parse a plan file.
+
+        Compiled templates are cached, so templates shared between plans are only compiled once per process.
+
+        If the plan file is a directory, it is loaded as a sharded plan directory, see load_plan_shards().
+
+        Parameters
+        ----------
+        plan_file : str
+            Source plan file or sharded plan directory to load.
+
+        workers : int
+            Optional number of worker processes to use when parsing plan shards.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Plan configuration.
+
+        """
+
+        plan_file_path = pathlib.Path(plan_file)
+
+        # Check if this is a sharded plan directory
+        if plan_file_path.is_dir():
+            return load_plan_shards(plan_file_path, self.yaml, workers=workers)
+
+        # Render first with jinja, the plan file is in the search path so we only need to pass its name
+        template_env = template_environment([plan_file_path.parent])
+
+        # Check if we can load the configuration
+        try:
+            raw_config = template_env.get_template(plan_file_path.name).render()
+        except jinja2.TemplateError as err:
+            raise BirdPlanError(f"Failed to template BirdPlan configuration file '{plan_file}': {err}") from None
+
+        # Load configuration using YAML
+        try:
+            plan: dict[str, Any] = self.yaml.load(raw_config)
+        except YAMLError as err:  # pragma: no cover
+            raise BirdPlanError(f" Failed to parse BirdPlan configuration in '{plan_file}': {err}") from None
+
+        return plan
+
+    def validate(self, **kwargs: Any) -> None:  # noqa: ANN401,D417
+        """
+        Validate configuration without generating the BIRD configuration.
+
+        External data is only resolved from the state cache, missing cache entries are skipped.
+
+        Parameters
+        ----------
+        plan_file : str
+            Source plan file to validate.
+
+        state_file : Optional[str]
+            Optional state file, used for cached IRR and PeeringDB data.
+
+        """
+
+        # Make sure we only use cached data and skip data that is not cached
+        self.birdconf.birdconfig_globals.validate_only = True
+
+        # Load configuration, which runs all the configuration checks
+        self.load(
+            plan_file=kwargs.get("plan_file"),
+            state_file=kwargs.get("state_file"),
+            ignore_irr_changes=True,
+            ignore_peeringdb_changes=True,
+            use_cached=True,
+        )
+
+        # Run the checks which are normally only done during configuration
+        self.birdconf.protocols.bgp.validate()
+
     def configure(self) -> str:
         """
         Create BIRD configuration.
@@ -175,15 +259,147 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
             str : Bird configuration as a string.
 
         """
+
+        # The state is regenerated, so it needs to be written out in full
+        self._state_journal = None
+
         return "\n".join(self.birdconf.get_config())
 
+    def configure_overrides(self, bird_config: str | None) -> BirdPlanBGPPeerOverridesApply:
+        """
+        Apply BGP graceful shutdown and quarantine overrides to a previously generated BIRD configuration.
+
+        Only the BGP peers with graceful shutdown or quarantine flags that changed since they were last configured are
+        re-rendered, the rest of the previous configuration is reused. If the previous configuration cannot be reused, the
+        full configuration is generated instead.
+
+        Parameters
+        ----------
+        bird_config : Optional[str]
+            Previously generated BIRD configuration.
+
+        Returns
+        -------
+        BirdPlanBGPPeerOverridesApply
+            Dictionary containing the BIRD configuration, if it was fully generated, the peers that changed and the BIRD
+            protocols that need to be reloaded.
+
+            eg.
+            {
+                'config': '...',
+                'full': False,
+                'peers': ['peer1'],
+                'protocols': ['bgp4_AS65001_peer1', 'bgp6_AS65001_peer1', ...],
+            }
+
+        """
+
+        bgp = self.birdconf.protocols.bgp
+
+        # Work out which peers changed
+        peers = bgp.apply_overrides()
+
+        config = None
+        if bird_config is not None:
+            # If nothing changed, we can use the previous configuration as is
+            config = reconfigure_peers(bgp, bird_config, peers) if peers else bird_config
+            # Record the state of the peers we re-rendered
+            if config is not None:
+                for peer in peers:
+                    self._state_journal_record(["bgp", "peers", peer.name])
+        # If we couldn't reuse the previous configuration, generate it all
+        full = config is None
+        if config is None:
+            config = self.configure()
+
+        return {
+            "config": config,
+            "full": full,
+            "peers": [peer.name for peer in peers],
+            "protocols": [protocol for peer in peers for protocol in peer_protocols(peer.conf.lines)],
+        }
+
+    def bgp_table_estimate(self) -> BirdPlanBGPTableEstimate:
+        """
+        Estimate the number of route entries held in the BGP peer import and export tables.
+
+        This must be called after the configuration has been generated, as the estimate is based on the peer state.
+
+        Returns
+        -------
+        BirdPlanBGPTableEstimate
+            Dictionary containing the estimate for each IP version, see rib_table_estimate() for the format.
+
+            eg.
+            {
+                'ipv4': {
+                    'peers': {...},
+                    'peer_types': {...},
+                    'total': {
+                        'import_table': {'kept': 100, 'saved': 0, 'unknown': 0},
+                        'export_table': {'kept': 2000, 'saved': 0, 'unknown': 0},
+                    },
+                },
+                'ipv6': {...},
+            }
+
+        """
+
+        return {ipv: rib_table_estimate(self.birdconf.protocols.bgp, ipv) for ipv in ("ipv4", "ipv6")}
+
+    def capacity_estimate(self) -> BirdPlanCapacityEstimate:
+        """
+        Estimate the number of routes BIRD will hold and how much memory it will need.
+
+        This must be called after the configuration has been generated, as the estimate is based on the peer state.
+
+        Returns
+        -------
+        BirdPlanCapacityEstimate
+            Dictionary containing the estimate, see capacity_estimate() for the format.
+
+            eg.
+            {
+                'ipv4': {
+                    'tables': {'t_bgp4': 100, 'master4': 100, 't_kernel4': 100, 't_bgp4_AS65001_c1_peer': 100},
+                    'adj_rib_in': 100,
+                    'adj_rib_out': 0,
+                    'routes': 400,
+                    'unknown': [],
+                    'prefix_sets': 1,
+                    'irr_networks': 0,
+                },
+                'ipv6': {...},
+                'asn_sets': 0,
+                'routes': 400,
+                'rss': 16854016,
+            }
+
+        """
+
+        return capacity_estimate(self.birdconf)
+
     def commit_state(self) -> None:
-        """Commit our current state."""
+        """
+        Commit our current state.
+
+        If the state was only changed by override commands, the changes are appended to the state journal, otherwise the state
+        file is written out in full and the journal is removed.
+
+        """
 
         # Raise an exception if we don't have a state file loaded
         if self.state_file is None:
             raise BirdPlanError("Commit of BirdPlan state requires a state file, none loaded")
 
+        state_journal = StateJournal(self.state_file)
+
+        # Check if we can just journal the changes
+        if self._state_journal is not None:
+            state_journal.append(self._state_journal)
+            self._state_journal = []
+            return
+
         # Try get user and group ID's
         try:
             birdplan_uid = pwd.getpwnam("birdplan").pw_uid
@@ -194,23 +410,33 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         except KeyError:
             birdplan_gid = None
 
-        # Write out state file
+        # Write out state file to a temporary file, which replaces the state file once complete
+        state_file = pathlib.Path(self.state_file)
+        state_file_tmp = state_file.with_name(f".{state_file.name}.tmp")
         try:
-            fd = os.open(self.state_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+            fd = os.open(state_file_tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
             # Chown the file if we have the user and group ID's
             if birdplan_uid and birdplan_gid:
                 os.fchown(fd, birdplan_uid, birdplan_gid)
             # Open for writing
             with os.fdopen(fd, "w") as file:
                 file.write(json.dumps(self.state))
+                file.flush()
+                os.fsync(file.fileno())
+            state_file_tmp.replace(state_file)
         except OSError as err:  # pragma: no cover
             raise BirdPlanError(f"Failed to open '{self.state_file}' for writing: {err}") from None
 
+        # The journal is now part of the state file
+        state_journal.remove()
+        self._state_journal = []
+
     def load_state(self) -> None:
         """Load our state."""
 
         # Clear state
         self.state = {}
+        self._state_journal = []
 
         # Skip if we don't have a state file
         if not self.state_file:
@@ -228,6 +454,9 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
                 # We use the state_file here because the size of raw_state may be larger than 100MiB
                 raise BirdPlanError(f" Failed to parse BirdPlan state file '{state_file}': {err}") from None
 
+        # Replay changes made since the state file was last written out in full
+        StateJournal(self.state_file).replay(self.state)
+
     def state_ospf_summary(self, bird_socket: str | None = None) -> BirdPlanOSPFSummary:
         """
         Return OSPF summary.
@@ -282,10 +511,18 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
 
         return ret
 
-    def state_bgp_peer_summary(self, bird_socket: str | None = None) -> BirdPlanBGPPeerSummary:
+    def state_bgp_peer_summary(self, bird_socket: str | None = None, asn: int | None = None) -> BirdPlanBGPPeerSummary:
         """
         Return BGP peer summary.
 
+        Parameters
+        ----------
+        bird_socket : Optional[str]
+            BIRD control socket to use.
+
+        asn : Optional[int]
+            Only return the peers with this ASN, their protocols are queried directly instead of retrieving all protocols.
+
         Returns
         -------
         BirdPlanBGPPeerStatus
@@ -300,7 +537,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
                     'protocols': {
                         'ipv4': ...,
                         'ipv6': ...,
-                    }
+                    },
+                    'prefix_limit': ...,
                 }
                 'peer2': {
                     ...,
@@ -320,31 +558,46 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if "bgp" not in self.state:
             return ret
 
-        # Query bird client for the current protocols
-        birdc = birdclient.BirdClient(control_socket=bird_socket)
-        bird_protocols = birdc.show_protocols()
-
-        # Check if we have any peers in our state
-        if "peers" in self.state["bgp"]:
-            # If we do loop with them
-            for peer, peer_state in self.state["bgp"]["peers"].items():
-                # Start with a clear status
-                ret[peer] = {
-                    "name": peer,
-                    "asn": peer_state["asn"],
-                    "description": peer_state["description"],
-                    "protocols": peer_state["protocols"],
-                }
-
-                # Next loop through each protocol
-                for ipv, peer_state_protocol in peer_state["protocols"].items():
-                    # If we don't have a live session, skip adding it
-                    if peer_state_protocol["name"] not in bird_protocols:
-                        continue
-                    # Set protocol name
-                    ret[peer]["protocols"][ipv]["protocol"] = ipv
-                    # But if we do, add it
-                    ret[peer]["protocols"][ipv]["status"] = bird_protocols[peer_state_protocol["name"]]
+        peers_state = self.state["bgp"].get("peers", {})
+
+        # Work out which peers we're returning, looking them up by ASN if we're only returning a single AS
+        if asn is None:
+            peers = list(peers_state)
+        else:
+            peers = [peer for peer in self.bgp_peer_index.asn(asn) if peer in peers_state and peers_state[peer]["asn"] == asn]
+
+        for peer in peers:
+            peer_state = peers_state[peer]
+            # Start with a clear status
+            ret[peer] = {
+                "name": peer,
+                "asn": peer_state["asn"],
+                "description": peer_state["description"],
+                "protocols": peer_state["protocols"],
+            }
+            # Add the prefix limits if we have them
+            if "prefix_limit" in peer_state:
+                ret[peer]["prefix_limit"] = peer_state["prefix_limit"]
+
+        # Query bird client for the current protocols, only querying the protocols of the peers we need if we're returning an AS
+        protocol_names = None
+        if asn is not None:
+            protocol_names = [protocol["name"] for peer in peers for protocol in peers_state[peer]["protocols"].values()]
+        bird_protocols = self._bird_protocols(bird_socket, protocol_names)
+
+        # Add the live sessions to the peers they belong to
+        for protocol_name, bird_state in bird_protocols.items():
+            peer_protocol = self.bgp_peer_index.protocol(protocol_name)
+            if peer_protocol is None:
+                continue
+            peer, ipv = peer_protocol
+            # Skip protocols that are not in the state of a peer we're returning
+            if peer not in ret or ret[peer]["protocols"].get(ipv, {}).get("name") != protocol_name:
+                continue
+            # Set protocol name
+            ret[peer]["protocols"][ipv]["protocol"] = ipv
+            # And add the status
+            ret[peer]["protocols"][ipv]["status"] = bird_state
 
         return ret
 
@@ -406,6 +659,219 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
 
         return ret
 
+    def state_bgp_peer_routes(
+        self,
+        peer: str,
+        ipv: str | None = None,
+        filtered: bool = False,  # noqa: FBT001,FBT002
+        bird_socket: str | None = None,
+    ) -> Iterator[BirdPlanBGPPeerRoute]:
+        """
+        Return the routes in a specific BGP peer table.
+
+        Routes are streamed from the BIRD control socket as they are received.
+
+        Parameters
+        ----------
+        peer : str
+            Peer name to return routes for.
+
+        ipv : Optional[str]
+            Optional IP version to return routes for, either "ipv4" or "ipv6", defaults to both.
+
+        filtered : bool
+            Return the routes rejected by the peer import filter instead of those accepted.
+
+        bird_socket : Optional[str]
+            BIRD control socket to use.
+
+        Returns
+        -------
+        Iterator[BirdPlanBGPPeerRoute]
+            Iterator of routes in the peer table.
+
+            eg.
+            {
+                'table': ...,
+                'prefix': ...,
+                'protocol': ...,
+                'primary': ...,
+                'nexthops': ...,
+                'attributes': ...,
+                ...
+            }
+
+        """
+
+        # Raise an exception if we don't have a state file loaded
+        if self.state_file is None:
+            raise BirdPlanError("The use of BGP peer routes requires a state file, none loaded")
+
+        # Return if we don't have any BGP state
+        if "bgp" not in self.state:
+            raise BirdPlanError("No BGP state found")
+        # Check if the configured state has this peer, if not return
+        if peer not in self.state["bgp"]["peers"]:
+            raise BirdPlanError(f"BGP peer '{peer}' not found in configured state")
+
+        # Work out which tables we're dumping
+        peer_state = self.state["bgp"]["peers"][peer]
+        peer_tables = peer_state.get("tables", {})
+        if ipv:
+            if ipv not in peer_tables:
+                raise BirdPlanError(f"BGP peer '{peer}' has no {ipv} table")
+            table_ipvs = [ipv]
+        else:
+            table_ipvs = list(peer_tables)
+
+        # Peers using a flat table share the main BGP table, so we only want the routes from their own protocol
+        protocols: dict[str, str | None] = dict.fromkeys(table_ipvs)
+        if peer_state.get("flat_table"):
+            protocols = {table_ipv: peer_state["protocols"][table_ipv]["name"] for table_ipv in table_ipvs}
+
+        # Stream the routes from the BIRD control socket
+        route_stream = BirdRouteStream(bird_socket=bird_socket)
+
+        return (
+            route
+            for table_ipv in table_ipvs
+            for route in route_stream.routes(peer_tables[table_ipv], filtered=filtered, protocol=protocols[table_ipv])
+        )
+
+    def state_bgp_peer_reload(
+        self,
+        peers: list[str] | None = None,
+        direction: str = "both",
+        rate: float = 10.0,
+        bird_socket: str | None = None,
+    ) -> BirdPlanBGPPeerReload:
+        """
+        Reload BGP peers, staggered and rate limited so BIRD is not overwhelmed.
+
+        Peers are reloaded smallest first, peers without a prefix limit could be sending us a full table so they are reloaded
+        last.
+
+        Parameters
+        ----------
+        peers : Optional[List[str]]
+            Peers to reload, defaults to all peers in the state.
+
+        direction : str
+            Reload the routes we import ("in"), export ("out") or both.
+
+        rate : float
+            Maximum number of reload commands to send to BIRD each second.
+
+        bird_socket : Optional[str]
+            BIRD control socket to use.
+
+        Returns
+        -------
+        BirdPlanBGPPeerReload
+            Dictionary containing the commands sent to BIRD for each peer, along with any error.
+
+            eg.
+            {
+                'peers': {
+                    'e1': {'commands': ['reload bgp4_AS65001_e1'], 'error': None},
+                },
+                'seconds': 0.25,
+            }
+
+        """
+
+        # Raise an exception if we don't have a state file loaded
+        if self.state_file is None:
+            raise BirdPlanError("The use of BGP peer reload requires a state file, none loaded")
+
+        # Return if we don't have any BGP state
+        if "bgp" not in self.state:
+            raise BirdPlanError("No BGP state found")
+
+        peers_state = self.state["bgp"].get("peers", {})
+        if peers is None:
+            peers = list(peers_state)
+        # Check if the configured state has the peers
+        for peer in peers:
+            if peer not in peers_state:
+                raise BirdPlanError(f"BGP peer '{peer}' not found in configured state")
+
+        # Work out the protocols to reload for each peer
+        protocols = {
+            peer: [protocol["name"] for _, protocol in sorted(peers_state[peer].get("protocols", {}).items())] for peer in peers
+        }
+
+        scheduler = ReloadScheduler(bird_socket, rate=rate)
+        return scheduler.run(reload_jobs(self.state, protocols), direction)
+
+    def state_cache_refresh(
+        self,
+        concurrency: int = 4,
+        jitter: float = 0.0,
+        retries: int = 3,
+        ignore_irr_changes: bool = False,  # noqa: FBT001,FBT002
+        ignore_peeringdb_changes: bool = False,  # noqa: FBT001,FBT002
+    ) -> BirdPlanCacheRefresh:
+        """
+        Refresh the IRR and PeeringDB information cached in the state, for use with the "use_cached" load option.
+
+        The configuration must be loaded before calling this method, the state needs to be committed afterwards.
+
+        Parameters
+        ----------
+        concurrency : int
+            Maximum number of peers to refresh at the same time.
+
+        jitter : float
+            Maximum number of seconds to randomly delay each peer by.
+
+        retries : int
+            Number of times to retry a failed lookup, backing off exponentially.
+
+        ignore_irr_changes : bool
+            Ignore substantial changes in the IRR network counts.
+
+        ignore_peeringdb_changes : bool
+            Ignore substantial changes in the PeeringDB prefix limits.
+
+        Returns
+        -------
+        BirdPlanCacheRefresh
+            Dictionary containing the sources refreshed for each peer, along with any errors.
+
+            eg.
+            {
+                'peers': {
+                    'c1': {
+                        'refreshed': ['irr', 'peeringdb'],
+                        'errors': {},
+                        'updated': [['bgp', 'peers', 'c1', 'prefix_limit', 'peeringdb', 'ipv4'], ...],
+                    },
+                },
+                'seconds': 12.5,
+            }
+
+        """
+
+        # Raise an exception if we don't have a state file loaded
+        if self.state_file is None:
+            raise BirdPlanError("The use of cache refresh requires a state file, none loaded")
+
+        cache_refresh = CacheRefresh(concurrency=concurrency, jitter=jitter, retries=retries)
+        result = cache_refresh.run(
+            cache_refresh_jobs(self.birdconf, self.state),
+            self.state,
+            ignore_irr_changes=ignore_irr_changes,
+            ignore_peeringdb_changes=ignore_peeringdb_changes,
+        )
+
+        # Only the items we refreshed need to be written out
+        for peer_result in result["peers"].values():
+            for path in peer_result["updated"]:
+                self._state_journal_record(path)
+
+        return result
+
     def state_bgp_peer_graceful_shutdown_set(self, peer: str, value: bool) -> None:  # noqa: FBT001
         """
         Set the BGP graceful shutdown override state for a peer.
@@ -435,6 +901,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         # Set the global setting for this pattern
         self.state["bgp"]["+graceful_shutdown"][peer] = value
 
+        self._state_journal_record(["bgp", "+graceful_shutdown"])
+
     def state_bgp_peer_graceful_shutdown_remove(self, peer: str) -> None:
         """
         Remove a BGP graceful shutdown override flag from a peer or pattern.
@@ -465,10 +933,17 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
             if not self.state["bgp"]["+graceful_shutdown"]:
                 del self.state["bgp"]["+graceful_shutdown"]
 
-    def state_bgp_peer_graceful_shutdown_status(self) -> BirdPlanBGPPeerGracefulShutdownStatus:
+            self._state_journal_record(["bgp", "+graceful_shutdown"])
+
+    def state_bgp_peer_graceful_shutdown_status(self, peers: list[str] | None = None) -> BirdPlanBGPPeerGracefulShutdownStatus:
         """
         Return the status of BGP peer graceful shutdown.
 
+        Parameters
+        ----------
+        peers : Optional[List[str]]
+            Only return the status of these peers, defaults to all peers.
+
         Returns
         -------
         BirdPlanBGPPeerGracefulShutdownStatus
@@ -509,16 +984,18 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if "+graceful_shutdown" in self.state["bgp"]:
             ret["overrides"] = self.state["bgp"]["+graceful_shutdown"]
 
-        # Check if we have any peers in our state
-        if "peers" in self.state["bgp"]:
-            # If we do loop with them
-            for peer, peer_state in self.state["bgp"]["peers"].items():
-                # And check if they have a graceful shutdown state or not
-                ret["current"][peer] = peer_state.get("graceful_shutdown", False)
+        peers_state = self.state["bgp"].get("peers", {})
+        config_peers = self.birdconf.protocols.bgp.peers
+
+        # Loop with the peers in our state and check if they have a graceful shutdown state or not
+        for peer in peers_state if peers is None else peers:
+            if peer in peers_state:
+                ret["current"][peer] = peers_state[peer].get("graceful_shutdown", False)
 
         # Generate the override status as if we were doing a configure
-        for peer in self.birdconf.protocols.bgp.peers:
-            ret["pending"][peer] = self.birdconf.protocols.bgp.peer(peer).graceful_shutdown
+        for peer in config_peers if peers is None else peers:
+            if peer in config_peers:
+                ret["pending"][peer] = config_peers[peer].graceful_shutdown
 
         return ret
 
@@ -551,6 +1028,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         # Set the global setting for this pattern
         self.state["bgp"]["+quarantine"][peer] = value
 
+        self._state_journal_record(["bgp", "+quarantine"])
+
     def state_bgp_peer_quarantine_remove(self, peer: str) -> None:
         """
         Remove a BGP quarantine override flag from a peer or pattern.
@@ -580,10 +1059,17 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if not self.state["bgp"]["+quarantine"]:
             del self.state["bgp"]["+quarantine"]
 
-    def state_bgp_peer_quarantine_status(self) -> BirdPlanBGPPeerQuarantineStatus:
+        self._state_journal_record(["bgp", "+quarantine"])
+
+    def state_bgp_peer_quarantine_status(self, peers: list[str] | None = None) -> BirdPlanBGPPeerQuarantineStatus:
         """
         Return the status of BGP peer quarantine.
 
+        Parameters
+        ----------
+        peers : Optional[List[str]]
+            Only return the status of these peers, defaults to all peers.
+
         Returns
         -------
         BirdPlanBGPPeerQuarantineStatus
@@ -624,16 +1110,18 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if "+quarantine" in self.state["bgp"]:
             ret["overrides"] = self.state["bgp"]["+quarantine"]
 
-        # Check if we have any peers in our state
-        if "peers" in self.state["bgp"]:
-            # If we do loop with them
-            for peer, peer_state in self.state["bgp"]["peers"].items():
-                # And check if they have a quarantine state or not
-                ret["current"][peer] = peer_state.get("quarantine", False)
+        peers_state = self.state["bgp"].get("peers", {})
+        config_peers = self.birdconf.protocols.bgp.peers
+
+        # Loop with the peers in our state and check if they have a quarantine state or not
+        for peer in peers_state if peers is None else peers:
+            if peer in peers_state:
+                ret["current"][peer] = peers_state[peer].get("quarantine", False)
 
         # Generate the override status as if we were doing a configure
-        for peer in self.birdconf.protocols.bgp.peers:
-            ret["pending"][peer] = self.birdconf.protocols.bgp.peer(peer).quarantine
+        for peer in config_peers if peers is None else peers:
+            if peer in config_peers:
+                ret["pending"][peer] = config_peers[peer].quarantine
 
         return ret
 
@@ -673,6 +1161,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         # Set the interface cost value
         self.state["ospf"]["areas"][area]["+interfaces"][interface]["cost"] = cost
 
+        self._state_journal_record(["ospf", "areas", area, "+interfaces"])
+
     def state_ospf_remove_interface_cost(self, area: str, interface: str) -> None:
         """
         Remove an OSPF interface cost override.
@@ -710,6 +1200,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if not self.state["ospf"]["areas"][area]["+interfaces"]:
             del self.state["ospf"]["areas"][area]["+interfaces"]
 
+        self._state_journal_record(["ospf", "areas", area, "+interfaces"])
+
     def state_ospf_set_interface_ecmp_weight(self, area: str, interface: str, ecmp_weight: int) -> None:
         """
         Set an OSPF interface ECMP weight override.
@@ -746,6 +1238,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         # Set the interface ecmp_weight value
         self.state["ospf"]["areas"][area]["+interfaces"][interface]["ecmp_weight"] = ecmp_weight
 
+        self._state_journal_record(["ospf", "areas", area, "+interfaces"])
+
     def state_ospf_remove_interface_ecmp_weight(self, area: str, interface: str) -> None:
         """
         Remove an OSPF interface ECMP weight override.
@@ -783,6 +1277,8 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         if not self.state["ospf"]["areas"][area]["+interfaces"]:
             del self.state["ospf"]["areas"][area]["+interfaces"]
 
+        self._state_journal_record(["ospf", "areas", area, "+interfaces"])
+
     def state_ospf_interface_status(self) -> BirdPlanOSPFInterfaceStatus:  # noqa: C901,PLR0912
         """
         Return the status of OSPF interfaces.
@@ -901,6 +1397,41 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
 
         return ret
 
+    def _bird_protocols(self, bird_socket: str | None, protocol_names: list[str] | None) -> dict[str, Any]:
+        """Return the status of the BIRD protocols, either all of them or only those we asked for."""
+
+        birdc = birdclient.BirdClient(control_socket=bird_socket)
+
+        if protocol_names is None:
+            bird_protocols: dict[str, Any] = birdc.show_protocols()
+            return bird_protocols
+
+        bird_protocols = {}
+        for protocol_name in protocol_names:
+            bird_state = birdc.show_protocol(protocol_name)
+            # Skip protocols BIRD doesn't have
+            if bird_state:
+                bird_protocols[protocol_name] = bird_state
+
+        return bird_protocols
+
+    def _state_journal_record(self, path: list[str]) -> None:
+        """Record the current value of a state item in the state journal."""
+
+        # Skip if the state needs to be written out in full anyway
+        if self._state_journal is None:
+            return
+
+        # Work out the current value, if the item does not exist it was deleted
+        value: Any = self.state
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                self._state_journal.append({"op": "delete", "path": path})
+                return
+            value = value[key]
+
+        self._state_journal.append({"op": "set", "path": path, "value": value})
+
     def _config_global(self) -> None:
         """Configure global options."""
 
@@ -974,6 +1505,34 @@ class BirdPlan:  # pylint: disable=too-many-public-methods
         """Return the BirdConfig object."""
         return self._birdconf
 
+    @property
+    def bgp_peer_index(self) -> BGPPeerIndex:
+        """
+        Return the indexes over the BGP peers in the state and configuration.
+
+        The indexes are built the first time they are needed and rebuilt if the state or configuration peers change.
+
+        """
+
+        peers_state = self.state.get("bgp", {}).get("peers", {})
+        config_peers = self.birdconf.protocols.bgp.peers
+
+        # Check if we can use the indexes we built last time
+        if self._bgp_peer_index:
+            cached_peers_state, cached_config_peers, peers_state_count, config_peers_count, index = self._bgp_peer_index
+            if (
+                cached_peers_state is peers_state
+                and cached_config_peers is config_peers
+                and peers_state_count == len(peers_state)
+                and config_peers_count == len(config_peers)
+            ):
+                return index
+
+        index = BGPPeerIndex.from_peers(peers_state, config_peers.values())
+        self._bgp_peer_index = (peers_state, config_peers, len(peers_state), len(config_peers), index)
+
+        return index
+
     @property
     def config(self) -> dict[str, Any]:
         """Return our config."""
@@ -19,14 +19,18 @@
 """BGPQ3/4 support class."""
 
 import functools
-import ipaddress
+import io
 import json
+import re
 import shutil
 import subprocess  # nosec
+import tempfile
 import time
+from collections.abc import Callable
 from typing import Any
 
 from .exceptions import BirdPlanError
+from .prefix_set import PrefixSet
 
 __all__ = ["BGPQ3"]
 
@@ -46,6 +50,9 @@ __all__ = ["BGPQ3"]
 # > }
 bgpq3_cache: dict[str, dict[str, Any]] = {}
 
+# Number of seconds cached results are valid for
+bgpq3_cache_ttl: float = 60
+
 
 class BGPQ3:
     """BGPQ3 support class."""
@@ -82,35 +89,33 @@ class BGPQ3:
         else:
             objects.extend(as_sets)
 
-        # Grab ASNs
-        is_birdplan_internal = False
-        asns_bgpq3: dict[str, list[str]] = {}
-        for obj in objects:
-            # Try pull result from our cache
-            result: Any = self._cache(f"asns:{obj}")
-            # If we can't, grab the result from BGPQ3 live
-            if not result:
-                # Try query object
-                try:
-                    result = self._bgpq3(["-l", "asns", "-t", "-3", obj])
-                except subprocess.CalledProcessError as err:
-                    raise BirdPlanError(f"Failed to query IRR ASNs from object '{obj}':\n%s" % err.output.decode("UTF-8")) from None
-                except BirdPlanError as err:
-                    raise BirdPlanError(f"Failed to query IRR ASNs from object '{obj}':\n{err}") from None
-                # Cache the result we got
-                self._cache(f"asns:{obj}", result)
-            # Check if this is a birdplan internal object
-            if obj.startswith("_BIRDPLAN:"):
-                is_birdplan_internal = True
-            # Update return value with result
-            asns_bgpq3.update(result)
+        # Objects we have cached are served from our cache, the rest are looked up in a single bgpq3 invocation
+        results, uncached = self._cached_results("asns", objects)
+        if uncached:
+            try:
+                result = self._bgpq3(["-l", "asns", "-t", "-3", *uncached])
+            except subprocess.CalledProcessError as err:
+                raise BirdPlanError(
+                    f"Failed to query IRR ASNs from {_objects_str(uncached)}:\n%s" % err.output.decode("UTF-8")
+                ) from None
+            except BirdPlanError as err:
+                raise BirdPlanError(f"Failed to query IRR ASNs from {_objects_str(uncached)}:\n{err}") from None
+            # Cache the result we got
+            self._cache(_cache_key("asns", uncached), result)
+            results.append(result)
 
         # If we don't have "asns" returned in the JSON structure, raise an exception
-        if "asns" not in asns_bgpq3:  # pragma: no cover
-            raise BirdPlanError(f"BGPQ3 output error, expecting 'asns': {asns_bgpq3}")
+        for result in results:
+            if "asns" not in result:  # pragma: no cover
+                raise BirdPlanError(f"BGPQ3 output error, expecting 'asns': {result}")
+        # Merge the ASNs from each result, removing duplicates
+        asns_bgpq3 = list(dict.fromkeys(asn for result in results for asn in result["asns"]))
+
+        # Check if this is a birdplan internal object
+        is_birdplan_internal = any(obj.startswith("_BIRDPLAN:") for obj in objects)
 
         filtered_asns = []
-        for asn in asns_bgpq3["asns"]:
+        for asn in asns_bgpq3:
             # Convert to int for below
             asn_i = int(asn)
             # 0	Reserved by [RFC7607]	[RFC7607]
@@ -144,7 +149,7 @@ class BGPQ3:
 
         return filtered_asns
 
-    def get_prefixes(self, as_sets: str | list[str]) -> dict[str, list[str]]:
+    def get_prefixes(self, as_sets: str | list[str]) -> dict[str, PrefixSet]:
         """Get prefixes."""
 
         # Build an object list depending on the type of "objects" above
@@ -154,50 +159,96 @@ class BGPQ3:
         else:
             objects.extend(as_sets)
 
-        # Grab IPv4 and IPv6 prefixes
-        prefixes_bgpq3: dict[str, list[dict[str, Any]]] = {}
+        # Start out with no prefixes
+        prefixes: dict[str, PrefixSet] = {"ipv4": PrefixSet(), "ipv6": PrefixSet()}
+
+        # Objects we have cached are served from our cache, the rest are looked up in a single bgpq3 invocation per family
+        results, uncached = self._cached_results("prefixes", objects)
+        if uncached:
+            result: dict[str, PrefixSet] = {}
+            # Lets see if we get results back from our IRR queries
+            try:
+                result.update(self._bgpq3_prefixes(["-l", "ipv4", "-m", "24", "-4", "-A", *uncached]))
+            except subprocess.CalledProcessError as err:
+                raise BirdPlanError(
+                    f"Failed to query IRR IPv4 prefixes from {_objects_str(uncached)}:\n%s" % err.output.decode("UTF-8")
+                ) from None
+            try:
+                result.update(self._bgpq3_prefixes(["-l", "ipv6", "-m", "48", "-6", "-A", *uncached]))
+            except subprocess.CalledProcessError as err:
+                raise BirdPlanError(
+                    f"Failed to query IRR IPv6 prefixes from {_objects_str(uncached)}:\n%s" % err.output.decode("UTF-8")
+                ) from None
+            # Cache the result we got
+            self._cache(_cache_key("prefixes", uncached), result)
+            results.append(result)
+
+        # If we only have one result we can use it as is
+        if len(results) == 1:
+            return prefixes | self._result_prefixes(results[0])
+
+        # Else we merge them, without touching the cached ones, removing duplicates
+        for result in results:
+            for family, family_prefixes in self._result_prefixes(result).items():
+                prefixes[family].extend(family_prefixes)
+
+        return {family: family_prefixes.sorted() for family, family_prefixes in prefixes.items()}
+
+    def _result_prefixes(self, result: dict[str, Any]) -> dict[str, PrefixSet]:
+        """Return the prefixes from a BGPQ3 result."""
+
+        prefixes: dict[str, PrefixSet] = {}
+
+        for family, family_prefixes in result.items():
+            # Results we got from BGPQ3 are already packed
+            if isinstance(family_prefixes, PrefixSet):
+                prefixes[family] = family_prefixes
+            # Else we have a result in BGPQ3 JSON format
+            else:
+                prefixes[family] = PrefixSet()
+                for entry in family_prefixes:
+                    self._add_prefix(prefixes[family], entry)
+
+        return prefixes
+
+    def _cached_results(self, kind: str, objects: list[str]) -> tuple[list[Any], list[str]]:
+        """
+        Return the cached results for a list of objects, along with the objects we still need to look up.
+
+        Objects are cached on their own when looked up on their own, and as a group when looked up together.
+
+        """
+
+        results: list[Any] = []
+        uncached: list[str] = []
+
         for obj in objects:
             # Try pull result from our cache
-            result: Any = self._cache(f"prefixes:{obj}")
-            # If we can't, grab the result from BGPQ3 live
-            if not result:
-                result = {}
-                # Lets see if we get results back from our IRR queries
-                try:
-                    result.update(self._bgpq3(["-l", "ipv4", "-m", "24", "-4", "-A", obj]))
-                except subprocess.CalledProcessError as err:
-                    raise BirdPlanError(
-                        f"Failed to query IRR IPv4 prefixes from object '{obj}':\n%s" % err.output.decode("UTF-8")
-                    ) from None
-                try:
-                    result.update(self._bgpq3(["-l", "ipv6", "-m", "48", "-6", "-A", obj]))
-                except subprocess.CalledProcessError as err:
-                    raise BirdPlanError(
-                        f"Failed to query IRR IPv6 prefixes from object '{obj}':\n%s" % err.output.decode("UTF-8")
-                    ) from None
-                # Cache the result we got
-                self._cache(f"prefixes:{obj}", result)
-            # Update return value with result
-            prefixes_bgpq3.update(result)
+            result = self._cache(_cache_key(kind, [obj]))
+            if result:
+                results.append(result)
+            elif obj not in uncached:
+                uncached.append(obj)
 
-        # Start out with no prefixes
-        prefixes: dict[str, list[str]] = {"ipv4": [], "ipv6": []}
+        # Check if we looked up the same group of objects before
+        if len(uncached) > 1:
+            result = self._cache(_cache_key(kind, uncached))
+            if result:
+                results.append(result)
+                uncached = []
 
-        for family in ("ipv4", "ipv6"):
-            for prefix in prefixes_bgpq3[family]:
-                # If it is exact, its easy to add
-                if prefix["exact"]:
-                    prefixes[family].append(prefix["prefix"])
-                else:
-                    # Work out greater_equal component
-                    if "greater-equal" in prefix:
-                        greater_equal = prefix["greater-equal"]
-                    else:
-                        greater_equal = ipaddress.ip_network(prefix["prefix"]).prefixlen
-                    # Add prefix, format is %s{%s,%s}
-                    prefixes[family].append(f"{prefix['prefix']}{{{greater_equal},{prefix['less-equal']}}}")
+        return results, uncached
 
-        return prefixes
+    def _add_prefix(self, prefixes: PrefixSet, entry: dict[str, Any]) -> None:
+        """Add a prefix in BGPQ3 JSON format to a prefix set."""
+
+        # If it is exact, its easy to add
+        if entry["exact"]:
+            prefixes.add(entry["prefix"])
+            return
+
+        # Add prefix with its length range, greater_equal defaults to the prefix length
+        prefixes.add(entry["prefix"], entry.get("greater-equal"), entry["less-equal"])
 
     def _bgpq3(self, args: list[str]) -> Any:  # noqa: ANN401
         """Run bgpq3."""
@@ -216,6 +267,51 @@ class BGPQ3:
         # Return the decoded json output
         return decoded
 
+    def _bgpq3_prefixes(self, args: list[str]) -> dict[str, PrefixSet]:
+        """
+        Run bgpq3 to retrieve prefixes.
+
+        The JSON output is parsed as it is read from bgpq3 and added to a prefix set, so we never hold the entire output in
+        memory.
+
+        """
+
+        # Run the IP tool with JSON output
+        cmd_args = [self._exe(), "-h", self.server, "-j"]
+        # Add our args
+        cmd_args.extend(args)
+
+        # Use a temporary file for stderr so we cannot deadlock on it while reading stdout
+        with (
+            tempfile.TemporaryFile() as stderr,
+            subprocess.Popen(cmd_args, stdout=subprocess.PIPE, stderr=stderr) as proc,  # noqa: S603
+        ):
+            if not proc.stdout:  # pragma: no cover
+                raise BirdPlanError(f"Failed to read output from {self._exe()}")
+
+            parser = _PrefixStreamParser(self._add_prefix)
+            output = io.TextIOWrapper(proc.stdout, encoding="UTF-8")
+            try:
+                for chunk in iter(functools.partial(output.read, 65536), ""):
+                    parser.feed(chunk)
+                result = parser.close()
+            except json.JSONDecodeError as err:
+                # Make sure the process is not left running if we could not parse its output
+                proc.kill()
+                decode_error = err
+            else:
+                decode_error = None
+
+            # Check if the process failed, this takes precedence over any decoding error
+            if proc.wait():
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(proc.returncode, cmd_args, output=stderr.read())
+
+        if decode_error:
+            raise BirdPlanError(f"Failed to decode JSON output from {self._exe()}: {decode_error}")
+
+        return result
+
     def _cache(self, obj: str, value: Any | None = None) -> Any | None:  # noqa: ANN401
         """Retrieve or store value in cache."""
 
@@ -228,8 +324,8 @@ class BGPQ3:
                 return None
             # Grab the cached object
             cached = bgpq3_cache[self.server]["objects"][obj]
-            # Make sure its timestamp is within 60s of being retrieved, if not, return None
-            if cached["_timestamp"] + 60 < time.time():  # pragma: no cover
+            # Make sure its timestamp is within the cache TTL of being retrieved, if not, return None
+            if cached["_timestamp"] + bgpq3_cache_ttl < time.time():  # pragma: no cover
                 return None
             # Else its valid, return the cached value
             return cached["value"]
@@ -256,3 +352,147 @@ class BGPQ3:
     def port(self) -> int:
         """Return the port we're using."""
         return self._port
+
+
+def _cache_key(kind: str, objects: list[str]) -> str:
+    """Return the cache key for the result of looking up a group of objects."""
+    return f"{kind}:{','.join(sorted(objects))}"
+
+
+def _objects_str(objects: list[str]) -> str:
+    """Return a group of objects for use in messages."""
+    if len(objects) == 1:
+        return f"object '{objects[0]}'"
+    return "objects " + ", ".join(f"'{obj}'" for obj in objects)
+
+
+# Whitespace between JSON tokens
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _PrefixStreamParser:
+    """
+    Incremental parser for the BGPQ3 prefix JSON output.
+
+    The output is in the format of {"ipv4": [{"prefix": ...}, ...]}, each prefix entry is decoded and added to a prefix set as
+    soon as it is complete.
+
+    """
+
+    _add_prefix: Callable[[PrefixSet, dict[str, Any]], None]
+    _buffer: str
+    _decoder: json.JSONDecoder
+    _key: str
+    _result: dict[str, PrefixSet]
+    _state: str
+
+    def __init__(self, add_prefix: Callable[[PrefixSet, dict[str, Any]], None]) -> None:
+        """Initialize object."""
+
+        self._add_prefix = add_prefix
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+        self._key = ""
+        self._result = {}
+        self._state = "start"
+
+    def feed(self, data: str) -> None:  # noqa: C901,PLR0912,PLR0915
+        """Feed data into the parser."""
+
+        self._buffer += data
+
+        buffer_len = len(self._buffer)
+        pos = 0
+        while True:
+            # Skip whitespace
+            pos = _WHITESPACE.match(self._buffer, pos).end()  # type: ignore[union-attr]
+            # If we have no more data, we need to wait for more
+            if pos >= buffer_len:
+                break
+
+            char = self._buffer[pos]
+
+            # Check for start of the top level object
+            if self._state == "start":
+                self._expect(char, "{", pos)
+                self._state = "key"
+                pos += 1
+            # Check for a family key
+            elif self._state == "key":
+                # Check for the end of the top level object
+                if char == "}":
+                    self._state = "end"
+                    pos += 1
+                    continue
+                value, next_pos = self._decode(pos)
+                if next_pos is None:
+                    break
+                self._key = value
+                self._result[self._key] = PrefixSet()
+                self._state = "colon"
+                pos = next_pos
+            # Check for the colon after the key
+            elif self._state == "colon":
+                self._expect(char, ":", pos)
+                self._state = "array"
+                pos += 1
+            # Check for the start of the prefix list
+            elif self._state == "array":
+                self._expect(char, "[", pos)
+                self._state = "item"
+                pos += 1
+            # Check for a prefix entry, or the end of the list
+            elif self._state == "item":
+                if char == "]":
+                    self._state = "next_key"
+                    pos += 1
+                    continue
+                value, next_pos = self._decode(pos)
+                if next_pos is None:
+                    break
+                self._add_prefix(self._result[self._key], value)
+                self._state = "next_item"
+                pos = next_pos
+            # Check for the separator between prefix entries
+            elif self._state == "next_item":
+                if char == "]":
+                    self._state = "next_key"
+                else:
+                    self._expect(char, ",", pos)
+                    self._state = "item"
+                pos += 1
+            # Check for the separator between families
+            elif self._state == "next_key":
+                if char == "}":
+                    self._state = "end"
+                else:
+                    self._expect(char, ",", pos)
+                    self._state = "key"
+                pos += 1
+            # We should not have anything after the end
+            else:
+                raise json.JSONDecodeError("Extra data", self._buffer, pos)
+
+        # Drop what we've already parsed
+        self._buffer = self._buffer[pos:]
+
+    def close(self) -> dict[str, PrefixSet]:
+        """Finish parsing and return the result."""
+
+        if self._state != "end" or self._buffer.strip():
+            raise json.JSONDecodeError("Unexpected end of data", self._buffer, len(self._buffer))
+
+        return self._result
+
+    def _decode(self, pos: int) -> tuple[Any, int | None]:
+        """Decode a JSON value at a position, returning None as the position if we need more data."""
+        try:
+            return self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            # If we can't decode, we probably don't have the entire value yet, close() will pick up actual errors
+            return None, None
+
+    def _expect(self, char: str, expected: str, pos: int) -> None:
+        """Raise an exception if a character is not what we expect."""
+        if char != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", self._buffer, pos)
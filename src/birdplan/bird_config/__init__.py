@@ -20,6 +20,7 @@
 
 from typing import Any
 
+from .config_stats import ConfigStats, check_config_budget, config_stats
 from .globals import BirdConfigGlobals
 from .sections import Sections
 from .sections.constants import SectionConstants
@@ -36,17 +37,33 @@ class BirdConfig:
 
     _sections: Sections
 
+    _config_stats: ConfigStats | None
+
     def __init__(self, test_mode: bool = False) -> None:  # noqa: FBT001,FBT002
         """Initialize the object."""
         self._birdconfig_globals = BirdConfigGlobals(test_mode=test_mode)
         self._sections = Sections(self.birdconfig_globals)
+        self._config_stats = None
 
     def get_config(self) -> list[str]:
         """Return the Bird configuration."""
 
         self.sections.configure()
 
-        return self.sections.conf.lines
+        lines = self.sections.conf.lines
+
+        # Account for the size of each section and BGP peer, checking the BGP peers are within budget
+        bgp = self.protocols.bgp
+        self._config_stats = config_stats(lines, {peer.section: peer.name for peer in bgp.peers.values()})
+        if bgp.config_budget:
+            check_config_budget(self._config_stats, bgp.config_budget)
+
+        return lines
+
+    @property
+    def config_stats(self) -> ConfigStats | None:
+        """Return the size statistics of the last configuration generated."""
+        return self._config_stats
 
     @property
     def birdconfig_globals(self) -> BirdConfigGlobals:
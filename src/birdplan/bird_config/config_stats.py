@@ -0,0 +1,205 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BIRD configuration size accounting."""
+
+import logging
+import re
+from typing import Any
+
+from ..exceptions import BirdPlanError
+
+__all__ = ["ConfigStats", "check_config_budget", "config_stats", "config_stats_summary"]
+
+
+# Match the line starting a block within a BGP peer section, capturing the kind of block and its name
+_PEER_BLOCK_REGEX = re.compile(r"^(define|filter|function|protocol) (\S+)")
+
+# Configuration size statistics
+ConfigStats = dict[str, Any]
+
+
+def config_stats(lines: list[str], peer_sections: dict[str, str]) -> ConfigStats:
+    """
+    Return the number of bytes and lines of each section of a BIRD configuration and each BGP peer.
+
+    Sections are delimited by their title blocks, BGP peer sections are further split into the blocks they are made up of.
+
+    Parameters
+    ----------
+    lines : List[str]
+        BIRD configuration lines, as returned by BirdConfig.get_config().
+
+    peer_sections : Dict[str, str]
+        BGP peer names indexed by their section title.
+
+    Returns
+    -------
+    ConfigStats
+        Dictionary containing the bytes and lines of the configuration, each line counting its line ending.
+
+        eg.
+        {
+            'total': {'bytes': 107420, 'lines': 2026},
+            'sections': {
+                'Global Constants': {'bytes': 1630, 'lines': 43},
+                ...
+            },
+            'peers': {
+                'c1': {
+                    'bytes': 5120,
+                    'lines': 158,
+                    'blocks': {
+                        'prefix_lists': {'bytes': 1024, 'lines': 20},
+                        'filters': ...,
+                        'protocols': ...,
+                    },
+                },
+            },
+        }
+
+    """
+
+    stats: ConfigStats = {"total": _counter(), "sections": {}, "peers": {}}
+
+    # Lines before the first section title are accounted for separately
+    counter = stats["sections"].setdefault("Header", _counter())
+    peer_blocks: dict[str, dict[str, int]] | None = None
+    block_counter = _counter()
+
+    for index, line in enumerate(lines):
+        # Check if this is the start of a title block, in which case switch to the section it belongs to
+        if line == "#" and index + 2 < len(lines) and lines[index + 2] == "#" and lines[index + 1].startswith("# "):
+            title = lines[index + 1][2:]
+            peer_name = peer_sections.get(title)
+            if peer_name is None:
+                counter = stats["sections"].setdefault(title, _counter())
+                peer_blocks = None
+            else:
+                peer_stats = stats["peers"].setdefault(peer_name, {**_counter(), "blocks": {}})
+                counter = peer_stats
+                peer_blocks = peer_stats["blocks"]
+                block_counter = peer_blocks.setdefault("other", _counter())
+
+        # Some items span multiple lines, so we count the line endings within them too
+        line_bytes = (len(line) if line.isascii() else len(line.encode("UTF-8"))) + 1
+        line_count = line.count("\n") + 1
+
+        stats["total"]["bytes"] += line_bytes
+        stats["total"]["lines"] += line_count
+        counter["bytes"] += line_bytes
+        counter["lines"] += line_count
+
+        # Within BGP peer sections, work out which block we're in
+        if peer_blocks is not None:
+            # Blocks start at the beginning of a line, so we can skip indented lines like prefix list entries
+            match = _PEER_BLOCK_REGEX.match(line) if not line.startswith(" ") else None
+            if match:
+                block_counter = peer_blocks.setdefault(_peer_block_kind(match.group(1), match.group(2)), _counter())
+            block_counter["bytes"] += line_bytes
+            block_counter["lines"] += line_count
+
+    # Configuration normally starts with a section title, so there is usually no header
+    if not stats["sections"]["Header"]["lines"]:
+        del stats["sections"]["Header"]
+
+    return stats
+
+
+def config_stats_summary(stats: ConfigStats, count: int = 10) -> list[str]:
+    """
+    Return a summary of the largest contributors to the configuration size, one line for each.
+
+    Parameters
+    ----------
+    stats : ConfigStats
+        Statistics as returned by config_stats().
+
+    count : int
+        Number of sections and BGP peers to return.
+
+    Returns
+    -------
+    List[str]
+        Summary lines, starting with the total.
+
+    """
+
+    total = stats["total"]
+    lines = [f"total: {total['bytes']} bytes, {total['lines']} lines"]
+
+    contributors = [(f"section '{name}'", counter, None) for name, counter in stats["sections"].items()]
+    contributors += [(f"peer '{name}'", counter, counter["blocks"]) for name, counter in stats["peers"].items()]
+    contributors.sort(key=lambda contributor: (-contributor[1]["bytes"], contributor[0]))
+
+    for name, counter, blocks in contributors[:count]:
+        line = f"{name}: {counter['bytes']} bytes, {counter['lines']} lines"
+        if total["bytes"]:
+            line += f" ({counter['bytes'] * 100 / total['bytes']:.1f}%)"
+        # For peers add the breakdown of their blocks, largest first
+        if blocks:
+            breakdown = sorted(blocks.items(), key=lambda block: (-block[1]["bytes"], block[0]))
+            line += " [" + ", ".join(f"{kind} {block['bytes']} bytes" for kind, block in breakdown) + "]"
+        lines.append(line)
+
+    return lines
+
+
+def check_config_budget(stats: ConfigStats, budget: dict[str, int | str]) -> None:
+    """
+    Check the configuration of each BGP peer is within budget.
+
+    Parameters
+    ----------
+    stats : ConfigStats
+        Statistics as returned by config_stats().
+
+    budget : Dict[str, Union[int, str]]
+        Budget containing the optional "peer_bytes" and "peer_lines" limits, with the "action" to take when a peer exceeds
+        them, either "warn" or "fail".
+
+    """
+
+    over_budget = []
+    for peer_name, peer_stats in sorted(stats["peers"].items()):
+        for item in ("bytes", "lines"):
+            limit = budget.get(f"peer_{item}")
+            if isinstance(limit, int) and peer_stats[item] > limit:
+                over_budget.append(f"BGP peer '{peer_name}' configuration exceeds budget: {item}={peer_stats[item]}, limit={limit}")
+
+    if not over_budget:
+        return
+
+    if budget.get("action", "fail") == "fail":
+        raise BirdPlanError("\n".join(over_budget))
+
+    for message in over_budget:
+        logging.warning(message)
+
+
+def _counter() -> dict[str, int]:
+    """Return a new byte and line counter."""
+    return {"bytes": 0, "lines": 0}
+
+
+def _peer_block_kind(kind: str, name: str) -> str:
+    """Return the kind of block within a BGP peer section."""
+    if kind == "define":
+        return "prefix_lists" if "prefixes" in name else "asn_lists"
+    return f"{kind}s"
@@ -43,6 +43,10 @@ class BirdConfigGlobals:  # pylint: disable=too-few-public-methods,too-many-inst
         VRF to use for BIRD.
     routing_table: int
         Kernel routing table to add the routes to.
+    workers: int
+        Number of worker processes to use when constructing and rendering BGP peers.
+    validate_only : bool
+        Only validate the configuration, cached external data is used if available and missing data is skipped.
 
     """
 
@@ -52,10 +56,12 @@ class BirdConfigGlobals:  # pylint: disable=too-few-public-methods,too-many-inst
     ignore_irr_changes: bool
     ignore_peeringdb_changes: bool
     use_cached: bool
+    validate_only: bool
     state: dict[str, Any]
     test_mode: bool
     vrf: str
     routing_table: int | None
+    workers: int
 
     def __init__(self, test_mode: bool = False) -> None:  # noqa: FBT001,FBT002
         """Initialize object."""
@@ -64,8 +70,10 @@ class BirdConfigGlobals:  # pylint: disable=too-few-public-methods,too-many-inst
         self.ignore_irr_changes = False
         self.ignore_peeringdb_changes = False
         self.use_cached = False
+        self.validate_only = False
         self.vrf = "default"
         self.routing_table = None
+        self.workers = 1
 
         # Debugging
         self.debug = False
@@ -29,6 +29,8 @@ class SectionConstants(SectionBase):
 
     _need_bogons: bool
 
+    bird_constants: dict[str, list[str]]
+
     def __init__(self, birdconfig_globals: BirdConfigGlobals) -> None:
         """Initialize the object."""
         super().__init__(birdconfig_globals)
@@ -39,6 +41,9 @@ class SectionConstants(SectionBase):
         # Add bogon constants to output
         self._need_bogons = False
 
+        # Shared constants added by protocols, indexed by constant name so they are only output once
+        self.bird_constants = {}
+
     def configure(self) -> None:
         """Configure global constants."""
         super().configure()
@@ -57,6 +62,11 @@ class SectionConstants(SectionBase):
             self._configure_bogons_ipv4()
             self._configure_bogons_ipv6()
 
+        # Check if we're adding shared constants, these come after the protocol specific constants
+        for content in self.bird_constants.values():
+            self.conf.append(content)
+            self.conf.append("")
+
     def _configure_defaults(self) -> None:
         """Configure default routes."""
         self.conf.add("# Default routes")
@@ -19,6 +19,7 @@
 """BIRD BGP protocol configuration."""
 
 from .....exceptions import BirdPlanError
+from .....override_matcher import OverrideMatcher
 from ....globals import BirdConfigGlobals
 from ...bird_attributes import SectionBirdAttributes
 from ...constants import SectionConstants
@@ -31,6 +32,7 @@ from ..rpki import ProtocolRPKI, RPKISource
 from .bgp_attributes import BGPAttributes, BGPPeertypeConstraints, BGPRoutePolicyAccept, BGPRoutePolicyImport
 from .bgp_functions import BGPFunctions
 from .bgp_types import BGPPeerConfig
+from .parallel import can_parallelize, construct_peers, render_peers
 from .peer import ProtocolBGPPeer
 
 __all__ = ["ProtocolBGP"]
@@ -101,9 +103,11 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
 
         self.functions.conf.append(self.bgp_functions, deferred=True)
 
+        # Peers using a flat table export from the main BGP table directly, which needs it to be sorted
+        table_options = " sorted" if any(peer.flat_table for peer in self.peers.values()) else ""
         self.tables.conf.append("# BGP Tables")
-        self.tables.conf.append("ipv4 table t_bgp4;")
-        self.tables.conf.append("ipv6 table t_bgp6;")
+        self.tables.conf.append(f"ipv4 table t_bgp4{table_options};")
+        self.tables.conf.append(f"ipv6 table t_bgp6{table_options};")
         self.tables.conf.append("")
 
         # Setup BGP origination
@@ -156,8 +160,13 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
 
         # Loop with BGP peers and configure them
         self.conf.add("")
-        for peer in self.peers.values():
-            self.conf.add(peer)
+        # Check if we're rendering the peers using a process pool
+        if can_parallelize(self, len(self.peers)):
+            for peer in render_peers(self):
+                self.conf.add(peer.conf.lines)
+        else:
+            for peer in self.peers.values():
+                self.conf.add(peer)
 
     def add_originated_route(self, route: str) -> None:
         """Add originated route."""
@@ -170,6 +179,10 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
         if peer_name in self.peers:
             raise BirdPlanError(f"BGP peer '{peer_name}' already exists")
 
+        # Make sure our overrides are compiled before the peer looks them up
+        if self.bgp_attributes.graceful_shutdown_overrides is None or self.bgp_attributes.quarantine_overrides is None:
+            self.compile_overrides()
+
         # Create BGP peer object
         peer = ProtocolBGPPeer(
             self.birdconfig_globals,
@@ -186,6 +199,66 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
         # Add peer to our configured peer list
         self.peers[peer_name] = peer
 
+    def add_peers(self, peers_config: BGPPeersConfig) -> None:
+        """Add peers to BGP, using a process pool to construct them if we have workers."""
+
+        # Compile the overrides once for all the peers, workers inherit them
+        self.compile_overrides()
+
+        # If we're not using a process pool, just add the peers one by one
+        if not can_parallelize(self, len(peers_config)):
+            for peer_name, peer_config in peers_config.items():
+                self.add_peer(peer_name, peer_config)
+            return
+
+        for peer_name in peers_config:
+            if peer_name in self.peers:
+                raise BirdPlanError(f"BGP peer '{peer_name}' already exists")
+
+        # Add peers to our configured peer list in the same order as their configuration
+        for peer in construct_peers(self, peers_config):
+            self.peers[peer.name] = peer
+
+    def compile_overrides(self) -> None:
+        """Compile the graceful shutdown and quarantine overrides from the state."""
+
+        bgp_state = self.birdconfig_globals.state.get("bgp", {})
+
+        self.bgp_attributes.graceful_shutdown_overrides = OverrideMatcher(bgp_state.get("+graceful_shutdown"))
+        self.bgp_attributes.quarantine_overrides = OverrideMatcher(bgp_state.get("+quarantine"))
+
+    def apply_overrides(self) -> list[ProtocolBGPPeer]:
+        """
+        Re-apply the graceful shutdown and quarantine overrides from the state to the peers.
+
+        Returns
+        -------
+        list[ProtocolBGPPeer] : BGP peers with flags which differ from when they were last configured.
+
+        """
+
+        self.compile_overrides()
+
+        peers_state = self.birdconfig_globals.state.get("bgp", {}).get("peers", {})
+
+        changed_peers = []
+        for peer in self.peers.values():
+            peer.apply_overrides()
+            # Peers we have no state for have never been configured
+            peer_state = peers_state.get(peer.name)
+            if (
+                peer_state is None
+                or peer_state.get("graceful_shutdown") != peer.graceful_shutdown
+                or peer_state.get("quarantine") != peer.quarantine
+            ):
+                changed_peers.append(peer)
+
+        return changed_peers
+
+    def validate(self) -> None:
+        """Validate the BGP configuration checks which are only done during configuration."""
+        self._originated_routes_by_family()
+
     def peer(self, name: str) -> ProtocolBGPPeer:
         """Return a BGP peer configuration object."""
         if name not in self.peers:
@@ -444,7 +517,8 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
         self.constants.conf.append("define BGP_LC_ACTION_BLACKHOLE_ORIGINATE = (BGP_ASN, BGP_LC_FUNCTION_ACTION, 2);")
         self.constants.conf.append("")
 
-    def _configure_originated_routes(self) -> None:
+    def _originated_routes_by_family(self) -> dict[str, list[str]]:
+        """Return the originated routes split into IPv4 and IPv6."""
         # Work out static v4 and v6 routes
         routes: dict[str, list[str]] = {"4": [], "6": []}
         for prefix in sorted(self.originated_routes.keys()):
@@ -455,6 +529,10 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
                 routes["6"].append(f"{prefix} {info}")
             else:
                 raise BirdPlanError(f"The BGP originate route '{prefix}' is odd")
+        return routes
+
+    def _configure_originated_routes(self) -> None:
+        routes = self._originated_routes_by_family()
 
         self.tables.conf.append("# BGP Origination Tables")
 
@@ -650,6 +728,56 @@ class ProtocolBGP(SectionProtocolBase):  # pylint: disable=too-many-public-metho
         """Global BGP peer quarantine state."""
         self.bgp_attributes.quarantine = quarantine
 
+    @property
+    def import_table(self) -> bool:
+        """Global BGP peer import table (Adj-RIB-In) retention."""
+        return self.bgp_attributes.import_table
+
+    @import_table.setter
+    def import_table(self, import_table: bool) -> None:
+        """Global BGP peer import table (Adj-RIB-In) retention."""
+        self.bgp_attributes.import_table = import_table
+
+    @property
+    def export_table(self) -> bool:
+        """Global BGP peer export table (Adj-RIB-Out) retention."""
+        return self.bgp_attributes.export_table
+
+    @export_table.setter
+    def export_table(self, export_table: bool) -> None:
+        """Global BGP peer export table (Adj-RIB-Out) retention."""
+        self.bgp_attributes.export_table = export_table
+
+    @property
+    def flat_table(self) -> bool:
+        """Global BGP peer flat table topology."""
+        return self.bgp_attributes.flat_table
+
+    @flat_table.setter
+    def flat_table(self, flat_table: bool) -> None:
+        """Global BGP peer flat table topology."""
+        self.bgp_attributes.flat_table = flat_table
+
+    @property
+    def config_budget(self) -> dict[str, int | str]:
+        """Global budget for the size of the configuration generated for each peer."""
+        return self.bgp_attributes.config_budget
+
+    @config_budget.setter
+    def config_budget(self, config_budget: dict[str, int | str]) -> None:
+        """Global budget for the size of the configuration generated for each peer."""
+        self.bgp_attributes.config_budget = config_budget
+
+    @property
+    def irr_change_limits(self) -> dict[str, int | str]:
+        """Global limits on the IRR prefixes added, removed or covered between runs."""
+        return self.bgp_attributes.irr_change_limits
+
+    @irr_change_limits.setter
+    def irr_change_limits(self, irr_change_limits: dict[str, int | str]) -> None:
+        """Global limits on the IRR prefixes added, removed or covered between runs."""
+        self.bgp_attributes.irr_change_limits = irr_change_limits
+
     @property
     def rr_cluster_id(self) -> str | None:
         """Return route reflector cluster ID."""
@@ -18,6 +18,7 @@
 
 """BIRD BGP protocol attributes."""
 
+from .....override_matcher import OverrideMatcher
 from ..rpki import RPKISource
 
 __all__ = ["BGPAttributes", "BGPPeertypeConstraints", "BGPRoutePolicyAccept", "BGPRoutePolicyImport"]
@@ -44,6 +45,15 @@ class BGPRoutePolicyAccept:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "bgp_customer_blackhole",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_transit_default",
+        "originated",
+        "originated_default",
+    )
+
     bgp_customer_blackhole: bool
     bgp_own_blackhole: bool
     bgp_own_default: bool
@@ -85,6 +95,16 @@ class BGPRoutePolicyImport:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "connected",
+        "kernel",
+        "kernel_blackhole",
+        "kernel_default",
+        "static",
+        "static_blackhole",
+        "static_default",
+    )
+
     connected: bool | list[str]
     kernel: bool
     kernel_blackhole: bool
@@ -152,9 +172,39 @@ class BGPPeertypeConstraints:  # pylint: disable=too-few-public-methods,too-many
         Extended community maximum length.
     large_community_import_maxlen : int
         Large community maximum length.
+    import_table : Optional[bool]
+        Keep an import table (Adj-RIB-In), defaults to the global BGP setting.
+    export_table : Optional[bool]
+        Keep an export table (Adj-RIB-Out), defaults to the global BGP setting.
 
     """
 
+    __slots__ = (
+        "aspath_import_maxlen",
+        "aspath_import_minlen",
+        "blackhole_export_maxlen4",
+        "blackhole_export_maxlen6",
+        "blackhole_export_minlen4",
+        "blackhole_export_minlen6",
+        "blackhole_import_maxlen4",
+        "blackhole_import_maxlen6",
+        "blackhole_import_minlen4",
+        "blackhole_import_minlen6",
+        "community_import_maxlen",
+        "export_maxlen4",
+        "export_maxlen6",
+        "export_minlen4",
+        "export_minlen6",
+        "export_table",
+        "extended_community_import_maxlen",
+        "import_maxlen4",
+        "import_maxlen6",
+        "import_minlen4",
+        "import_minlen6",
+        "import_table",
+        "large_community_import_maxlen",
+    )
+
     import_maxlen4: int
     import_minlen4: int
 
@@ -186,6 +236,9 @@ class BGPPeertypeConstraints:  # pylint: disable=too-few-public-methods,too-many
     extended_community_import_maxlen: int
     large_community_import_maxlen: int
 
+    import_table: bool | None
+    export_table: bool | None
+
     def __init__(self, peer_type: str | None) -> None:
         """Initialize object."""
 
@@ -222,6 +275,9 @@ class BGPPeertypeConstraints:  # pylint: disable=too-few-public-methods,too-many
         self.extended_community_import_maxlen = 100
         self.large_community_import_maxlen = 100
 
+        self.import_table = None
+        self.export_table = None
+
         # Override defaults for internal peer types
         if peer_type in ("internal", "rrclient", "rrserver", "rrserver-rrserver"):
             self.import_maxlen4 = 32
@@ -246,10 +302,18 @@ class BGPAttributes:  # pylint: disable=too-few-public-methods,too-many-instance
     ----------
     asn : int
         BGP ASN.
+    config_budget : Dict[str, Union[int, str]]
+        Budget for the size of the configuration generated for each peer.
     graceful_shutdown : boolean
         Set graceful_shutdown mode for all peers.
+    graceful_shutdown_overrides : Optional[OverrideMatcher]
+        Graceful shutdown overrides from the state, compiled once for all peers.
+    irr_change_limits : Dict[str, Union[int, str]]
+        Limits on the IRR prefixes added, removed or covered between runs, either a number of prefixes or a percentage.
     quarantine : boolean
         Set quarantine mode for all peers.
+    quarantine_overrides : Optional[OverrideMatcher]
+        Quarantine overrides from the state, compiled once for all peers.
     rr_cluster_id : Optional[str]
         Route relfector cluster ID in the case of us being a route reflector.
     route_policy_accept : BGPRoutePolicyAccept
@@ -260,12 +324,40 @@ class BGPAttributes:  # pylint: disable=too-few-public-methods,too-many-instance
         Prefix limits for each peer type we support.
     rpki_source: Optional[RPKISource]
         RPKI source to use for validation.
+    import_table : bool
+        Keep an import table (Adj-RIB-In) for peers, allowing soft reconfiguration without a route refresh.
+    export_table : bool
+        Keep an export table (Adj-RIB-Out) for peers.
+    flat_table : bool
+        Import routes from peers straight into the main BGP table, without a peer table and pipe in between.
 
     """
 
+    __slots__ = (
+        "asn",
+        "config_budget",
+        "export_table",
+        "flat_table",
+        "graceful_shutdown",
+        "graceful_shutdown_overrides",
+        "import_table",
+        "irr_change_limits",
+        "peertype_constraints",
+        "quarantine",
+        "quarantine_overrides",
+        "route_policy_accept",
+        "route_policy_import",
+        "rpki_source",
+        "rr_cluster_id",
+    )
+
     asn: int | None
+    config_budget: dict[str, int | str]
     graceful_shutdown: bool
+    graceful_shutdown_overrides: OverrideMatcher | None
+    irr_change_limits: dict[str, int | str]
     quarantine: bool
+    quarantine_overrides: OverrideMatcher | None
     rr_cluster_id: str | None
     route_policy_accept: BGPRoutePolicyAccept
     route_policy_import: BGPRoutePolicyImport
@@ -274,14 +366,28 @@ class BGPAttributes:  # pylint: disable=too-few-public-methods,too-many-instance
 
     rpki_source: RPKISource | None
 
+    import_table: bool
+    export_table: bool
+    flat_table: bool
+
     def __init__(self) -> None:
         """Initialize object."""
 
         self.asn = None
 
+        self.import_table = True
+        self.export_table = True
+        self.flat_table = False
+
         self.graceful_shutdown = False
+        self.graceful_shutdown_overrides = None
 
         self.quarantine = False
+        self.quarantine_overrides = None
+
+        self.irr_change_limits = {}
+
+        self.config_budget = {}
 
         self.rr_cluster_id = None
 
@@ -54,8 +54,13 @@ class BGPConfigParser(ConfigParser):
                 # Globals
                 "accept",
                 "asn",
+                "config_budget",
+                "export_table",
+                "flat_table",
                 "graceful_shutdown",
                 "import",
+                "import_table",
+                "irr_change_limits",
                 "originate",  # Origination
                 "peers",
                 "peertype_constraints",
@@ -119,10 +124,66 @@ class BGPConfigParser(ConfigParser):
         if "quarantine" in config["bgp"]:
             self.birdconf.protocols.bgp.quarantine = config["bgp"]["quarantine"]
 
+        # Setup which peer tables we keep, these can be overridden per peer type and per peer
+        for table in ("import_table", "export_table", "flat_table"):
+            if table in config["bgp"]:
+                if not isinstance(config["bgp"][table], bool):
+                    raise BirdPlanConfigError(f"The 'bgp' config item '{table}' must be a boolean")
+                setattr(self.birdconf.protocols.bgp, table, config["bgp"][table])
+
         # Set our route reflector cluster id
         if "rr_cluster_id" in config["bgp"]:
             self.birdconf.protocols.bgp.rr_cluster_id = config["bgp"]["rr_cluster_id"]
 
+        # Setup the limits on IRR prefix changes between runs
+        if "irr_change_limits" in config["bgp"]:
+            self._config_bgp_irr_change_limits(config)
+
+        # Setup the budget for the size of the configuration generated for each peer
+        if "config_budget" in config["bgp"]:
+            self._config_bgp_config_budget(config)
+
+    def _config_bgp_config_budget(self, config: dict[str, Any]) -> None:
+        """Configure bgp:config_budget section."""
+
+        if not isinstance(config["bgp"]["config_budget"], dict):
+            raise BirdPlanConfigError("The 'bgp' config item 'config_budget' must be a dictionary")
+
+        config_budget: dict[str, int | str] = {}
+        for item, value in config["bgp"]["config_budget"].items():
+            if item in ("peer_bytes", "peer_lines"):
+                if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                    raise BirdPlanConfigError(f"The 'bgp:config_budget' config item '{item}' must be a positive integer")
+            elif item == "action":
+                if value not in ("warn", "fail"):
+                    raise BirdPlanConfigError("The 'bgp:config_budget' config item 'action' must be either 'warn' or 'fail'")
+            else:
+                raise BirdPlanConfigError(f"The 'bgp:config_budget' config item '{item}' is not supported")
+            config_budget[item] = value
+
+        self.birdconf.protocols.bgp.config_budget = config_budget
+
+    def _config_bgp_irr_change_limits(self, config: dict[str, Any]) -> None:
+        """Configure bgp:irr_change_limits section."""
+
+        if not isinstance(config["bgp"]["irr_change_limits"], dict):
+            raise BirdPlanConfigError("The 'bgp' config item 'irr_change_limits' must be a dictionary")
+
+        irr_change_limits: dict[str, int | str] = {}
+        for change, limit in config["bgp"]["irr_change_limits"].items():
+            if change not in ("added", "removed", "covered"):
+                raise BirdPlanConfigError(f"The 'bgp:irr_change_limits' config item '{change}' is not supported")
+            # Limits can be a number of prefixes or a percentage of the prefixes from the previous run
+            is_percentage = isinstance(limit, str) and re.match(r"^[0-9]+(\.[0-9]+)?%$", limit)
+            is_count = isinstance(limit, int) and not isinstance(limit, bool) and limit >= 0
+            if not is_percentage and not is_count:
+                raise BirdPlanConfigError(
+                    f"The 'bgp:irr_change_limits' config item '{change}' must be a positive integer or a percentage"
+                )
+            irr_change_limits[change] = limit
+
+        self.birdconf.protocols.bgp.irr_change_limits = irr_change_limits
+
     def _config_bgp_peertype_constraints(self, config: dict[str, Any]) -> None:  # noqa: C901
         """Configure bgp:peertype_constraints section."""
 
@@ -170,10 +231,19 @@ class BGPConfigParser(ConfigParser):
                     "community_import_maxlen",
                     "extended_community_import_maxlen",
                     "large_community_import_maxlen",
+                    "import_table",
+                    "export_table",
                 ):
                     raise BirdPlanConfigError(
                         f"The 'bgp:peertype_constraints:{peer_type}' config item '{constraint_name}' is not supported"
                     )
+                # Make sure table retention is a boolean
+                if constraint_name.endswith("_table") and not isinstance(
+                    config["bgp"]["peertype_constraints"][peer_type][constraint_name], bool
+                ):
+                    raise BirdPlanConfigError(
+                        f"The 'bgp:peertype_constraints:{peer_type}' config item '{constraint_name}' must be a boolean"
+                    )
                 # Make sure this peer supports blackhole imports
                 if constraint_name.startswith("blackhole_import_"):  # noqa: SIM102
                     if peer_type not in (
@@ -296,6 +366,7 @@ class BGPConfigParser(ConfigParser):
             return
 
         # Loop with peer ASN and config
+        peers: dict[str, Any] = {}
         peer_count = len(config["bgp"]["peers"])
         peer_cur: int = 1
         for peer_name, peer_config in config["bgp"]["peers"].items():
@@ -311,15 +382,18 @@ class BGPConfigParser(ConfigParser):
                 )
 
             # Configure peer
-            self._config_bgp_peers_peer(config, peer_name, peer_config)
+            peers[peer_name] = self._config_bgp_peers_peer(config, peer_name, peer_config)
 
             # Bump current peer
             peer_cur += 1
 
+        # Add peers to BGP
+        self.birdconf.protocols.bgp.add_peers(peers)
+
     def _config_bgp_peers_peer(  # noqa: C901,PLR0912,PLR0915
         self, config: dict[str, Any], peer_name: str, peer_config: dict[str, Any]
-    ) -> None:
-        """Configure bgp:peers single peer."""
+    ) -> dict[str, Any]:
+        """Configure bgp:peers single peer, returning the peer configuration to add."""
 
         # Start with no peer config
         peer: dict[str, Any] = {}
@@ -334,6 +408,7 @@ class BGPConfigParser(ConfigParser):
                 "cost",
                 "description",
                 "error_wait_time",
+                "flat_table",
                 "graceful_shutdown",
                 "incoming_large_communities",
                 "multihop",
@@ -702,6 +777,8 @@ class BGPConfigParser(ConfigParser):
                         "community_import_maxlen",
                         "extended_community_import_maxlen",
                         "large_community_import_maxlen",
+                        "import_table",
+                        "export_table",
                     ):
                         raise BirdPlanConfigError(
                             f"Configuration item '{constraint_name}' not understood in bgp:peers:{peer_name}:prepend"
@@ -763,5 +840,4 @@ class BGPConfigParser(ConfigParser):
         ):
             peer["use_rpki"] = True
 
-        # Make sure we have items we need
-        self.birdconf.protocols.bgp.add_peer(peer_name, peer)
+        return peer
@@ -0,0 +1,138 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Incremental rendering of BGP peers into a previously generated configuration."""
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from .peer import ProtocolBGPPeer
+
+if TYPE_CHECKING:
+    from . import ProtocolBGP
+
+__all__ = ["peer_config_blocks", "peer_protocols", "reconfigure_peers"]
+
+
+# Match a protocol definition, capturing the protocol name
+_PROTOCOL_REGEX = re.compile(r"^protocol \S+ (\S+) \{")
+
+
+def _peer_blocks(lines: list[str]) -> dict[str, tuple[int, int]]:
+    """Return the start and end line of each BGP peer block, indexed by the peer section title."""
+
+    # Find the title line of each peer, peers are output one after the other at the end of the configuration
+    titles = [
+        index
+        for index in range(1, len(lines) - 1)
+        if lines[index].startswith("# BGP Peer: ") and lines[index - 1] == "#" and lines[index + 1] == "#"
+    ]
+
+    blocks: dict[str, tuple[int, int]] = {}
+    for title_index, index in enumerate(titles):
+        # Each block starts at the line before the title and ends where the next one starts
+        end = titles[title_index + 1] - 1 if title_index < len(titles) - 1 else len(lines)
+        blocks[lines[index][2:]] = (index - 1, end)
+
+    return blocks
+
+
+def peer_config_blocks(lines: list[str]) -> dict[str, list[str]]:
+    """Return the configuration lines of each BGP peer block, indexed by the peer section title."""
+    return {section: lines[start:end] for section, (start, end) in _peer_blocks(lines).items()}
+
+
+def peer_protocols(lines: list[str]) -> list[str]:
+    """Return the names of the protocols defined in configuration lines."""
+    return [match.group(1) for line in lines if (match := _PROTOCOL_REGEX.match(line))]
+
+
+def reconfigure_peers(bgp: "ProtocolBGP", bird_config: str, peers: list[ProtocolBGPPeer]) -> str | None:
+    """
+    Re-render BGP peers within a previously generated BIRD configuration.
+
+    The previous configuration can only be reused if it contains all of the peers and everything the re-rendered peers add to
+    the shared sections, such as functions and constants. If it cannot be reused nothing is changed.
+
+    Parameters
+    ----------
+    bgp : ProtocolBGP
+        BGP protocol the peers belong to.
+
+    bird_config : str
+        Previously generated BIRD configuration.
+
+    peers : list[ProtocolBGPPeer]
+        BGP peers to re-render.
+
+    Returns
+    -------
+    Optional[str] : BIRD configuration with the peers re-rendered, or `None` if the previous configuration cannot be reused.
+
+    """
+
+    lines = bird_config.split("\n")
+    blocks = _peer_blocks(lines)
+
+    # Make sure all the peers we're re-rendering exist in the previous configuration
+    if any(peer.section not in blocks for peer in peers):
+        return None
+
+    # Take note of what is already in the sections peers add to, tables are added with an order of 50
+    registries: list[dict[str, Any]] = [
+        bgp.functions.bird_functions,
+        bgp.bgp_functions.bird_functions,
+        bgp.constants.bird_constants,
+    ]
+    registered = [set(registry) for registry in registries]
+    tables = bgp.tables.conf.items.setdefault(50, [])
+    tables_count = len(tables)
+    peers_state = bgp.birdconfig_globals.state.setdefault("bgp", {}).setdefault("peers", {})
+    prev_peers_state = {peer.name: peers_state.get(peer.name) for peer in peers}
+
+    for peer in peers:
+        peer.configure()
+
+    # Work out what the peers added to the shared sections
+    added = [[name for name in registry if name not in names] for registry, names in zip(registries, registered, strict=True)]
+    new_functions = added[0] + added[1]
+    new_constants = ["\n".join(bgp.constants.bird_constants[name]) for name in added[2]]
+
+    # Check everything the peers added is already in the previous configuration
+    if any(f"function {name}(" not in bird_config for name in new_functions) or any(
+        constant not in bird_config for constant in new_constants
+    ):
+        # Undo the rendering of the peers
+        for registry, names in zip(registries, added, strict=True):
+            for name in names:
+                del registry[name]
+        del tables[tables_count:]
+        for peer in peers:
+            peer.conf.items.clear()
+            if prev_peers_state[peer.name] is None:
+                del peers_state[peer.name]
+            else:
+                peers_state[peer.name] = prev_peers_state[peer.name]
+        return None
+
+    # Replace the peer blocks, starting from the end so the line numbers of the blocks before stay the same
+    for peer in sorted(peers, key=lambda peer: blocks[peer.section][0], reverse=True):
+        start, end = blocks[peer.section]
+        lines[start:end] = peer.conf.lines
+
+    return "\n".join(lines)
@@ -0,0 +1,244 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parallel construction and rendering of BGP peers."""
+
+import functools
+import io
+import multiprocessing
+import pickle  # nosec
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from .bgp_types import BGPPeerConfig
+from .peer import ProtocolBGPPeer
+
+if TYPE_CHECKING:
+    from . import ProtocolBGP
+
+__all__ = ["can_parallelize", "construct_peers", "render_peers"]
+
+
+# Worker context, this is set in the parent before the pool is forked and inherited by the workers
+_context: dict[str, Any] = {}
+
+
+class _SharedPickler(pickle.Pickler):
+    """Pickler that replaces objects shared between the parent and workers with a reference."""
+
+    _shared: dict[int, int]
+
+    def __init__(self, file: io.BytesIO, shared: list[Any]) -> None:
+        """Initialize object."""
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        # Workers are forked, so the shared objects have the same identity in both the parent and workers
+        self._shared = {id(obj): index for index, obj in enumerate(shared)}
+
+    def persistent_id(self, obj: Any) -> int | None:  # noqa: ANN401
+        """Return the shared object reference if this is a shared object."""
+        return self._shared.get(id(obj))
+
+
+class _SharedUnpickler(pickle.Unpickler):  # nosec
+    """Unpickler that resolves shared object references to the parent objects."""
+
+    _shared: list[Any]
+
+    def __init__(self, file: io.BytesIO, shared: list[Any]) -> None:
+        """Initialize object."""
+        super().__init__(file)
+        self._shared = shared
+
+    def persistent_load(self, pid: Any) -> Any:  # noqa: ANN401
+        """Return the shared object for a reference."""
+        return self._shared[pid]
+
+
+def _shared_objects(bgp: "ProtocolBGP") -> list[Any]:
+    """Return the objects which are shared between all BGP peers."""
+    return [
+        bgp.birdconfig_globals,
+        bgp.birdattributes,
+        bgp.constants,
+        bgp.functions,
+        bgp.tables,
+        bgp.bgp_attributes,
+        bgp.bgp_functions,
+    ]
+
+
+def _chunksize(count: int, workers: int) -> int:
+    """Work out the number of peers to send to a worker at a time."""
+    return max(1, count // (workers * 4))
+
+
+def _call(func: Callable[[Any], Any], arg: Any) -> tuple[Any, Exception | None]:  # noqa: ANN401
+    """Call a function within a worker, returning the exception it raised instead of raising it."""
+    try:
+        return func(arg), None
+    except Exception as err:  # noqa: BLE001
+        return None, err
+
+
+def _pool_map(func: Callable[[Any], Any], args: Sequence[Any], workers: int) -> list[Any]:
+    """
+    Map arguments over a process pool.
+
+    The pool raises whichever exception arrives first, which depends on the number of workers, so we collect them all and
+    raise the exception of the first argument that failed.
+
+    """
+
+    with multiprocessing.get_context("fork").Pool(processes=workers) as pool:
+        results = pool.map(functools.partial(_call, func), args, chunksize=_chunksize(len(args), workers))
+
+    for _, err in results:
+        if err is not None:
+            raise err
+
+    return [result for result, _ in results]
+
+
+def can_parallelize(bgp: "ProtocolBGP", count: int) -> bool:
+    """Check if we can and should use a process pool for the peers."""
+    # Workers inherit our objects, so we can only use the pool on platforms which support forking
+    return bgp.birdconfig_globals.workers > 1 and count > 1 and "fork" in multiprocessing.get_all_start_methods()
+
+
+def _construct_peer(peer_name: str) -> bytes:
+    """Construct a BGP peer within a worker."""
+    bgp: ProtocolBGP = _context["bgp"]
+
+    peer = ProtocolBGPPeer(
+        bgp.birdconfig_globals,
+        bgp.birdattributes,
+        bgp.constants,
+        bgp.functions,
+        bgp.tables,
+        bgp.bgp_attributes,
+        bgp.bgp_functions,
+        peer_name,
+        _context["peers_config"][peer_name],
+    )
+
+    # Pickle the peer, leaving out the shared objects which the parent will link back in
+    buffer = io.BytesIO()
+    _SharedPickler(buffer, _shared_objects(bgp)).dump(peer)
+    return buffer.getvalue()
+
+
+def construct_peers(bgp: "ProtocolBGP", peers_config: dict[str, BGPPeerConfig]) -> list[ProtocolBGPPeer]:
+    """
+    Construct BGP peers using a process pool.
+
+    If peers fail to construct, the error of the first one in peer configuration order is raised, like it would be when
+    constructing the peers one at a time.
+
+    Parameters
+    ----------
+    bgp : ProtocolBGP
+        BGP protocol the peers belong to.
+
+    peers_config : dict[str, BGPPeerConfig]
+        Peer configuration indexed by peer name.
+
+    Returns
+    -------
+    list[ProtocolBGPPeer] : BGP peers in the same order as the peer configuration.
+
+    """
+
+    workers = bgp.birdconfig_globals.workers
+    shared = _shared_objects(bgp)
+
+    _context["bgp"] = bgp
+    _context["peers_config"] = peers_config
+    try:
+        results = _pool_map(_construct_peer, list(peers_config), workers)
+    finally:
+        _context.clear()
+
+    return [_SharedUnpickler(io.BytesIO(result), shared).load() for result in results]  # nosec
+
+
+def _render_peer(peer_index: int) -> dict[str, Any]:
+    """Render a BGP peer within a worker."""
+    bgp: ProtocolBGP = _context["bgp"]
+    peer: ProtocolBGPPeer = _context["peers"][peer_index]
+
+    # Take note of what is already in the sections peers add to
+    functions = set(bgp.functions.bird_functions)
+    bgp_functions = set(bgp.bgp_functions.bird_functions)
+    constants = set(bgp.constants.bird_constants)
+    tables = len(bgp.tables.conf.items.get(50, []))
+
+    peer.configure()
+
+    # Return the peer configuration, state and everything it added to the shared sections, in the order it was added
+    return {
+        "lines": peer.conf.lines,
+        "state": peer.state,
+        "functions": [(name, value) for name, value in bgp.functions.bird_functions.items() if name not in functions],
+        "bgp_functions": [(name, value) for name, value in bgp.bgp_functions.bird_functions.items() if name not in bgp_functions],
+        "constants": [(name, value) for name, value in bgp.constants.bird_constants.items() if name not in constants],
+        "tables": bgp.tables.conf.items.get(50, [])[tables:],
+    }
+
+
+def render_peers(bgp: "ProtocolBGP") -> list[ProtocolBGPPeer]:
+    """
+    Render BGP peer configuration using a process pool.
+
+    The results are merged in peer order, so the output is the same as rendering the peers one at a time.
+
+    Parameters
+    ----------
+    bgp : ProtocolBGP
+        BGP protocol the peers belong to.
+
+    Returns
+    -------
+    list[ProtocolBGPPeer] : BGP peers with their configuration rendered.
+
+    """
+
+    workers = bgp.birdconfig_globals.workers
+    peers = list(bgp.peers.values())
+
+    _context["bgp"] = bgp
+    _context["peers"] = peers
+    try:
+        results = _pool_map(_render_peer, range(len(peers)), workers)
+    finally:
+        _context.clear()
+
+    # Merge the results back in peer order
+    for peer, result in zip(peers, results, strict=True):
+        for name, value in result["functions"]:
+            bgp.functions.bird_functions.setdefault(name, value)
+        for name, value in result["bgp_functions"]:
+            bgp.bgp_functions.bird_functions.setdefault(name, value)
+        for name, value in result["constants"]:
+            bgp.constants.bird_constants.setdefault(name, value)
+        bgp.tables.conf.add(result["tables"], order=50)
+        # Link the peer state back in
+        peer.state.update(result["state"])
+        bgp.birdconfig_globals.state["bgp"]["peers"][peer.name] = peer.state
+        peer.conf.add(result["lines"])
+
+    return peers
@@ -20,15 +20,14 @@
 
 # pylint: disable=too-many-lines
 
-import fnmatch
 import logging
-import re
 from typing import Any
 
 from ......bgpq3 import BGPQ3
 from ......console.colors import colored
 from ......exceptions import BirdPlanError
 from ......peeringdb import PeeringDB
+from ......prefix_set import PrefixSet
 from ..... import util
 from .....globals import BirdConfigGlobals
 from ....bird_attributes import SectionBirdAttributes
@@ -41,6 +40,7 @@ from ..bgp_attributes import BGPAttributes, BGPPeertypeConstraints
 from ..bgp_functions import BGPFunctions
 from ..bgp_types import BGPPeerConfig
 from .actions import BGPPeerActions, BGPPeerActionType
+from .change_guards import check_irr_network_count, check_irr_prefix_changes, check_peeringdb_prefix_limit
 from .peer_attributes import (
     BGPPeerAttributes,
     BGPPeerCommunities,
@@ -69,6 +69,9 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
     _peer_attributes: BGPPeerAttributes
     _state: dict[str, Any]
     _prev_state: dict[str, Any] | None
+    _graceful_shutdown_configured: bool
+    _quarantine_configured: bool
+    _peeringdb_prefix_limits: list[str]
 
     def __init__(  # noqa: C901,PLR0912,PLR0913,PLR0915
         self,
@@ -138,7 +141,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         # Check if we have actions, if we do we need to parse them
         if "actions" in peer_config:
-            self.peer_attributes.actions = BGPPeerActions(self.functions, self.bgp_functions, self.asn, self.name)
+            self.peer_attributes.actions = BGPPeerActions(self.constants, self.functions, self.bgp_functions, self.asn, self.name)
             self.peer_attributes.actions.configure(peer_config["actions"])
 
         # Check if we're replacing the ASN in the AS-PATH
@@ -584,6 +587,12 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         if "passive" in peer_config:
             self.passive = peer_config["passive"]
 
+        # Check if we're importing straight into the main BGP table
+        if "flat_table" in peer_config:
+            if not isinstance(peer_config["flat_table"], bool):
+                raise BirdPlanError(f"BGP peer 'flat_table' configuration for peer '{self.name}' must be a boolean")
+            self.peer_attributes.flat_table = peer_config["flat_table"]
+
         # Default redistribution settings based on peer type
         if self.peer_type in (
             "customer",
@@ -779,6 +788,9 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                         f"BGP peer 'import_filter' configuration '{filter_type}' for peer '{self.name}' with type "
                         f"'{self.peer_type}' is invalid"
                     )
+                # Prefixes are kept in a compact prefix set
+                if filter_type == "prefixes":
+                    filter_config = PrefixSet([filter_config] if isinstance(filter_config, str) else filter_config)  # noqa: PLW2901
                 # Set filter policy
                 setattr(self.import_filter_policy, filter_type, filter_config)
 
@@ -796,6 +808,9 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                         f"BGP peer 'import_filter_deny' configuration '{filter_type}' for peer '{self.name}' with type "
                         f"'{self.peer_type}' is invalid"
                     )
+                # Prefixes are kept in a compact prefix set
+                if filter_type == "prefixes":
+                    filter_config = PrefixSet([filter_config] if isinstance(filter_config, str) else filter_config)  # noqa: PLW2901
                 # Set filter policy
                 setattr(self.import_filter_deny_policy, filter_type, filter_config)
 
@@ -808,9 +823,19 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                         f"BGP peer 'export_filter' configuration '{filter_type}' for peer '{self.name}' with type "
                         f"'{self.peer_type}' is invalid"
                     )
+                # Prefixes are kept in a compact prefix set
+                if filter_type == "prefixes":
+                    filter_config = PrefixSet([filter_config] if isinstance(filter_config, str) else filter_config)  # noqa: PLW2901
                 # Set filter policy
                 setattr(self.export_filter_policy, filter_type, filter_config)
 
+        # Work out our derived filter flags now that the filter policies are complete
+        self.peer_attributes.has_import_prefix_filter = bool(
+            self.import_filter_policy.prefixes or self.import_filter_policy.as_sets
+        )
+        self.peer_attributes.has_import_prefix_deny_filter = bool(self.import_filter_deny_policy.prefixes)
+        self.peer_attributes.has_export_prefix_filter = bool(self.export_filter_policy.prefixes)
+
         #
         # bgp:peers:$PPER:accept
         #
@@ -1107,11 +1132,18 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     "community_import_maxlen",
                     "extended_community_import_maxlen",
                     "large_community_import_maxlen",
+                    "import_table",
+                    "export_table",
                 ):
                     raise BirdPlanError(
                         f"BGP peer 'constraints' configuration '{constraint_name}' for peer '{self.name}' "
                         f"with type '{self.peer_type}' is invalid"
                     )
+                # Make sure table retention is a boolean
+                if constraint_name.endswith("_table") and not isinstance(constraint_value, bool):
+                    raise BirdPlanError(
+                        f"BGP peer 'constraints' configuration '{constraint_name}' for peer '{self.name}' must be a boolean"
+                    )
                 # Make sure this peer supports blackhole imports
                 if constraint_name.startswith("blackhole_import_"):  # noqa: SIM102
                     if self.peer_type not in (
@@ -1185,6 +1217,11 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # NETWORK AND STATE (CACHE) RELATED QUERIES
         #
 
+        # Keep track of which prefix limits come from PeeringDB, as they are replaced by the retrieved values below
+        self._peeringdb_prefix_limits = [
+            ipv for ipv, prefix_limit in (("ipv4", self.prefix_limit4), ("ipv6", self.prefix_limit6)) if prefix_limit == "peeringdb"
+        ]
+
         # Work out the prefix limits...
         if self.prefix_limit4 == "peeringdb" or self.prefix_limit6 == "peeringdb":
             # Setup our peeringdb info
@@ -1202,12 +1239,16 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                         and "peeringdb" in self.prev_state["prefix_limit"]
                         and "ipv4" in self.prev_state["prefix_limit"]["peeringdb"]
                     ):
-                        raise BirdPlanError(
-                            f"No PeeringDB information in cache for peer '{self.name}' "
-                            f"with type '{self.peer_type}' for IPv4 prefix limit"
-                        )
-                    # Pull entry from cache
-                    peeringdb_info["info_prefixes4"] = self.prev_state["prefix_limit"]["peeringdb"]["ipv4"]
+                        # If we're only validating, we can do without the cached information
+                        if not self.birdconfig_globals.validate_only:
+                            raise BirdPlanError(
+                                f"No PeeringDB information in cache for peer '{self.name}' "
+                                f"with type '{self.peer_type}' for IPv4 prefix limit"
+                            )
+                        peeringdb_info["info_prefixes4"] = None
+                    else:
+                        # Pull entry from cache
+                        peeringdb_info["info_prefixes4"] = self.prev_state["prefix_limit"]["peeringdb"]["ipv4"]
                 # Check if we're pulling the IPv6 limits out our cache
                 if self.prefix_limit6 == "peeringdb":
                     if not (
@@ -1216,12 +1257,16 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                         and "peeringdb" in self.prev_state["prefix_limit"]
                         and "ipv6" in self.prev_state["prefix_limit"]["peeringdb"]
                     ):
-                        raise BirdPlanError(
-                            f"No PeeringDB information in cache for peer '{self.name}' "
-                            f"with type '{self.peer_type}' for IPv6 prefix limit"
-                        )
-                    # Pull entry from cache
-                    peeringdb_info["info_prefixes6"] = self.prev_state["prefix_limit"]["peeringdb"]["ipv6"]
+                        # If we're only validating, we can do without the cached information
+                        if not self.birdconfig_globals.validate_only:
+                            raise BirdPlanError(
+                                f"No PeeringDB information in cache for peer '{self.name}' "
+                                f"with type '{self.peer_type}' for IPv6 prefix limit"
+                            )
+                        peeringdb_info["info_prefixes6"] = None
+                    else:
+                        # Pull entry from cache
+                        peeringdb_info["info_prefixes6"] = self.prev_state["prefix_limit"]["peeringdb"]["ipv6"]
             else:
                 if not self.birdconfig_globals.suppress_info:
                     logging.info("[bgp:peer:%s] Retrieving prefix limits from PeeringDB", self.name)
@@ -1248,22 +1293,14 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     and "peeringdb" in self.prev_state["prefix_limit"]
                     and "ipv4" in self.prev_state["prefix_limit"]["peeringdb"]
                 ):
-                    # Check if there was a substantial reduction in number of prefixes allowed
-                    if peeringdb_info["info_prefixes4"] * 2 < self.prev_state["prefix_limit"]["peeringdb"]["ipv4"]:
-                        raise BirdPlanError(
-                            f"PeeringDB IPv4 prefix limit for peer '{self.name}' with type '{self.peer_type}' "
-                            "decreased substantially from previous run: "
-                            "last=%s, now=%s"
-                            % (self.prev_state["prefix_limit"]["peeringdb"]["ipv4"], peeringdb_info["info_prefixes4"])
-                        )
-                    # Check if there was a substantial increase in number of prefixes allowed
-                    if peeringdb_info["info_prefixes4"] / 2 > self.prev_state["prefix_limit"]["peeringdb"]["ipv4"]:
-                        raise BirdPlanError(
-                            f"PeeringDB IPv4 prefix limit for peer '{self.name}' with type '{self.peer_type}' "
-                            "increased substantially from previous run: "
-                            "last=%s, now=%s"
-                            % (self.prev_state["prefix_limit"]["peeringdb"]["ipv4"], peeringdb_info["info_prefixes4"])
-                        )
+                    # Check there was no substantial change from the previous run
+                    check_peeringdb_prefix_limit(
+                        self.name,
+                        self.peer_type,
+                        "4",
+                        self.prev_state["prefix_limit"]["peeringdb"]["ipv4"],
+                        peeringdb_info["info_prefixes4"],
+                    )
                 # Set the limits
                 self.prefix_limit4 = None
                 self.prefix_limit4_peeringdb = peeringdb_info["info_prefixes4"]
@@ -1278,22 +1315,14 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     and "peeringdb" in self.prev_state["prefix_limit"]
                     and "ipv6" in self.prev_state["prefix_limit"]["peeringdb"]
                 ):
-                    # Check if there was a substantial reduction in number of prefixes allowed
-                    if peeringdb_info["info_prefixes6"] * 2 < self.prev_state["prefix_limit"]["peeringdb"]["ipv6"]:
-                        raise BirdPlanError(
-                            f"PeeringDB IPv6 prefix limit for peer '{self.name}' with type '{self.peer_type}' "
-                            "decreased substantially from previous run: "
-                            "last=%s, now=%s"
-                            % (self.prev_state["prefix_limit"]["peeringdb"]["ipv6"], peeringdb_info["info_prefixes6"])
-                        )
-                    # Check if there was a substantial increase in number of prefixes allowed
-                    if peeringdb_info["info_prefixes6"] / 2 > self.prev_state["prefix_limit"]["peeringdb"]["ipv6"]:
-                        raise BirdPlanError(
-                            f"PeeringDB IPv6 prefix limit for peer '{self.name}' with type '{self.peer_type}' "
-                            "increased substantially from previous run: "
-                            "last=%s, now=%s"
-                            % (self.prev_state["prefix_limit"]["peeringdb"]["ipv6"], peeringdb_info["info_prefixes6"])
-                        )
+                    # Check there was no substantial change from the previous run
+                    check_peeringdb_prefix_limit(
+                        self.name,
+                        self.peer_type,
+                        "6",
+                        self.prev_state["prefix_limit"]["peeringdb"]["ipv6"],
+                        peeringdb_info["info_prefixes6"],
+                    )
                 # Set the limits
                 self.prefix_limit6 = None
                 self.prefix_limit6_peeringdb = peeringdb_info["info_prefixes6"]
@@ -1302,7 +1331,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         if self.import_filter_policy.as_sets:
             # Setup our IRR info
             irr_asns: list[str] = []
-            irr_prefixes: dict[str, Any] = {"ipv4": [], "ipv6": []}
+            irr_prefixes: dict[str, PrefixSet] = {"ipv4": PrefixSet(), "ipv6": PrefixSet()}
 
             # Check if we're using cached values or not
             if self.birdconfig_globals.use_cached:
@@ -1316,11 +1345,14 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     and "origin_asns" in self.prev_state["import_filter"]
                     and "irr" in self.prev_state["import_filter"]["origin_asns"]
                 ):
-                    raise BirdPlanError(
-                        f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR origin ASNs"
-                    )
-                # Populate irr_asns
-                irr_asns = self.prev_state["import_filter"]["origin_asns"]["irr"]
+                    # If we're only validating, we can do without the cached information
+                    if not self.birdconfig_globals.validate_only:
+                        raise BirdPlanError(
+                            f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR origin ASNs"
+                        )
+                else:
+                    # Populate irr_asns
+                    irr_asns = self.prev_state["import_filter"]["origin_asns"]["irr"]
 
                 # Grab IRR prefixes for IPv4 from previous state
                 if not (
@@ -1330,11 +1362,14 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     and "irr" in self.prev_state["import_filter"]["prefixes"]
                     and "ipv4" in self.prev_state["import_filter"]["prefixes"]["irr"]
                 ):
-                    raise BirdPlanError(
-                        f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR IPv4 prefixes"
-                    )
-                # Populate IRR IPv4 prefixes
-                irr_prefixes["ipv4"] = self.prev_state["import_filter"]["prefixes"]["irr"]["ipv4"]
+                    # If we're only validating, we can do without the cached information
+                    if not self.birdconfig_globals.validate_only:
+                        raise BirdPlanError(
+                            f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR IPv4 prefixes"
+                        )
+                else:
+                    # Populate IRR IPv4 prefixes
+                    irr_prefixes["ipv4"] = PrefixSet(self.prev_state["import_filter"]["prefixes"]["irr"]["ipv4"])
 
                 # Grab IRR prefixes for IPv6 from previous state
                 if not (
@@ -1344,11 +1379,14 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     and "irr" in self.prev_state["import_filter"]["prefixes"]
                     and "ipv6" in self.prev_state["import_filter"]["prefixes"]["irr"]
                 ):
-                    raise BirdPlanError(
-                        f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR IPv6 prefixes"
-                    )
-                # Populate IRR IPv6 prefixes
-                irr_prefixes["ipv6"] = self.prev_state["import_filter"]["prefixes"]["irr"]["ipv6"]
+                    # If we're only validating, we can do without the cached information
+                    if not self.birdconfig_globals.validate_only:
+                        raise BirdPlanError(
+                            f"No IRR information in cache for peer '{self.name}' with type '{self.peer_type}' for IRR IPv6 prefixes"
+                        )
+                else:
+                    # Populate IRR IPv6 prefixes
+                    irr_prefixes["ipv6"] = PrefixSet(self.prev_state["import_filter"]["prefixes"]["irr"]["ipv6"])
 
             else:
                 if not self.birdconfig_globals.suppress_info:
@@ -1376,93 +1414,66 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
             # Lets work out what to do with the IPv4 prefixes
             if irr_prefixes["ipv4"]:
-                # Sanity checks for IPv4 network count
+                # Sanity checks for IPv4 prefixes, cached prefixes are the same as the previous run so there is nothing to check
                 if (
                     not self.birdconfig_globals.ignore_irr_changes  # pylint: disable=too-many-boolean-expressions
+                    and not self.birdconfig_globals.use_cached
                     and self.prev_state
                     and "import_filter" in self.prev_state
                     and "prefixes" in self.prev_state["import_filter"]
                     and "irr" in self.prev_state["import_filter"]["prefixes"]
                     and "ipv4" in self.prev_state["import_filter"]["prefixes"]["irr"]
                 ):
-                    # Check if there was a substantial reduction in number of prefixes allowed
-                    new_network_count = util.network_count(irr_prefixes["ipv4"])
-                    old_network_count = util.network_count(self.prev_state["import_filter"]["prefixes"]["irr"]["ipv4"])
-                    if new_network_count * 2 < old_network_count:
-                        raise BirdPlanError(
-                            f"IRR IPv4 network count for peer '{self.name}' with type '{self.peer_type}' "
-                            "decreased substantially from previous run: "
-                            "last=%s, now=%s" % (old_network_count, new_network_count)
-                        )
-                    # Check if there was a substantial increase in number of prefixes allowed
-                    if new_network_count / 2 > old_network_count:
-                        raise BirdPlanError(
-                            f"IRR IPv4 network count for peer '{self.name}' with type '{self.peer_type}' "
-                            "increased substantially from previous run: "
-                            "last=%s, now=%s" % (old_network_count, new_network_count)
-                        )
+                    # Check there were no substantial changes from the previous run
+                    self._check_irr_changes("4", irr_prefixes["ipv4"])
                 # All looks good, add them
                 self.import_filter_policy.prefixes_irr.extend(irr_prefixes["ipv4"])
 
             # Lets work out what to do with the IPv6 prefixes
             if irr_prefixes["ipv6"]:
-                # Sanity checks for IPv6 network count
+                # Sanity checks for IPv6 prefixes, cached prefixes are the same as the previous run so there is nothing to check
                 if (
                     not self.birdconfig_globals.ignore_irr_changes  # pylint: disable=too-many-boolean-expressions
+                    and not self.birdconfig_globals.use_cached
                     and self.prev_state
                     and "import_filter" in self.prev_state
                     and "prefixes" in self.prev_state["import_filter"]
                     and "irr" in self.prev_state["import_filter"]["prefixes"]
                     and "ipv6" in self.prev_state["import_filter"]["prefixes"]["irr"]
                 ):
-                    # Check if there was a substantial reduction in number of prefixes allowed
-                    new_network_count = util.network_count(irr_prefixes["ipv6"])
-                    old_network_count = util.network_count(self.prev_state["import_filter"]["prefixes"]["irr"]["ipv6"])
-                    if new_network_count * 2 < old_network_count:
-                        raise BirdPlanError(
-                            f"IRR IPv6 network count for peer '{self.name}' with type '{self.peer_type}' "
-                            "decreased substantially from previous run: "
-                            "last=%s, now=%s" % (old_network_count, new_network_count)
-                        )
-                    # Check if there was a substantial increase in number of prefixes allowed
-                    if new_network_count / 2 > old_network_count:
-                        raise BirdPlanError(
-                            f"IRR IPv6 network count for peer '{self.name}' with type '{self.peer_type}' "
-                            "increased substantially from previous run: "
-                            "last=%s, now=%s" % (old_network_count, new_network_count)
-                        )
+                    # Check there were no substantial changes from the previous run
+                    self._check_irr_changes("6", irr_prefixes["ipv6"])
                 # All looks good, add them
                 self.import_filter_policy.prefixes_irr.extend(irr_prefixes["ipv6"])
 
-        # Check if we have a graceful shutdown override
-        if ("bgp" in self.birdconfig_globals.state) and ("+graceful_shutdown" in self.birdconfig_globals.state["bgp"]):
-            # Then check if we have an explicit setting
-            if self.name in self.birdconfig_globals.state["bgp"]["+graceful_shutdown"]:
-                self.graceful_shutdown = self.birdconfig_globals.state["bgp"]["+graceful_shutdown"][self.name]
-            # If not we process the patterns
-            else:
-                for item in sorted(self.birdconfig_globals.state["bgp"]["+graceful_shutdown"]):
-                    # Skip non patterns
-                    if "*" not in item:
-                        continue
-                    # If pattern matches peer name, set the value for graceful shutdown
-                    if fnmatch.fnmatch(self.name, item):
-                        self.graceful_shutdown = self.birdconfig_globals.state["bgp"]["+graceful_shutdown"][item]
+        # Keep the configured graceful shutdown and quarantine flags, so the overrides can be re-applied
+        self._graceful_shutdown_configured = self.graceful_shutdown
+        self._quarantine_configured = self.quarantine
+        self.apply_overrides()
 
-        # Check if we have a quarantine override
-        if ("bgp" in self.birdconfig_globals.state) and ("+quarantine" in self.birdconfig_globals.state["bgp"]):
-            # Then check if we have an explicit setting
-            if self.name in self.birdconfig_globals.state["bgp"]["+quarantine"]:
-                self.quarantine = self.birdconfig_globals.state["bgp"]["+quarantine"][self.name]
-            # If not we process the patterns
-            else:
-                for item in sorted(self.birdconfig_globals.state["bgp"]["+quarantine"]):
-                    # Skip non patterns
-                    if "*" not in item:
-                        continue
-                    # If pattern matches peer name, set the value for quarantine
-                    if fnmatch.fnmatch(self.name, item):
-                        self.quarantine = self.birdconfig_globals.state["bgp"]["+quarantine"][item]
+    def _check_irr_changes(self, ipv: str, prefixes: PrefixSet) -> None:
+        """Check the IRR prefixes for an IP version did not change substantially from the previous run."""
+
+        if not self.prev_state:  # pragma: no cover
+            raise RuntimeError
+
+        previous_prefixes = PrefixSet(self.prev_state["import_filter"]["prefixes"]["irr"][f"ipv{ipv}"])
+
+        check_irr_network_count(self.name, self.peer_type, ipv, previous_prefixes.network_count(), prefixes.network_count())
+
+        # Work out which prefixes changed and check them against our limits
+        changes = check_irr_prefix_changes(
+            self.name, self.peer_type, ipv, previous_prefixes, prefixes, self.bgp_attributes.irr_change_limits
+        )
+        if any(changes.values()) and not self.birdconfig_globals.suppress_info:
+            logging.info(
+                "[bgp:peer:%s] IRR IPv%s prefixes changed from previous run: added=%s, removed=%s, covered=%s",
+                self.name,
+                ipv,
+                changes["added"],
+                changes["removed"],
+                changes["covered"],
+            )
 
     def configure(self) -> None:  # noqa: C901,PLR0912,PLR0915
         """Configure BGP peer."""
@@ -1539,11 +1550,8 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Setup routing tables
         self._setup_peer_tables()
 
-        # Setup constants
-        self._setup_peer_constants()
-
-        # Setup functions
-        self._setup_peer_functions()
+        # Setup actions
+        self._setup_peer_actions()
 
         # Setup filters
         self._setup_import_aspath_asns_filter()
@@ -1569,17 +1577,18 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # BGP peer protocols
         self._setup_peer_protocols()
 
-        # Configure pipe from the BGP peer table to the main BGP table
-        bgp_peer_pipe = ProtocolPipe(
-            birdconfig_globals=self.birdconfig_globals,
-            table_from=self.bgp_table_name,
-            table_to="bgp",
-            export_filter_type=ProtocolPipeFilterType.UNVERSIONED,
-            import_filter_type=ProtocolPipeFilterType.UNVERSIONED,
-            has_ipv4=self.has_ipv4,
-            has_ipv6=self.has_ipv6,
-        )
-        self.conf.add(bgp_peer_pipe)
+        # Configure pipe from the BGP peer table to the main BGP table, unless we import straight into it
+        if not self.flat_table:
+            bgp_peer_pipe = ProtocolPipe(
+                birdconfig_globals=self.birdconfig_globals,
+                table_from=self.bgp_table_name,
+                table_to="bgp",
+                export_filter_type=ProtocolPipeFilterType.UNVERSIONED,
+                import_filter_type=ProtocolPipeFilterType.UNVERSIONED,
+                has_ipv4=self.has_ipv4,
+                has_ipv6=self.has_ipv6,
+            )
+            self.conf.add(bgp_peer_pipe)
 
         # End of peer
         self.conf.add("")
@@ -1593,6 +1602,24 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Save our configuration
         self.birdconfig_globals.state["bgp"]["peers"][self.name] = self.state
 
+    def apply_overrides(self) -> None:
+        """Apply the graceful shutdown and quarantine overrides to the configured flags."""
+
+        self.graceful_shutdown = self._graceful_shutdown_configured
+        self.quarantine = self._quarantine_configured
+
+        # Check if we have a graceful shutdown override
+        if self.bgp_attributes.graceful_shutdown_overrides:
+            graceful_shutdown = self.bgp_attributes.graceful_shutdown_overrides.get(self.name)
+            if graceful_shutdown is not None:
+                self.graceful_shutdown = graceful_shutdown
+
+        # Check if we have a quarantine override
+        if self.bgp_attributes.quarantine_overrides:
+            quarantine = self.bgp_attributes.quarantine_overrides.get(self.name)
+            if quarantine is not None:
+                self.quarantine = quarantine
+
     def protocol_name(self, ipv: str) -> str:
         """Return the IP versioned protocol name."""
         return f"bgp{ipv}_AS{self.asn}_{self.name}"
@@ -1601,6 +1628,12 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         """Return the IP versioned BGP table name."""
         return f"t_bgp{ipv}_AS{self.asn}_{self.name}_peer"
 
+    def protocol_table_name(self, ipv: str) -> str:
+        """Return the IP versioned table name the BGP protocol is connected to."""
+        if self.flat_table:
+            return f"t_bgp{ipv}"
+        return self.bgp_table_name(ipv)
+
     @property
     def filter_name_export(self) -> str:
         """Return the IP versioned peer export filter name."""
@@ -1643,6 +1676,16 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Start with no tables as we can have IPv4 and/or IPv6 tables below
         state_tables = {}
 
+        # If we're importing straight into the main BGP table, there are no peer tables to create
+        if self.flat_table:
+            if self.has_ipv4:
+                state_tables["ipv4"] = self.protocol_table_name("4")
+            if self.has_ipv6:
+                state_tables["ipv6"] = self.protocol_table_name("6")
+            self.state["tables"] = state_tables
+            self.state["flat_table"] = True
+            return
+
         self.tables.conf.append(f"# BGP Peer Tables: {self.asn} - {self.name}")
 
         # Only create an IPv4 table if we have IPv4 configuration
@@ -1660,33 +1703,12 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Store our BGP table names
         self.state["tables"] = state_tables
 
-    def _setup_peer_constants(self) -> None:
-        """Peer constant setup."""
+    def _setup_peer_actions(self) -> None:
+        """Peer action setup."""
 
-        # Generate constants for actions
+        # Register the shared constants and functions for our actions, these are only output once for all peers
         if self.peer_attributes.actions:
-            # Grab constants section
-            constants = self.peer_attributes.actions.generate_constants()
-            # If we have something, add it to our configuration
-            if constants:
-                self.conf.add(f"# BGP Peer Constants: {self.asn} - {self.name}")
-                for line in constants:
-                    self.conf.add(line)
-                self.conf.add("")
-
-    def _setup_peer_functions(self) -> None:
-        """Peer function setup."""
-
-        # Generate functions for actions
-        if self.peer_attributes.actions:
-            # Grab functions section
-            functions = self.peer_attributes.actions.generate_functions()
-            # If we have something, add it to our configuration
-            if functions:
-                self.conf.add(f"# BGP Peer Functions: {self.asn} - {self.name}")
-                for line in self.peer_attributes.actions.generate_functions():
-                    self.conf.add(line)
-                self.conf.add("")
+            self.peer_attributes.actions.register()
 
     def _setup_import_aspath_asns_filter(self) -> None:  # noqa: C901,PLR0912
         """AS-PATH ASN import list setup."""
@@ -1965,7 +1987,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
             self.state["import_filter"] = {}
         self.state["import_filter"]["peer_asns"] = state
 
-    def _setup_peer_import_prefix_filter(  # noqa: C901,PLR0912,PLR0915
+    def _setup_peer_import_prefix_filter(  # noqa: C901
         self,
     ) -> None:
         """Prefix import filter setup."""
@@ -1976,43 +1998,25 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         state: dict[str, dict[str, Any]] = {}
 
-        # Work out prefixes
-        import_prefix_lists: dict[str, list[str]] = {"4": [], "6": []}
-        for prefix in sorted(self.import_filter_policy.prefixes):
-            if ":" in prefix:
-                import_prefix_lists["6"].append(prefix)
-            else:
-                import_prefix_lists["4"].append(prefix)
-        import_prefix_lists_irr: dict[str, list[str]] = {"4": [], "6": []}
-        for prefix in sorted(self.import_filter_policy.prefixes_irr):
-            if ":" in prefix:
-                import_prefix_lists_irr["6"].append(prefix)
-            else:
-                import_prefix_lists_irr["4"].append(prefix)
-
         # Output prefix definitions
         for ipv in ["4", "6"]:
-            import_prefix_list = import_prefix_lists[ipv]
-            import_prefix_list_irr = import_prefix_lists_irr[ipv]
+            # Work out prefixes, sorted and with duplicates removed
+            import_prefix_list = self.import_filter_policy.prefixes.family(ipv).sorted()
+            import_prefix_list_irr = self.import_filter_policy.prefixes_irr.family(ipv).sorted()
 
             import_prefixes = []
             import_blackholes = []
 
             # Add statically defined prefix list
+            static_blackholes = import_prefix_list.blackholes().sorted()
             if import_prefix_list:
                 # Save prefix list in our state
                 if "static" not in state:
                     state["static"] = {}
-                state["static"][f"ipv{ipv}"] = import_prefix_list
-
-                for prefix in import_prefix_list:
-                    import_prefixes.append(prefix)
-                    # Add blackhole
-                    blackhole = re.split(r"[{+]", prefix, maxsplit=1)[0] + "+"
-                    import_blackholes.append(blackhole)
-            # Sort and unique our results
-            import_prefixes = sorted(set(import_prefixes))
-            import_blackholes = sorted(set(import_blackholes))
+                state["static"][f"ipv{ipv}"] = import_prefix_list.to_list()
+
+                import_prefixes.extend(import_prefix_list)
+                import_blackholes.extend(static_blackholes)
             # Add title for this section
             import_prefixes.insert(0, f"# {len(import_prefix_list)} explicitly defined")
             import_blackholes.insert(0, f"# {len(import_prefix_list)} explicitly defined")
@@ -2022,20 +2026,11 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                 # Save prefix list in our state
                 if "irr" not in state:
                     state["irr"] = {}
-                state["irr"][f"ipv{ipv}"] = import_prefix_list_irr
+                state["irr"][f"ipv{ipv}"] = import_prefix_list_irr.to_list()
 
-                import_prefixes_irr = []
-                import_blackholes_irr = []
-
-                # Loop with each prefix we got from IRR
-                for prefix in import_prefix_list_irr:
-                    # Make sure we're not making duplicates
-                    if prefix not in import_prefixes:
-                        import_prefixes_irr.append(prefix)
-                    # Add blackhole, and make sure we're not duplicating here either
-                    blackhole = prefix.split("{", 1)[0] + "+"
-                    if blackhole not in import_blackholes:
-                        import_blackholes_irr.append(blackhole)
+                # Make sure we're not duplicating the statically defined prefixes and blackholes
+                import_prefixes_irr = import_prefix_list_irr.difference(import_prefix_list)
+                import_blackholes_irr = import_prefix_list_irr.blackholes().sorted().difference(static_blackholes)
 
                 # Add title to top of prefixes retrieved via IRR
                 import_prefixes.append(
@@ -2075,7 +2070,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
             self.state["import_filter"] = {}
         self.state["import_filter"]["prefixes"] = state
 
-    def _setup_peer_import_prefix_deny_filter(  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    def _setup_peer_import_prefix_deny_filter(
         self,
     ) -> None:
         """Prefix import deny filter setup."""
@@ -2086,27 +2081,18 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         state: dict[str, list[str]] = {}
 
-        # Work out prefixes
-        import_prefix_lists: dict[str, list[str]] = {"4": [], "6": []}
-        for prefix in sorted(self.import_filter_deny_policy.prefixes):
-            if ":" in prefix:
-                import_prefix_lists["6"].append(prefix)
-            else:
-                import_prefix_lists["4"].append(prefix)
-
         # Output prefix definitions
         for ipv in ["4", "6"]:
-            import_prefix_list = import_prefix_lists[ipv]
+            # Work out prefixes, sorted and with duplicates removed
+            import_prefix_list = self.import_filter_deny_policy.prefixes.family(ipv).sorted()
 
             import_prefixes = []
 
             # Add statically defined prefix list
             if import_prefix_list:
-                state[f"ipv{ipv}"] = import_prefix_list
+                state[f"ipv{ipv}"] = import_prefix_list.to_list()
                 import_prefixes.extend(import_prefix_list)
 
-            # Sort and unique our results
-            import_prefixes = sorted(set(import_prefixes))
             # Add title for this section
             import_prefixes.insert(0, f"# {len(import_prefix_list)} explicitly defined")
 
@@ -2125,7 +2111,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
             self.state["import_filter_deny"] = {}
         self.state["import_filter_deny"]["prefixes"] = state
 
-    def _setup_peer_export_prefix_filter(self) -> None:  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    def _setup_peer_export_prefix_filter(self) -> None:
         """Prefix export filter setup."""
 
         # Short circuit and exit if we have none
@@ -2134,17 +2120,10 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         state: dict[str, dict[str, Any]] = {}
 
-        # Work out prefixes
-        export_prefix_lists: dict[str, list[str]] = {"4": [], "6": []}
-        for prefix in sorted(self.export_filter_policy.prefixes):
-            if ":" in prefix:
-                export_prefix_lists["6"].append(prefix)
-            else:
-                export_prefix_lists["4"].append(prefix)
-
         # Output prefix definitions
         for ipv in ["4", "6"]:
-            export_prefix_list = export_prefix_lists[ipv]
+            # Work out prefixes, sorted and with duplicates removed
+            export_prefix_list = self.export_filter_policy.prefixes.family(ipv).sorted()
 
             export_prefixes = []
 
@@ -2153,13 +2132,10 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                 # Save prefix list in our state
                 if "static" not in state:
                     state["static"] = {}
-                state["static"][f"ipv{ipv}"] = export_prefix_list
+                state["static"][f"ipv{ipv}"] = export_prefix_list.to_list()
 
                 export_prefixes.extend(export_prefix_list)
 
-            # Sort and unique our results
-            export_prefixes = sorted(set(export_prefixes))
-
             # Add title for this section
             export_prefixes.insert(0, f"# {len(export_prefix_list)} explicitly defined")
 
@@ -2190,6 +2166,13 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         self.conf.add("string filter_name;")
         self.conf.add("{")
         self.conf.add(f'  filter_name = "{filter_name}";')
+        self._peer_to_bgp_export_filter_checks()
+        self.conf.add("};")
+        self.conf.add("")
+
+    def _peer_to_bgp_export_filter_checks(self) -> None:
+        """Add the checks done on routes going into our main BGP table, ending with accepting the route."""
+
         # If this is a filtered route, reject it
         self.conf.add(f"  {self.bgp_functions.peer_reject_filtered()};")
         # Enable blackholing for customers and internal peers
@@ -2200,19 +2183,30 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
             self.conf.add(f"  {self.bgp_functions.peer_accept_blackhole_originated()};")
         # Finally accept the route
         self.conf.add(f"  {self.bgp_functions.peer_accept()};")
-        self.conf.add("};")
-        self.conf.add("")
 
     def _peer_to_bgp_import_filter(  # noqa: C901,PLR0912,PLR0915
         self,
     ) -> None:
-        """Import filter FROM the main BGP table to the BGP peer table."""
+        """
+        Import filter FROM the main BGP table to the BGP peer table.
 
-        # Set our filter name
-        filter_name = self.filter_name_import_bgp
+        When using a flat table, this is the export filter to the BGP peer instead, as there is no peer table.
+
+        """
+
+        # Set our filter name and where the routes are going to
+        if self.flat_table:
+            filter_name = self.filter_name_export
+            target = "peer"
+        else:
+            filter_name = self.filter_name_import_bgp
+            target = "t_bgp_peer"
 
         # Configure import filter from our main BGP table
-        self.conf.add("# Import filter FROM the main BGP table to the BGP peer table")
+        if self.flat_table:
+            self.conf.add("# Export filter TO the BGP peer from the main BGP table")
+        else:
+            self.conf.add("# Import filter FROM the main BGP table to the BGP peer table")
         self.conf.add(f"filter {filter_name}")
         self.conf.add("string filter_name;")
         self.conf.add("bool accept_route;")
@@ -2221,6 +2215,20 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         self.conf.add("  accept_route = false;")
         self.conf.add("")
 
+        # With a flat table we also need to do what the peer export filter would have done
+        if self.flat_table:
+            if self.quarantine:
+                self.conf.add("  # Peer is quarantined so reject exporting of routes")
+                self.conf.add("  if DEBUG then")
+                self.conf.add(
+                    f'   print "[{filter_name}] Rejecting ", {self.functions.route_info()}, " from t_bgp to peer (quarantined)";'
+                )
+                self.conf.add("  reject;")
+            else:
+                self.conf.add("  # Never send routes back to our peer")
+                self.conf.add(f'  if (proto = "{self.protocol_name("4")}" || proto = "{self.protocol_name("6")}") then reject;')
+            self.conf.add("")
+
         # Reject NOADVERTISE
         self.conf.add(f"  {self.bgp_functions.peer_reject_noadvertise()};")
 
@@ -2824,7 +2832,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     if action.action_type != BGPPeerActionType.EXPORT:
                         continue
                     # Call BIRD function and reject route if we need to
-                    conf.append(f"    if ! {action.function_name}() then accept_route = false;")
+                    conf.append(f"    if ! {action.call()} then accept_route = false;")
 
         conf.append("  }")
 
@@ -2839,7 +2847,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         self.conf.add("    # Finally accept")
         self.conf.add("    if DEBUG then")
         self.conf.add(
-            f'      print "[{filter_name}] Accepting ", {self.functions.route_info()}, " from t_bgp to t_bgp_peer (fallthrough)";'
+            f'      print "[{filter_name}] Accepting ", {self.functions.route_info()}, " from t_bgp to {target} (fallthrough)";'
         )
         self.conf.add("    accept;")
         self.conf.add("  }")
@@ -2848,7 +2856,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         self.conf.add("  # Reject by default")
         self.conf.add("  if DEBUG then")
         self.conf.add(
-            f'    print "[{filter_name}] Rejecting ", {self.functions.route_info()}, " from t_bgp to t_bgp_peer (fallthrough)";'
+            f'    print "[{filter_name}] Rejecting ", {self.functions.route_info()}, " from t_bgp to {target} (fallthrough)";'
         )
         self.conf.add("  reject;")
         self.conf.add("};")
@@ -2857,6 +2865,11 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
     def _peer_export_filter(self) -> None:
         """Peer export filter setup from peer table to peer."""
 
+        # With a flat table we export straight from the main BGP table
+        if self.flat_table:
+            self._peer_to_bgp_import_filter()
+            return
+
         filter_name = self.filter_name_export
 
         # Configure export filter to the BGP peer
@@ -2884,7 +2897,10 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         filter_name = self.filter_name_import
 
         # Configure import filter from the BGP peer
-        self.conf.add("# Import filter FROM the BGP peer TO the peer BGP table")
+        if self.flat_table:
+            self.conf.add("# Import filter FROM the BGP peer TO the main BGP table")
+        else:
+            self.conf.add("# Import filter FROM the BGP peer TO the peer BGP table")
         self.conf.add(f"filter {filter_name}")
         self.conf.add("string filter_name;")
         self.conf.add("{")
@@ -3151,7 +3167,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
                     if action.action_type != BGPPeerActionType.IMPORT:
                         continue
                     # Call BIRD function and reject route if we need to
-                    self.conf.add(f"  {action.function_name}();")
+                    self.conf.add(f"  {action.call()};")
 
         # Enable graceful_shutdown for this prefix
         if self.graceful_shutdown:
@@ -3159,7 +3175,11 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Set local_pref to 0 (GRACEFUL_SHUTDOWN) for the peer in graceful_shutdown
         self.conf.add(f"  {self.bgp_functions.peer_import_graceful_shutdown()};")
 
-        self.conf.add("  accept;")
+        # With a flat table, finish off with what the pipe to the main BGP table would have done
+        if self.flat_table:
+            self._peer_to_bgp_export_filter_checks()
+        else:
+            self.conf.add("  accept;")
         self.conf.add("};")
         self.conf.add("")
 
@@ -3216,7 +3236,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         # Setup peer table
         self.conf.add(f"  ipv{ipv} {{")
-        self.conf.add(f"    table {self.bgp_table_name(ipv)};")
+        self.conf.add(f"    table {self.protocol_table_name(ipv)};")
         self.conf.add(f"    igp table master{ipv};")
         # Set the nexthop to ourselves for external peers
         if self.peer_type in ("customer", "peer", "transit", "routecollector", "routeserver"):
@@ -3227,13 +3247,23 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         # Decide if we're adding all BGP paths
         if self.add_paths:
             self.conf.add(f"    add paths {self.add_paths};")
+        # When exporting from the main BGP table, try the next best route if the export filter rejects the best one
+        if self.flat_table:
+            self.conf.add("    secondary;")
         # Setup import and export table so we can do soft reconfiguration
-        self.conf.add("    import table;")
-        self.conf.add("    export table;")
+        if self.import_table:
+            self.conf.add("    import table;")
+        if self.export_table:
+            self.conf.add("    export table;")
+        # With a flat table the import filter rejects filtered routes, keep them so they can still be inspected
+        if self.flat_table:
+            self.conf.add("    import keep filtered on;")
         # Setup prefix limit
         prefix_limit = getattr(self, f"prefix_limit{ipv}")
         if prefix_limit:
-            self.conf.add(f"    import limit {prefix_limit} action {self.prefix_limit_action.value};")
+            # The import limit only counts accepted routes, with a flat table we need to count the filtered routes too
+            limit_type = "receive" if self.flat_table else "import"
+            self.conf.add(f"    {limit_type} limit {prefix_limit} action {self.prefix_limit_action.value};")
             protocol_state["prefix_limit"] = prefix_limit
         # Setup filters
         self.conf.add(f"    import filter {self.filter_name_import};")
@@ -3258,6 +3288,9 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
     def _setup_peer_to_bgp_filters(self) -> None:
         """Peer filters to the main BGP table."""
+        # With a flat table there is no pipe, its filters are fused into the peer filters
+        if self.flat_table:
+            return
         self._peer_to_bgp_export_filter()
         self._peer_to_bgp_import_filter()
 
@@ -3392,6 +3425,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
     def neighbor4(self, neighbor4: str) -> None:
         """Set our IPv4 neighbor address."""
         self.peer_attributes.neighbor4 = neighbor4
+        self.peer_attributes.has_ipv4 = neighbor4 is not None
 
     @property
     def neighbor6(self) -> str | None:
@@ -3402,6 +3436,7 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
     def neighbor6(self, neighbor6: str) -> None:
         """Set our IPv4 neighbor address."""
         self.peer_attributes.neighbor6 = neighbor6
+        self.peer_attributes.has_ipv6 = neighbor6 is not None
 
     @property
     def source_address4(self) -> str | None:
@@ -3613,6 +3648,11 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
         """Set our IPv6 prefix limit from PeeringDB."""
         self.peer_attributes.prefix_limit6_peeringdb = prefix_limit6
 
+    @property
+    def peeringdb_prefix_limits(self) -> list[str]:
+        """Return the IP versions our prefix limits are retrieved from PeeringDB for."""
+        return self._peeringdb_prefix_limits
+
     @property
     def quarantine(self) -> bool:
         """Peer quarantine property."""
@@ -3658,6 +3698,31 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
 
         return self.bgp_attributes.peertype_constraints[peer_type]
 
+    @property
+    def flat_table(self) -> bool:
+        """Return if we import routes straight into the main BGP table, without a peer table and pipe."""
+        if self.peer_attributes.flat_table is not None:
+            return self.peer_attributes.flat_table
+        return self.bgp_attributes.flat_table
+
+    @property
+    def import_table(self) -> bool:
+        """Return if we keep an import table (Adj-RIB-In) for this peer."""
+        if self.constraints.import_table is not None:
+            return self.constraints.import_table
+        if self.global_constraints.import_table is not None:
+            return self.global_constraints.import_table
+        return self.bgp_attributes.import_table
+
+    @property
+    def export_table(self) -> bool:
+        """Return if we keep an export table (Adj-RIB-Out) for this peer."""
+        if self.constraints.export_table is not None:
+            return self.constraints.export_table
+        if self.global_constraints.export_table is not None:
+            return self.global_constraints.export_table
+        return self.bgp_attributes.export_table
+
     # IPV4 BLACKHOLE IMPORT PREFIX LENGTHS
 
     @property
@@ -3963,27 +4028,27 @@ class ProtocolBGPPeer(SectionProtocolBase):  # pylint: disable=too-many-instance
     @property
     def has_ipv4(self) -> bool:
         """Return if we have IPv4."""
-        return self.neighbor4 is not None
+        return self.peer_attributes.has_ipv4
 
     @property
     def has_ipv6(self) -> bool:
         """Peer is configured with IPv6."""
-        return self.neighbor6 is not None
+        return self.peer_attributes.has_ipv6
 
     @property
-    def has_import_prefix_filter(self) -> BGPPeerFilterItem:
+    def has_import_prefix_filter(self) -> bool:
         """Peer has a import prefix filter."""
-        return self.import_filter_policy.prefixes or self.import_filter_policy.as_sets
+        return self.peer_attributes.has_import_prefix_filter
 
     @property
-    def has_import_prefix_deny_filter(self) -> BGPPeerFilterItem:
+    def has_import_prefix_deny_filter(self) -> bool:
         """Peer has a import prefix deny filter."""
-        return self.import_filter_deny_policy.prefixes
+        return self.peer_attributes.has_import_prefix_deny_filter
 
     @property
-    def has_export_prefix_filter(self) -> BGPPeerFilterItem:
+    def has_export_prefix_filter(self) -> bool:
         """Peer has a export prefix filter."""
-        return self.export_filter_policy.prefixes
+        return self.peer_attributes.has_export_prefix_filter
 
     @property
     def actions(self) -> BGPPeerActions | None:
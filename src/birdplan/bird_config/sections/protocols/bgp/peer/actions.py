@@ -18,11 +18,13 @@
 
 """BIRD BGP peer action support."""
 
+import hashlib
 from enum import Enum
 from typing import Any
 
 from ......exceptions import BirdPlanConfigError
 from ..... import util
+from ....constants import SectionConstants
 from ....functions import BirdVariable, SectionFunctions
 from ..bgp_functions import BGPFunctions
 
@@ -36,9 +38,15 @@ class BGPPeerActionType(Enum):
     EXPORT = "export"
 
 
-class BGPPeerAction:
-    """BGP peer action."""
+class BGPPeerAction:  # pylint: disable=too-many-instance-attributes
+    """
+    BGP peer action.
 
+    Actions are canonicalised and hashed so that peers with identical match and action bodies share a single BIRD function and
+    a single set of match constants. The function is parameterised with the calling filter name and the peer's action ID.
+    """
+
+    _constants: SectionConstants
     _global_functions: SectionFunctions
     _bgp_functions: BGPFunctions
 
@@ -63,8 +71,11 @@ class BGPPeerAction:
     _action_remove_large_community: list[str]
     _action_prepend: int
 
+    _digest: str
+
     def __init__(  # noqa: PLR0913
         self,
+        constants: SectionConstants,
         global_functions: SectionFunctions,
         bgp_functions: BGPFunctions,
         asn: int,
@@ -74,6 +85,7 @@ class BGPPeerAction:
     ) -> None:
         """Initialize BGP peer action."""
 
+        self._constants = constants
         self._global_functions = global_functions
         self._bgp_functions = bgp_functions
 
@@ -105,6 +117,9 @@ class BGPPeerAction:
             self._parse_matches(action["matches"])
         self._parse_actions(action["action"])
 
+        # Work out our digest, which is used to share the function and constants between all peers with the same action
+        self._digest = hashlib.sha256(repr(self._canonical_key()).encode("UTF-8")).hexdigest()[:12]
+
     def _parse_matches(self, matches: dict[str, Any]) -> None:
         """Parse the matches."""
 
@@ -118,7 +133,7 @@ class BGPPeerAction:
             if isinstance(match_v, str):
                 match_v_list.append(match_v)
             else:
-                match_v_list.extend(match_v)
+                match_v_list.extend([f"{x}" for x in match_v])
             # Process each type of match
             if match_k in ("origin_asn", "prefix", "community", "extended_community", "large_community"):
                 setattr(self, f"_match_{match_k}", match_v_list)
@@ -173,81 +188,47 @@ class BGPPeerAction:
             else:
                 raise BirdPlanConfigError(f"Action type '{action_k}' is not valid")
 
-    def generate_constants(self) -> list[str]:  # noqa: C901
-        """Generate the constants for the action."""
-        constants = []
-        # Loop with basic match types
+    def generate_constants(self) -> dict[str, list[str]]:
+        """Generate the constants for the action, indexed by constant name."""
+        constants: dict[str, list[str]] = {}
+        # Loop with match types and the constant lists they need
         for match_type in (
             "origin_asn",
             "prefix",
-        ):
-            match_list_name = getattr(self, f"match_list_name_{match_type}")
-            # Pull out straight matches
-            match_list = [x for x in getattr(self, f"_match_{match_type}") if not x.startswith("!")]
-            # Pull out negative NOT matches
-            match_list_not = [x[1:] for x in getattr(self, f"_match_{match_type}") if x.startswith("!")]
-            # Generate origin ASN match lists
-            if match_type == "origin_asn":
-                if match_list:
-                    constants.append(f"define {match_list_name} = [")
-                    constants.extend([f"  {line}" for line in ", ".join(match_list).split(" ")])
-                    constants.append("];")
-                if match_list_not:
-                    constants.append(f"define {match_list_name}_not = [")
-                    constants.extend([f"  {line}" for line in ", ".join(match_list_not).split(" ")])
-                    constants.append("];")
-            # Generate prefix match lists
-            elif match_type == "prefix":
-                # Pull out IPv4 and IPv6 prefixes lists
-                match_list_v4, match_list_not_v4, match_list_v6, match_list_not_v6 = self._get_match_prefix_lists()
-                # Generate IPv4 prefix match lists
-                if match_list_v4:
-                    constants.append(f"define {match_list_name}_v4 = [")
-                    constants.extend([f"  {line}" for line in ", ".join([x.replace(" ", "") for x in match_list_v4]).split(" ")])
-                    constants.append("];")
-                if match_list_not_v4:
-                    constants.append(f"define {match_list_name}_not_v4 = [")
-                    constants.extend(
-                        [f"  {line}" for line in ", ".join([x.replace(" ", "") for x in match_list_not_v4]).split(" ")]
-                    )
-                    constants.append("];")
-                # Generate IPv6 prefix match lists
-                if match_list_v6:
-                    constants.append(f"define {match_list_name}_v6 = [")
-                    constants.extend([f"  {line}" for line in ", ".join([x.replace(" ", "") for x in match_list_v6]).split(" ")])
-                    constants.append("];")
-                if match_list_not_v6:
-                    constants.append(f"define {match_list_name}_not_v6 = [")
-                    constants.extend(
-                        [f"  {line}" for line in ", ".join([x.replace(" ", "") for x in match_list_not_v6]).split(" ")]
-                    )
-                    constants.append("];")
-
-        # Loop with community match types
-        for match_type in (
             "community",
             "extended_community",
             "large_community",
         ):
             match_list_name = getattr(self, f"match_list_name_{match_type}")
-            match_list = getattr(self, f"_match_{match_type}")
-            # Loop with match list and convert from xxx:yyy to (xxx,yyy) format
-            match_list = util.sanitize_community_list(match_list)
-            if match_list:
-                constants.append(f"define {match_list_name} = [")
-                constants.extend([f"  {line}" for line in ", ".join(match_list).split(" ")])
-                constants.append("];")
-        # Return list of constants for this peer
+            # Generate prefix match lists, these are split by IP version
+            if match_type == "prefix":
+                match_list_v4, match_list_not_v4, match_list_v6, match_list_not_v6 = self._get_match_prefix_lists()
+                match_lists = {
+                    f"{match_list_name}_v4": match_list_v4,
+                    f"{match_list_name}_not_v4": match_list_not_v4,
+                    f"{match_list_name}_v6": match_list_v6,
+                    f"{match_list_name}_not_v6": match_list_not_v6,
+                }
+            else:
+                match_list, match_list_not = self._get_match_lists(match_type)
+                match_lists = {match_list_name: match_list, f"{match_list_name}_not": match_list_not}
+            # Generate each non-empty list
+            for constant_name, constant_list in match_lists.items():
+                if not constant_list:
+                    continue
+                constant = [f"define {constant_name} = ["]
+                constant.extend([f"  {line}" for line in ", ".join(constant_list).split(" ")])
+                constant.append("];")
+                constants[constant_name] = constant
+        # Return constants for this action
         return constants
 
     def generate_function(self) -> list[str]:  # noqa: C901,PLR0912,PLR0915
         """Generate the function for the action."""
         function = []
         # Generate function header
-        function.append(f"function {self.function_name}() -> bool")
-        function.append("string filter_name;")
-        function.append("{")
-        function.append(f'  filter_name = "{self.function_name}";')
+        function.append(f"# BGP peer {self.action_type.value} action")
+        function.append(f"function {self.function_name}(string filter_name; int action_id) -> bool {{")
 
         # Generate match statements
         # NK: We use the for loop because we have duplicate code between the various match types
@@ -259,42 +240,38 @@ class BGPPeerAction:
             "large_community",
         ):
             match_list_name = getattr(self, f"match_list_name_{match_type}")
-            # Grab list of raw matches
-            match_list_raw = getattr(self, f"_match_{match_type}")
-            # Pull out straight matches
-            match_list = [x for x in match_list_raw if not x.startswith("!")]
-            # Pull out negative NOT matches
-            match_list_not = [x[1:] for x in match_list_raw if x.startswith("!")]
-
-            # Add commentfor this match type
-            if match_list_raw:
+            # Pull out straight matches and negative NOT matches
+            match_list, match_list_not = self._get_match_lists(match_type)
+
+            # Add comment for this match type
+            if match_list or match_list_not:
                 function.append(f"  # Match {match_type}")
             # Check origin ASN match
             if match_type == "origin_asn":
                 if match_list:
                     function.append(f"  if (bgp_path.first !~ {match_list_name}) then return true;")
                 if match_list_not:
-                    function.append(f"  if (bgp_path.first !~ {match_list_name}_not) then return true;")
+                    function.append(f"  if (bgp_path.first ~ {match_list_name}_not) then return true;")
             # Check prefix match
             elif match_type == "prefix":
                 # Pull out IPv4 and IPv6 prefixes lists
                 match_list_v4, match_list_not_v4, match_list_v6, match_list_not_v6 = self._get_match_prefix_lists()
                 # Check IPv4 prefix match
                 if match_list_v4 or match_list_not_v4:
-                    function.append("  if (net.type = NET_IP4) then {{")
+                    function.append("  if (net.type = NET_IP4) then {")
                     if match_list_v4:
                         function.append(f"    if (net !~ {match_list_name}_v4) then return true;")
                     if match_list_not_v4:
                         function.append(f"    if (net ~ {match_list_name}_not_v4) then return true;")
-                    function.append("  }}")
+                    function.append("  }")
                 # Check IPv6 prefix match
                 if match_list_v6 or match_list_not_v6:
-                    function.append("  if (net.type = NET_IP6) then {{")
+                    function.append("  if (net.type = NET_IP6) then {")
                     if match_list_v6:
                         function.append(f"    if (net !~ {match_list_name}_v6) then return true;")
                     if match_list_not_v6:
                         function.append(f"    if (net ~ {match_list_name}_not_v6) then return true;")
-                    function.append("  }}")
+                    function.append("  }")
             # Check community match
             elif match_type == "community":
                 if match_list:
@@ -325,14 +302,14 @@ class BGPPeerAction:
             if self.action_type == BGPPeerActionType.IMPORT:
                 function.append(
                     f"  if DEBUG then print\n"
-                    f"""    "{self.function_name} [action:{self.action_id}] Filtering ","""
+                    f"""    filter_name, " [action:", action_id, "] Filtering ","""
                     f" {self.global_functions.route_info()};"
                 )
                 function.append("  bgp_large_community.add(BGP_LC_FILTERED_ACTION);")
             elif self.action_type == BGPPeerActionType.EXPORT:
                 function.append(
                     f"  if DEBUG then print\n"
-                    f"""    "{self.function_name} [action:{self.action_id}] Rejecting ","""
+                    f"""    filter_name, " [action:", action_id, "] Rejecting ","""
                     f" {self.global_functions.route_info()};"
                 )
             # Set fallthrough value to false as we're rejecting
@@ -342,7 +319,7 @@ class BGPPeerAction:
         if self._action_add_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Adding communities """
+                f"""    filter_name, " [action:", action_id, "] Adding communities """
                 f"""{", ".join(self._action_add_community)} to ","""
                 f" {self.global_functions.route_info()};"
             )
@@ -354,7 +331,7 @@ class BGPPeerAction:
         if self._action_add_extended_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Adding extended communities """
+                f"""    filter_name, " [action:", action_id, "] Adding extended communities """
                 f"""{", ".join(self._action_add_extended_community)} to ","""
                 f" {self.global_functions.route_info()};"
             )
@@ -369,7 +346,7 @@ class BGPPeerAction:
         if self._action_add_large_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Adding large communities """
+                f"""    filter_name, " [action:", action_id, "] Adding large communities """
                 f"""{", ".join(self._action_add_large_community)} to ","""
                 f" {self.global_functions.route_info()};"
             )
@@ -384,7 +361,7 @@ class BGPPeerAction:
         if self._action_remove_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Removing communities """
+                f"""    filter_name, " [action:", action_id, "] Removing communities """
                 f"""{", ".join(self._action_remove_community)} from ","""
                 f" {self.global_functions.route_info()};"
             )
@@ -394,19 +371,17 @@ class BGPPeerAction:
         if self._action_remove_extended_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Removing extended communities """
+                f"""    filter_name, " [action:", action_id, "] Removing extended communities """
                 f"""{", ".join(self._action_remove_extended_community)} from ","""
                 f" {self.global_functions.route_info()};"
             )
-            function.extend(
-                [f"  bgp_extended_community.remove({community});" for community in self._action_remove_extended_community]
-            )
+            function.extend([f"  bgp_ext_community.remove({community});" for community in self._action_remove_extended_community])
 
         # Handle remove_large_community action
         if self._action_remove_large_community:
             function.append(
                 f"  if DEBUG then print\n"
-                f"""    "{self.function_name} [action:{self.action_id}] Removing large communities """
+                f"""    filter_name, " [action:", action_id, "] Removing large communities """
                 f"""{", ".join(self._action_remove_large_community)} from ","""
                 f" {self.global_functions.route_info()};"
             )
@@ -422,14 +397,69 @@ class BGPPeerAction:
         # Return list of function lines
         return function
 
+    def register(self) -> None:
+        """Register our shared constants and function, this is only done for the first peer using this action."""
+        # If our function is already registered, so are our constants
+        if self.function_name in self.bgp_functions.bird_functions:
+            return
+        # Add our constants
+        self.constants.bird_constants.update(self.generate_constants())
+        # Add our function
+        self.bgp_functions.bird_functions[self.function_name] = "\n".join(self.generate_function())
+
+    def call(self) -> str:
+        """Return the BIRD function call for this action."""
+        return f"{self.function_name}(filter_name, {self.action_id})"
+
+    def _canonical_key(self) -> tuple[Any, ...]:
+        """Return the canonical representation of our match and action bodies."""
+        return (
+            self.action_type.value,
+            tuple(sorted(self._match_origin_asn)),
+            tuple(sorted(self._match_prefix)),
+            tuple(sorted(self._match_community)),
+            tuple(sorted(self._match_extended_community)),
+            tuple(sorted(self._match_large_community)),
+            self._action_reject,
+            tuple(sorted(f"{x}" for x in self._action_add_community)),
+            tuple(sorted(f"{x}" for x in self._action_add_extended_community)),
+            tuple(sorted(f"{x}" for x in self._action_add_large_community)),
+            tuple(sorted(f"{x}" for x in self._action_remove_community)),
+            tuple(sorted(f"{x}" for x in self._action_remove_extended_community)),
+            tuple(sorted(f"{x}" for x in self._action_remove_large_community)),
+            self._action_prepend,
+        )
+
+    def _get_match_lists(self, match_type: str) -> tuple[list[str], list[str]]:
+        """Get the straight and negative NOT match lists for a match type."""
+        match_list_raw = getattr(self, f"_match_{match_type}")
+        # Pull out straight matches
+        match_list = [x for x in match_list_raw if not x.startswith("!")]
+        # Pull out negative NOT matches
+        match_list_not = [x[1:] for x in match_list_raw if x.startswith("!")]
+        # Communities need to be converted from xxx:yyy to (xxx,yyy) format
+        if match_type in ("community", "extended_community", "large_community"):
+            match_list = util.sanitize_community_list(match_list)
+            match_list_not = util.sanitize_community_list(match_list_not)
+        return match_list, match_list_not
+
     def _get_match_prefix_lists(self) -> tuple[list[str], list[str], list[str], list[str]]:
         """Get the match prefix lists for IPv4 an IPv6."""
-        match_list_v4 = [x for x in self._match_prefix if ":" not in x]
-        match_list_not_v4 = [x for x in self._match_prefix if ":" not in x]
-        match_list_v6 = [x for x in self._match_prefix if ":" in x]
-        match_list_not_v6 = [x for x in self._match_prefix if ":" in x]
+        match_list, match_list_not = self._get_match_lists("prefix")
+        # Strip spaces from prefixes
+        match_list = [x.replace(" ", "") for x in match_list]
+        match_list_not = [x.replace(" ", "") for x in match_list_not]
+        match_list_v4 = [x for x in match_list if ":" not in x]
+        match_list_not_v4 = [x for x in match_list_not if ":" not in x]
+        match_list_v6 = [x for x in match_list if ":" in x]
+        match_list_not_v6 = [x for x in match_list_not if ":" in x]
         return match_list_v4, match_list_not_v4, match_list_v6, match_list_not_v6
 
+    @property
+    def constants(self) -> SectionConstants:
+        """Return the global constants."""
+        return self._constants
+
     @property
     def global_functions(self) -> SectionFunctions:
         """Return the global functions."""
@@ -440,35 +470,40 @@ class BGPPeerAction:
         """Return the BGP functions."""
         return self._bgp_functions
 
+    @property
+    def digest(self) -> str:
+        """Return the digest of our canonical match and action bodies."""
+        return self._digest
+
     @property
     def function_name(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_{self.action_type.value}"
+        """Return our shared function name."""
+        return f"bgp_action_{self.digest}_{self.action_type.value}"
 
     @property
     def match_list_name_origin_asn(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_match_origin_asn"
+        """Return our origin ASN match list name."""
+        return f"bgp_action_{self.digest}_match_origin_asn"
 
     @property
     def match_list_name_prefix(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_match_prefix"
+        """Return our prefix match list name."""
+        return f"bgp_action_{self.digest}_match_prefix"
 
     @property
     def match_list_name_community(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_match_community"
+        """Return our community match list name."""
+        return f"bgp_action_{self.digest}_match_community"
 
     @property
     def match_list_name_extended_community(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_match_extended_community"
+        """Return our extended community match list name."""
+        return f"bgp_action_{self.digest}_match_extended_community"
 
     @property
     def match_list_name_large_community(self) -> str:
-        """Return our origin ASN deny list name."""
-        return f"bgp_AS{self.asn}_{self.peer_name}_action{self.action_id}_match_large_community"
+        """Return our large community match list name."""
+        return f"bgp_action_{self.digest}_match_large_community"
 
     @property
     def asn(self) -> int:
@@ -494,6 +529,7 @@ class BGPPeerAction:
 class BGPPeerActions:
     """BGP peer actions."""
 
+    _constants: SectionConstants
     _global_functions: SectionFunctions
     _bgp_functions: BGPFunctions
 
@@ -501,9 +537,12 @@ class BGPPeerActions:
     _peer_name: str
     _actions: list[BGPPeerAction]
 
-    def __init__(self, global_functions: SectionFunctions, bgp_functions: BGPFunctions, asn: int, peer_name: str) -> None:
+    def __init__(
+        self, constants: SectionConstants, global_functions: SectionFunctions, bgp_functions: BGPFunctions, asn: int, peer_name: str
+    ) -> None:
         """Initialize BGP peer actions."""
 
+        self._constants = constants
         self._global_functions = global_functions
         self._bgp_functions = bgp_functions
 
@@ -523,23 +562,21 @@ class BGPPeerActions:
         action_id = 1
         for action in actions:
             self.actions.append(
-                BGPPeerAction(self.global_functions, self.bgp_functions, self.asn, self.peer_name, action_id, action)
+                BGPPeerAction(
+                    self.constants, self.global_functions, self.bgp_functions, self.asn, self.peer_name, action_id, action
+                )
             )
             action_id += 1
 
-    def generate_constants(self) -> list[str]:
-        """Generate the constants for the actions."""
-        constants = []
+    def register(self) -> None:
+        """Register the shared constants and functions for the actions."""
         for action in self.actions:
-            constants.extend(action.generate_constants())
-        return constants
+            action.register()
 
-    def generate_functions(self) -> list[str]:
-        """Generate the functions for the actions."""
-        functions = []
-        for action in self.actions:
-            functions.extend(action.generate_function())
-        return functions
+    @property
+    def constants(self) -> SectionConstants:
+        """Return the global constants."""
+        return self._constants
 
     @property
     def global_functions(self) -> SectionFunctions:
@@ -0,0 +1,142 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BIRD BGP protocol peer checks for substantial changes in PeeringDB and IRR information."""
+
+from ......exceptions import BirdPlanError
+from ......prefix_set import PrefixSet
+
+__all__ = ["check_irr_network_count", "check_irr_prefix_changes", "check_peeringdb_prefix_limit"]
+
+
+def check_peeringdb_prefix_limit(peer_name: str, peer_type: str, ipv: str, last: int, now: int) -> None:
+    """
+    Check that a PeeringDB prefix limit has not changed substantially from the previous run.
+
+    Parameters
+    ----------
+    peer_name : str
+        Peer name.
+
+    peer_type : str
+        Peer type.
+
+    ipv : str
+        IP version, either "4" or "6".
+
+    last : int
+        Prefix limit from the previous run.
+
+    now : int
+        Prefix limit retrieved now.
+
+    """
+
+    _check_change(f"PeeringDB IPv{ipv} prefix limit", peer_name, peer_type, last, now)
+
+
+def check_irr_network_count(peer_name: str, peer_type: str, ipv: str, last: int, now: int) -> None:
+    """
+    Check that an IRR network count has not changed substantially from the previous run.
+
+    Parameters
+    ----------
+    peer_name : str
+        Peer name.
+
+    peer_type : str
+        Peer type.
+
+    ipv : str
+        IP version, either "4" or "6".
+
+    last : int
+        Network count from the previous run.
+
+    now : int
+        Network count retrieved now.
+
+    """
+
+    _check_change(f"IRR IPv{ipv} network count", peer_name, peer_type, last, now)
+
+
+def check_irr_prefix_changes(  # noqa: PLR0913,PLR0917
+    peer_name: str, peer_type: str, ipv: str, last: PrefixSet, now: PrefixSet, limits: dict[str, int | str]
+) -> dict[str, int]:
+    """
+    Check that the IRR prefixes added, removed or covered since the previous run do not exceed their limits.
+
+    Parameters
+    ----------
+    peer_name : str
+        Peer name.
+
+    peer_type : str
+        Peer type.
+
+    ipv : str
+        IP version, either "4" or "6".
+
+    last : PrefixSet
+        Prefixes from the previous run.
+
+    now : PrefixSet
+        Prefixes retrieved now.
+
+    limits : Dict[str, Union[int, str]]
+        Limits keyed by "added", "removed" or "covered", either a number of prefixes or a percentage of the previous run
+        prefixes in the format of "N%".
+
+    Returns
+    -------
+    Dict[str, int]
+        Number of prefixes added, removed and covered.
+
+    """
+
+    changes = {change: len(prefixes) for change, prefixes in now.changes(last).items()}
+
+    for change, limit in limits.items():
+        # Work out the number of prefixes we're allowed to change, percentages are of the prefixes from the previous run
+        max_changes = len(last) * float(limit[:-1]) / 100 if isinstance(limit, str) else limit
+        if changes[change] > max_changes:
+            raise BirdPlanError(
+                f"IRR IPv{ipv} prefixes {change} for peer '{peer_name}' with type '{peer_type}' "
+                f"exceeds limit of {limit} from previous run: last={len(last)}, {change}={changes[change]}"
+            )
+
+    return changes
+
+
+def _check_change(what: str, peer_name: str, peer_type: str, last: int, now: int) -> None:
+    """Raise an exception if a value has halved or doubled since the previous run."""
+
+    # Check if there was a substantial reduction
+    if now * 2 < last:
+        raise BirdPlanError(
+            f"{what} for peer '{peer_name}' with type '{peer_type}' "
+            f"decreased substantially from previous run: last={last}, now={now}"
+        )
+    # Check if there was a substantial increase
+    if now / 2 > last:
+        raise BirdPlanError(
+            f"{what} for peer '{peer_name}' with type '{peer_type}' "
+            f"increased substantially from previous run: last={last}, now={now}"
+        )
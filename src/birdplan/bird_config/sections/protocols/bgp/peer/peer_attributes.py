@@ -21,6 +21,7 @@
 import enum
 
 from ......exceptions import BirdPlanError
+from ......prefix_set import PrefixSet
 from .actions import BGPPeerActions
 
 __all__ = [
@@ -94,6 +95,27 @@ class BGPPeerCommunitiesOutgoing:  # pylint: disable=too-few-public-methods,too-
 
     """
 
+    __slots__ = (
+        "bgp",
+        "bgp_customer",
+        "bgp_customer_blackhole",
+        "bgp_own",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_peering",
+        "bgp_transit",
+        "bgp_transit_default",
+        "connected",
+        "kernel",
+        "kernel_blackhole",
+        "kernel_default",
+        "originated",
+        "originated_default",
+        "static",
+        "static_blackhole",
+        "static_default",
+    )
+
     connected: list[str]
     kernel: list[str]
     kernel_blackhole: list[str]
@@ -147,6 +169,11 @@ class BGPPeerCommunities:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "incoming",
+        "outgoing",
+    )
+
     incoming: list[str]
 
     outgoing: BGPPeerCommunitiesOutgoing
@@ -200,6 +227,27 @@ class BGPPeerLargeCommunitiesOutgoing:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "bgp",
+        "bgp_customer",
+        "bgp_customer_blackhole",
+        "bgp_own",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_peering",
+        "bgp_transit",
+        "bgp_transit_default",
+        "connected",
+        "kernel",
+        "kernel_blackhole",
+        "kernel_default",
+        "originated",
+        "originated_default",
+        "static",
+        "static_blackhole",
+        "static_default",
+    )
+
     connected: list[str]
     kernel: list[str]
     kernel_blackhole: list[str]
@@ -253,6 +301,11 @@ class BGPPeerLargeCommunities:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "incoming",
+        "outgoing",
+    )
+
     incoming: list[str]
 
     outgoing: BGPPeerLargeCommunitiesOutgoing
@@ -276,6 +329,8 @@ class BGPPeerPrependItem:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = ("own_asn",)
+
     own_asn: int
 
     def __init__(self) -> None:
@@ -326,6 +381,26 @@ class BGPPeerPrepend:  # pylint: disable=too-few-public-methods,too-many-instanc
 
     """
 
+    __slots__ = (
+        "bgp_customer",
+        "bgp_customer_blackhole",
+        "bgp_own",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_peering",
+        "bgp_transit",
+        "bgp_transit_default",
+        "connected",
+        "kernel",
+        "kernel_blackhole",
+        "kernel_default",
+        "originated",
+        "originated_default",
+        "static",
+        "static_blackhole",
+        "static_default",
+    )
+
     connected: BGPPeerPrependItem
     kernel: BGPPeerPrependItem
     kernel_blackhole: BGPPeerPrependItem
@@ -382,6 +457,13 @@ class BGPPeerRoutePolicyAccept:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "bgp_customer_blackhole",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_transit_default",
+    )
+
     bgp_customer_blackhole: bool
     bgp_own_blackhole: bool
     bgp_own_default: bool
@@ -405,21 +487,27 @@ class BGPPeerImportFilterDenyPolicy:  # pylint: disable=too-few-public-methods
         List of ASNs to filter in the AS-PATH.
     origin_asns : BGPPeerFilterItem
         List of origin ASNs to filter on.
-    prefixes : BGPPeerFilterItem
-        List of prefixes to filter on.
+    prefixes : PrefixSet
+        Prefixes to filter on.
 
 
     """
 
+    __slots__ = (
+        "aspath_asns",
+        "origin_asns",
+        "prefixes",
+    )
+
     aspath_asns: BGPPeerFilterItem
     origin_asns: BGPPeerFilterItem
-    prefixes: BGPPeerFilterItem
+    prefixes: PrefixSet
 
     def __init__(self) -> None:
         """Initialize object."""
         self.aspath_asns = []
         self.origin_asns = []
-        self.prefixes = []
+        self.prefixes = PrefixSet()
 
 
 class BGPPeerImportFilterPolicy:  # pylint: disable=too-few-public-methods
@@ -436,22 +524,32 @@ class BGPPeerImportFilterPolicy:  # pylint: disable=too-few-public-methods
         List of origin ASNs to filter on.
     peer_asns : BGPPeerFilterItem
         List of peer ASNs to filter on.
-    prefixes : BGPPeerFilterItem
-        List of prefixes to filter on.
+    prefixes : PrefixSet
+        Prefixes to filter on.
     origin_asns_irr : List[str]
         INTERNAL ONLY. These ASNs are resolved from the `as_sets` attribute.
-    prefixes_irr : List[str]
+    prefixes_irr : PrefixSet
         INTERNAL ONLY. These prefixes are resolved from the `as_sets` attribute.
 
     """
 
+    __slots__ = (
+        "as_sets",
+        "aspath_asns",
+        "origin_asns",
+        "origin_asns_irr",
+        "peer_asns",
+        "prefixes",
+        "prefixes_irr",
+    )
+
     as_sets: BGPPeerFilterItem
     aspath_asns: BGPPeerFilterItem
     origin_asns: BGPPeerFilterItem
     peer_asns: BGPPeerFilterItem
-    prefixes: BGPPeerFilterItem
+    prefixes: PrefixSet
     origin_asns_irr: list[str]
-    prefixes_irr: list[str]
+    prefixes_irr: PrefixSet
 
     def __init__(self) -> None:
         """Initialize object."""
@@ -459,10 +557,10 @@ class BGPPeerImportFilterPolicy:  # pylint: disable=too-few-public-methods
         self.aspath_asns = []
         self.origin_asns = []
         self.peer_asns = []
-        self.prefixes = []
+        self.prefixes = PrefixSet()
         # INTERNAL attributes, these are populated during initialization
         self.origin_asns_irr = []
-        self.prefixes_irr = []
+        self.prefixes_irr = PrefixSet()
 
 
 class BGPPeerExportFilterPolicy:  # pylint: disable=too-few-public-methods
@@ -473,18 +571,23 @@ class BGPPeerExportFilterPolicy:  # pylint: disable=too-few-public-methods
     ----------
     origin_asns : BGPPeerFilterItem
         List of origin ASNs to filter on.
-    prefixes : BGPPeerFilterItem
-        List of prefixes to filter on.
+    prefixes : PrefixSet
+        Prefixes to filter on.
 
     """
 
+    __slots__ = (
+        "origin_asns",
+        "prefixes",
+    )
+
     origin_asns: BGPPeerFilterItem
-    prefixes: BGPPeerFilterItem
+    prefixes: PrefixSet
 
     def __init__(self) -> None:
         """Initialize object."""
         self.origin_asns = []
-        self.prefixes = []
+        self.prefixes = PrefixSet()
 
 
 class BGPPeerLocation:  # pylint: disable=too-few-public-methods
@@ -500,6 +603,11 @@ class BGPPeerLocation:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "iso3166",
+        "unm49",
+    )
+
     unm49: int | None
     iso3166: int | None
 
@@ -552,6 +660,26 @@ class BGPPeerRoutePolicyRedistribute:  # pylint: disable=too-few-public-methods,
 
     """
 
+    __slots__ = (
+        "bgp_customer",
+        "bgp_customer_blackhole",
+        "bgp_own",
+        "bgp_own_blackhole",
+        "bgp_own_default",
+        "bgp_peering",
+        "bgp_transit",
+        "bgp_transit_default",
+        "connected",
+        "kernel",
+        "kernel_blackhole",
+        "kernel_default",
+        "originated",
+        "originated_default",
+        "static",
+        "static_blackhole",
+        "static_default",
+    )
+
     connected: bool
     kernel: bool
     kernel_blackhole: bool
@@ -639,9 +767,39 @@ class BGPPeerConstraints:  # pylint: disable=too-few-public-methods,too-many-ins
         Extended community maximum length.
     large_community_maxlen : Optional[int]
         Large community maximum length.
+    import_table : Optional[bool]
+        Keep an import table (Adj-RIB-In).
+    export_table : Optional[bool]
+        Keep an export table (Adj-RIB-Out).
 
     """
 
+    __slots__ = (
+        "aspath_import_maxlen",
+        "aspath_import_minlen",
+        "blackhole_export_maxlen4",
+        "blackhole_export_maxlen6",
+        "blackhole_export_minlen4",
+        "blackhole_export_minlen6",
+        "blackhole_import_maxlen4",
+        "blackhole_import_maxlen6",
+        "blackhole_import_minlen4",
+        "blackhole_import_minlen6",
+        "community_import_maxlen",
+        "export_maxlen4",
+        "export_maxlen6",
+        "export_minlen4",
+        "export_minlen6",
+        "export_table",
+        "extended_community_import_maxlen",
+        "import_maxlen4",
+        "import_maxlen6",
+        "import_minlen4",
+        "import_minlen6",
+        "import_table",
+        "large_community_import_maxlen",
+    )
+
     import_maxlen4: int | None
     import_minlen4: int | None
 
@@ -673,6 +831,9 @@ class BGPPeerConstraints:  # pylint: disable=too-few-public-methods,too-many-ins
     extended_community_import_maxlen: int | None
     large_community_import_maxlen: int | None
 
+    import_table: bool | None
+    export_table: bool | None
+
     def __init__(self) -> None:
         """Initialize object."""
 
@@ -707,6 +868,9 @@ class BGPPeerConstraints:  # pylint: disable=too-few-public-methods,too-many-ins
         self.extended_community_import_maxlen = None
         self.large_community_import_maxlen = None
 
+        self.import_table = None
+        self.export_table = None
+
 
 class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """
@@ -777,6 +941,9 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
     passive : bool
         Indicate if this is a passive peer or not.
 
+    flat_table : Optional[bool]
+        Import routes straight into the main BGP table, defaults to the global BGP setting.
+
     quarantine : bool
         Set if the peer is quarantined.
 
@@ -824,8 +991,70 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
     use_rpki: bool
         Use RPKI validation for this peer.
 
+    has_ipv4 : bool
+        Derived flag indicating a IPv4 neighbor is configured.
+
+    has_ipv6 : bool
+        Derived flag indicating a IPv6 neighbor is configured.
+
+    has_import_prefix_filter : bool
+        Derived flag indicating the import filter policy has prefixes or AS-SETs.
+
+    has_import_prefix_deny_filter : bool
+        Derived flag indicating the import filter deny policy has prefixes.
+
+    has_export_prefix_filter : bool
+        Derived flag indicating the export filter policy has prefixes.
+
     """
 
+    __slots__ = (
+        "_asn",
+        "_description",
+        "_name",
+        "_peer_type",
+        "actions",
+        "add_paths",
+        "blackhole_community",
+        "communities",
+        "connect_delay_time",
+        "connect_retry_time",
+        "constraints",
+        "cost",
+        "error_wait_time",
+        "export_filter_policy",
+        "flat_table",
+        "graceful_shutdown",
+        "has_export_prefix_filter",
+        "has_import_prefix_deny_filter",
+        "has_import_prefix_filter",
+        "has_ipv4",
+        "has_ipv6",
+        "import_filter_deny_policy",
+        "import_filter_policy",
+        "large_communities",
+        "location",
+        "multihop",
+        "neighbor4",
+        "neighbor6",
+        "passive",
+        "password",
+        "prefix_limit4",
+        "prefix_limit4_peeringdb",
+        "prefix_limit6",
+        "prefix_limit6_peeringdb",
+        "prefix_limit_action",
+        "prepend",
+        "quarantine",
+        "replace_aspath",
+        "route_policy_accept",
+        "route_policy_redistribute",
+        "source_address4",
+        "source_address6",
+        "ttl_security",
+        "use_rpki",
+    )
+
     _name: str | None
     _description: str | None
     location: BGPPeerLocation
@@ -859,6 +1088,8 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
     # Default to disabling passive mode
     passive: bool
 
+    flat_table: bool | None
+
     quarantine: bool
 
     prefix_limit_action: BGPPeerImportPrefixLimitAction
@@ -886,6 +1117,12 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
 
     use_rpki: bool
 
+    has_ipv4: bool
+    has_ipv6: bool
+    has_import_prefix_filter: bool
+    has_import_prefix_deny_filter: bool
+    has_export_prefix_filter: bool
+
     def __init__(self) -> None:
         """Initialize object."""
 
@@ -922,6 +1159,8 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
         # Default to disabling passive mode
         self.passive = False
 
+        self.flat_table = None
+
         self.quarantine = False
 
         self.prefix_limit_action = BGPPeerImportPrefixLimitAction.RESTART
@@ -950,6 +1189,12 @@ class BGPPeerAttributes:  # pylint: disable=too-few-public-methods,too-many-inst
 
         self.use_rpki = False
 
+        self.has_ipv4 = False
+        self.has_ipv6 = False
+        self.has_import_prefix_filter = False
+        self.has_import_prefix_deny_filter = False
+        self.has_export_prefix_filter = False
+
     @property
     def name(self) -> str:
         """Return our name."""
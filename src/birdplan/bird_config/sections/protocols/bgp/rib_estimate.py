@@ -0,0 +1,249 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Estimate of the routes held in BGP peer import and export tables."""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import ProtocolBGP
+    from .peer import ProtocolBGPPeer
+
+__all__ = ["RIB_TABLE_SOURCES", "rib_prefix_count", "rib_route_count", "rib_table_estimate", "rib_table_estimate_summary"]
+
+
+# Peer types whose imported routes end up in each class of redistributed routes
+RIB_TABLE_SOURCES = {
+    "bgp_customer": ("customer",),
+    "bgp_peering": ("peer", "routeserver"),
+    "bgp_transit": ("transit",),
+}
+
+
+def _import_routes(peer: "ProtocolBGPPeer", ipv: str) -> int | None:
+    """Return the number of routes we expect to receive from a peer, or None if we have no idea."""
+
+    # A prefix limit is the most a peer can send us, PeeringDB limits take preference like they do in the configuration
+    for limit_type in ("peeringdb", "static"):
+        prefix_limit = peer.state.get("prefix_limit", {}).get(limit_type, {}).get(ipv)
+        if prefix_limit:
+            return int(prefix_limit)
+
+    # Failing that, the prefix lists tell us what a peer is allowed to send us
+    prefixes = peer.state.get("import_filter", {}).get("prefixes", {})
+    prefix_count = sum(len(prefixes.get(prefix_type, {}).get(ipv, [])) for prefix_type in ("static", "irr"))
+    if prefix_count:
+        return prefix_count
+
+    return None
+
+
+def _export_routes(peer: "ProtocolBGPPeer", imported: dict[str, dict[str, int | None]]) -> int | None:
+    """Return the number of routes we expect to send to a peer, or None if we have no idea."""
+
+    export_routes: dict[str, dict[str, int | None]] = {}
+    for redistribute, peer_types in RIB_TABLE_SOURCES.items():
+        if not getattr(peer.route_policy_redistribute, redistribute):
+            continue
+        for peer_type in peer_types:
+            # We don't send routes back to where they came from
+            export_routes[peer_type] = {
+                source_name: source_import_routes
+                for source_name, source_import_routes in imported[peer_type].items()
+                if source_name != peer.name
+            }
+
+    # Peers we send all paths to get a route from each source, the rest only get the best route for each prefix
+    if peer.add_paths in ("tx", "on"):
+        return rib_route_count(export_routes)
+    return rib_prefix_count(export_routes)
+
+
+def rib_route_count(routes: dict[str, dict[str, int | None]]) -> int | None:
+    """
+    Return the number of routes received from a number of peers.
+
+    Parameters
+    ----------
+    routes : Dict[str, Dict[str, Optional[int]]]
+        Number of routes received from each peer, keyed by peer type and then peer name.
+
+    Returns
+    -------
+    Optional[int]
+        Number of routes, or None if the number of routes for any of the peers is unknown.
+
+    """
+
+    route_counts = [count for peer_routes in routes.values() for count in peer_routes.values()]
+    if None in route_counts:
+        return None
+
+    return sum(count for count in route_counts if count is not None)
+
+
+def rib_prefix_count(routes: dict[str, dict[str, int | None]]) -> int | None:
+    """
+    Return the number of distinct prefixes in the routes received from a number of peers.
+
+    Routes from each customer are taken to be distinct. Transit providers are taken to each send the full table, which
+    covers the routes we get from peers and routeservers.
+
+    Parameters
+    ----------
+    routes : Dict[str, Dict[str, Optional[int]]]
+        Number of routes received from each peer, keyed by peer type and then peer name.
+
+    Returns
+    -------
+    Optional[int]
+        Number of prefixes, or None if the number of routes for any of the peers is unknown.
+
+    """
+
+    if rib_route_count(routes) is None:
+        return None
+
+    customer_routes = sum(count or 0 for count in routes.get("customer", {}).values())
+    peering_routes = sum(count or 0 for peer_type in ("peer", "routeserver") for count in routes.get(peer_type, {}).values())
+    transit_routes = max((count or 0 for count in routes.get("transit", {}).values()), default=0)
+
+    return customer_routes + max(peering_routes, transit_routes)
+
+
+def _table_counters() -> dict[str, int]:
+    """Return a new set of table counters."""
+    return {"kept": 0, "saved": 0, "unknown": 0}
+
+
+def rib_table_estimate(bgp: "ProtocolBGP", ipv: str) -> dict[str, Any]:
+    """
+    Estimate the number of route entries held in BGP peer import and export tables.
+
+    The estimate is based on the peer prefix limits and prefix lists in the state, so it must be called after the
+    configuration has been generated. Routes we export are estimated from the routes we import from the peer types being
+    redistributed, only counting the best route for each prefix unless we send all paths to the peer. Routes received from
+    internal peers are not taken into account.
+
+    Parameters
+    ----------
+    bgp : ProtocolBGP
+        BGP protocol.
+
+    ipv : str
+        IP version, either "ipv4" or "ipv6".
+
+    Returns
+    -------
+    Dict[str, Any]
+        Estimate of the table entries, "kept" entries are those held in tables we keep, "saved" entries those we would
+        hold if the tables we don't keep were kept and "unknown" the number of peers we could not estimate for.
+
+        eg.
+        {
+            'peers': {
+                'e1': {
+                    'import_table': True,
+                    'import_routes': 100,
+                    'export_table': True,
+                    'export_routes': 2000,
+                },
+            },
+            'peer_types': {
+                'customer': {
+                    'import_table': {'kept': 100, 'saved': 0, 'unknown': 0},
+                    'export_table': {'kept': 2000, 'saved': 0, 'unknown': 0},
+                },
+            },
+            'total': {
+                'import_table': {'kept': 100, 'saved': 0, 'unknown': 0},
+                'export_table': {'kept': 2000, 'saved': 0, 'unknown': 0},
+            },
+        }
+
+    """
+
+    # Only peers with a protocol for this IP version hold any routes
+    peers = [peer for peer in bgp.peers.values() if ipv in peer.state.get("protocols", {})]
+
+    # Work out what we import from each peer first, as this is what we export to others
+    imported: dict[str, dict[str, int | None]] = {peer_type: {} for source in RIB_TABLE_SOURCES.values() for peer_type in source}
+    import_routes = {peer.name: _import_routes(peer, ipv) for peer in peers}
+    for peer in peers:
+        if peer.peer_type in imported:
+            imported[peer.peer_type][peer.name] = import_routes[peer.name]
+
+    estimate: dict[str, Any] = {
+        "peers": {},
+        "peer_types": {},
+        "total": {"import_table": _table_counters(), "export_table": _table_counters()},
+    }
+
+    for peer in peers:
+        peer_estimate = {
+            "import_table": peer.import_table,
+            "import_routes": import_routes[peer.name],
+            "export_table": peer.export_table,
+            "export_routes": _export_routes(peer, imported),
+        }
+        estimate["peers"][peer.name] = peer_estimate
+
+        if peer.peer_type not in estimate["peer_types"]:
+            estimate["peer_types"][peer.peer_type] = {"import_table": _table_counters(), "export_table": _table_counters()}
+
+        # Add the peer to its peer type and the total
+        for table, routes in (("import_table", "import_routes"), ("export_table", "export_routes")):
+            for counters in (estimate["peer_types"][peer.peer_type][table], estimate["total"][table]):
+                if peer_estimate[routes] is None:
+                    counters["unknown"] += 1
+                elif peer_estimate[table]:
+                    counters["kept"] += peer_estimate[routes]
+                else:
+                    counters["saved"] += peer_estimate[routes]
+
+    return estimate
+
+
+def rib_table_estimate_summary(estimate: dict[str, Any]) -> list[str]:
+    """
+    Return a summary of a table estimate, one line per peer type and one for the total.
+
+    Parameters
+    ----------
+    estimate : Dict[str, Any]
+        Estimate as returned by rib_table_estimate().
+
+    Returns
+    -------
+    List[str]
+        Summary lines.
+
+    """
+
+    lines = []
+    for name, tables in [*sorted(estimate["peer_types"].items()), ("total", estimate["total"])]:
+        line = f"{name}:"
+        for table in ("import_table", "export_table"):
+            counters = tables[table]
+            line += f" {table} {counters['kept']} kept, {counters['saved']} saved"
+            if counters["unknown"]:
+                line += f" ({counters['unknown']} unknown)"
+            line += ";"
+        lines.append(line[:-1])
+
+    return lines
@@ -34,6 +34,8 @@ class OSPFAreaAttributes:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = ("_name",)
+
     _name: str | None
 
     def __init__(self) -> None:
@@ -49,6 +49,15 @@ class OSPFAreaInterfaceAttributes:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "_name",
+        "cost",
+        "ecmp_weight",
+        "hello",
+        "stub",
+        "wait",
+    )
+
     _name: str | None
 
     cost: int
@@ -32,6 +32,8 @@ class OSPFRoutePolicyAccept:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = ("default",)
+
     default: bool
 
     def __init__(self) -> None:
@@ -59,6 +61,14 @@ class OSPFRoutePolicyRedistribute:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "connected",
+        "kernel",
+        "kernel_default",
+        "static",
+        "static_default",
+    )
+
     connected: bool | list[str]
     kernel: bool
     kernel_default: bool
@@ -87,6 +97,11 @@ class OSPFAttributes:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "route_policy_accept",
+        "route_policy_redistribute",
+    )
+
     route_policy_accept: OSPFRoutePolicyAccept
     route_policy_redistribute: OSPFRoutePolicyRedistribute
 
@@ -32,6 +32,8 @@ class RIPRoutePolicyAccept:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = ("default",)
+
     default: bool
 
     def __init__(self) -> None:
@@ -63,6 +65,16 @@ class RIPRoutePolicyRedistribute:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "connected",
+        "kernel",
+        "kernel_default",
+        "rip",
+        "rip_default",
+        "static",
+        "static_default",
+    )
+
     connected: bool | list[str]
     kernel: bool
     kernel_default: bool
@@ -95,6 +107,11 @@ class RIPAttributes:  # pylint: disable=too-few-public-methods
 
     """
 
+    __slots__ = (
+        "route_policy_accept",
+        "route_policy_redistribute",
+    )
+
     route_policy_accept: RIPRoutePolicyAccept
     route_policy_redistribute: RIPRoutePolicyRedistribute
 
@@ -0,0 +1,242 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Streaming BIRD control socket route reader."""
+
+import re
+import socket
+from collections.abc import Iterator
+from typing import Any
+
+from .exceptions import BirdPlanError
+
+__all__ = ["BirdRouteStream"]
+
+
+# Default BIRD control socket
+BIRD_CONTROL_SOCKET = "/run/bird/bird.ctl"
+
+# Route as returned by the stream
+BirdRoute = dict[str, Any]
+
+# Reply codes we use from the BIRD control socket
+BIRD_REPLY_OK = "0000"
+BIRD_REPLY_WELCOME = "0001"
+BIRD_REPLY_ROUTE = "1007"
+BIRD_REPLY_ROUTE_TYPE = "1008"
+BIRD_REPLY_ROUTE_ATTRIBUTES = "1012"
+
+# Route lines look like the below, alternative routes for the same prefix have the prefix column blank
+#   10.0.0.0/24          unicast [bgp4_AS65001_e1 2024-01-01 from 192.0.2.1] * (100) [AS65001i]
+ROUTE_LINE_REGEX = re.compile(
+    r"^(?P<prefix>\S+)?\s+(?P<type>\S+)\s+"
+    r"\[(?P<protocol>\S+)\s+(?P<since>[^\]]*?)(?:\s+from\s+(?P<from>\S+))?\]\s+"
+    r"(?P<primary>\*\s+)?\((?P<preference>\d+)(?:/(?P<metric>[^)]*))?\)"
+    r"(?:\s+\[(?P<info>[^\]]*)\])?"
+)
+
+
+class BirdRouteStream:
+    """
+    Streaming reader for routes from the BIRD control socket.
+
+    Replies are parsed line by line as they arrive and routes are yielded as soon as they are complete, so the memory used
+    does not depend on the size of the table being dumped.
+
+    """
+
+    _bird_socket: str
+
+    def __init__(self, bird_socket: str | None = None) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        bird_socket : Optional[str]
+            BIRD control socket path, defaults to "/run/bird/bird.ctl".
+
+        """
+
+        self._bird_socket = bird_socket or BIRD_CONTROL_SOCKET
+
+    def routes(  # noqa: C901,PLR0912
+        self,
+        table: str,
+        filtered: bool = False,  # noqa: FBT001,FBT002
+        protocol: str | None = None,
+    ) -> Iterator[BirdRoute]:
+        """
+        Stream the routes in a BIRD table.
+
+        Parameters
+        ----------
+        table : str
+            BIRD table name.
+
+        filtered : bool
+            Return the routes rejected by the import filter instead of those accepted.
+
+        protocol : Optional[str]
+            Only return the routes from this protocol.
+
+        Returns
+        -------
+        Iterator[BirdRoute]
+            Iterator of routes, eg.
+            {
+                'table': 't_bgp4_AS65001_e1_peer',
+                'prefix': '100.64.101.0/24',
+                'type': 'unicast',
+                'protocol': 'bgp4_AS65001_e1',
+                'since': '2024-01-01',
+                'from': None,
+                'primary': True,
+                'preference': 100,
+                'info': 'AS65001i',
+                'nexthops': ['via 100.64.0.2 on eth0'],
+                'route_type': 'BGP univ',
+                'attributes': {
+                    'BGP.origin': 'IGP',
+                    ...
+                },
+            }
+
+        """
+
+        query = f"show route table {table}"
+        if protocol:
+            query += f" protocol {protocol}"
+        if filtered:
+            query += " filtered"
+        query += " all"
+
+        route: BirdRoute | None = None
+        prefix: str | None = None
+        attribute: str | None = None
+
+        for code, text in self.query(query):
+            # Route line, which starts a new route
+            if code == BIRD_REPLY_ROUTE and not text.startswith("\t"):
+                # Skip the table header BIRD outputs before the routes
+                if text.startswith("Table ") and text.endswith(":"):
+                    continue
+                match = ROUTE_LINE_REGEX.match(text)
+                if not match:
+                    raise BirdPlanError(f"Failed to parse BIRD route line: {text}")
+                if route:
+                    yield route
+                # Alternative routes for the same prefix have it blank, so carry it forward
+                if match.group("prefix"):
+                    prefix = match.group("prefix")
+                route = {
+                    "table": table,
+                    "prefix": prefix,
+                    "type": match.group("type"),
+                    "protocol": match.group("protocol"),
+                    "since": match.group("since"),
+                    "from": match.group("from"),
+                    "primary": match.group("primary") is not None,
+                    "preference": int(match.group("preference")),
+                    "info": match.group("info"),
+                    "nexthops": [],
+                    "route_type": None,
+                    "attributes": {},
+                }
+                attribute = None
+                continue
+
+            # Anything else belongs to the current route
+            if not route:
+                continue
+            line = text.strip()
+            if code == BIRD_REPLY_ROUTE:
+                route["nexthops"].append(line)
+            elif code == BIRD_REPLY_ROUTE_TYPE and line.startswith("Type:"):
+                route["route_type"] = line[5:].strip()
+            elif code == BIRD_REPLY_ROUTE_ATTRIBUTES:
+                # Attributes are in the format of "name: value", values that are too long are continued on the next line
+                name, sep, value = line.partition(": ")
+                if sep and " " not in name:
+                    attribute = name
+                    route["attributes"][attribute] = value
+                elif attribute:
+                    route["attributes"][attribute] += f" {line}"
+
+        if route:
+            yield route
+
+    def query(self, query: str) -> Iterator[tuple[str, str]]:
+        """
+        Send a query to the BIRD control socket and stream the reply.
+
+        Parameters
+        ----------
+        query : str
+            Query to send to BIRD.
+
+        Returns
+        -------
+        Iterator[tuple[str, str]]
+            Iterator of the reply code and text for each line, continuation lines are returned with the code of the line
+            they continue.
+
+        """
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self._bird_socket)
+        except OSError as err:
+            sock.close()
+            raise BirdPlanError(f"Failed to connect to BIRD control socket '{self._bird_socket}': {err}") from None
+
+        with sock, sock.makefile("rb") as reply:
+            # Wait for BIRD to say hello before we send our query
+            for code, _ in self._read_reply(reply):
+                if code != BIRD_REPLY_WELCOME:
+                    raise BirdPlanError(f"Unexpected welcome from BIRD control socket '{self._bird_socket}'")
+
+            sock.sendall(f"{query}\n".encode())
+
+            yield from self._read_reply(reply)
+
+    def _read_reply(self, reply: Any) -> Iterator[tuple[str, str]]:  # noqa: ANN401
+        """Read a single reply from the BIRD control socket."""
+
+        code = ""
+        for raw_line in reply:
+            line = raw_line.decode("UTF-8", errors="replace").rstrip("\r\n")
+            # Continuation lines start with a space and belong to the last code we saw
+            if line.startswith(" "):
+                yield code, line[1:]
+                continue
+            # Check we have a properly formatted line
+            if len(line) < 5 or not line[:4].isdigit() or line[4] not in "- ":  # noqa: PLR2004
+                raise BirdPlanError(f"Invalid reply from BIRD control socket: {line}")
+            code = line[:4]
+            # Codes starting with 8 and 9 are errors
+            if code[0] in "89":
+                raise BirdPlanError(f"BIRD control socket returned an error: {line[5:]}")
+            # The final line of a reply has a space after the code
+            if line[4] == " ":
+                if code not in (BIRD_REPLY_OK, BIRD_REPLY_WELCOME) or line[5:]:
+                    yield code, line[5:]
+                return
+            yield code, line[5:]
+
+        raise BirdPlanError(f"Connection to BIRD control socket '{self._bird_socket}' closed unexpectedly")
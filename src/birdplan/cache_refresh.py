@@ -0,0 +1,426 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan refresh of cached IRR and PeeringDB information."""
+
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from .bgpq3 import BGPQ3
+from .bird_config.sections.protocols.bgp.peer.change_guards import (
+    check_irr_network_count,
+    check_irr_prefix_changes,
+    check_peeringdb_prefix_limit,
+)
+from .exceptions import BirdPlanError
+from .peeringdb import PeeringDB
+from .prefix_set import PrefixSet
+
+if TYPE_CHECKING:
+    from .bird_config import BirdConfig
+
+__all__ = ["CACHE_SOURCES", "CacheRefresh", "CacheRefreshJob", "cache_refresh_jobs"]
+
+
+# Sources of cached information
+CACHE_SOURCES = ("irr", "peeringdb")
+
+# Cache refresh job for a single peer
+CacheRefreshJob = dict[str, Any]
+
+
+def cache_refresh_jobs(birdconf: "BirdConfig", state: dict[str, Any]) -> list[CacheRefreshJob]:
+    """
+    Return the cache refresh jobs for the peers that use IRR or PeeringDB information.
+
+    Peers which are not in the state yet are skipped, their information is retrieved the first time they are configured.
+
+    Parameters
+    ----------
+    birdconf : BirdConfig
+        BIRD configuration, with the plan loaded.
+
+    state : Dict[str, Any]
+        BirdPlan state.
+
+    Returns
+    -------
+    List[CacheRefreshJob]
+        Cache refresh jobs, sorted by peer name.
+
+        eg.
+        [
+            {
+                'peer': 'c1',
+                'type': 'customer',
+                'asn': 65001,
+                'as_sets': ['AS-C1'],
+                'peeringdb': ['ipv4', 'ipv6'],
+                'irr_change_limits': {'removed': '10%'},
+            },
+        ]
+
+    """
+
+    peers_state = state.get("bgp", {}).get("peers", {})
+
+    jobs = []
+    for peer_name, peer in sorted(birdconf.protocols.bgp.peers.items()):
+        as_sets = peer.import_filter_policy.as_sets
+        job = {
+            "peer": peer_name,
+            "type": peer.peer_type,
+            "asn": peer.asn,
+            "as_sets": [as_sets] if isinstance(as_sets, str) else list(as_sets or []),
+            "peeringdb": peer.peeringdb_prefix_limits,
+            "irr_change_limits": birdconf.protocols.bgp.irr_change_limits,
+        }
+        if not job["as_sets"] and not job["peeringdb"]:
+            continue
+        if peer_name not in peers_state:
+            logging.info("Skipping cache refresh for BGP peer '%s' as it has not been configured yet", peer_name)
+            continue
+        jobs.append(job)
+
+    return jobs
+
+
+class _SourceBackoff:
+    """Exponential backoff for a source of information, shared between all workers."""
+
+    _lock: threading.Lock
+    _failures: int
+    _retry_after: float
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._retry_after = 0.0
+
+    def wait(self) -> None:
+        """Wait until the source may be queried again."""
+
+        with self._lock:
+            delay = self._retry_after - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def failed(self, backoff: float, max_backoff: float) -> None:
+        """Back off after a failed query."""
+
+        with self._lock:
+            self._failures += 1
+            self._retry_after = time.monotonic() + min(backoff * 2 ** (self._failures - 1), max_backoff)
+
+    def succeeded(self) -> None:
+        """Reset the backoff after a successful query."""
+
+        with self._lock:
+            self._failures = 0
+
+
+class CacheRefresh:  # pylint: disable=too-many-instance-attributes
+    """
+    Refresh of the IRR and PeeringDB information cached in the state.
+
+    The information is retrieved by a limited number of workers, each peer is started after a random delay so the lookups
+    are spread out. When a lookup fails, all lookups to that source back off exponentially before being retried, the other
+    source is not held up.
+
+    """
+
+    _concurrency: int
+    _jitter: float
+    _retries: int
+    _backoff: float
+    _max_backoff: float
+    _bgpq3: BGPQ3
+    _peeringdb: PeeringDB
+    _peeringdb_lock: threading.Lock
+    _source_backoff: dict[str, _SourceBackoff]
+
+    def __init__(  # noqa: PLR0913
+        self,
+        concurrency: int = 4,
+        jitter: float = 0.0,
+        retries: int = 3,
+        backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        *,
+        bgpq3: BGPQ3 | None = None,
+        peeringdb: PeeringDB | None = None,
+    ) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        concurrency : int
+            Maximum number of peers to refresh at the same time.
+
+        jitter : float
+            Maximum number of seconds to randomly delay each peer by.
+
+        retries : int
+            Number of times to retry a failed lookup.
+
+        backoff : float
+            Number of seconds to back off a source after its first failure, doubling after each failure that follows.
+
+        max_backoff : float
+            Maximum number of seconds to back off a source.
+
+        bgpq3 : Optional[BGPQ3]
+            Optional IRR lookup object to use.
+
+        peeringdb : Optional[PeeringDB]
+            Optional PeeringDB lookup object to use.
+
+        """
+
+        if concurrency < 1:
+            raise BirdPlanError("Cache refresh concurrency must be at least 1")
+        if jitter < 0:
+            raise BirdPlanError("Cache refresh jitter cannot be negative")
+        if retries < 0:
+            raise BirdPlanError("Cache refresh retries cannot be negative")
+
+        self._concurrency = concurrency
+        self._jitter = jitter
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._bgpq3 = bgpq3 or BGPQ3()
+        self._peeringdb = peeringdb or PeeringDB()
+        # PeeringDB lookups keep track of the time of the last request to rate limit themselves, so they're made one at a time
+        self._peeringdb_lock = threading.Lock()
+        self._source_backoff = {source: _SourceBackoff() for source in CACHE_SOURCES}
+
+    def run(
+        self,
+        jobs: list[CacheRefreshJob],
+        state: dict[str, Any],
+        ignore_irr_changes: bool = False,  # noqa: FBT001,FBT002
+        ignore_peeringdb_changes: bool = False,  # noqa: FBT001,FBT002
+    ) -> dict[str, Any]:
+        """
+        Run cache refresh jobs, updating the state with the information retrieved.
+
+        The information retrieved is subject to the same checks for substantial changes as when configuring. A source that
+        fails for a peer leaves the cached information for that source as is, without holding up the other source or peers.
+
+        Parameters
+        ----------
+        jobs : List[CacheRefreshJob]
+            Cache refresh jobs, as returned by cache_refresh_jobs().
+
+        state : Dict[str, Any]
+            BirdPlan state to update.
+
+        ignore_irr_changes : bool
+            Ignore substantial changes in the IRR network counts.
+
+        ignore_peeringdb_changes : bool
+            Ignore substantial changes in the PeeringDB prefix limits.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Sources refreshed for each peer and the state items updated, along with any errors and the total number of seconds
+            the refresh took.
+
+            eg.
+            {
+                'peers': {
+                    'c1': {
+                        'refreshed': ['irr'],
+                        'errors': {'peeringdb': 'PeeringDB request timed out: ...'},
+                        'updated': [['bgp', 'peers', 'c1', 'import_filter', 'origin_asns', 'irr'], ...],
+                        'irr_changes': {'ipv4': {'added': 2, 'removed': 1, 'covered': 0}},
+                    },
+                },
+                'seconds': 12.5,
+            }
+
+        """
+
+        started = time.monotonic()
+        results: dict[str, dict[str, Any]] = {}
+        peers_state = state.setdefault("bgp", {}).setdefault("peers", {})
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="birdplan-cache") as executor:
+            futures = {
+                executor.submit(
+                    self._run_job, job, peers_state.get(job["peer"], {}), ignore_irr_changes, ignore_peeringdb_changes
+                ): job
+                for job in jobs
+            }
+            for count, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                job = futures[future]
+                result, updates = future.result()
+                # Only the main thread updates the state
+                for path, value in updates:
+                    parent = peers_state.setdefault(job["peer"], {})
+                    for key in path[:-1]:
+                        parent = parent.setdefault(key, {})
+                    # A value of None removes the item
+                    if value is None:
+                        parent.pop(path[-1], None)
+                    else:
+                        parent[path[-1]] = value
+                    result["updated"].append(["bgp", "peers", job["peer"], *path])
+                results[job["peer"]] = result
+                for source, error in result["errors"].items():
+                    logging.warning("Failed to refresh %s information for BGP peer '%s': %s", source, job["peer"], error)
+                logging.info("Refreshed cached information for BGP peer '%s' (%s/%s)", job["peer"], count, len(jobs))
+
+        return {"peers": {job["peer"]: results[job["peer"]] for job in jobs}, "seconds": time.monotonic() - started}
+
+    def _run_job(
+        self,
+        job: CacheRefreshJob,
+        peer_state: dict[str, Any],
+        ignore_irr_changes: bool,  # noqa: FBT001
+        ignore_peeringdb_changes: bool,  # noqa: FBT001
+    ) -> tuple[dict[str, Any], list[tuple[list[str], Any]]]:
+        """Refresh the cached information of a single peer, returning the result and the state items to update."""
+
+        result: dict[str, Any] = {"refreshed": [], "errors": {}, "updated": [], "irr_changes": {}}
+        updates: list[tuple[list[str], Any]] = []
+
+        # Spread the lookups out
+        if self._jitter:
+            time.sleep(random.uniform(0, self._jitter))  # noqa: S311
+
+        if job["peeringdb"]:
+            try:
+                updates.extend(self._refresh_peeringdb(job, peer_state, ignore_peeringdb_changes))
+                result["refreshed"].append("peeringdb")
+            except BirdPlanError as err:
+                result["errors"]["peeringdb"] = f"{err}"
+
+        if job["as_sets"]:
+            try:
+                irr_updates, result["irr_changes"] = self._refresh_irr(job, peer_state, ignore_irr_changes)
+                updates.extend(irr_updates)
+                result["refreshed"].append("irr")
+            except BirdPlanError as err:
+                result["errors"]["irr"] = f"{err}"
+
+        return result, updates
+
+    def _refresh_peeringdb(
+        self,
+        job: CacheRefreshJob,
+        peer_state: dict[str, Any],
+        ignore_changes: bool,  # noqa: FBT001
+    ) -> list[tuple[list[str], Any]]:
+        """Retrieve the PeeringDB prefix limits of a peer."""
+
+        with self._peeringdb_lock:
+            peeringdb_info = self._lookup("peeringdb", self._peeringdb.get_prefix_limits, job["asn"])
+
+        # Make sure we got limits back from PeeringDB, the same as when configuring
+        for ipv in ("4", "6"):
+            if not peeringdb_info[f"info_prefixes{ipv}"]:
+                raise BirdPlanError(f"No IPv{ipv} PeeringDB information found for peer '{job['peer']}' with type '{job['type']}'")
+
+        # Check all the limits before updating any of them
+        cached_limits = peer_state.get("prefix_limit", {}).get("peeringdb", {})
+        for ipv in job["peeringdb"]:
+            if not ignore_changes and ipv in cached_limits:
+                check_peeringdb_prefix_limit(
+                    job["peer"], job["type"], ipv[3:], cached_limits[ipv], peeringdb_info[f"info_prefixes{ipv[3:]}"]
+                )
+
+        return [(["prefix_limit", "peeringdb", ipv], peeringdb_info[f"info_prefixes{ipv[3:]}"]) for ipv in job["peeringdb"]]
+
+    def _refresh_irr(
+        self,
+        job: CacheRefreshJob,
+        peer_state: dict[str, Any],
+        ignore_changes: bool,  # noqa: FBT001
+    ) -> tuple[list[tuple[list[str], Any]], dict[str, dict[str, int]]]:
+        """
+        Retrieve the IRR origin ASNs and prefixes of a peer, returning the state items to update and the prefix changes.
+
+        Families which no longer have any prefixes are returned with a value of None, so their cached prefixes are removed.
+
+        """
+
+        irr_asns = self._lookup("irr", self._bgpq3.get_asns, job["as_sets"])
+        # Make sure we got IRR ASNs back, the same as when configuring
+        if not irr_asns:
+            raise BirdPlanError(f"No IRR ASNs found for peer '{job['peer']}' with type '{job['type']}'")
+
+        irr_prefixes: dict[str, PrefixSet] = self._lookup("irr", self._bgpq3.get_prefixes, job["as_sets"])
+        # Make sure we got IRR prefixes back, the same as when configuring
+        if not irr_prefixes.get("ipv4") and not irr_prefixes.get("ipv6"):
+            raise BirdPlanError(f"No IRR prefixes found for peer '{job['peer']}' with type '{job['type']}'")
+
+        updates: list[tuple[list[str], Any]] = [(["import_filter", "origin_asns", "irr"], irr_asns)]
+
+        # Check all the network counts and prefix changes before updating any of them
+        cached_prefixes = peer_state.get("import_filter", {}).get("prefixes", {}).get("irr", {})
+        changes: dict[str, dict[str, int]] = {}
+        for ipv in ("ipv4", "ipv6"):
+            prefixes = irr_prefixes.get(ipv)
+            # Families without prefixes are not cached when configuring either, so remove the prefixes we had cached
+            if not prefixes:
+                if ipv in cached_prefixes:
+                    updates.append((["import_filter", "prefixes", "irr", ipv], None))
+                continue
+            if not ignore_changes and ipv in cached_prefixes:
+                previous_prefixes = PrefixSet(cached_prefixes[ipv])
+                check_irr_network_count(
+                    job["peer"], job["type"], ipv[3:], previous_prefixes.network_count(), prefixes.network_count()
+                )
+                changes[ipv] = check_irr_prefix_changes(
+                    job["peer"], job["type"], ipv[3:], previous_prefixes, prefixes, job["irr_change_limits"]
+                )
+            updates.append((["import_filter", "prefixes", "irr", ipv], prefixes.family(ipv[3:]).sorted().to_list()))
+
+        return updates, changes
+
+    def _lookup(self, source: str, lookup: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        """Run a lookup against a source, retrying with backoff if it fails."""
+
+        source_backoff = self._source_backoff[source]
+
+        attempt = 0
+        while True:
+            source_backoff.wait()
+            try:
+                value = lookup(*args)
+            except BirdPlanError:
+                # Back off all lookups to this source, not just our own
+                source_backoff.failed(self._backoff, self._max_backoff)
+                attempt += 1
+                if attempt > self._retries:
+                    raise
+                continue
+            source_backoff.succeeded()
+            return value
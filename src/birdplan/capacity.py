@@ -0,0 +1,218 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan capacity planning."""
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from .bird_config import util
+from .bird_config.sections.protocols.bgp.rib_estimate import rib_prefix_count, rib_table_estimate
+
+if TYPE_CHECKING:
+    from .bird_config import BirdConfig
+    from .bird_config.sections.protocols.bgp.peer import ProtocolBGPPeer
+
+__all__ = ["CAPACITY_BYTES", "capacity_estimate", "capacity_estimate_summary"]
+
+
+# Approximate number of bytes BIRD uses for each object, these are rough figures for BIRD 2 on 64-bit platforms
+CAPACITY_BYTES = {
+    # BIRD process with an empty configuration
+    "base": 16 * 1024 * 1024,
+    # Route entry in a table, import table or export table, including its share of the network entry
+    "route": 160,
+    # Attributes of a route received from a peer, these are shared with the tables the route is piped to
+    "attributes": 128,
+    # Prefix set entry
+    "prefix_set": 48,
+    # ASN set entry
+    "asn_set": 16,
+}
+
+# Match the start of a set definition
+_DEFINE_REGEX = re.compile(r"^define (?P<name>\S+) = \[$")
+
+
+def _filter_sets(peer: "ProtocolBGPPeer") -> dict[str, int]:
+    """Return the number of entries in the prefix and ASN sets defined for a peer."""
+
+    filter_sets = {"ipv4": 0, "ipv6": 0, "asns": 0}
+
+    set_type = None
+    for line in peer.conf.lines:
+        # Check if this is the start of a set we count
+        if match := _DEFINE_REGEX.match(line):
+            name = match.group("name")
+            if name.startswith("bgp4_"):
+                set_type = "ipv4"
+            elif name.startswith("bgp6_"):
+                set_type = "ipv6"
+            elif name.endswith(("_asns_import", "_asns_deny_import", "_asns_export")):
+                set_type = "asns"
+            continue
+        if set_type is None:
+            continue
+        # Count each entry until the end of the set, comments are not entries
+        if line == "];":
+            set_type = None
+        elif not line.lstrip().startswith("#"):
+            filter_sets[set_type] += 1
+
+    return filter_sets
+
+
+def _capacity_estimate_ipv(birdconf: "BirdConfig", ipv: str) -> dict[str, Any]:
+    """Return the capacity estimate for an IP version."""
+
+    bgp = birdconf.protocols.bgp
+    ipv_num = ipv[-1]
+
+    rib_estimate = rib_table_estimate(bgp, ipv)
+    peers = [peer for peer in bgp.peers.values() if peer.name in rib_estimate["peers"]]
+
+    # The main BGP table holds every route we import, the master table only the best route for each prefix
+    imported: dict[str, dict[str, int | None]] = {}
+    for peer in peers:
+        import_routes = rib_estimate["peers"][peer.name]["import_routes"]
+        if import_routes is not None:
+            imported.setdefault(peer.peer_type, {})[peer.name] = import_routes
+    bgp_routes = sum(count or 0 for peer_routes in imported.values() for count in peer_routes.values())
+    best_routes = rib_prefix_count(imported) or 0
+
+    tables = {f"t_bgp{ipv_num}": bgp_routes, f"master{ipv_num}": best_routes}
+    if birdconf.tables.master.route_policy_export.kernel.bgp:
+        tables[f"t_kernel{ipv_num}"] = best_routes
+
+    # Peer tables hold what we import from the peer and what we may export to it
+    for peer in peers:
+        if peer.flat_table:
+            continue
+        peer_estimate = rib_estimate["peers"][peer.name]
+        tables[peer.bgp_table_name(ipv_num)] = (peer_estimate["import_routes"] or 0) + (peer_estimate["export_routes"] or 0)
+
+    # Work out the filter set sizes and how many networks the IRR prefixes cover
+    prefix_sets = 0
+    irr_networks = 0
+    for peer in peers:
+        prefix_sets += _filter_sets(peer)[ipv]
+        irr_prefixes = peer.state.get("import_filter", {}).get("prefixes", {}).get("irr", {}).get(ipv, [])
+        irr_networks += util.network_count(irr_prefixes)
+
+    adj_rib_in = rib_estimate["total"]["import_table"]["kept"]
+    adj_rib_out = rib_estimate["total"]["export_table"]["kept"]
+
+    return {
+        "tables": tables,
+        "adj_rib_in": adj_rib_in,
+        "adj_rib_out": adj_rib_out,
+        "routes": sum(tables.values()) + adj_rib_in + adj_rib_out,
+        "unknown": sorted({name for name, peer_estimate in rib_estimate["peers"].items() if None in peer_estimate.values()}),
+        "prefix_sets": prefix_sets,
+        "irr_networks": irr_networks,
+    }
+
+
+def capacity_estimate(birdconf: "BirdConfig") -> dict[str, Any]:
+    """
+    Estimate the number of routes BIRD will hold and how much memory it will need.
+
+    The estimate is based on the BGP peer table estimate, so it must be called after the configuration has been generated. Peers
+    we cannot estimate the routes for are listed as unknown and do not count towards the totals.
+
+    Parameters
+    ----------
+    birdconf : BirdConfig
+        BIRD configuration.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Estimate of the routes in each table, the route entries in import and export tables, the total route entries, the filter
+        set sizes and the approximate BIRD RSS in bytes.
+
+        eg.
+        {
+            'ipv4': {
+                'tables': {'t_bgp4': 1000100, 'master4': 1000100, 't_kernel4': 1000100, 't_bgp4_AS65001_c1_peer': 1000100},
+                'adj_rib_in': 1000100,
+                'adj_rib_out': 1000100,
+                'routes': 6000600,
+                'unknown': ['i1'],
+                'prefix_sets': 10,
+                'irr_networks': 12,
+            },
+            'ipv6': {...},
+            'asn_sets': 20,
+            'routes': 6000600,
+            'rss': 1000000000,
+        }
+
+    """
+
+    estimate: dict[str, Any] = {ipv: _capacity_estimate_ipv(birdconf, ipv) for ipv in ("ipv4", "ipv6")}
+    estimate["asn_sets"] = sum(_filter_sets(peer)["asns"] for peer in birdconf.protocols.bgp.peers.values())
+    estimate["routes"] = estimate["ipv4"]["routes"] + estimate["ipv6"]["routes"]
+
+    # Attributes are only stored once for each route we receive, no matter how many tables it ends up in
+    received_routes = sum(estimate[ipv]["tables"][f"t_bgp{ipv[-1]}"] for ipv in ("ipv4", "ipv6"))
+    prefix_sets = estimate["ipv4"]["prefix_sets"] + estimate["ipv6"]["prefix_sets"]
+    estimate["rss"] = (
+        CAPACITY_BYTES["base"]
+        + estimate["routes"] * CAPACITY_BYTES["route"]
+        + received_routes * CAPACITY_BYTES["attributes"]
+        + prefix_sets * CAPACITY_BYTES["prefix_set"]
+        + estimate["asn_sets"] * CAPACITY_BYTES["asn_set"]
+    )
+
+    return estimate
+
+
+def capacity_estimate_summary(estimate: dict[str, Any]) -> list[str]:
+    """
+    Return a summary of a capacity estimate.
+
+    Parameters
+    ----------
+    estimate : Dict[str, Any]
+        Estimate as returned by capacity_estimate().
+
+    Returns
+    -------
+    List[str]
+        Summary lines.
+
+    """
+
+    lines = []
+    for ipv in ("ipv4", "ipv6"):
+        ipv_estimate = estimate[ipv]
+        lines.append(f"{ipv}:")
+        for table, routes in sorted(ipv_estimate["tables"].items()):
+            lines.append(f"  table {table}: {routes} routes")
+        lines.append(f"  import tables: {ipv_estimate['adj_rib_in']} routes")
+        lines.append(f"  export tables: {ipv_estimate['adj_rib_out']} routes")
+        lines.append(f"  prefix sets: {ipv_estimate['prefix_sets']} entries ({ipv_estimate['irr_networks']} IRR networks)")
+        if ipv_estimate["unknown"]:
+            lines.append(f"  unknown peers: {', '.join(ipv_estimate['unknown'])}")
+    lines.append(f"ASN sets: {estimate['asn_sets']} entries")
+    lines.append(f"Route entries: {estimate['routes']}")
+    lines.append(f"Approximate BIRD RSS: {estimate['rss'] / 1024 / 1024:.1f} MiB")
+
+    return lines
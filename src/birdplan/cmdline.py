@@ -19,12 +19,15 @@
 """BirdPlan commandline interface."""
 
 import argparse
+import contextlib
 import copy
+import grp
 import json
 import logging
 import logging.handlers
 import os
 import pathlib
+import pwd
 import sys
 from collections.abc import Callable
 from typing import Any, ClassVar, Literal, NoReturn
@@ -35,7 +38,14 @@ from .exceptions import BirdPlanError, BirdPlanUsageError
 from .plugin import PluginCollection
 from .version import __version__
 
-__all__ = ["BirdPlanArgumentParser", "BirdPlanCommandLine", "ColorFormatter"]
+__all__ = [
+    "BirdPlanArgumentParser",
+    "BirdPlanCommandLine",
+    "ColorFormatter",
+    "parse_only_asn",
+    "write_config_file",
+    "write_monitor_file",
+]
 
 
 # Defaults
@@ -49,6 +59,121 @@ BIRDPLAN_MONITOR_FILE = "/var/lib/birdplan/monitor.json"
 TRACE_LOG_LEVEL = 5
 
 
+def write_config_file(filename: str, data: str) -> None:
+    """
+    Write out BIRD configuration file with data.
+
+    Parameters
+    ----------
+    filename : str
+        BIRD configuration file name.
+
+    data : str
+        BIRD configuration.
+
+    """
+
+    # Get birdplan user id
+    try:
+        birdplan_uid = pwd.getpwnam("birdplan").pw_uid
+    except KeyError:
+        birdplan_uid = -1
+
+    # Get bird group id
+    try:
+        bird_gid = grp.getgrnam("bird").gr_gid
+    except KeyError:
+        bird_gid = None
+
+    # Write out config file
+    try:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+        # If we have a bird group, set it
+        if bird_gid:
+            os.fchown(fd, birdplan_uid, bird_gid)
+        # Write out config
+        with os.fdopen(fd, "w") as config_file:
+            config_file.write(data)
+    except OSError as err:  # pragma: no cover
+        raise BirdPlanError(f"Failed to open '{filename}' for writing: {err}") from None
+
+
+def parse_only_asn(only: str) -> int | None:
+    """
+    Parse the ASN from an --only option.
+
+    Parameters
+    ----------
+    only : str
+        Option value, either AS<NUMBER> or a peer name.
+
+    Returns
+    -------
+    Optional[int]
+        ASN if the option value is in the format of AS<NUMBER>, otherwise None.
+
+    """
+
+    if only[0:2] != "AS":
+        return None
+    if not only[2:].isdigit() or int(only[2:]) < 1:
+        raise BirdPlanUsageError(f"Invalid value '{only}' for --only, must be AS<NUMBER>")
+
+    return int(only[2:])
+
+
+def write_monitor_file(filename: pathlib.Path, data: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Write out monitor file with data, if it changed.
+
+    The file is written to a temporary file and renamed over the previous one, so readers never see a partial file.
+
+    Parameters
+    ----------
+    filename : pathlib.Path
+        Monitor file name.
+
+    data : Dict[str, Any]
+        Monitor data.
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        Previous monitor data if we had any.
+
+    """
+
+    monitor_json = json.dumps(data, indent=4, sort_keys=True)
+
+    # Grab the previous snapshot
+    previous_json = None
+    with contextlib.suppress(FileNotFoundError):
+        previous_json = filename.read_text(encoding="UTF-8")
+    previous_data = None
+    if previous_json:
+        with contextlib.suppress(json.JSONDecodeError):
+            previous_data = json.loads(previous_json)
+
+    # If nothing changed, there is nothing to write
+    if monitor_json == previous_json:
+        logging.debug("Monitor file '%s' unchanged", filename)
+        return previous_data
+
+    # Write out the monitor file atomically
+    tmp_filename = filename.with_name(f".{filename.name}.tmp")
+    try:
+        fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with os.fdopen(fd, "w", encoding="UTF-8") as monitor_file:
+            # Write out data json
+            logging.debug("Writing monitor file '%s'", filename)
+            monitor_file.write(monitor_json)
+        tmp_filename.replace(filename)
+    except OSError as err:  # pragma: no cover
+        raise BirdPlanError(f"Failed to open '{filename}' for writing: {err}") from None
+
+    return previous_data
+
+
 class ColorFormatter(logging.Formatter):
     """
     A custom log formatter class that.
@@ -289,7 +414,7 @@ class BirdPlanCommandLine:
             nargs=1,
             metavar="BIRDPLAN_FILE",
             default=[BIRDPLAN_FILE],
-            help=f"BirdPlan file to process (default: {BIRDPLAN_FILE})",
+            help=f"BirdPlan file or sharded plan directory to process (default: {BIRDPLAN_FILE})",
         )
         optional_group.add_argument(
             "-s",
@@ -362,6 +487,9 @@ class BirdPlanCommandLine:
         use_cached : bool
             Optional parameter to use cached values from state during configuration load.
 
+        workers : int
+            Optional number of worker processes to use when constructing and rendering BGP peers.
+
         """
 
         # Set the state file
@@ -375,6 +503,75 @@ class BirdPlanCommandLine:
             **kwargs,
         )
 
+    def birdplan_validate_config(self) -> None:
+        """Validate BirdPlan configuration."""
+
+        # Set the state file
+        state_file: str = self.args.birdplan_state_file[0] or BIRDPLAN_STATE_FILE
+
+        # Try validate configuration
+        self.birdplan.validate(
+            plan_file=self.args.birdplan_file[0],
+            state_file=state_file,
+        )
+
+    def birdplan_configure_overrides(self, config_file: str) -> str:
+        """
+        Apply BGP peer graceful shutdown and quarantine overrides to a BIRD configuration file.
+
+        Parameters
+        ----------
+        config_file : str
+            BIRD configuration file previously generated, which is updated with the overrides.
+
+        Returns
+        -------
+        str
+            Summary of the changes made.
+
+        """
+
+        # Read the previously generated configuration, if we have one
+        bird_config = None
+        with contextlib.suppress(FileNotFoundError):
+            bird_config = pathlib.Path(config_file).read_text(encoding="UTF-8")
+
+        result = self.birdplan.configure_overrides(bird_config)
+
+        # Only write out the configuration if it changed
+        if result["config"] != bird_config:
+            write_config_file(config_file, result["config"])
+
+        summary = f"BIRD configuration updated for {len(result['peers'])} peer(s)"
+        if result["full"]:
+            summary += " (full configuration generated)"
+        if result["protocols"]:
+            summary += f", protocols to reload: {', '.join(result['protocols'])}"
+
+        return summary
+
+    def birdplan_bgp_only_peers(self, only: str) -> list[str]:
+        """
+        Return the BGP peers matching an --only option, using the BirdPlan peer indexes.
+
+        Parameters
+        ----------
+        only : str
+            Option value, either AS<NUMBER> or a peer name.
+
+        Returns
+        -------
+        List[str]
+            Names of the matching peers.
+
+        """
+
+        asn = parse_only_asn(only)
+        if asn is None:
+            return [only]
+
+        return self.birdplan.bgp_peer_index.asn(asn)
+
     def birdplan_commit_state(self) -> None:
         """Commit BirdPlan state."""
 
@@ -0,0 +1,254 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan application of BIRD configuration changes."""
+
+import hashlib
+import pathlib
+import time
+from typing import Any
+
+from .bird_config.sections.protocols.bgp.incremental import peer_config_blocks, peer_protocols
+from .bird_route_stream import BirdRouteStream
+from .cmdline import write_config_file
+from .exceptions import BirdPlanError
+from .reload_scheduler import ReloadScheduler, reload_jobs
+
+__all__ = ["APPLY_MODES", "BirdConfigApply", "config_changes", "config_fingerprints"]
+
+
+# Ways we can get BIRD to pick up configuration changes
+APPLY_MODES = ("configure", "soft", "reload")
+
+# Configuration fingerprints
+ConfigFingerprints = dict[str, Any]
+
+
+def _fingerprint(lines: list[str]) -> str:
+    """Return the fingerprint of configuration lines."""
+    return hashlib.sha256("\n".join(lines).encode("UTF-8")).hexdigest()
+
+
+def config_fingerprints(bird_config: str) -> ConfigFingerprints:
+    """
+    Return the fingerprints of a BIRD configuration, used to work out what changed since it was last applied.
+
+    Parameters
+    ----------
+    bird_config : str
+        BIRD configuration.
+
+    Returns
+    -------
+    ConfigFingerprints
+        Fingerprint of everything but the BGP peers, along with the fingerprint and protocols of each BGP peer.
+
+        eg.
+        {
+            'global': '...',
+            'peers': {
+                'e1': {
+                    'fingerprint': '...',
+                    'protocols': ['bgp4_AS65001_e1', 'p_bgp4_AS65001_e1_peer_to_bgp4'],
+                },
+            },
+        }
+
+    """
+
+    lines = bird_config.split("\n")
+    blocks = peer_config_blocks(lines)
+
+    # Peer blocks are output one after the other at the end of the configuration, so everything before them is global
+    global_lines = lines[: len(lines) - sum(len(block) for block in blocks.values())]
+
+    return {
+        "global": _fingerprint(global_lines),
+        "peers": {
+            section.rsplit(" - ", 1)[-1]: {"fingerprint": _fingerprint(block), "protocols": peer_protocols(block)}
+            for section, block in blocks.items()
+        },
+    }
+
+
+def config_changes(previous: ConfigFingerprints | None, current: ConfigFingerprints) -> dict[str, Any]:
+    """
+    Return what changed between two BIRD configurations.
+
+    Parameters
+    ----------
+    previous : Optional[ConfigFingerprints]
+        Fingerprints of the configuration last applied, everything is taken to have changed if we don't have them.
+
+    current : ConfigFingerprints
+        Fingerprints of the configuration being applied.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Changes to the configuration, "protocols" are the protocols of each BGP peer that changed.
+
+        eg.
+        {
+            'changed': True,
+            'global': False,
+            'peers': {'added': [], 'changed': ['e1'], 'removed': []},
+            'protocols': {'e1': ['bgp4_AS65001_e1', 'p_bgp4_AS65001_e1_peer_to_bgp4']},
+        }
+
+    """
+
+    previous_peers = previous["peers"] if previous else {}
+    current_peers = current["peers"]
+
+    peers = {
+        "added": sorted(peer for peer in current_peers if peer not in previous_peers),
+        "changed": sorted(
+            peer
+            for peer, fingerprints in current_peers.items()
+            if peer in previous_peers and previous_peers[peer]["fingerprint"] != fingerprints["fingerprint"]
+        ),
+        "removed": sorted(peer for peer in previous_peers if peer not in current_peers),
+    }
+    global_changed = previous is None or previous["global"] != current["global"]
+
+    return {
+        "changed": global_changed or any(peers.values()),
+        "global": global_changed,
+        "peers": peers,
+        "protocols": {peer: current_peers[peer]["protocols"] for peer in peers["changed"]},
+    }
+
+
+class BirdConfigApply:
+    """
+    Apply a BIRD configuration over the BIRD control socket.
+
+    The configuration is written to a temporary file and checked by BIRD, only once it passes the check does it replace the
+    configuration file and get loaded.
+
+    """
+
+    _bird: BirdRouteStream
+    _reload_scheduler: ReloadScheduler
+
+    def __init__(self, bird_socket: str | None = None, reload_scheduler: ReloadScheduler | None = None) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        bird_socket : Optional[str]
+            BIRD control socket path, defaults to "/run/bird/bird.ctl".
+
+        reload_scheduler : Optional[ReloadScheduler]
+            Scheduler used to reload the BGP peers that changed, defaults to a scheduler with its default rate limit.
+
+        """
+
+        self._bird = BirdRouteStream(bird_socket)
+        self._reload_scheduler = reload_scheduler or ReloadScheduler(bird_socket)
+
+    def apply(
+        self,
+        config_file: str,
+        bird_config: str,
+        changes: dict[str, Any],
+        mode: str = "configure",
+        state: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Write out, check and load a BIRD configuration.
+
+        Parameters
+        ----------
+        config_file : str
+            BIRD configuration file.
+
+        bird_config : str
+            BIRD configuration.
+
+        changes : Dict[str, Any]
+            Changes to the configuration, as returned by config_changes().
+
+        mode : str
+            How BIRD picks up the changes, "configure" lets BIRD restart the protocols which changed, "soft" only updates the
+            filters and "reload" updates the filters and reloads the routes of the BGP peers that changed. Global changes can
+            affect every peer, so "reload" does a full "configure" when there are any.
+
+        state : Optional[Dict[str, Any]]
+            BirdPlan state, used to reload the smallest BGP peers first.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Commands we sent to BIRD, along with the mode used, the number of seconds BIRD took to load the configuration and
+            the errors of the BGP peers which failed to reload. BIRD has already loaded the configuration when peers fail to
+            reload, so these are returned rather than raised.
+
+            eg.
+            {
+                'mode': 'reload',
+                'commands': ['configure soft "/etc/bird/bird.conf"', 'reload bgp4_AS65001_e1'],
+                'seconds': 0.25,
+                'errors': {},
+            }
+
+        """
+
+        if mode not in APPLY_MODES:
+            raise BirdPlanError(f"Invalid apply mode '{mode}', it must be one of: {', '.join(APPLY_MODES)}")
+
+        # Write the configuration out next to the configuration file, so we can replace it atomically
+        config_path = pathlib.Path(config_file)
+        config_path_tmp = config_path.with_name(f".{config_path.name}.tmp")
+        write_config_file(f"{config_path_tmp}", bird_config)
+
+        # Get BIRD to check the configuration before we replace the one it is using
+        try:
+            self._query(f'configure check "{config_path_tmp.resolve()}"')
+        except BirdPlanError as err:
+            config_path_tmp.unlink(missing_ok=True)
+            raise BirdPlanError(f"BIRD configuration check failed: {err}") from None
+        config_path_tmp.replace(config_path)
+
+        # Work out what we need to tell BIRD
+        if mode == "reload" and changes["global"]:
+            mode = "configure"
+        commands = [
+            f'configure soft "{config_path.resolve()}"' if mode in ("soft", "reload") else f'configure "{config_path.resolve()}"'
+        ]
+
+        started = time.monotonic()
+        self._query(commands[0])
+
+        # Reload the peers that changed, staggered so we don't overwhelm BIRD
+        errors: dict[str, str] = {}
+        if mode == "reload":
+            reload = self._reload_scheduler.run(reload_jobs(state or {}, changes["protocols"]))
+            for peer, peer_reload in reload["peers"].items():
+                commands.extend(peer_reload["commands"])
+                if peer_reload["error"]:
+                    errors[peer] = peer_reload["error"]
+
+        return {"mode": mode, "commands": commands, "seconds": time.monotonic() - started, "errors": errors}
+
+    def _query(self, query: str) -> list[str]:
+        """Send a query to BIRD, returning the reply lines."""
+        return [text for _, text in self._bird.query(query)]
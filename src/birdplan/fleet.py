@@ -0,0 +1,309 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan configuration of a fleet of routers in a single run."""
+
+import concurrent.futures
+import logging
+import math
+import multiprocessing
+import time
+from typing import Any
+
+from . import BirdPlan, bgpq3, peeringdb
+from .bgpq3 import BGPQ3
+from .cmdline import write_config_file
+from .exceptions import BirdPlanError
+from .peeringdb import PeeringDB
+
+__all__ = ["FleetConfigure", "FleetRouter", "fleet_lookups"]
+
+
+# Result of configuring a router
+FleetRouterResult = dict[str, Any]
+
+# Worker context, this is set in the parent before the pool is forked and inherited by the workers
+_context: dict[str, Any] = {}
+
+
+class FleetRouter:
+    """
+    A router in the fleet, each with its own plan, state and BIRD configuration file.
+
+    Attributes
+    ----------
+    name : str
+        Router name.
+
+    plan_file : str
+        BirdPlan file for this router.
+
+    state_file : str
+        BirdPlan state file for this router.
+
+    output_file : str
+        BIRD configuration file to write for this router.
+
+    """
+
+    __slots__ = ("name", "output_file", "plan_file", "state_file")
+
+    name: str
+    plan_file: str
+    state_file: str
+    output_file: str
+
+    def __init__(self, name: str, plan_file: str, state_file: str, output_file: str) -> None:
+        """Initialize object."""
+
+        self.name = name
+        self.plan_file = plan_file
+        self.state_file = state_file
+        self.output_file = output_file
+
+    @classmethod
+    def from_arg(cls, arg: str) -> "FleetRouter":
+        """
+        Create a router from a commandline argument.
+
+        Parameters
+        ----------
+        arg : str
+            Router in the format of NAME=PLAN_FILE,STATE_FILE,BIRD_CONFIG_FILE.
+
+        Returns
+        -------
+        FleetRouter
+            Fleet router.
+
+        """
+
+        name, _, files = arg.partition("=")
+        parts = files.split(",")
+        if not name or len(parts) != 3 or not all(parts):  # noqa: PLR2004
+            raise BirdPlanError(
+                f"Invalid fleet router '{arg}', it must be in the format NAME=PLAN_FILE,STATE_FILE,BIRD_CONFIG_FILE"
+            )
+        if parts[2] == "-":
+            raise BirdPlanError(f"Fleet router '{name}' must be configured to output to a file")
+
+        return cls(name, *parts)
+
+
+def fleet_lookups(plans: list[dict[str, Any]]) -> tuple[set[str], set[int]]:
+    """
+    Return the union of the IRR objects and PeeringDB ASNs a list of plans will look up.
+
+    Parameters
+    ----------
+    plans : List[Dict[str, Any]]
+        Plans, as returned by BirdPlan.load_plan().
+
+    Returns
+    -------
+    tuple[set[str], set[int]]
+        IRR objects and ASNs that will be looked up in PeeringDB.
+
+    """
+
+    as_sets: set[str] = set()
+    asns: set[int] = set()
+
+    for plan in plans:
+        for peer_config in ((plan or {}).get("bgp") or {}).get("peers", {}).values():
+            # IRR objects used by the peer import filter, which can also be configured using the "filter" alias
+            import_filter = peer_config.get("import_filter") or peer_config.get("filter") or {}
+            peer_as_sets = import_filter.get("as_sets")
+            if isinstance(peer_as_sets, str):
+                as_sets.add(peer_as_sets)
+            elif peer_as_sets:
+                as_sets.update(peer_as_sets)
+            # Prefix limits default to being looked up in PeeringDB for customers and peers
+            if peer_config.get("type") not in ("customer", "peer"):
+                continue
+            if any(
+                f"neighbor{ipv}" in peer_config and peer_config.get(f"prefix_limit{ipv}", "peeringdb") == "peeringdb"
+                for ipv in ("4", "6")
+            ):
+                asns.add(peer_config["asn"])
+
+    return as_sets, asns
+
+
+class FleetConfigure:
+    """
+    Configuration of a fleet of routers in a single run.
+
+    The plans are loaded up front so the IRR and PeeringDB lookups for all routers can be resolved once, the routers are then
+    configured in worker processes which inherit the lookup results.
+
+    """
+
+    _routers: list[FleetRouter]
+    _workers: int
+
+    def __init__(self, routers: list[FleetRouter], workers: int = 1) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        routers : List[FleetRouter]
+            Routers to configure.
+
+        workers : int
+            Number of worker processes to configure routers with.
+
+        """
+
+        if not routers:
+            raise BirdPlanError("No fleet routers specified")
+        if len({router.name for router in routers}) != len(routers):
+            raise BirdPlanError("Fleet router names must be unique")
+
+        self._routers = routers
+        self._workers = max(1, workers)
+
+    def run(self, **kwargs: Any) -> dict[str, FleetRouterResult]:  # noqa: ANN401,D417
+        """
+        Configure the routers.
+
+        Routers are configured independently, a router which fails does not stop the others being configured.
+
+        Parameters
+        ----------
+        ignore_irr_changes : bool
+            Optional parameter to ignore IRR lookups during configuration load.
+
+        ignore_peeringdb_changes : bool
+            Optional parameter to ignore peering DB lookups during configuraiton load.
+
+        use_cached : bool
+            Optional parameter to use cached values from state during configuration load.
+
+        write_state : bool
+            Optional parameter to write the router state files, defaults to True.
+
+        Returns
+        -------
+        Dict[str, FleetRouterResult]
+            Results indexed by router name, in router order.
+
+            eg.
+            {
+                'edge1': {
+                    'output_file': '/etc/bird/edge1.conf',
+                    'seconds': 1.5,
+                    'error': None,
+                },
+            }
+
+        """
+
+        # Load all the plans, templates included by multiple plans are only compiled once
+        plans: dict[str, dict[str, Any]] = {}
+        results: dict[str, FleetRouterResult] = {}
+        for router in self._routers:
+            try:
+                plans[router.name] = BirdPlan().load_plan(router.plan_file)
+            except BirdPlanError as err:
+                results[router.name] = {"output_file": router.output_file, "seconds": 0.0, "error": f"{err}"}
+
+        # Lookup results must stay valid until the last router is configured
+        cache_ttls = (bgpq3.bgpq3_cache_ttl, peeringdb.peeringdb_cache_ttl)
+        bgpq3.bgpq3_cache_ttl = peeringdb.peeringdb_cache_ttl = math.inf
+
+        _context["plans"] = plans
+        _context["options"] = kwargs
+        try:
+            if not kwargs.get("use_cached"):
+                self._prefetch(*fleet_lookups(list(plans.values())))
+
+            names = [router.name for router in self._routers if router.name in plans]
+            _context["routers"] = {router.name: router for router in self._routers}
+
+            workers = min(self._workers, len(names))
+            # Workers inherit the plans and lookups, so we can only use the pool on platforms which support forking
+            if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                with multiprocessing.get_context("fork").Pool(processes=workers) as pool:
+                    results.update(pool.imap_unordered(_configure_router, names))
+            else:
+                results.update(_configure_router(name) for name in names)
+        finally:
+            _context.clear()
+            bgpq3.bgpq3_cache_ttl, peeringdb.peeringdb_cache_ttl = cache_ttls
+
+        return {router.name: results[router.name] for router in self._routers}
+
+    def _prefetch(self, as_sets: set[str], asns: set[int]) -> None:
+        """Resolve IRR objects and PeeringDB ASNs into the lookup caches."""
+
+        logging.info("Resolving %s IRR objects and %s PeeringDB ASNs for %s routers", len(as_sets), len(asns), len(self._routers))
+
+        # IRR queries are run by bgpq3, so we can run them concurrently
+        bgpq3_client = BGPQ3()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="birdplan-fleet") as executor:
+            futures = {}
+            for obj in sorted(as_sets):
+                futures[executor.submit(bgpq3_client.get_asns, obj)] = obj
+                futures[executor.submit(bgpq3_client.get_prefixes, obj)] = obj
+            for future in concurrent.futures.as_completed(futures):
+                # Failures are reported against the routers using the object when they are configured
+                try:
+                    future.result()
+                except BirdPlanError as err:
+                    logging.warning("Failed to resolve IRR object '%s': %s", futures[future], err)
+
+        # PeeringDB requests are rate limited, so these are done one at a time
+        peeringdb_client = PeeringDB()
+        for asn in sorted(asns):
+            try:
+                peeringdb_client.get_prefix_limits(asn)
+            except BirdPlanError as err:
+                logging.warning("Failed to resolve PeeringDB information for AS%s: %s", asn, err)
+
+
+def _configure_router(name: str) -> tuple[str, FleetRouterResult]:
+    """Configure a router, within a worker when we're using a pool."""
+
+    router: FleetRouter = _context["routers"][name]
+    options: dict[str, Any] = _context["options"]
+
+    started = time.monotonic()
+    result: FleetRouterResult = {"output_file": router.output_file, "seconds": 0.0, "error": None}
+
+    try:
+        birdplan = BirdPlan()
+        birdplan.load(
+            plan_file=router.plan_file,
+            plan=_context["plans"][name],
+            state_file=router.state_file,
+            ignore_irr_changes=options.get("ignore_irr_changes", False),
+            ignore_peeringdb_changes=options.get("ignore_peeringdb_changes", False),
+            use_cached=options.get("use_cached", False),
+        )
+        bird_config = birdplan.configure()
+        if options.get("write_state", True):
+            birdplan.commit_state()
+        write_config_file(router.output_file, bird_config)
+    except BirdPlanError as err:
+        result["error"] = f"{err}"
+
+    result["seconds"] = time.monotonic() - started
+
+    return name, result
@@ -18,37 +18,157 @@
 
 """BirdPlan monitor interface."""
 
+import argparse
 import contextlib
+import pathlib
 import sys
 import time
+from typing import Any
 
-from .cmdline import BirdPlanCommandLine
+from .cmdline import BIRDPLAN_MONITOR_FILE, BirdPlanCommandLine, write_monitor_file
 from .exceptions import BirdPlanError
+from .monitor_events import write_monitor_events
+from .monitor_instances import MonitorInstance, MonitorInstances
+from .monitor_metrics import MonitorMetrics
 
 __all__: list[str] = []
 
 
-def _run_monitor() -> None:
-    """Run the birdplan monitor."""
+# Default interval between monitor runs
+MONITOR_INTERVAL = 120
+
+
+def _run_monitor(birdplan_args: list[str], monitor_args: list[str]) -> dict[str, Any] | None:
+    """Run the birdplan monitor, returning the monitor status if we got it."""
     birdplan_cmdline = BirdPlanCommandLine(is_console=False)
 
     with contextlib.suppress(BirdPlanError):
-        birdplan_cmdline.run(["monitor"])
+        return birdplan_cmdline.run([*birdplan_args, "monitor", *monitor_args]).data
+
+    return None
+
+
+def _parse_args() -> tuple[argparse.Namespace, list[str]]:
+    """Parse the monitor commandline arguments, any we don't know about are passed to birdplan."""
+
+    argparser = argparse.ArgumentParser(prog="birdplan-monitor", description="BirdPlan monitor for BIRD.")
+    argparser.add_argument(
+        "--interval",
+        type=int,
+        default=MONITOR_INTERVAL,
+        metavar="SECONDS",
+        help=f"Interval between monitor runs (default: {MONITOR_INTERVAL})",
+    )
+    argparser.add_argument(
+        "--metrics-listen",
+        metavar="[HOST:]PORT",
+        help="Serve OpenMetrics on this address, refreshed on each monitor run",
+    )
+    # Options passed through to "birdplan monitor"
+    argparser.add_argument("-o", "--output-file", metavar="MONITOR_OUTPUT_FILE", help="Monitor filename to output to")
+    argparser.add_argument("--event-log", metavar="EVENT_LOG_FILE", help="Append state transitions to this file")
+    argparser.add_argument("--event-socket", metavar="EVENT_SOCKET", help="Send state transitions to this UNIX socket")
+    # Multiple instance monitoring
+    argparser.add_argument(
+        "--instance",
+        action="append",
+        default=[],
+        metavar="NAME=PLAN_FILE,STATE_FILE,BIRD_SOCKET",
+        help="Monitor this BIRD instance, can be specified multiple times to monitor instances concurrently",
+    )
+    argparser.add_argument(
+        "--stale-after",
+        type=int,
+        metavar="SECONDS",
+        help="Number of seconds after which an instance status is considered stale (default: 2 x interval)",
+    )
+    argparser.add_argument(
+        "--workers",
+        type=int,
+        metavar="WORKERS",
+        help="Maximum number of instances to poll at the same time (default: all)",
+    )
+
+    return argparser.parse_known_args()
+
+
+def _monitor_instances(args: argparse.Namespace, metrics: MonitorMetrics | None) -> None:
+    """Monitor multiple BIRD instances concurrently, writing out their merged status."""
+
+    try:
+        instances = MonitorInstances(
+            [MonitorInstance.from_arg(instance) for instance in args.instance],
+            stale_after=args.stale_after or args.interval * 2,
+            max_workers=args.workers,
+        )
+    except BirdPlanError as err:
+        sys.exit(f"ERROR: {err}")
+
+    output_file = pathlib.Path(args.output_file or BIRDPLAN_MONITOR_FILE)
+    event_log = pathlib.Path(args.event_log) if args.event_log else None
+
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                # Wait at most an interval for the instances, slow instances are picked up on the next run
+                events = instances.poll(timeout=args.interval)
+                merged_status = instances.merged_status()
+                write_monitor_file(output_file, merged_status)
+                write_monitor_events(events, event_log=event_log, event_socket=args.event_socket)
+                # Refresh the metrics snapshot, scrapes in between runs return the last snapshot
+                if metrics:
+                    metrics.update_instances(merged_status)
+            except BirdPlanError:
+                pass
+            # Sleep for the rest of the interval
+            time.sleep(max(args.interval - (time.monotonic() - started), 0))
+    except KeyboardInterrupt:
+        instances.shutdown()
+        sys.exit(0)
 
 
 # Main entry point from the birdplan monitor
 def main() -> None:
     """Entry point function for the birdplan monitor."""
 
+    args, birdplan_args = _parse_args()
+
+    # Work out the arguments we pass to "birdplan monitor"
+    monitor_args = []
+    for option, value in (
+        ("--output-file", args.output_file),
+        ("--event-log", args.event_log),
+        ("--event-socket", args.event_socket),
+    ):
+        if value:
+            monitor_args.extend([option, value])
+
+    # Setup our metrics exporter if we're serving metrics
+    metrics: MonitorMetrics | None = None
+    if args.metrics_listen:
+        metrics = MonitorMetrics()
+        try:
+            metrics.serve(args.metrics_listen)
+        except BirdPlanError as err:
+            sys.exit(f"ERROR: {err}")
+
+    # If we're monitoring multiple instances, they each have their own plan, state and BIRD control socket
+    if args.instance:
+        _monitor_instances(args, metrics)
+
     while True:
         try:
-            _run_monitor()
+            monitor_status = _run_monitor(birdplan_args, monitor_args)
+            # Refresh the metrics snapshot, scrapes in between runs return the last snapshot
+            if metrics and monitor_status is not None:
+                metrics.update(monitor_status)
         except KeyboardInterrupt:
             sys.exit(0)
         except BirdPlanError:
             pass
-        # Sleep 2 minutes before trying again
-        time.sleep(120)
+        # Sleep before trying again
+        time.sleep(args.interval)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan monitor state transition events."""
+
+import json
+import logging
+import pathlib
+import socket
+import time
+from typing import Any
+
+from .exceptions import BirdPlanError
+
+__all__ = ["MonitorEvent", "monitor_events", "write_monitor_events"]
+
+
+# Monitor event
+MonitorEvent = dict[str, Any]
+
+
+def monitor_events(previous: dict[str, Any] | None, current: dict[str, Any], timestamp: float | None = None) -> list[MonitorEvent]:
+    """
+    Return the per-peer and per-protocol state transitions between two monitor snapshots.
+
+    Parameters
+    ----------
+    previous : Optional[Dict[str, Any]]
+        Previous monitor status, no events are returned if we don't have one.
+
+    current : Dict[str, Any]
+        Current monitor status.
+
+    timestamp : Optional[float]
+        Time to use for the events, defaults to now.
+
+    Returns
+    -------
+    List[MonitorEvent]
+        State transition events, "added" and "removed" events are returned when a protocol appears or disappears.
+
+        eg.
+        {
+            'timestamp': 1704067200.0,
+            'protocol': 'bgp',
+            'name': 'bgp4_AS65001_e1',
+            'event': 'state',
+            'peer': 'e1',
+            'ipv': 'ipv4',
+            'previous': {'state': 'up', 'info': 'established'},
+            'current': {'state': 'start', 'info': 'active'},
+        }
+
+    """
+
+    if previous is None:
+        return []
+
+    if timestamp is None:
+        timestamp = time.time()
+
+    events: list[MonitorEvent] = []
+
+    # Flatten both snapshots into protocol keys and their state, so we can compare them
+    previous_protocols = _monitor_protocols(previous)
+    current_protocols = _monitor_protocols(current)
+
+    for key, current_state in current_protocols.items():
+        previous_state = previous_protocols.get(key)
+        if previous_state == current_state:
+            continue
+        event = "added" if previous_state is None else "state"
+        events.append(_monitor_event(timestamp, key, event, previous_state, current_state))
+
+    for key, previous_state in previous_protocols.items():
+        if key not in current_protocols:
+            events.append(_monitor_event(timestamp, key, "removed", previous_state, None))
+
+    return events
+
+
+def write_monitor_events(
+    events: list[MonitorEvent], event_log: pathlib.Path | None = None, event_socket: str | None = None
+) -> None:
+    """
+    Write monitor events in JSON Lines format.
+
+    Parameters
+    ----------
+    events : List[MonitorEvent]
+        Events to write.
+
+    event_log : Optional[pathlib.Path]
+        File to append the events to.
+
+    event_socket : Optional[str]
+        UNIX socket to send the events to, events are dropped with a warning if nothing is listening.
+
+    """
+
+    if not events:
+        return
+
+    data = "".join(json.dumps(event, sort_keys=True) + "\n" for event in events).encode("UTF-8")
+
+    if event_log:
+        try:
+            with event_log.open("ab") as event_file:
+                event_file.write(data)
+        except OSError as err:  # pragma: no cover
+            raise BirdPlanError(f"Failed to open '{event_log}' for writing: {err}") from None
+
+    if event_socket:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(event_socket)
+                sock.sendall(data)
+        except OSError as err:
+            logging.warning("Failed to send monitor events to '%s': %s", event_socket, err)
+
+
+def _monitor_protocols(monitor_status: dict[str, Any]) -> dict[tuple[str, ...], dict[str, Any]]:
+    """Return the state of each protocol in a monitor snapshot."""
+
+    protocols: dict[tuple[str, ...], dict[str, Any]] = {}
+
+    for peer_name, peer in monitor_status.get("bgp", {}).items():
+        for ipv, protocol in peer.get("protocols", {}).items():
+            status = protocol.get("status", {})
+            protocols[("bgp", peer_name, ipv)] = {
+                "name": protocol.get("name"),
+                "state": status.get("state"),
+                "info": status.get("info"),
+            }
+
+    for protocol_name, status in monitor_status.get("ospf", {}).items():
+        protocols[("ospf", protocol_name)] = {
+            "name": protocol_name,
+            "state": status.get("state"),
+            "info": status.get("info"),
+        }
+
+    return protocols
+
+
+def _monitor_event(
+    timestamp: float,
+    key: tuple[str, ...],
+    event: str,
+    previous_state: dict[str, Any] | None,
+    current_state: dict[str, Any] | None,
+) -> MonitorEvent:
+    """Build a monitor event."""
+
+    name = (current_state or previous_state or {}).get("name")
+
+    monitor_event: MonitorEvent = {"timestamp": timestamp, "protocol": key[0], "name": name, "event": event}
+    if key[0] == "bgp":
+        monitor_event["peer"] = key[1]
+        monitor_event["ipv"] = key[2]
+    monitor_event["previous"] = {"state": previous_state["state"], "info": previous_state["info"]} if previous_state else None
+    monitor_event["current"] = {"state": current_state["state"], "info": current_state["info"]} if current_state else None
+
+    return monitor_event
@@ -0,0 +1,345 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan monitoring of multiple BIRD instances."""
+
+import concurrent.futures
+import logging
+import pathlib
+import time
+from typing import Any
+
+from . import BirdPlan
+from .exceptions import BirdPlanError
+from .monitor_events import MonitorEvent, monitor_events
+from .state_journal import StateJournal
+
+__all__ = ["MonitorInstance", "MonitorInstances"]
+
+
+# Signature of the files an instance is loaded from, used to detect when they change
+FilesSignature = tuple[tuple[str, int | None, int | None], ...]
+
+
+def _file_signature(path: pathlib.Path) -> tuple[str, int | None, int | None]:
+    """Return the signature of a file, which changes when the file is written to, replaced or removed."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (f"{path}", None, None)
+    return (f"{path}", stat.st_mtime_ns, stat.st_size)
+
+
+class MonitorInstance:
+    """
+    A monitored BIRD instance, each with its own plan, state and control socket.
+
+    The plan and state are loaded when the instance is created and only loaded again when the plan, state or state journal
+    files change, so polling the instance only queries BIRD.
+
+    Attributes
+    ----------
+    name : str
+        Instance name.
+
+    plan_file : str
+        BirdPlan file for this instance.
+
+    state_file : str
+        BirdPlan state file for this instance.
+
+    bird_socket : str
+        BIRD control socket for this instance.
+
+    status : Dict[str, Any]
+        Last monitor status retrieved.
+
+    last_update : Optional[float]
+        Time the status was last retrieved.
+
+    last_error : Optional[str]
+        Error from the last attempt at retrieving the status, if it failed.
+
+    future : Optional[concurrent.futures.Future]
+        Poll in progress for this instance.
+
+    """
+
+    __slots__ = (
+        "_birdplan",
+        "_files_signature",
+        "bird_socket",
+        "future",
+        "last_error",
+        "last_update",
+        "name",
+        "plan_file",
+        "state_file",
+        "status",
+    )
+
+    _birdplan: BirdPlan | None
+    _files_signature: FilesSignature | None
+
+    name: str
+    plan_file: str
+    state_file: str
+    bird_socket: str
+    status: dict[str, Any]
+    last_update: float | None
+    last_error: str | None
+    future: concurrent.futures.Future[dict[str, Any]] | None
+
+    def __init__(self, name: str, plan_file: str, state_file: str, bird_socket: str) -> None:
+        """Initialize object."""
+
+        self.name = name
+        self.plan_file = plan_file
+        self.state_file = state_file
+        self.bird_socket = bird_socket
+        self.status = {}
+        self.last_update = None
+        self.last_error = None
+        self.future = None
+
+        self._birdplan = None
+        self._files_signature = None
+        self.load()
+
+    @classmethod
+    def from_arg(cls, arg: str) -> "MonitorInstance":
+        """
+        Create an instance from a commandline argument.
+
+        Parameters
+        ----------
+        arg : str
+            Instance in the format of NAME=PLAN_FILE,STATE_FILE,BIRD_SOCKET.
+
+        Returns
+        -------
+        MonitorInstance
+            Monitored instance.
+
+        """
+
+        name, _, files = arg.partition("=")
+        parts = files.split(",")
+        if not name or len(parts) != 3 or not all(parts):  # noqa: PLR2004
+            raise BirdPlanError(f"Invalid monitor instance '{arg}', it must be in the format NAME=PLAN_FILE,STATE_FILE,BIRD_SOCKET")
+
+        return cls(name, *parts)
+
+    def load(self) -> None:
+        """Load the plan and state for this instance."""
+
+        # Take the signature before loading, so changes made while we're loading are picked up on the next poll
+        files_signature = self.files_signature()
+
+        birdplan = BirdPlan()
+        birdplan.birdconf.birdconfig_globals.suppress_info = True
+        birdplan.load(
+            plan_file=self.plan_file,
+            state_file=self.state_file,
+            ignore_irr_changes=True,
+            ignore_peeringdb_changes=True,
+            use_cached=True,
+        )
+
+        self._birdplan = birdplan
+        self._files_signature = files_signature
+
+    def files_signature(self) -> FilesSignature:
+        """
+        Return the signature of the files this instance is loaded from.
+
+        Returns
+        -------
+        FilesSignature
+            Path, modification time and size of the plan file, or each shard of a sharded plan directory, the state file and
+            the state journal.
+
+        """
+
+        plan_path = pathlib.Path(self.plan_file)
+        paths = sorted(plan_path.rglob("*.yaml")) if plan_path.is_dir() else [plan_path]
+        paths += [pathlib.Path(self.state_file), StateJournal(self.state_file).journal_file]
+
+        return tuple(_file_signature(path) for path in paths)
+
+    def poll(self) -> dict[str, Any]:
+        """
+        Retrieve the monitor status for this instance, loading the plan and state again if they changed.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Monitor status.
+
+        """
+
+        if self._birdplan is None or self.files_signature() != self._files_signature:
+            self.load()
+
+        birdplan = self.birdplan
+
+        return {
+            "bgp": birdplan.state_bgp_peer_summary(bird_socket=self.bird_socket),
+            "ospf": birdplan.state_ospf_summary(bird_socket=self.bird_socket),
+        }
+
+    @property
+    def birdplan(self) -> BirdPlan:
+        """Return the BirdPlan loaded for this instance."""
+        if self._birdplan is None:
+            raise RuntimeError("Attribute 'birdplan' is not set")
+        return self._birdplan
+
+
+class MonitorInstances:
+    """
+    Concurrent monitoring of multiple BIRD instances from a single process.
+
+    Each instance is polled in its own thread, an instance that is slow to respond does not hold up the others and is not
+    polled again until its previous poll has completed.
+
+    """
+
+    _instances: list[MonitorInstance]
+    _executor: concurrent.futures.ThreadPoolExecutor
+    _stale_after: float
+
+    def __init__(self, instances: list[MonitorInstance], stale_after: float, max_workers: int | None = None) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        instances : List[MonitorInstance]
+            Instances to monitor.
+
+        stale_after : float
+            Number of seconds after which an instance status is considered stale.
+
+        max_workers : Optional[int]
+            Maximum number of instances to poll at the same time, defaults to all of them.
+
+        """
+
+        if len({instance.name for instance in instances}) != len(instances):
+            raise BirdPlanError("Monitor instance names must be unique")
+
+        self._instances = instances
+        self._stale_after = stale_after
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(instances) or 1, thread_name_prefix="birdplan-monitor"
+        )
+
+    def poll(self, timeout: float | None = None) -> list[MonitorEvent]:
+        """
+        Poll all instances concurrently.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum number of seconds to wait for the instances, instances that take longer are picked up on the next poll.
+
+        Returns
+        -------
+        List[MonitorEvent]
+            State transitions since the previous poll, with the "instance" item added.
+
+        """
+
+        # Start polling the instances which are not still busy with a previous poll
+        for instance in self._instances:
+            if instance.future is None:
+                instance.future = self._executor.submit(instance.poll)
+
+        pending = [instance.future for instance in self._instances if instance.future]
+        concurrent.futures.wait(pending, timeout=timeout)
+
+        events: list[MonitorEvent] = []
+
+        # Collect the results of the polls that completed
+        for instance in self._instances:
+            future = instance.future
+            if future is None or not future.done():
+                continue
+            instance.future = None
+            # A failing instance must not stop us monitoring the others
+            try:
+                status = future.result()
+            except Exception as err:  # noqa: BLE001
+                logging.warning("Failed to monitor instance '%s': %s", instance.name, err)
+                instance.last_error = f"{err}"
+                continue
+            # Work out what changed since the last time we got the status
+            previous_status = instance.status if instance.last_update is not None else None
+            for event in monitor_events(previous_status, status):
+                event["instance"] = instance.name
+                events.append(event)
+            instance.status = status
+            instance.last_update = time.time()
+            instance.last_error = None
+
+        return events
+
+    def merged_status(self, timestamp: float | None = None) -> dict[str, dict[str, Any]]:
+        """
+        Return the merged status of all instances.
+
+        Parameters
+        ----------
+        timestamp : Optional[float]
+            Time to use when working out if an instance is stale, defaults to now.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            Merged status, keyed by instance name.
+
+            eg.
+            {
+                'vrf1': {
+                    'status': {'bgp': ..., 'ospf': ...},
+                    'last_update': ...,
+                    'last_error': ...,
+                    'stale': ...,
+                },
+            }
+
+        """
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        return {
+            instance.name: {
+                "status": instance.status,
+                "last_update": instance.last_update,
+                "last_error": instance.last_error,
+                "stale": instance.last_update is None or timestamp - instance.last_update > self._stale_after,
+            }
+            for instance in self._instances
+        }
+
+    def shutdown(self) -> None:
+        """Stop polling, without waiting for polls still in progress."""
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,313 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan monitor metrics exporter."""
+
+import datetime as dt
+import http.server
+import logging
+import math
+import socket
+import threading
+import time
+from typing import Any
+
+from .exceptions import BirdPlanError
+
+__all__ = ["MonitorMetrics"]
+
+
+# Content types we can serve the metrics with, the body is compatible with both
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric definitions, name => (type, help)
+METRICS = {
+    "birdplan_monitor_last_update_timestamp_seconds": ("gauge", "Time the monitor snapshot was last refreshed."),
+    "birdplan_monitor_instance_last_update_timestamp_seconds": ("gauge", "Time the instance status was last retrieved."),
+    "birdplan_monitor_instance_stale": ("gauge", "Instance status has not been retrieved recently."),
+    "birdplan_bgp_peer_up": ("gauge", "BGP peer protocol is up and established."),
+    "birdplan_bgp_peer_uptime_seconds": ("gauge", "Time since the BGP peer protocol last changed state."),
+    "birdplan_bgp_peer_routes_imported": ("gauge", "Number of routes imported from the BGP peer."),
+    "birdplan_bgp_peer_routes_exported": ("gauge", "Number of routes exported to the BGP peer."),
+    "birdplan_bgp_peer_prefix_limit": ("gauge", "BGP peer import prefix limit."),
+    "birdplan_bgp_peer_prefix_limit_headroom": ("gauge", "Number of routes the BGP peer can still send before hitting its limit."),
+    "birdplan_ospf_protocol_up": ("gauge", "OSPF protocol is up."),
+    "birdplan_ospf_protocol_routes_imported": ("gauge", "Number of routes imported from the OSPF protocol."),
+    "birdplan_ospf_protocol_routes_exported": ("gauge", "Number of routes exported to the OSPF protocol."),
+}
+
+Sample = tuple[str, dict[str, str], float]
+
+
+class MonitorMetrics:
+    """
+    BirdPlan monitor metrics exporter.
+
+    The metrics are rendered once when the monitor status is updated, scrapes only return the last rendered snapshot.
+
+    """
+
+    _snapshot: bytes
+    _server: http.server.ThreadingHTTPServer | None
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        self._snapshot = b"# EOF\n"
+        self._server = None
+
+    def update(self, monitor_status: dict[str, Any], timestamp: float | None = None) -> None:
+        """
+        Update the metrics snapshot from the monitor status.
+
+        Parameters
+        ----------
+        monitor_status : Dict[str, Any]
+            Monitor status, as returned by the "monitor" command.
+
+        timestamp : Optional[float]
+            Time the status was retrieved, defaults to now.
+
+        """
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        samples: list[Sample] = [("birdplan_monitor_last_update_timestamp_seconds", {}, timestamp)]
+        samples.extend(self._bgp_samples(monitor_status.get("bgp", {}), timestamp, {}))
+        samples.extend(self._ospf_samples(monitor_status.get("ospf", {}), {}))
+
+        # Swapping the reference is atomic, so scrapes always see a complete snapshot
+        self._snapshot = self._render(samples)
+
+    def update_instances(self, instances: dict[str, dict[str, Any]], timestamp: float | None = None) -> None:
+        """
+        Update the metrics snapshot from the merged status of multiple monitored instances.
+
+        Parameters
+        ----------
+        instances : Dict[str, Dict[str, Any]]
+            Merged instance status, keyed by instance name, with the "status", "last_update" and "stale" items.
+
+        timestamp : Optional[float]
+            Time the status was merged, defaults to now.
+
+        """
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        samples: list[Sample] = [("birdplan_monitor_last_update_timestamp_seconds", {}, timestamp)]
+        for instance_name, instance in instances.items():
+            labels = {"instance": instance_name}
+            samples.append(("birdplan_monitor_instance_stale", labels, 1 if instance["stale"] else 0))
+            # Skip instances we have never retrieved the status for
+            if instance["last_update"] is None:
+                continue
+            samples.append(("birdplan_monitor_instance_last_update_timestamp_seconds", labels, instance["last_update"]))
+            samples.extend(self._bgp_samples(instance["status"].get("bgp", {}), instance["last_update"], labels))
+            samples.extend(self._ospf_samples(instance["status"].get("ospf", {}), labels))
+
+        # Swapping the reference is atomic, so scrapes always see a complete snapshot
+        self._snapshot = self._render(samples)
+
+    def serve(self, listen: str) -> None:
+        """
+        Start serving the metrics over HTTP in a background thread.
+
+        Parameters
+        ----------
+        listen : str
+            Address to listen on in the format of [HOST:]PORT, IPv6 addresses must be enclosed in [].
+
+        """
+
+        host, _, port = listen.rpartition(":")
+        host = host.strip("[]")
+        if not port.isdigit():
+            raise BirdPlanError(f"Invalid metrics listen address '{listen}'")
+
+        metrics = self
+
+        class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+            """Metrics request handler."""
+
+            def do_GET(self) -> None:
+                """Return the metrics snapshot."""
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                content_type = PROMETHEUS_CONTENT_TYPE
+                if "application/openmetrics-text" in self.headers.get("Accept", ""):
+                    content_type = OPENMETRICS_CONTENT_TYPE
+                snapshot = metrics.snapshot
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", f"{len(snapshot)}")
+                self.end_headers()
+                self.wfile.write(snapshot)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002,ANN401
+                """Log requests at debug level."""
+                logging.debug("Metrics request from %s: %s", self.address_string(), format % args)
+
+        try:
+            server_class = http.server.ThreadingHTTPServer
+            if ":" in host:
+                server_class = _ThreadingHTTPServerIPv6
+            self._server = server_class((host, int(port)), _MetricsHandler)
+        except OSError as err:
+            raise BirdPlanError(f"Failed to listen for metrics on '{listen}': {err}") from None
+
+        logging.info("Serving metrics on %s", listen)
+        threading.Thread(target=self._server.serve_forever, name="birdplan-metrics", daemon=True).start()
+
+    def shutdown(self) -> None:
+        """Stop serving the metrics."""
+
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _bgp_samples(  # noqa: C901
+        self, bgp_status: dict[str, Any], timestamp: float, base_labels: dict[str, str]
+    ) -> list[Sample]:
+        """Return BGP peer samples."""
+
+        samples: list[Sample] = []
+
+        for peer_name, peer in bgp_status.items():
+            for ipv, protocol in peer.get("protocols", {}).items():
+                labels = {**base_labels, "peer": peer_name, "asn": f"{peer['asn']}", "ipv": ipv}
+
+                # Grab the prefix limit from the state, PeeringDB limits take preference like they do in the configuration
+                prefix_limit = None
+                for limit_type in ("peeringdb", "static"):
+                    if ipv in peer.get("prefix_limit", {}).get(limit_type, {}):
+                        prefix_limit = _to_number(peer["prefix_limit"][limit_type][ipv])
+                        break
+                if prefix_limit is not None:
+                    samples.append(("birdplan_bgp_peer_prefix_limit", labels, prefix_limit))
+
+                # If we have no live status there is nothing else to add
+                if "status" not in protocol:
+                    samples.append(("birdplan_bgp_peer_up", labels, 0))
+                    continue
+                status = protocol["status"]
+
+                is_up = status.get("state") == "up" and status.get("info") == "established"
+                samples.append(("birdplan_bgp_peer_up", labels, 1 if is_up else 0))
+
+                since = _to_timestamp(status.get("since"))
+                if since is not None:
+                    samples.append(("birdplan_bgp_peer_uptime_seconds", labels, max(timestamp - since, 0)))
+
+                routes_imported = _to_number(status.get("routes_imported"))
+                if routes_imported is not None:
+                    samples.append(("birdplan_bgp_peer_routes_imported", labels, routes_imported))
+                    if prefix_limit is not None:
+                        samples.append(("birdplan_bgp_peer_prefix_limit_headroom", labels, prefix_limit - routes_imported))
+
+                routes_exported = _to_number(status.get("routes_exported"))
+                if routes_exported is not None:
+                    samples.append(("birdplan_bgp_peer_routes_exported", labels, routes_exported))
+
+        return samples
+
+    def _ospf_samples(self, ospf_status: dict[str, Any], base_labels: dict[str, str]) -> list[Sample]:
+        """Return OSPF protocol samples."""
+
+        samples: list[Sample] = []
+
+        for protocol_name, status in ospf_status.items():
+            labels = {**base_labels, "protocol": protocol_name}
+            samples.append(("birdplan_ospf_protocol_up", labels, 1 if status.get("state") == "up" else 0))
+            for metric, key in (
+                ("birdplan_ospf_protocol_routes_imported", "routes_imported"),
+                ("birdplan_ospf_protocol_routes_exported", "routes_exported"),
+            ):
+                value = _to_number(status.get(key))
+                if value is not None:
+                    samples.append((metric, labels, value))
+
+        return samples
+
+    def _render(self, samples: list[Sample]) -> bytes:
+        """Render samples in the OpenMetrics text format, grouped by metric."""
+
+        lines: list[str] = []
+        for metric, (metric_type, metric_help) in METRICS.items():
+            metric_samples = [sample for sample in samples if sample[0] == metric]
+            if not metric_samples:
+                continue
+            lines.append(f"# HELP {metric} {metric_help}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for _, labels, value in metric_samples:
+                label_str = ",".join(f'{name}="{_escape_label(label)}"' for name, label in labels.items())
+                value_str = _format_value(value)
+                lines.append(f"{metric}{{{label_str}}} {value_str}" if label_str else f"{metric} {value_str}")
+        lines.append("# EOF")
+
+        return ("\n".join(lines) + "\n").encode("UTF-8")
+
+    @property
+    def snapshot(self) -> bytes:
+        """Return the current metrics snapshot."""
+        return self._snapshot
+
+
+class _ThreadingHTTPServerIPv6(http.server.ThreadingHTTPServer):
+    """Threading HTTP server listening on IPv6."""
+
+    address_family = socket.AF_INET6
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value without losing precision, large counters and timestamps must not be rounded."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return f"{int(value)}"
+    return repr(float(value))
+
+
+def _to_number(value: Any) -> float | None:  # noqa: ANN401
+    """Convert a value to a number, returning None if it is not one."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value: Any) -> float | None:  # noqa: ANN401
+    """Convert a BIRD since value to a UNIX timestamp, returning None if we cannot parse it."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return dt.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
@@ -0,0 +1,103 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Override matching support."""
+
+import fnmatch
+import re
+from typing import Any
+
+__all__ = ["OverrideMatcher"]
+
+
+class OverrideMatcher:
+    r"""
+    Override matcher.
+
+    Overrides are indexed by either an exact name or a pattern containing a \*. An exact name match takes precedence, if there
+    is no exact match the patterns are checked in sorted order and the last matching pattern wins.
+
+    The patterns are compiled into a single regex when the matcher is created, so matching a name does not depend on the number
+    of patterns.
+
+    """
+
+    _exact: dict[str, Any]
+    _values: dict[int, Any]
+    _regex: re.Pattern[str] | None
+
+    def __init__(self, overrides: dict[str, Any] | None = None) -> None:
+        """Initialize object."""
+
+        self._exact = {}
+        self._values = {}
+        self._regex = None
+
+        if not overrides:
+            return
+
+        self._exact = dict(overrides)
+
+        # Patterns are checked in reverse sorted order, as the first alternative that matches wins in a regex
+        alternatives = []
+        group = 1
+        for pattern in sorted(overrides, reverse=True):
+            # Skip non patterns
+            if "*" not in pattern:
+                continue
+            regex = fnmatch.translate(pattern)
+            alternatives.append(f"({regex})")
+            self._values[group] = overrides[pattern]
+            # Skip over the groups the translated pattern may contain
+            group += re.compile(regex).groups + 1
+
+        if alternatives:
+            self._regex = re.compile("|".join(alternatives))
+
+    def __bool__(self) -> bool:
+        """Return if we have any overrides."""
+        return bool(self._exact)
+
+    def get(self, name: str) -> Any | None:  # noqa: ANN401
+        """
+        Get the override value for a name.
+
+        Parameters
+        ----------
+        name : str
+            Name to get the override value for.
+
+        Returns
+        -------
+        Optional[Any] : Override value or `None` if there is no override for the name.
+
+        """
+
+        # Check if we have an explicit setting
+        if name in self._exact:
+            return self._exact[name]
+
+        # If not we process the patterns
+        if self._regex is None:
+            return None
+        match = self._regex.match(name)
+        if not match:
+            return None
+
+        # The group wrapping the pattern that matched is the last group to close
+        return self._values[match.lastindex]  # type: ignore[index]
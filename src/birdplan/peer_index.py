@@ -0,0 +1,139 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan indexes over BGP peers."""
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .bird_config.sections.protocols.bgp.peer import ProtocolBGPPeer
+
+__all__ = ["BGPPeerIndex"]
+
+
+class BGPPeerIndex:
+    """
+    Indexes over BGP peers by ASN, protocol name and peer type.
+
+    The indexes are built in a single pass over the peers, after which looking up a single peer or AS does not depend on the
+    number of peers.
+
+    """
+
+    __slots__ = ("_by_asn", "_by_protocol", "_by_type", "_peers")
+
+    _peers: set[str]
+    _by_asn: dict[int, list[str]]
+    _by_protocol: dict[str, tuple[str, str]]
+    _by_type: dict[str, list[str]]
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        self._peers = set()
+        self._by_asn = {}
+        self._by_protocol = {}
+        self._by_type = {}
+
+    @classmethod
+    def from_peers(cls, peers_state: dict[str, Any], peers: Iterable["ProtocolBGPPeer"] = ()) -> "BGPPeerIndex":
+        """
+        Create an index over the BGP peers in the state and configuration.
+
+        Parameters
+        ----------
+        peers_state : Dict[str, Any]
+            BGP peers in the state, keyed by peer name.
+
+        peers : Iterable[ProtocolBGPPeer]
+            BGP peers in the configuration.
+
+        Returns
+        -------
+        BGPPeerIndex
+            BGP peer index.
+
+        """
+
+        index = cls()
+
+        for peer in peers:
+            protocols = {}
+            for ipv in ("4", "6"):
+                if getattr(peer, f"has_ipv{ipv}"):
+                    protocols[f"ipv{ipv}"] = peer.protocol_name(ipv)
+            index.add(peer.name, peer.asn, peer.peer_type, protocols)
+
+        # Peers in both the state and configuration can also be found by what they were last configured with
+        for peer_name, peer_state in peers_state.items():
+            protocols = {ipv: protocol["name"] for ipv, protocol in peer_state.get("protocols", {}).items()}
+            index.add(peer_name, peer_state["asn"], peer_state.get("type"), protocols)
+
+        return index
+
+    def add(self, peer_name: str, asn: int, peer_type: str | None, protocols: dict[str, str]) -> None:
+        """
+        Add a BGP peer to the index, a peer which is already in the index keeps its existing entries.
+
+        Parameters
+        ----------
+        peer_name : str
+            Peer name.
+
+        asn : int
+            Peer ASN.
+
+        peer_type : Optional[str]
+            Peer type, if known.
+
+        protocols : Dict[str, str]
+            Protocol names of the peer, keyed by IP version, eg. "ipv4".
+
+        """
+
+        self._peers.add(peer_name)
+        # Peers added more than once are only indexed once for each ASN and peer type
+        if peer_name not in self._by_asn.setdefault(asn, []):
+            self._by_asn[asn].append(peer_name)
+        if peer_type and peer_name not in self._by_type.setdefault(peer_type, []):
+            self._by_type[peer_type].append(peer_name)
+        # Protocols which are already indexed keep the peer they were first added with
+        for ipv, protocol_name in protocols.items():
+            self._by_protocol.setdefault(protocol_name, (peer_name, ipv))
+
+    def asn(self, asn: int) -> list[str]:
+        """Return the names of the peers with an ASN."""
+        return self._by_asn.get(asn, [])
+
+    def protocol(self, protocol_name: str) -> tuple[str, str] | None:
+        """Return the peer name and IP version of a protocol, or None if it does not belong to a peer."""
+        return self._by_protocol.get(protocol_name)
+
+    def peer_type(self, peer_type: str) -> list[str]:
+        """Return the names of the peers of a peer type."""
+        return self._by_type.get(peer_type, [])
+
+    def __contains__(self, peer_name: object) -> bool:
+        """Return if a peer is in the index."""
+        return peer_name in self._peers
+
+    def __len__(self) -> int:
+        """Return the number of peers in the index."""
+        return len(self._peers)
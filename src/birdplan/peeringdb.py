@@ -44,6 +44,9 @@ PeeringDBInfo = dict[str, Any]
 #  > }
 peeringdb_cache: dict[str, dict[str, Any]] = {}
 
+# Number of seconds cached results are valid for
+peeringdb_cache_ttl: float = 60
+
 # Keep track of the timestamp of our last request
 peeringdb_last_request: float = 0
 
@@ -115,8 +118,8 @@ class PeeringDB:  # pylint: disable=too-few-public-methods
                 return None
             # Grab the cached object
             cached = peeringdb_cache["objects"][obj]
-            # Make sure its timestamp is within 60s of being retrieved, if not, return None
-            if cached["_timestamp"] + 60 < time.time():  # pragma: no cover
+            # Make sure its timestamp is within the cache TTL of being retrieved, if not, return None
+            if cached["_timestamp"] + peeringdb_cache_ttl < time.time():  # pragma: no cover
                 return None
             # Else its valid, return the cached value
             return cached["value"]
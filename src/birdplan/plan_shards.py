@@ -0,0 +1,295 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan sharded plan directory loading."""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import pathlib
+import pickle  # nosec
+from typing import Any
+
+import jinja2
+
+from .exceptions import BirdPlanError
+from .template_cache import template_environment
+from .yaml import YAML, YAMLError
+
+__all__ = ["PlanShardCache", "load_plan_shards"]
+
+
+# Parse cache file within the plan directory
+PLAN_SHARD_CACHE_FILE = ".birdplan-cache"
+# Parse cache format version, this must be bumped if the cached data changes
+PLAN_SHARD_CACHE_VERSION = 1
+
+# Markers of Jinja2 statements, expressions and comments
+JINJA2_MARKERS = ("{%", "{{", "{#")
+
+# Worker context, this is set in the parent before the pool is forked and inherited by the workers
+_context: dict[str, Any] = {}
+
+
+class PlanShardCache:
+    """
+    Parsed plan shards, indexed by a hash of their rendered content.
+
+    The cache is kept in the plan directory, if it cannot be read or written the shards are just parsed again.
+
+    """
+
+    _cache_file: pathlib.Path
+    _entries: dict[str, Any]
+    _used: set[str]
+    _changed: bool
+
+    def __init__(self, plan_dir: pathlib.Path) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        plan_dir : pathlib.Path
+            Plan directory the cache belongs to.
+
+        """
+
+        self._cache_file = plan_dir / PLAN_SHARD_CACHE_FILE
+        self._entries = {}
+        self._used = set()
+        self._changed = False
+
+        try:
+            with self._cache_file.open("rb") as cache_file:
+                cache = pickle.load(cache_file)  # noqa: S301 # nosec
+        except FileNotFoundError:
+            return
+        except (OSError, pickle.UnpicklingError, EOFError) as err:
+            logging.debug("Ignoring plan shard cache '%s': %s", self._cache_file, err)
+            return
+
+        if isinstance(cache, dict) and cache.get("version") == PLAN_SHARD_CACHE_VERSION:
+            self._entries = cache["entries"]
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Return a parsed shard from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Shard content hash.
+
+        Returns
+        -------
+        tuple[bool, Any]
+            If the shard was found and the parsed shard.
+
+        """
+
+        if key not in self._entries:
+            return False, None
+
+        self._used.add(key)
+        return True, self._entries[key]
+
+    def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """
+        Add a parsed shard to the cache.
+
+        Parameters
+        ----------
+        key : str
+            Shard content hash.
+
+        value : Any
+            Parsed shard.
+
+        """
+
+        self._entries[key] = value
+        self._used.add(key)
+        self._changed = True
+
+    def save(self) -> None:
+        """Save the cache, leaving out shards which were not used in this load."""
+
+        # Skip writing the cache if nothing changed
+        if not self._changed and self._used == set(self._entries):
+            return
+
+        entries = {key: self._entries[key] for key in self._used}
+        cache_file_tmp = self._cache_file.with_name(f"{self._cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with cache_file_tmp.open("wb") as cache_file:
+                pickle.dump({"version": PLAN_SHARD_CACHE_VERSION, "entries": entries}, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            cache_file_tmp.replace(self._cache_file)
+        except OSError as err:
+            logging.debug("Failed to write plan shard cache '%s': %s", self._cache_file, err)
+            cache_file_tmp.unlink(missing_ok=True)
+
+
+def load_plan_shards(plan_dir: pathlib.Path, yaml: YAML, workers: int = 1) -> dict[str, Any]:
+    """
+    Load a sharded plan directory.
+
+    Each "*.yaml" file below the plan directory is a shard, which is rendered with Jinja2 and parsed as a YAML mapping on its
+    own. The shards are merged in path order, a shard cannot redefine a value set by another shard.
+
+    Parsed shards are cached by a hash of their rendered content, so only the shards that changed are parsed again. Shards
+    which are not in the cache are parsed in worker processes if we have more than one worker.
+
+    Parameters
+    ----------
+    plan_dir : pathlib.Path
+        Plan directory.
+
+    yaml : YAML
+        YAML parser to use.
+
+    workers : int
+        Number of worker processes to parse shards with.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Plan configuration.
+
+    """
+
+    shard_files = sorted(path.relative_to(plan_dir).as_posix() for path in plan_dir.rglob("*.yaml") if path.is_file())
+    if not shard_files:
+        raise BirdPlanError(f"No plan shards found in BirdPlan plan directory '{plan_dir}'")
+
+    template_env = template_environment([plan_dir])
+    cache = PlanShardCache(plan_dir)
+
+    # Render the shards and work out which we need to parse
+    shards: dict[str, Any] = {}
+    keys: dict[str, str] = {}
+    to_parse: dict[str, str] = {}
+    for shard_file in shard_files:
+        raw_shard = _render_shard(template_env, plan_dir, shard_file)
+        keys[shard_file] = hashlib.sha256(raw_shard.encode("UTF-8")).hexdigest()
+        found, shards[shard_file] = cache.get(keys[shard_file])
+        if not found:
+            to_parse[shard_file] = raw_shard
+
+    # Parse the shards that changed
+    if to_parse:
+        logging.debug("Parsing %s of %s plan shards in '%s'", len(to_parse), len(shard_files), plan_dir)
+        for shard_file, result in _parse_shards(yaml, to_parse, workers).items():
+            if isinstance(result, YAMLError):
+                raise BirdPlanError(f"Failed to parse BirdPlan plan shard '{plan_dir / shard_file}': {result}")
+            shards[shard_file] = result
+            cache.set(keys[shard_file], result)
+    cache.save()
+
+    # Merge the shards in order
+    plan: dict[str, Any] = {}
+    owners: dict[tuple[str, ...], str] = {}
+    for shard_file in shard_files:
+        shard = shards[shard_file]
+        # Skip empty shards
+        if shard is None:
+            continue
+        if not isinstance(shard, dict):
+            raise BirdPlanError(f"BirdPlan plan shard '{plan_dir / shard_file}' must contain a mapping")
+        _merge_shard(plan, shard, shard_file, (), owners)
+
+    return plan
+
+
+def _render_shard(template_env: jinja2.Environment, plan_dir: pathlib.Path, shard_file: str) -> str:
+    """Render a shard."""
+
+    try:
+        raw_shard = (plan_dir / shard_file).read_text(encoding="UTF-8")
+    except OSError as err:
+        raise BirdPlanError(f"Failed to read BirdPlan plan shard '{plan_dir / shard_file}': {err}") from None
+
+    # Only shards which use Jinja2 need to be rendered, compiling a template costs more than parsing a small shard
+    if any(marker in raw_shard for marker in JINJA2_MARKERS):
+        try:
+            raw_shard = template_env.get_template(shard_file).render()
+        except jinja2.TemplateError as err:
+            raise BirdPlanError(f"Failed to template BirdPlan plan shard '{plan_dir / shard_file}': {err}") from None
+
+    return raw_shard
+
+
+def _parse_shard(shard_file: str) -> Any:  # noqa: ANN401
+    """Parse a shard, within a worker when we're using a pool."""
+
+    try:
+        return _context["yaml"].load(_context["shards"][shard_file])
+    except YAMLError as err:
+        # Return the error instead of raising it, so it is not lost on its way back from the worker
+        return YAMLError(f"{err}")
+
+
+def _parse_shards(yaml: YAML, shards: dict[str, str], workers: int) -> dict[str, Any]:
+    """Parse shards, using a process pool if we have more than one worker."""
+
+    _context["yaml"] = yaml
+    _context["shards"] = shards
+    try:
+        workers = min(workers, len(shards))
+        # Workers inherit the rendered shards, so we can only use the pool on platforms which support forking
+        if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            with multiprocessing.get_context("fork").Pool(processes=workers) as pool:
+                results = pool.map(_parse_shard, shards.keys())
+        else:
+            results = [_parse_shard(shard_file) for shard_file in shards]
+    finally:
+        _context.clear()
+
+    return dict(zip(shards.keys(), results, strict=True))
+
+
+def _merge_shard(
+    plan: dict[str, Any], shard: dict[str, Any], shard_file: str, path: tuple[str, ...], owners: dict[tuple[str, ...], str]
+) -> None:
+    """Merge a shard into the plan, mappings are merged and anything else can only be set once."""
+
+    for key, value in shard.items():
+        item_path = (*path, f"{key}")
+        if key not in plan:
+            plan[key] = value
+            owners[item_path] = shard_file
+            continue
+        if isinstance(plan[key], dict) and isinstance(value, dict):
+            _merge_shard(plan[key], value, shard_file, item_path, owners)
+            continue
+        owner = _owner(owners, item_path)
+        raise BirdPlanError(
+            f"BirdPlan plan shard '{shard_file}' redefines '{':'.join(item_path)}' which is already set in plan shard '{owner}'"
+        )
+
+
+def _owner(owners: dict[tuple[str, ...], str], path: tuple[str, ...]) -> str:
+    """Return the shard that set a plan item."""
+
+    while path:
+        if path in owners:
+            return owners[path]
+        path = path[:-1]
+
+    return "unknown"  # pragma: no cover
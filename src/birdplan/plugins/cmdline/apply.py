@@ -0,0 +1,232 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan commandline options for "birdplan apply"."""
+
+import argparse
+import pathlib
+import time
+from typing import Any
+
+from ...cmdline import BIRD_CONFIG_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult
+from ...config_apply import APPLY_MODES, BirdConfigApply, config_changes, config_fingerprints
+from ...exceptions import BirdPlanError
+from ...reload_scheduler import ReloadScheduler
+from .cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlineApply"]
+
+
+class BirdPlanCmdlineApplyResult(BirdPlanCommandlineResult):
+    """BirdPlan apply result class."""
+
+    def as_text(self) -> str:
+        """
+        Return data as text.
+
+        Returns
+        -------
+        str
+            Data as text.
+
+        """
+
+        if not self.data["applied"]:
+            return "BIRD configuration unchanged, nothing applied\n"
+
+        changes = self.data["changes"]
+
+        text = f"BIRD configuration applied using '{self.data['mode']}' in {self.data['seconds']:.2f}s"
+        if changes["global"]:
+            text += ", global configuration changed"
+        for change in ("added", "changed", "removed"):
+            if changes["peers"][change]:
+                text += f", peers {change}: {', '.join(changes['peers'][change])}"
+        reloaded = [command.split(" ", 1)[1] for command in self.data["commands"] if command.startswith("reload ")]
+        if reloaded:
+            text += f", protocols reloaded: {', '.join(reloaded)}"
+
+        return text + "\n"
+
+
+class BirdPlanCmdlineApply(BirdPlanCmdlinePluginBase):
+    """BirdPlan "apply" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan apply"
+        self.plugin_order = 10
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        root_parser = args["root_parser"]
+
+        subparser = root_parser.add_parser("apply", help="Create BIRD configuration and load it if it changed")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="apply",
+            default="apply",
+            help=argparse.SUPPRESS,
+        )
+
+        # Output filename
+        subparser.add_argument(
+            "-o",
+            "--output-file",
+            nargs=1,
+            metavar="BIRD_CONFIG_FILE",
+            default=[BIRD_CONFIG_FILE],
+            help=f"BIRD config file to output (default: {BIRD_CONFIG_FILE})",
+        )
+
+        # How BIRD picks up the changes
+        subparser.add_argument(
+            "--mode",
+            choices=APPLY_MODES,
+            default="configure",
+            help="Use 'configure', 'configure soft' or 'configure soft' followed by a reload of the changed BGP peers "
+            "(default: configure)",
+        )
+
+        # Limit on reloading the BGP peers that changed
+        subparser.add_argument(
+            "--reload-rate",
+            type=float,
+            default=10.0,
+            metavar="COMMANDS",
+            help="Maximum number of reload commands to send to BIRD each second when using '--mode reload' (default: 10)",
+        )
+
+        # Apply even if nothing changed
+        subparser.add_argument(
+            "--force", action="store_true", default=False, help="Apply the configuration even if nothing changed"
+        )
+
+        # Ignore IRR changes
+        subparser.add_argument(
+            "--ignore-irr-changes", action="store_true", default=False, help="Ignore IRR changes between last run and this run"
+        )
+
+        # Ignore PeeringDB changes
+        subparser.add_argument(
+            "--ignore-peeringdb-changes",
+            action="store_true",
+            default=False,
+            help="Ignore PeeringDB changes between last run and this run",
+        )
+
+        # Use last cached data
+        subparser.add_argument(
+            "--use-cached",
+            action="store_true",
+            default=False,
+            help="Use cached IRR and PeeringDB data instead of doing network requests",
+        )
+
+        # Number of worker processes
+        subparser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            metavar="WORKERS",
+            help="Number of worker processes to use when constructing and rendering BGP peers (default: 1)",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_apply(self, args: dict[str, Any]) -> BirdPlanCmdlineApplyResult:
+        """
+        Commandline handler for "apply" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Load BirdPlan configuration
+        cmdline.birdplan_load_config(
+            ignore_irr_changes=cmdline.args.ignore_irr_changes,
+            ignore_peeringdb_changes=cmdline.args.ignore_peeringdb_changes,
+            use_cached=cmdline.args.use_cached,
+            workers=cmdline.args.workers,
+        )
+        # Grab what we applied last time, before the state is regenerated
+        last_applied = cmdline.birdplan.state.get("apply")
+        # Generate BIRD configuration
+        bird_config = cmdline.birdplan.configure()
+
+        config_file = cmdline.args.output_file[0]
+
+        # Work out what changed since we last applied the configuration
+        fingerprints = config_fingerprints(bird_config)
+        changes = config_changes(last_applied["fingerprints"] if last_applied else None, fingerprints)
+
+        result: dict[str, Any] = {"applied": False, "changes": changes}
+
+        # Only bother BIRD if something changed, or the configuration file went missing
+        if changes["changed"] or cmdline.args.force or not pathlib.Path(config_file).exists():
+            bird_socket = cmdline.args.bird_socket[0]
+            reload_scheduler = ReloadScheduler(bird_socket, rate=cmdline.args.reload_rate)
+            bird_apply = BirdConfigApply(bird_socket, reload_scheduler=reload_scheduler)
+            result.update(bird_apply.apply(config_file, bird_config, changes, cmdline.args.mode, state=cmdline.birdplan.state))
+            result["applied"] = True
+            # Forget the fingerprints of the peers which failed to reload, so they are reloaded again next time
+            for peer in result["errors"]:
+                fingerprints["peers"][peer]["fingerprint"] = None
+            # Record what we applied, so we can tell what changed next time
+            cmdline.birdplan.state["apply"] = {
+                "fingerprints": fingerprints,
+                "timestamp": time.time(),
+                "mode": result["mode"],
+                "commands": result["commands"],
+                "seconds": result["seconds"],
+            }
+        elif last_applied:
+            cmdline.birdplan.state["apply"] = last_applied
+
+        # Commit BirdPlan state, BIRD has loaded the configuration even if some peers failed to reload
+        cmdline.birdplan_commit_state()
+
+        # Now that we've recorded what we applied, let the user know about the peers which failed to reload
+        if result.get("errors"):
+            errors = "\n".join(f"  {peer}: {error}" for peer, error in result["errors"].items())
+            raise BirdPlanError(f"Failed to reload {len(result['errors'])} BGP peer(s):\n{errors}")
+
+        return BirdPlanCmdlineApplyResult(result)
@@ -140,6 +140,14 @@ class BirdPlanCmdlineBGPPeerGracefulShutdownShow(BirdPlanCmdlinePluginBase):
             help=argparse.SUPPRESS,
         )
 
+        subparser.add_argument(
+            "--only",
+            nargs=1,
+            default=None,
+            metavar="ONLY",
+            help="Limit output to: PEER or AS<NUMBER>",
+        )
+
         # Set our internal subparser property
         self._subparser = subparser
         self._subparsers = None
@@ -166,7 +174,12 @@ class BirdPlanCmdlineBGPPeerGracefulShutdownShow(BirdPlanCmdlinePluginBase):
         # Load BirdPlan configuration using the cache
         cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
 
+        # Work out which peers we're limiting the output to
+        peers = None
+        if cmdline.args.only:
+            peers = cmdline.birdplan_bgp_only_peers(cmdline.args.only[0])
+
         # Grab peer list
-        res: BirdPlanBGPPeerGracefulShutdownStatus = cmdline.birdplan.state_bgp_peer_graceful_shutdown_status()
+        res: BirdPlanBGPPeerGracefulShutdownStatus = cmdline.birdplan.state_bgp_peer_graceful_shutdown_status(peers=peers)
 
         return BirdPlanCmdlineBGPPeerGracefulShutdownShowResult(res)
@@ -21,7 +21,7 @@
 import argparse
 from typing import Any
 
-from ......cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ......cmdline import BIRD_CONFIG_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult
 from ....cmdline_plugin import BirdPlanCmdlinePluginBase
 
 __all__ = ["BirdPlanCmdlineBGPPeerQuarantineRemove"]
@@ -72,6 +72,22 @@ class BirdPlanCmdlineBGPPeerQuarantineRemove(BirdPlanCmdlinePluginBase):
             help="Peer name (* = pattern match character)",
         )
 
+        # Apply to the BIRD configuration
+        subparser.add_argument(
+            "--apply",
+            action="store_true",
+            default=False,
+            help="Apply the quarantine override to the BIRD configuration file, only re-rendering peers that changed",
+        )
+        subparser.add_argument(
+            "-o",
+            "--output-file",
+            nargs=1,
+            metavar="BIRD_CONFIG_FILE",
+            default=[BIRD_CONFIG_FILE],
+            help=f"BIRD config file to apply the override to when using --apply (default: {BIRD_CONFIG_FILE})",
+        )
+
         # Set our internal subparser property
         self._subparser = subparser
         self._subparsers = None
@@ -104,7 +120,16 @@ class BirdPlanCmdlineBGPPeerQuarantineRemove(BirdPlanCmdlinePluginBase):
         # Try remove quarantine override flag
         cmdline.birdplan.state_bgp_peer_quarantine_remove(peer)
 
+        # Check if we're applying the override to the BIRD configuration
+        summary = None
+        if cmdline.args.apply:
+            summary = cmdline.birdplan_configure_overrides(cmdline.args.output_file[0])
+
         # Commit BirdPlan our state
         cmdline.birdplan_commit_state()
 
-        return BirdPlanCommandlineResult(f"BGP quarantine REMOVED from peer(s) matching '{peer}'")
+        result = f"BGP quarantine REMOVED from peer(s) matching '{peer}'"
+        if summary:
+            result += f"\n{summary}"
+
+        return BirdPlanCommandlineResult(result)
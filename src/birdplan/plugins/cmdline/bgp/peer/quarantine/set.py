@@ -21,7 +21,7 @@
 import argparse
 from typing import Any
 
-from ......cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ......cmdline import BIRD_CONFIG_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult
 from ......exceptions import BirdPlanUsageError
 from ....cmdline_plugin import BirdPlanCmdlinePluginBase
 
@@ -77,6 +77,22 @@ class BirdPlanCmdlineBGPPeerQuarantineSet(BirdPlanCmdlinePluginBase):
             help="Flag value ('true' or 'false')",
         )
 
+        # Apply to the BIRD configuration
+        subparser.add_argument(
+            "--apply",
+            action="store_true",
+            default=False,
+            help="Apply the quarantine override to the BIRD configuration file, only re-rendering peers that changed",
+        )
+        subparser.add_argument(
+            "-o",
+            "--output-file",
+            nargs=1,
+            metavar="BIRD_CONFIG_FILE",
+            default=[BIRD_CONFIG_FILE],
+            help=f"BIRD config file to apply the override to when using --apply (default: {BIRD_CONFIG_FILE})",
+        )
+
         # Set our internal subparser property
         self._subparser = subparser
         self._subparsers = None
@@ -114,9 +130,18 @@ class BirdPlanCmdlineBGPPeerQuarantineSet(BirdPlanCmdlinePluginBase):
         # Try set quarantine flag
         cmdline.birdplan.state_bgp_peer_quarantine_set(peer, value)
 
+        # Check if we're applying the override to the BIRD configuration
+        summary = None
+        if cmdline.args.apply:
+            summary = cmdline.birdplan_configure_overrides(cmdline.args.output_file[0])
+
         # Commit BirdPlan our state
         cmdline.birdplan_commit_state()
 
         status = "ENABLED" if value else "DISABLED"
 
-        return BirdPlanCommandlineResult(f"BGP quarantine {status} for peer(s) matching '{peer}'")
+        result = f"BGP quarantine {status} for peer(s) matching '{peer}'"
+        if summary:
+            result += f"\n{summary}"
+
+        return BirdPlanCommandlineResult(result)
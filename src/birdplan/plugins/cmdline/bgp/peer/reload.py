@@ -0,0 +1,156 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan commandline options for BGP peer reload [<peer> ...]."""
+
+import argparse
+import io
+from typing import Any
+
+from .....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from .....exceptions import BirdPlanError
+from .....reload_scheduler import RELOAD_DIRECTIONS
+from ...cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlineBGPPeerReload"]
+
+
+class BirdPlanCmdlineBGPPeerReloadResult(BirdPlanCommandlineResult):
+    """BirdPlan BGP peer reload result."""
+
+    def as_text(self) -> str:
+        """
+        Return data in text format.
+
+        Returns
+        -------
+        str
+            Return data in text format.
+
+        """
+
+        ob = io.StringIO()
+
+        for peer, result in self.data["peers"].items():
+            ob.write(f"{peer}: reloaded {', '.join(command.split(' ')[-1] for command in result['commands'])}\n")
+        ob.write(f"Reloaded {len(self.data['peers'])} BGP peer(s) in {self.data['seconds']:.1f}s\n")
+
+        return ob.getvalue()
+
+
+class BirdPlanCmdlineBGPPeerReload(BirdPlanCmdlinePluginBase):
+    """BirdPlan "bgp peer reload [<peer> ...]" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan bgp peer reload [<peer> ...]"
+        self.plugin_order = 30
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        plugins = args["plugins"]
+
+        parent_subparsers = plugins.call_plugin("birdplan.plugins.cmdline.bgp.peer", "get_subparsers", {})
+
+        # CMD: bgp peer reload [<peer> ...]
+        subparser = parent_subparsers.add_parser("reload", help="Reload BGP peers, staggered and rate limited")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="bgp_peer_reload",
+            default="bgp_peer_reload",
+            help=argparse.SUPPRESS,
+        )
+
+        subparser.add_argument(
+            "--direction",
+            choices=RELOAD_DIRECTIONS,
+            default="both",
+            help="Reload the routes we import, export or both (default: both)",
+        )
+
+        subparser.add_argument(
+            "--rate",
+            type=float,
+            default=10.0,
+            metavar="COMMANDS",
+            help="Maximum number of reload commands to send to BIRD each second (default: 10)",
+        )
+
+        subparser.add_argument(
+            "peer",
+            nargs="*",
+            metavar="PEER",
+            help="Peers to reload (their BirdPlan names), defaults to all peers",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_bgp_peer_reload(self, args: dict[str, Any]) -> BirdPlanCmdlineBGPPeerReloadResult:
+        """
+        Commandline handler for "bgp peer reload [<peer> ...]" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        if not self._subparser:  # pragma: no cover
+            raise RuntimeError
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Suppress info output
+        cmdline.birdplan.birdconf.birdconfig_globals.suppress_info = True
+
+        # Load BirdPlan configuration using the cache
+        cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
+
+        result = cmdline.birdplan.state_bgp_peer_reload(
+            cmdline.args.peer or None,
+            direction=cmdline.args.direction,
+            rate=cmdline.args.rate,
+            bird_socket=cmdline.args.bird_socket[0],
+        )
+
+        # Let the caller know if any of the peers failed, the others have been reloaded
+        failed = [peer for peer, peer_result in result["peers"].items() if peer_result["error"]]
+        if failed:
+            errors = "\n".join(f"  {peer}: {result['peers'][peer]['error']}" for peer in failed)
+            raise BirdPlanError(f"Failed to reload {len(failed)} of {len(result['peers'])} BGP peer(s):\n{errors}")
+
+        return BirdPlanCmdlineBGPPeerReloadResult(result)
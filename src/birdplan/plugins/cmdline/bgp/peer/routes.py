@@ -0,0 +1,252 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan commandline options for BGP peer routes <peer>."""
+
+import argparse
+import json
+import sys
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ...cmdline_plugin import BirdPlanCmdlinePluginBase
+
+if TYPE_CHECKING:
+    from birdplan import BirdPlanBGPPeerRoute
+
+__all__ = ["BirdPlanCmdlineBGPPeerRoutesPeerArg"]
+
+
+class BirdPlanCmdlineBGPPeerRoutesPeerArgResult(BirdPlanCommandlineResult):
+    """
+    BirdPlan BGP peer routes peer result.
+
+    The data is an iterator of routes which is consumed as the routes are output, one route per line.
+
+    """
+
+    def as_text(self) -> str:
+        """
+        Return data in text format.
+
+        Returns
+        -------
+        str
+            Return data in text format.
+
+        """
+
+        return "".join(self.text_lines())
+
+    def as_json(self) -> str:
+        """
+        Return data as JSON Lines.
+
+        Returns
+        -------
+        str
+            Return data as JSON Lines.
+
+        """
+
+        return "".join(self.json_lines())
+
+    def text_lines(self) -> Iterator[str]:
+        """
+        Return an iterator of routes in text format.
+
+        Returns
+        -------
+        Iterator[str]
+            Iterator of text lines, one per route.
+
+        """
+
+        route: BirdPlanBGPPeerRoute
+        for route in self.data:
+            primary = "*" if route["primary"] else " "
+            nexthops = ", ".join(route["nexthops"]) or "-"
+            as_path = route["attributes"].get("BGP.as_path", "")
+            yield f"{route['prefix']:<20} {primary} {route['protocol']} ({route['preference']}) {nexthops} [{as_path}]\n"
+
+    def json_lines(self) -> Iterator[str]:
+        """
+        Return an iterator of routes in JSON Lines format.
+
+        Returns
+        -------
+        Iterator[str]
+            Iterator of JSON lines, one per route.
+
+        """
+
+        for route in self.data:
+            yield json.dumps(route) + "\n"
+
+    def write(self, fp: TextIO, as_json: bool = False) -> int:  # noqa: FBT001,FBT002
+        """
+        Write routes to a file as they are received.
+
+        Parameters
+        ----------
+        fp : TextIO
+            File to write to.
+
+        as_json : bool
+            Write routes in JSON Lines format.
+
+        Returns
+        -------
+        int
+            Number of routes written.
+
+        """
+
+        count = 0
+        for line in self.json_lines() if as_json else self.text_lines():
+            fp.write(line)
+            fp.flush()
+            count += 1
+
+        return count
+
+
+class BirdPlanCmdlineBGPPeerRoutesPeerArg(BirdPlanCmdlinePluginBase):
+    """BirdPlan "bgp peer routes <peer>" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan bgp peer routes <peer>"
+        self.plugin_order = 30
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        plugins = args["plugins"]
+
+        parent_subparsers = plugins.call_plugin("birdplan.plugins.cmdline.bgp.peer", "get_subparsers", {})
+
+        # CMD: bgp peer routes <peer>
+        subparser = parent_subparsers.add_parser("routes", help="BGP peer routes commands")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="bgp_peer_routes",
+            default="bgp_peer_routes",
+            help=argparse.SUPPRESS,
+        )
+
+        # Allow limiting the output to a single IP version
+        ipv_group = subparser.add_mutually_exclusive_group()
+        ipv_group.add_argument(
+            "--ipv4",
+            action="store_const",
+            const="ipv4",
+            dest="ipv",
+            help="Only output IPv4 routes",
+        )
+        ipv_group.add_argument(
+            "--ipv6",
+            action="store_const",
+            const="ipv6",
+            dest="ipv",
+            help="Only output IPv6 routes",
+        )
+
+        subparser.add_argument(
+            "--filtered",
+            action="store_true",
+            default=False,
+            help="Output the routes rejected by the import filter",
+        )
+
+        # Allow JSON output to be specified after the command too, the global option must be specified before it
+        subparser.add_argument(
+            "-j",
+            "--json",
+            action="store_true",
+            default=False,
+            dest="routes_json",
+            help="Output routes in JSON Lines format",
+        )
+
+        subparser.add_argument(
+            "peer",
+            nargs=1,
+            metavar="PEER",
+            help="Peer to output routes for (its BirdPlan name)",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_bgp_peer_routes(self, args: dict[str, Any]) -> BirdPlanCmdlineBGPPeerRoutesPeerArgResult:
+        """
+        Commandline handler for "bgp peer routes <peer>" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        if not self._subparser:  # pragma: no cover
+            raise RuntimeError
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Grab Bird control socket
+        bird_socket = cmdline.args.bird_socket[0]
+
+        # Grab the peer
+        peer = cmdline.args.peer[0]
+
+        # Suppress info output
+        cmdline.birdplan.birdconf.birdconfig_globals.suppress_info = True
+
+        # Load BirdPlan configuration using the cache
+        cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
+
+        # Grab the route stream
+        routes = cmdline.birdplan.state_bgp_peer_routes(
+            peer, ipv=cmdline.args.ipv, filtered=cmdline.args.filtered, bird_socket=bird_socket
+        )
+
+        # If we're on the console, output the routes as we receive them rather than buffering them
+        if cmdline.is_console:
+            result = BirdPlanCmdlineBGPPeerRoutesPeerArgResult(routes, has_console_output=False)
+            result.write(sys.stdout, as_json=cmdline.args.json or cmdline.args.routes_json)
+            return result
+
+        return BirdPlanCmdlineBGPPeerRoutesPeerArgResult(routes)
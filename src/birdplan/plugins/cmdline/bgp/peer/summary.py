@@ -22,7 +22,7 @@ import argparse
 import io
 from typing import TYPE_CHECKING, Any
 
-from .....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from .....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult, parse_only_asn
 from .....console.colors import colored
 from .....exceptions import BirdPlanUsageError
 from ...cmdline_plugin import BirdPlanCmdlinePluginBase
@@ -167,12 +167,9 @@ class BirdPlanCmdlineBGPPeerShow(BirdPlanCmdlinePluginBase):
         # Validate extra options
         arg_only = None
         if cmdline.args.only:
-            if cmdline.args.only[0][0:2] != "AS":
+            arg_only = parse_only_asn(cmdline.args.only[0])
+            if arg_only is None:
                 raise BirdPlanUsageError("Invalid value for --only, must be AS<NUMBER>")
-            if int(cmdline.args.only[0]) < 1:
-                raise BirdPlanUsageError("Invalid value for --only, must be AS<NUMBER>")
-            # Save the arg for later
-            arg_only = cmdline.args.only[0]
 
         # Grab Bird control socket
         bird_socket = cmdline.args.bird_socket[0]
@@ -183,11 +180,7 @@ class BirdPlanCmdlineBGPPeerShow(BirdPlanCmdlinePluginBase):
         # Load BirdPlan configuration using the cache
         cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
 
-        # Grab peer list
-        peer_list: BirdPlanBGPPeerSummary = cmdline.birdplan.state_bgp_peer_summary(bird_socket=bird_socket)
-
-        # Check if we're filtering on a specific AS
-        if arg_only and arg_only[0:2] == "AS":
-            peer_list = {k: v for k, v in peer_list.items() if v["asn"] == int(arg_only[2:])}
+        # Grab peer list, looking up the peers directly if we're filtering on a specific AS
+        peer_list: BirdPlanBGPPeerSummary = cmdline.birdplan.state_bgp_peer_summary(bird_socket=bird_socket, asn=arg_only)
 
         return BirdPlanCmdlineBGPPeerShowResult(peer_list)
@@ -0,0 +1,179 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan commandline options for "birdplan cache refresh"."""
+
+import argparse
+import io
+from typing import Any
+
+from ....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ....exceptions import BirdPlanError
+from ..cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlineCacheRefresh"]
+
+
+class BirdPlanCmdlineCacheRefreshResult(BirdPlanCommandlineResult):
+    """BirdPlan cache refresh result."""
+
+    def as_text(self) -> str:
+        """
+        Return data in text format.
+
+        Returns
+        -------
+        str
+            Return data in text format.
+
+        """
+
+        ob = io.StringIO()
+
+        for peer, result in self.data["peers"].items():
+            ob.write(f"{peer}: refreshed {', '.join(result['refreshed']) or 'nothing'}\n")
+        ob.write(f"Refreshed cached information for {len(self.data['peers'])} BGP peer(s) in {self.data['seconds']:.1f}s\n")
+
+        return ob.getvalue()
+
+
+class BirdPlanCmdlineCacheRefresh(BirdPlanCmdlinePluginBase):
+    """BirdPlan "cache refresh" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan cache refresh"
+        self.plugin_order = 20
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        plugins = args["plugins"]
+
+        parent_subparsers = plugins.call_plugin("birdplan.plugins.cmdline.cache", "get_subparsers", {})
+
+        # CMD: cache refresh
+        subparser = parent_subparsers.add_parser("refresh", help="Refresh cached IRR and PeeringDB information")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="cache_refresh",
+            default="cache_refresh",
+            help=argparse.SUPPRESS,
+        )
+
+        subparser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            metavar="PEERS",
+            help="Maximum number of BGP peers to refresh at the same time (default: 4)",
+        )
+
+        subparser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.0,
+            metavar="SECONDS",
+            help="Maximum number of seconds to randomly delay each BGP peer by (default: 0)",
+        )
+
+        subparser.add_argument(
+            "--retries",
+            type=int,
+            default=3,
+            help="Number of times to retry a failed lookup, backing off exponentially (default: 3)",
+        )
+
+        # Ignore IRR changes
+        subparser.add_argument(
+            "--ignore-irr-changes", action="store_true", default=False, help="Ignore IRR changes between last run and this run"
+        )
+
+        # Ignore PeeringDB changes
+        subparser.add_argument(
+            "--ignore-peeringdb-changes",
+            action="store_true",
+            default=False,
+            help="Ignore PeeringDB changes between last run and this run",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_cache_refresh(self, args: dict[str, Any]) -> BirdPlanCmdlineCacheRefreshResult:
+        """
+        Commandline handler for "cache refresh" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        if not self._subparser:  # pragma: no cover
+            raise RuntimeError
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Suppress info output
+        cmdline.birdplan.birdconf.birdconfig_globals.suppress_info = True
+        # We're refreshing the cache, so peers which are missing cached information must not stop us loading the configuration
+        cmdline.birdplan.birdconf.birdconfig_globals.validate_only = True
+
+        # Load BirdPlan configuration using the cache
+        cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
+
+        result = cmdline.birdplan.state_cache_refresh(
+            concurrency=cmdline.args.concurrency,
+            jitter=cmdline.args.jitter,
+            retries=cmdline.args.retries,
+            ignore_irr_changes=cmdline.args.ignore_irr_changes,
+            ignore_peeringdb_changes=cmdline.args.ignore_peeringdb_changes,
+        )
+
+        # Commit the information we did refresh, even if some of it failed
+        cmdline.birdplan.commit_state()
+
+        # Let the caller know if any of the lookups failed
+        failed = [
+            (peer, source, error)
+            for peer, peer_result in result["peers"].items()
+            for source, error in peer_result["errors"].items()
+        ]
+        if failed:
+            errors = "\n".join(f"  {peer} ({source}): {error}" for peer, source, error in failed)
+            raise BirdPlanError(f"Failed to refresh cached information for {len(failed)} lookup(s):\n{errors}")
+
+        return BirdPlanCmdlineCacheRefreshResult(result)
@@ -19,13 +19,12 @@
 """BirdPlan commandline options for "birdplan configure"."""
 
 import argparse
-import grp
-import os
-import pwd
+import logging
 from typing import Any
 
-from ...cmdline import BIRD_CONFIG_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult
-from ...exceptions import BirdPlanError
+from ...bird_config.config_stats import config_stats_summary
+from ...bird_config.sections.protocols.bgp.rib_estimate import rib_table_estimate_summary
+from ...cmdline import BIRD_CONFIG_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult, write_config_file
 from .cmdline_plugin import BirdPlanCmdlinePluginBase
 
 __all__ = ["BirdPlanCmdlineConfigure"]
@@ -102,6 +101,26 @@ class BirdPlanCmdlineConfigure(BirdPlanCmdlinePluginBase):
             help="Use cached IRR and PeeringDB data instead of doing network requests",
         )
 
+        # Number of worker processes
+        subparser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            metavar="WORKERS",
+            help="Number of worker processes to use when constructing and rendering BGP peers (default: 1)",
+        )
+
+        # Configuration size statistics
+        subparser.add_argument(
+            "--stats",
+            nargs="?",
+            type=int,
+            const=10,
+            default=None,
+            metavar="COUNT",
+            help="Output the sections and BGP peers contributing most to the configuration size (default: 10)",
+        )
+
         # Set our internal subparser property
         self._subparser = subparser
         self._subparsers = None
@@ -124,10 +143,25 @@ class BirdPlanCmdlineConfigure(BirdPlanCmdlinePluginBase):
             ignore_irr_changes=cmdline.args.ignore_irr_changes,
             ignore_peeringdb_changes=cmdline.args.ignore_peeringdb_changes,
             use_cached=cmdline.args.use_cached,
+            workers=cmdline.args.workers,
         )
         # Generate BIRD configuration
         bird_config = cmdline.birdplan.configure()
 
+        # Report how many routes the BGP peer import and export tables are expected to hold
+        if not cmdline.birdplan.birdconf.birdconfig_globals.suppress_info:
+            for ipv, estimate in cmdline.birdplan.bgp_table_estimate().items():
+                if not estimate["peers"]:
+                    continue
+                for line in rib_table_estimate_summary(estimate):
+                    logging.info("BGP %s peer table estimate for %s", ipv, line)
+
+        # Report the sections and peers contributing most to the size of the configuration
+        stats = cmdline.birdplan.birdconf.config_stats
+        if cmdline.args.stats and stats:
+            for line in config_stats_summary(stats, cmdline.args.stats):
+                logging.info("BIRD configuration size for %s", line)
+
         # Commit BirdPlan state
         cmdline.birdplan_commit_state()
 
@@ -155,29 +189,7 @@ class BirdPlanCmdlineConfigure(BirdPlanCmdlinePluginBase):
         if not self.config_filename:
             raise RuntimeError("Attribute 'config_filename' must be set")
 
-        # Get birdplan user id
-        try:
-            birdplan_uid = pwd.getpwnam("birdplan").pw_uid
-        except KeyError:
-            birdplan_uid = -1
-
-        # Get bird group id
-        try:
-            bird_gid = grp.getgrnam("bird").gr_gid
-        except KeyError:
-            bird_gid = None
-
-        # Write out config file
-        try:
-            fd = os.open(self.config_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
-            # If we have a bird group, set it
-            if bird_gid:
-                os.fchown(fd, birdplan_uid, bird_gid)
-            # Write out config
-            with os.fdopen(fd, "w") as config_file:
-                config_file.write(data)
-        except OSError as err:  # pragma: no cover
-            raise BirdPlanError(f"Failed to open '{self.config_filename}' for writing: {err}") from None
+        write_config_file(self.config_filename, data)
 
     @property
     def config_filename(self) -> str | None:
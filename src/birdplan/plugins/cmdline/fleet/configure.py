@@ -0,0 +1,191 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan commandline options for "birdplan fleet configure"."""
+
+import argparse
+import io
+import os
+import pathlib
+from typing import Any
+
+from ....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ....exceptions import BirdPlanError
+from ....fleet import FleetConfigure, FleetRouter
+from ..cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlineFleetConfigure"]
+
+
+class BirdPlanCmdlineFleetConfigureResult(BirdPlanCommandlineResult):
+    """BirdPlan fleet configure result class."""
+
+    def as_text(self) -> str:
+        """
+        Return data as text.
+
+        Returns
+        -------
+        str
+            Data as text.
+
+        """
+
+        ob = io.StringIO()
+
+        for name, result in self.data.items():
+            if result["error"]:
+                ob.write(f"{name}: FAILED ({result['seconds']:.1f}s): {result['error']}\n")
+            else:
+                ob.write(f"{name}: configuration written to '{result['output_file']}' ({result['seconds']:.1f}s)\n")
+
+        return ob.getvalue()
+
+
+class BirdPlanCmdlineFleetConfigure(BirdPlanCmdlinePluginBase):
+    """BirdPlan "fleet configure" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan fleet configure"
+        self.plugin_order = 20
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        plugins = args["plugins"]
+
+        parent_subparsers = plugins.call_plugin("birdplan.plugins.cmdline.fleet", "get_subparsers", {})
+
+        # CMD: fleet configure
+        subparser = parent_subparsers.add_parser("configure", help="Create BIRD configuration for a fleet of routers")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="fleet_configure",
+            default="fleet_configure",
+            help=argparse.SUPPRESS,
+        )
+
+        # Routers to configure
+        subparser.add_argument(
+            "-r",
+            "--router",
+            action="append",
+            default=[],
+            metavar="NAME=PLAN_FILE,STATE_FILE,BIRD_CONFIG_FILE",
+            help="Router to configure, can be specified multiple times",
+        )
+
+        # File with routers to configure
+        subparser.add_argument(
+            "--router-file",
+            nargs=1,
+            metavar="ROUTER_FILE",
+            help="File with routers to configure, one per line in the same format as --router",
+        )
+
+        # Ignore IRR changes
+        subparser.add_argument(
+            "--ignore-irr-changes", action="store_true", default=False, help="Ignore IRR changes between last run and this run"
+        )
+
+        # Ignore PeeringDB changes
+        subparser.add_argument(
+            "--ignore-peeringdb-changes",
+            action="store_true",
+            default=False,
+            help="Ignore PeeringDB changes between last run and this run",
+        )
+
+        # Use last cached data
+        subparser.add_argument(
+            "--use-cached",
+            action="store_true",
+            default=False,
+            help="Use cached IRR and PeeringDB data instead of doing network requests",
+        )
+
+        # Number of worker processes
+        subparser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            metavar="WORKERS",
+            help="Number of worker processes to configure routers with (default: number of CPUs)",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_fleet_configure(self, args: dict[str, Any]) -> BirdPlanCmdlineFleetConfigureResult:
+        """
+        Commandline handler for "fleet configure" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        if not self._subparser:  # pragma: no cover
+            raise RuntimeError
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Grab the routers from the commandline and router file
+        router_args: list[str] = list(cmdline.args.router)
+        if cmdline.args.router_file:
+            router_file = pathlib.Path(cmdline.args.router_file[0])
+            try:
+                router_lines = router_file.read_text(encoding="UTF-8").splitlines()
+            except OSError as err:
+                raise BirdPlanError(f"Failed to read fleet router file '{router_file}': {err}") from None
+            router_args.extend(line.strip() for line in router_lines if line.strip() and not line.strip().startswith("#"))
+
+        fleet = FleetConfigure([FleetRouter.from_arg(arg) for arg in router_args], workers=cmdline.args.workers)
+
+        results = fleet.run(
+            ignore_irr_changes=cmdline.args.ignore_irr_changes,
+            ignore_peeringdb_changes=cmdline.args.ignore_peeringdb_changes,
+            use_cached=cmdline.args.use_cached,
+            write_state=not cmdline.args.no_write_state,
+        )
+
+        # Let the caller know if any of the routers failed, the others have been configured
+        failed = [name for name, result in results.items() if result["error"]]
+        if failed:
+            errors = "\n".join(f"  {name}: {results[name]['error']}" for name in failed)
+            raise BirdPlanError(f"Failed to configure {len(failed)} of {len(results)} fleet router(s):\n{errors}")
+
+        return BirdPlanCmdlineFleetConfigureResult(results)
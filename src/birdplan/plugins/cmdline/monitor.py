@@ -19,13 +19,12 @@
 """BirdPlan commandline options for "birdplan monitor"."""
 
 import argparse
-import json
-import logging
 import pathlib
 from typing import Any
 
-from ...cmdline import BIRDPLAN_MONITOR_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult
-from ...exceptions import BirdPlanError
+from ...cmdline import BIRDPLAN_MONITOR_FILE, BirdPlanCommandLine, BirdPlanCommandlineResult, write_monitor_file
+from ...exceptions import BirdPlanUsageError
+from ...monitor_events import monitor_events, write_monitor_events
 from .cmdline_plugin import BirdPlanCmdlinePluginBase
 
 __all__ = ["BirdPlanCmdlineMonitor"]
@@ -81,6 +80,22 @@ class BirdPlanCmdlineMonitor(BirdPlanCmdlinePluginBase):
             help=f"Monitor filename to output to, using '-' will output to stdout (default: {BIRDPLAN_MONITOR_FILE})",
         )
 
+        # State transition events
+        subparser.add_argument(
+            "--event-log",
+            nargs=1,
+            metavar="EVENT_LOG_FILE",
+            default=[None],
+            help="Append peer and protocol state transitions to this file in JSON Lines format, requires a monitor file",
+        )
+        subparser.add_argument(
+            "--event-socket",
+            nargs=1,
+            metavar="EVENT_SOCKET",
+            default=[None],
+            help="Send peer and protocol state transitions to this UNIX socket in JSON Lines format, requires a monitor file",
+        )
+
         # Set our internal subparser property
         self._subparser = subparser
         self._subparsers = None
@@ -98,6 +113,11 @@ class BirdPlanCmdlineMonitor(BirdPlanCmdlinePluginBase):
 
         cmdline: BirdPlanCommandLine = args["cmdline"]
 
+        # State transitions are worked out against the previous snapshot in the monitor file, so we need one
+        output_file = cmdline.args.output_file[0]
+        if (not output_file or output_file == "-") and (cmdline.args.event_log[0] or cmdline.args.event_socket[0]):
+            raise BirdPlanUsageError("Options '--event-log' and '--event-socket' require a monitor output file", self._subparser)
+
         # Grab Bird control socket
         bird_socket = cmdline.args.bird_socket[0]
 
@@ -107,9 +127,6 @@ class BirdPlanCmdlineMonitor(BirdPlanCmdlinePluginBase):
         # Load BirdPlan configuration
         cmdline.birdplan_load_config(ignore_irr_changes=True, ignore_peeringdb_changes=True, use_cached=True)
 
-        # Save the output filename
-        self.output_filename = cmdline.args.output_file[0]
-
         # Grab information to return
         bgp_protocol = cmdline.birdplan.state_bgp_peer_summary(bird_socket=bird_socket)
         ospf_protocol = cmdline.birdplan.state_ospf_summary(bird_socket=bird_socket)
@@ -120,35 +137,48 @@ class BirdPlanCmdlineMonitor(BirdPlanCmdlinePluginBase):
             "ospf": ospf_protocol,
         }
 
-        # If we're outputting to file, write it here
-        if self.output_filename and self.output_filename != "-":
-            self._write_monitor_file(monitor_status)
-            return BirdPlanCommandlineResult(monitor_status, has_console_output=False)
+        # If we're outputting to stdout, there is no previous snapshot to compare against
+        if not output_file or output_file == "-":
+            return BirdPlanCommandlineResult(monitor_status)
+
+        # Save the output filename
+        self.output_filename = pathlib.Path(output_file)
 
-        return BirdPlanCommandlineResult(monitor_status)
+        # Write out the monitor file if it changed and work out what changed since the previous snapshot
+        previous_status = self._write_monitor_file(monitor_status)
 
-    def _write_monitor_file(self, data: dict[str, Any]) -> None:
+        # Write out any state transitions
+        event_log = cmdline.args.event_log[0]
+        event_socket = cmdline.args.event_socket[0]
+        if event_log or event_socket:
+            write_monitor_events(
+                monitor_events(previous_status, monitor_status),
+                event_log=pathlib.Path(event_log) if event_log else None,
+                event_socket=event_socket,
+            )
+
+        return BirdPlanCommandlineResult(monitor_status, has_console_output=False)
+
+    def _write_monitor_file(self, data: dict[str, Any]) -> dict[str, Any] | None:
         """
-        Write out monitor file with data.
+        Write out monitor file with data, if it changed.
 
         Parameters
         ----------
         data : str
             Monitor data.
 
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Previous monitor data if we had any.
+
         """
 
         if not self.output_filename:
             raise RuntimeError("Attribute 'output_filename' must be set")
 
-        # Write out config file
-        try:
-            with self.output_filename.open("w", encoding="UTF-8") as config_file:
-                # Write out data json
-                logging.debug("Writing monitor file '%s'", self.output_filename)
-                config_file.write(json.dumps(data, indent=4, sort_keys=True))
-        except OSError as err:  # pragma: no cover
-            raise BirdPlanError(f"Failed to open '{self.output_filename}' for writing: {err}") from None
+        return write_monitor_file(self.output_filename, data)
 
     @property
     def output_filename(self) -> pathlib.Path | None:
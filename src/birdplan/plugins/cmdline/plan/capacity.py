@@ -0,0 +1,137 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan commandline options for "birdplan plan capacity"."""
+
+import argparse
+from typing import Any
+
+from ....capacity import capacity_estimate_summary
+from ....cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from ..cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlinePlanCapacity"]
+
+
+class BirdPlanCmdlinePlanCapacityResult(BirdPlanCommandlineResult):
+    """BirdPlan plan capacity result class."""
+
+    def as_text(self) -> str:
+        """
+        Return data as text.
+
+        Returns
+        -------
+        str
+            Data as text.
+
+        """
+
+        return "\n".join(capacity_estimate_summary(self.data)) + "\n"
+
+
+class BirdPlanCmdlinePlanCapacity(BirdPlanCmdlinePluginBase):
+    """BirdPlan "plan capacity" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan plan capacity"
+        self.plugin_order = 20
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        plugins = args["plugins"]
+
+        parent_subparsers = plugins.call_plugin("birdplan.plugins.cmdline.plan", "get_subparsers", {})
+
+        # CMD: plan capacity
+        subparser = parent_subparsers.add_parser("capacity", help="Estimate BIRD table sizes and memory use")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="plan_capacity",
+            default="plan_capacity",
+            help=argparse.SUPPRESS,
+        )
+
+        # Ignore IRR changes
+        subparser.add_argument(
+            "--ignore-irr-changes", action="store_true", default=False, help="Ignore IRR changes between last run and this run"
+        )
+
+        # Ignore PeeringDB changes
+        subparser.add_argument(
+            "--ignore-peeringdb-changes",
+            action="store_true",
+            default=False,
+            help="Ignore PeeringDB changes between last run and this run",
+        )
+
+        # Use last cached data
+        subparser.add_argument(
+            "--use-cached",
+            action="store_true",
+            default=False,
+            help="Use cached IRR and PeeringDB data instead of doing network requests",
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_plan_capacity(self, args: dict[str, Any]) -> BirdPlanCmdlinePlanCapacityResult:
+        """
+        Commandline handler for "plan capacity" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        if not self._subparser:  # pragma: no cover
+            raise RuntimeError
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Load BirdPlan configuration
+        cmdline.birdplan_load_config(
+            ignore_irr_changes=cmdline.args.ignore_irr_changes,
+            ignore_peeringdb_changes=cmdline.args.ignore_peeringdb_changes,
+            use_cached=cmdline.args.use_cached,
+        )
+        # Generate the BIRD configuration, which is not written out, as the estimate is based on the peer state
+        cmdline.birdplan.configure()
+
+        return BirdPlanCmdlinePlanCapacityResult(cmdline.birdplan.capacity_estimate())
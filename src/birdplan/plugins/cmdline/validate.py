@@ -0,0 +1,88 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan commandline options for "birdplan validate"."""
+
+import argparse
+from typing import Any
+
+from ...cmdline import BirdPlanCommandLine, BirdPlanCommandlineResult
+from .cmdline_plugin import BirdPlanCmdlinePluginBase
+
+__all__ = ["BirdPlanCmdlineValidate"]
+
+
+class BirdPlanCmdlineValidate(BirdPlanCmdlinePluginBase):
+    """BirdPlan "validate" command."""
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        super().__init__()
+
+        # Plugin setup
+        self.plugin_description = "birdplan validate"
+        self.plugin_order = 10
+
+    def register_parsers(self, args: dict[str, Any]) -> None:
+        """
+        Register commandline parsers.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        root_parser = args["root_parser"]
+
+        subparser = root_parser.add_parser("validate", help="Validate BirdPlan configuration without creating BIRD configuration")
+
+        subparser.add_argument(
+            "--action",
+            action="store_const",
+            const="validate",
+            default="validate",
+            help=argparse.SUPPRESS,
+        )
+
+        # Set our internal subparser property
+        self._subparser = subparser
+        self._subparsers = None
+
+    def cmd_validate(self, args: dict[str, Any]) -> BirdPlanCommandlineResult:
+        """
+        Commandline handler for "validate" action.
+
+        Parameters
+        ----------
+        args : Dict[str, Any]
+            Method argument(s).
+
+        """
+
+        cmdline: BirdPlanCommandLine = args["cmdline"]
+
+        # Suppress info output
+        cmdline.birdplan.birdconf.birdconfig_globals.suppress_info = True
+
+        # Validate BirdPlan configuration, this raises an exception if its not valid
+        cmdline.birdplan_validate_config()
+
+        return BirdPlanCommandlineResult("BirdPlan configuration is valid")
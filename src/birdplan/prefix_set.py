@@ -0,0 +1,451 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compact prefix set support."""
+
+import array
+import itertools
+import socket
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+from .exceptions import BirdPlanError
+
+__all__ = ["PrefixSet"]
+
+
+# Forms a prefix can be written in, we keep track of this so we output the prefix the same way it was provided
+PREFIX_FORM_EXACT = 0  # address/length
+PREFIX_FORM_RANGE = 1  # address/length{greater_equal,less_equal}
+PREFIX_FORM_PLUS = 2  # address/length+
+PREFIX_FORM_MINUS = 3  # address/length-
+
+# Prefix record, (family, address high, address low, length, greater equal, less equal, form)
+PrefixRecord = tuple[int, int, int, int, int, int, int]
+
+
+def _record_key(record: PrefixRecord) -> tuple[int, ...]:
+    """Return the part of a prefix record which determines what it matches, this excludes the form."""
+    return record[:6]
+
+
+def _record_merge_key(record: PrefixRecord) -> tuple[int, ...]:
+    """Return the key used to compare prefix records, which orders prefixes matching wider length ranges first."""
+    return (record[0], record[1], record[2], record[3], record[4], -record[5])
+
+
+def _record_range(record: PrefixRecord) -> tuple[int, int]:
+    """Return the first and last address of a prefix record."""
+    start = (record[1] << 64) | record[2]
+    return start, start + (1 << ((128 if record[0] == 6 else 32) - record[3])) - 1  # noqa: PLR2004
+
+
+def _record_covers(covering: PrefixRecord, record: PrefixRecord) -> bool:
+    """Return if a prefix record matching an address range covering another one, matches all its prefix lengths too."""
+    return covering[4] <= record[4] and record[5] <= covering[5]
+
+
+def _leave_prefixes(within: list[tuple[PrefixRecord, int, int]], family: int, address: int) -> None:
+    """Remove the prefixes we're within which don't contain an address."""
+    while within and (within[-1][0][0] != family or within[-1][2] < address):
+        within.pop()
+
+
+class PrefixSet:
+    """
+    Compact prefix set.
+
+    Prefixes are stored as packed records of (family, address, length, greater-equal, less-equal) in arrays, instead of one
+    string per prefix. This keeps memory use low when dealing with the very large prefix lists that can be returned from IRR.
+
+    The greater-equal and less-equal values are always the effective prefix length range matched, irrespective of the form the
+    prefix was written in.
+
+    """
+
+    _family: array.array[int]
+    _address_high: array.array[int]
+    _address_low: array.array[int]
+    _length: array.array[int]
+    _greater_equal: array.array[int]
+    _less_equal: array.array[int]
+    _form: array.array[int]
+
+    def __init__(self, prefixes: Iterable[str] | None = None) -> None:
+        """Initialize object."""
+
+        self._family = array.array("B")
+        # IPv6 addresses don't fit into a single 64bit integer, so we split them into high and low halves
+        self._address_high = array.array("Q")
+        self._address_low = array.array("Q")
+        self._length = array.array("B")
+        self._greater_equal = array.array("B")
+        self._less_equal = array.array("B")
+        self._form = array.array("B")
+
+        # Add prefixes we were provided
+        if prefixes is not None:
+            self.extend(prefixes)
+
+    def __len__(self) -> int:
+        """Return the number of prefixes."""
+        return len(self._family)
+
+    def __bool__(self) -> bool:
+        """Return if we have any prefixes."""
+        return len(self._family) > 0
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the prefixes in BIRD format."""
+        for index in range(len(self._family)):
+            yield self.prefix(index)
+
+    def add(self, prefix: str, greater_equal: int | None = None, less_equal: int | None = None) -> None:
+        """
+        Add a prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            Prefix in the format of address/length.
+
+        greater_equal : Optional[int]
+            Minimum prefix length to match, defaults to the prefix length.
+
+        less_equal : Optional[int]
+            Maximum prefix length to match, if not provided the prefix is an exact match.
+
+        """
+
+        if less_equal is None:
+            self._add(prefix, prefix, greater_equal, less_equal, PREFIX_FORM_EXACT)
+        else:
+            self._add(prefix, prefix, greater_equal, less_equal, PREFIX_FORM_RANGE)
+
+    def add_str(self, prefix: str) -> None:
+        """
+        Add a prefix in BIRD format.
+
+        Parameters
+        ----------
+        prefix : str
+            Prefix in the format of address/length, address/length{greater_equal,less_equal}, address/length+ or
+            address/length-.
+
+        """
+
+        # Check if we have a length range
+        if prefix.endswith("}") and "{" in prefix:
+            network, _, length_range = prefix[:-1].partition("{")
+            greater_equal, _, less_equal = length_range.partition(",")
+            try:
+                self._add(prefix, network, int(greater_equal), int(less_equal), PREFIX_FORM_RANGE)
+            except ValueError:
+                raise BirdPlanError(f"Prefix '{prefix}' is not valid") from None
+        # Check if we're matching the prefix and all longer prefixes
+        elif prefix.endswith("+"):
+            self._add(prefix, prefix[:-1], None, None, PREFIX_FORM_PLUS)
+        # Check if we're matching the prefix and all shorter prefixes
+        elif prefix.endswith("-"):
+            self._add(prefix, prefix[:-1], None, None, PREFIX_FORM_MINUS)
+        else:
+            self._add(prefix, prefix, None, None, PREFIX_FORM_EXACT)
+
+    def extend(self, prefixes: Iterable[str]) -> None:
+        """
+        Add prefixes in BIRD format, or all the prefixes from another prefix set.
+
+        Parameters
+        ----------
+        prefixes : Iterable[str]
+            Prefixes to add, if this is a PrefixSet the packed records are copied directly.
+
+        """
+
+        if isinstance(prefixes, PrefixSet):
+            self._family.extend(prefixes._family)  # noqa: SLF001
+            self._address_high.extend(prefixes._address_high)  # noqa: SLF001
+            self._address_low.extend(prefixes._address_low)  # noqa: SLF001
+            self._length.extend(prefixes._length)  # noqa: SLF001
+            self._greater_equal.extend(prefixes._greater_equal)  # noqa: SLF001
+            self._less_equal.extend(prefixes._less_equal)  # noqa: SLF001
+            self._form.extend(prefixes._form)  # noqa: SLF001
+            return
+
+        for prefix in prefixes:
+            self.add_str(prefix)
+
+    def prefix(self, index: int) -> str:
+        """Return a prefix in BIRD format."""
+
+        if self._family[index] == 6:  # noqa: PLR2004
+            address_int = (self._address_high[index] << 64) | self._address_low[index]
+            address = socket.inet_ntop(socket.AF_INET6, address_int.to_bytes(16, "big"))
+        else:
+            address = socket.inet_ntop(socket.AF_INET, self._address_low[index].to_bytes(4, "big"))
+
+        # Output the prefix in the same form it was provided
+        form = self._form[index]
+        if form == PREFIX_FORM_RANGE:
+            return f"{address}/{self._length[index]}{{{self._greater_equal[index]},{self._less_equal[index]}}}"
+        if form == PREFIX_FORM_PLUS:
+            return f"{address}/{self._length[index]}+"
+        if form == PREFIX_FORM_MINUS:
+            return f"{address}/{self._length[index]}-"
+        return f"{address}/{self._length[index]}"
+
+    def family(self, ipv: int | str) -> "PrefixSet":
+        """
+        Return a prefix set containing only one address family.
+
+        Parameters
+        ----------
+        ipv : int | str
+            Address family, either 4 or 6.
+
+        """
+
+        selectors = [family == int(ipv) for family in self._family]
+        return self._from_records(itertools.compress(self._records(), selectors))
+
+    def sorted(self) -> "PrefixSet":
+        """Return a sorted prefix set with duplicates removed, prefixes are sorted by family, address and length range."""
+
+        # Sort the records, the sort is stable so the first form a prefix was written in is kept
+        records = sorted(self._records(), key=_record_key)
+        # Remove prefixes that match the same range, irrespective of the form they were written in
+        unique = (next(group) for _, group in itertools.groupby(records, key=_record_key))
+
+        return self._from_records(unique)
+
+    def difference(self, other: "PrefixSet") -> "PrefixSet":
+        """
+        Return a prefix set with the prefixes that are not in another prefix set.
+
+        Parameters
+        ----------
+        other : PrefixSet
+            Prefixes to exclude.
+
+        """
+
+        exclude = {_record_key(record) for record in other._records()}  # noqa: SLF001
+        return self._from_records(record for record in self._records() if _record_key(record) not in exclude)
+
+    def changes(self, previous: "PrefixSet") -> dict[str, "PrefixSet"]:
+        """
+        Return the changes from a previous prefix set to this one.
+
+        Both prefix sets are sorted, which takes linear time when they already are, like the prefix lists we get from IRR and
+        keep in the state. They are then compared in a single pass, keeping track of the prefixes we're currently within.
+
+        Parameters
+        ----------
+        previous : PrefixSet
+            Previous prefix set to compare against.
+
+        Returns
+        -------
+        Dict[str, PrefixSet]
+            Prefixes which were "added", "removed" and prefixes which were removed but are still "covered" by a shorter prefix
+            matching the same prefix lengths.
+
+        """
+
+        current_records, current_keys = self._merge_records()
+        previous_records, previous_keys = previous._merge_records()  # noqa: SLF001
+
+        added: list[PrefixRecord] = []
+        removed: list[PrefixRecord] = []
+        covered: list[PrefixRecord] = []
+        # Current prefixes containing the address we're at, from the shortest to the longest
+        within: list[tuple[PrefixRecord, int, int]] = []
+
+        current_index = 0
+        previous_index = 0
+        for _ in range(len(current_records) + len(previous_records)):
+            current_key = current_keys[current_index]
+            previous_key = previous_keys[previous_index]
+            # Check if the next record is a current one, either added or in both prefix sets
+            if current_key <= previous_key:
+                # We're done if we've reached the end of both
+                if current_index == len(current_records):
+                    break
+                record = current_records[current_index]
+                current_index += 1
+                if current_key == previous_key:
+                    previous_index += 1
+                else:
+                    added.append(record)
+                start, end = _record_range(record)
+                _leave_prefixes(within, record[0], start)
+                within.append((record, start, end))
+                continue
+
+            # Else this is a previous record which was removed, check if it is still covered
+            record = previous_records[previous_index]
+            previous_index += 1
+            start, end = _record_range(record)
+            _leave_prefixes(within, record[0], start)
+            if any(end <= covering_end and _record_covers(covering, record) for covering, _, covering_end in within):
+                covered.append(record)
+            else:
+                removed.append(record)
+
+        return {
+            "added": self._from_records(added),
+            "removed": self._from_records(removed),
+            "covered": self._from_records(covered),
+        }
+
+    def blackholes(self) -> "PrefixSet":
+        """Return a prefix set matching the prefixes and all longer prefixes, which is used for blackhole filtering."""
+
+        result = PrefixSet()
+        result._family = array.array("B", self._family)
+        result._address_high = array.array("Q", self._address_high)
+        result._address_low = array.array("Q", self._address_low)
+        result._length = array.array("B", self._length)
+        result._greater_equal = array.array("B", self._length)
+        result._less_equal = array.array("B", (128 if family == 6 else 32 for family in self._family))  # noqa: PLR2004
+        result._form = array.array("B", itertools.repeat(PREFIX_FORM_PLUS, len(self._family)))
+
+        return result
+
+    def network_count(self) -> int:
+        """
+        Get the number of ISP networks within the prefix set.
+
+        This is the number of /24's for IPv4 and the approximate number of /48's for IPv6, the same as `util.network_count`.
+
+        """
+
+        count = 0
+        for family, length in zip(self._family, self._length, strict=True):
+            # Networks longer than an ISP network don't count towards the total
+            if family == 4:  # noqa: PLR2004
+                if length <= 24:  # noqa: PLR2004
+                    count += 1 << (24 - length)
+            elif length <= 48:  # noqa: PLR2004
+                count += 1 << (48 - length)
+
+        return count
+
+    def to_list(self) -> list[str]:
+        """Return the prefixes as a list in BIRD format."""
+        return list(self)
+
+    def _add(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, prefix: str, network: str, greater_equal: int | None, less_equal: int | None, form: int
+    ) -> None:
+        """Add a prefix record."""
+
+        address, _, length_raw = network.partition("/")
+
+        # Work out which family this is and pack the address
+        try:
+            if ":" in address:
+                family = 6
+                address_bytes = socket.inet_pton(socket.AF_INET6, address)
+            else:
+                family = 4
+                address_bytes = socket.inet_pton(socket.AF_INET, address)
+            length = int(length_raw)
+        except (OSError, ValueError):
+            raise BirdPlanError(f"Prefix '{prefix}' is not valid") from None
+
+        # Make sure the prefix lengths are within range for the family
+        max_length = 128 if family == 6 else 32  # noqa: PLR2004
+        for value in (length, greater_equal, less_equal):
+            if value is not None and not 0 <= value <= max_length:
+                raise BirdPlanError(f"Prefix '{prefix}' length '{value}' is not valid")
+
+        # Work out the effective length range we're matching
+        if form == PREFIX_FORM_EXACT:
+            greater_equal, less_equal = length, length
+        elif form == PREFIX_FORM_PLUS:
+            greater_equal, less_equal = length, max_length
+        elif form == PREFIX_FORM_MINUS:
+            greater_equal, less_equal = 0, length
+        elif greater_equal is None:
+            greater_equal = length
+
+        address_int = int.from_bytes(address_bytes, "big")
+
+        self._family.append(family)
+        self._address_high.append(address_int >> 64)
+        self._address_low.append(address_int & 0xFFFFFFFFFFFFFFFF)
+        self._length.append(length)
+        self._greater_equal.append(greater_equal)
+        self._less_equal.append(less_equal)  # type: ignore[arg-type]
+        self._form.append(form)
+
+    def _merge_records(self) -> tuple[list[PrefixRecord], list[tuple[int, ...]]]:
+        """
+        Return the records sorted for comparing against another prefix set, along with their keys.
+
+        Prefixes with the same address and length are ordered with the widest length range first, so they come before the
+        prefixes they cover. Duplicates are removed and a key sorting after all others is added to the end of the keys.
+
+        """
+
+        # Sorting takes linear time if the records are already sorted, or close to it
+        records = sorted(self._records(), key=_record_merge_key)
+
+        unique_records: list[PrefixRecord] = []
+        keys: list[tuple[int, ...]] = []
+        for record in records:
+            key = _record_merge_key(record)
+            if keys and keys[-1] == key:
+                continue
+            unique_records.append(record)
+            keys.append(key)
+        keys.append((256,))
+
+        return unique_records, keys
+
+    def _records(self) -> Iterator[PrefixRecord]:
+        """Return an iterator over the prefix records."""
+        return zip(
+            self._family,
+            self._address_high,
+            self._address_low,
+            self._length,
+            self._greater_equal,
+            self._less_equal,
+            self._form,
+            strict=True,
+        )
+
+    @classmethod
+    def _from_records(cls, records: Iterable[PrefixRecord]) -> Self:
+        """Create a prefix set from prefix records."""
+
+        result = cls()
+        # Transpose the records back into columns
+        columns = list(zip(*records, strict=True))
+        if columns:
+            result._family = array.array("B", columns[0])
+            result._address_high = array.array("Q", columns[1])
+            result._address_low = array.array("Q", columns[2])
+            result._length = array.array("B", columns[3])
+            result._greater_equal = array.array("B", columns[4])
+            result._less_equal = array.array("B", columns[5])
+            result._form = array.array("B", columns[6])
+
+        return result
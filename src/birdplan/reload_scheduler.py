@@ -0,0 +1,200 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""BirdPlan staggered reload of BGP peers."""
+
+import logging
+import time
+from typing import Any
+
+from .bird_route_stream import BirdRouteStream
+from .exceptions import BirdPlanError
+
+__all__ = ["RELOAD_DIRECTIONS", "ReloadJob", "ReloadScheduler", "reload_jobs"]
+
+
+# Directions we can reload routes in
+RELOAD_DIRECTIONS = ("in", "out", "both")
+
+# Reload job for a single peer
+ReloadJob = dict[str, Any]
+
+
+def _peer_routes(peer_state: dict[str, Any]) -> int | None:
+    """Return the number of routes we expect from a peer, or None if it could be sending us a full table."""
+
+    # Prefix limits are the most a peer can send us, PeeringDB limits take preference like they do in the configuration
+    routes = None
+    for limit_type in ("peeringdb", "static"):
+        limits = peer_state.get("prefix_limit", {}).get(limit_type, {})
+        if limits:
+            routes = sum(int(limit) for limit in limits.values())
+            break
+
+    return routes
+
+
+def reload_jobs(state: dict[str, Any], protocols: dict[str, list[str]]) -> list[ReloadJob]:
+    """
+    Return the reload jobs for a number of peers, smallest peers first.
+
+    Peers without a prefix limit could be sending us a full table, so they are reloaded last.
+
+    Parameters
+    ----------
+    state : Dict[str, Any]
+        BirdPlan state, used to work out how many routes each peer has.
+
+    protocols : Dict[str, List[str]]
+        BIRD protocols to reload, keyed by peer name.
+
+    Returns
+    -------
+    List[ReloadJob]
+        Reload jobs in the order they should be run.
+
+        eg.
+        [
+            {'peer': 'e1', 'protocols': ['bgp4_AS65001_e1', 'bgp6_AS65001_e1'], 'routes': 100},
+            {'peer': 't1', 'protocols': ['bgp4_AS65003_t1'], 'routes': None},
+        ]
+
+    """
+
+    peers_state = state.get("bgp", {}).get("peers", {})
+
+    jobs = [
+        {"peer": peer, "protocols": peer_protocols, "routes": _peer_routes(peers_state.get(peer, {}))}
+        for peer, peer_protocols in protocols.items()
+        if peer_protocols
+    ]
+
+    return sorted(jobs, key=lambda job: (job["routes"] is None, job["routes"] or 0, job["peer"]))
+
+
+class ReloadScheduler:
+    """
+    Staggered, rate limited reload of BGP peers.
+
+    Reloading many peers at once makes BIRD re-evaluate all of their routes at the same time, which pegs its CPU and delays
+    convergence for everyone. Jobs are run in order, with a limit on the number of reload commands sent to BIRD each second.
+
+    BIRD replies to a reload command as soon as the route refresh is queued, without waiting for it to complete, so the number
+    of reloads BIRD is busy with is only bounded by the rate at which we send the commands.
+
+    """
+
+    _bird: BirdRouteStream
+    _rate: float
+    _next_command: float
+
+    def __init__(self, bird_socket: str | None = None, rate: float = 10.0) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        bird_socket : Optional[str]
+            BIRD control socket path, defaults to "/run/bird/bird.ctl".
+
+        rate : float
+            Maximum number of reload commands to send to BIRD each second.
+
+        """
+
+        if rate <= 0:
+            raise BirdPlanError("Reload rate must be greater than 0")
+
+        self._bird = BirdRouteStream(bird_socket)
+        self._rate = rate
+        self._next_command = 0.0
+
+    def run(self, jobs: list[ReloadJob], direction: str = "both") -> dict[str, Any]:
+        """
+        Run reload jobs.
+
+        A peer that fails to reload does not stop the others from being reloaded.
+
+        Parameters
+        ----------
+        jobs : List[ReloadJob]
+            Reload jobs, as returned by reload_jobs().
+
+        direction : str
+            Reload the routes we import ("in"), export ("out") or both.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Commands sent to BIRD for each peer, along with any error and the total number of seconds the reload took.
+
+            eg.
+            {
+                'peers': {
+                    'e1': {'commands': ['reload bgp4_AS65001_e1'], 'error': None},
+                },
+                'seconds': 0.25,
+            }
+
+        """
+
+        if direction not in RELOAD_DIRECTIONS:
+            raise BirdPlanError(f"Invalid reload direction '{direction}', it must be one of: {', '.join(RELOAD_DIRECTIONS)}")
+
+        started = time.monotonic()
+        results: dict[str, dict[str, Any]] = {}
+
+        for count, job in enumerate(jobs, start=1):
+            results[job["peer"]] = self._run_job(job, direction)
+            if results[job["peer"]]["error"]:
+                logging.warning(
+                    "Failed to reload BGP peer '%s' (%s/%s): %s", job["peer"], count, len(jobs), results[job["peer"]]["error"]
+                )
+            else:
+                logging.info("Reloaded BGP peer '%s' (%s/%s)", job["peer"], count, len(jobs))
+
+        return {"peers": results, "seconds": time.monotonic() - started}
+
+    def _run_job(self, job: ReloadJob, direction: str) -> dict[str, Any]:
+        """Reload the protocols of a single peer."""
+
+        result: dict[str, Any] = {"commands": [], "error": None}
+
+        for protocol in job["protocols"]:
+            command = f"reload {protocol}" if direction == "both" else f"reload {direction} {protocol}"
+            self._wait_for_budget()
+            result["commands"].append(command)
+            try:
+                for _ in self._bird.query(command):
+                    pass
+            except BirdPlanError as err:
+                result["error"] = f"{err}"
+                break
+
+        return result
+
+    def _wait_for_budget(self) -> None:
+        """Wait until we're allowed to send the next command to BIRD."""
+
+        now = time.monotonic()
+        slot = max(now, self._next_command)
+        self._next_command = slot + 1 / self._rate
+
+        if slot > now:
+            time.sleep(slot - now)
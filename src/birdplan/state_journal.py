@@ -0,0 +1,224 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan state journal."""
+
+import contextlib
+import fcntl
+import grp
+import json
+import logging
+import os
+import pathlib
+import pwd
+from typing import Any
+
+from .exceptions import BirdPlanError
+
+__all__ = ["StateJournal", "StateJournalEntry"]
+
+
+# State journal entry, setting or deleting the state item at a path
+StateJournalEntry = dict[str, Any]
+
+# Journal format version
+STATE_JOURNAL_VERSION = 1
+
+
+class StateJournal:
+    """
+    Append-only journal of changes to a state file.
+
+    Small state changes are appended to the journal instead of rewriting the entire state file. The journal is replayed when
+    the state is loaded and removed when the state file is next written out in full.
+
+    The first line of the journal identifies the state file it applies to, a journal left behind by a state file that was
+    replaced after the journal was started is ignored. Each line after that is an entry which sets or deletes a state item.
+
+    eg.
+    {"op": "set", "path": ["bgp", "+quarantine"], "value": {"peer1": true}}
+    {"op": "delete", "path": ["bgp", "+quarantine"]}
+
+    """
+
+    _state_file: pathlib.Path
+    _journal_file: pathlib.Path
+
+    def __init__(self, state_file: str) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        state_file : str
+            State file the journal belongs to.
+
+        """
+
+        self._state_file = pathlib.Path(state_file)
+        self._journal_file = self._state_file.with_name(f"{self._state_file.name}.journal")
+
+    def append(self, entries: list[StateJournalEntry]) -> None:
+        """
+        Append entries to the journal.
+
+        The entries are written with a single write and synced to disk before returning.
+
+        Parameters
+        ----------
+        entries : List[StateJournalEntry]
+            Entries to append.
+
+        """
+
+        if not entries:
+            return
+
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("UTF-8")
+
+        try:
+            fd = os.open(self._journal_file, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o640)
+        except OSError as err:
+            raise BirdPlanError(f"Failed to open '{self._journal_file}' for writing: {err}") from None
+
+        try:
+            # Make sure only one process appends at a time
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            size = os.fstat(fd).st_size
+            # Drop a partial entry left behind by a write that did not complete
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                logging.warning("Discarding incomplete entry at the end of the state journal '%s'", self._journal_file)
+                size = self._last_line_end(fd, size)
+                os.ftruncate(fd, size)
+            # If this is a new journal, start it with the header
+            if not size:
+                _chown(fd)
+                header = {"journal": STATE_JOURNAL_VERSION, "state": self._state_file_id()}
+                data = (json.dumps(header) + "\n").encode("UTF-8") + data
+            # Write out the entries
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        except OSError as err:
+            raise BirdPlanError(f"Failed to write state journal '{self._journal_file}': {err}") from None
+        finally:
+            os.close(fd)
+
+    def replay(self, state: dict[str, Any]) -> int:
+        """
+        Replay the journal onto the state.
+
+        Parameters
+        ----------
+        state : Dict[str, Any]
+            State loaded from the state file, which is updated in place.
+
+        Returns
+        -------
+        int
+            Number of journal entries replayed.
+
+        """
+
+        try:
+            lines = self._journal_file.read_bytes().split(b"\n")
+        except FileNotFoundError:
+            return 0
+        except OSError as err:
+            raise BirdPlanError(f"Failed to read state journal '{self._journal_file}': {err}") from None
+
+        # The last line is empty if the final entry was completely written
+        if lines[-1]:
+            logging.warning("Ignoring incomplete entry at the end of the state journal '%s'", self._journal_file)
+        lines = lines[:-1]
+        if not lines:
+            return 0
+
+        try:
+            header = json.loads(lines[0])
+            entries = [json.loads(line) for line in lines[1:]]
+        except json.JSONDecodeError as err:
+            raise BirdPlanError(f"Failed to parse state journal '{self._journal_file}': {err}") from None
+
+        if header.get("journal") != STATE_JOURNAL_VERSION:
+            raise BirdPlanError(f"State journal '{self._journal_file}' has an unsupported version")
+        # Check the journal belongs to the state file we loaded
+        if header.get("state") != self._state_file_id():
+            logging.warning("Ignoring state journal '%s' as it does not match the state file", self._journal_file)
+            return 0
+
+        for entry in entries:
+            _apply_entry(state, entry)
+
+        return len(entries)
+
+    def remove(self) -> None:
+        """Remove the journal, which must be done after the state file was written out in full."""
+
+        try:
+            self._journal_file.unlink(missing_ok=True)
+        except OSError as err:
+            raise BirdPlanError(f"Failed to remove state journal '{self._journal_file}': {err}") from None
+
+    def _state_file_id(self) -> list[int] | None:
+        """Return the identity of the state file, which changes when the state file is replaced."""
+
+        try:
+            stat = self._state_file.stat()
+        except FileNotFoundError:
+            return None
+
+        return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    def _last_line_end(self, fd: int, size: int) -> int:
+        """Return the offset just past the last complete line in the journal."""
+
+        data = os.pread(fd, size, 0)
+        return data.rfind(b"\n") + 1
+
+    @property
+    def journal_file(self) -> pathlib.Path:
+        """Return the journal file path."""
+        return self._journal_file
+
+
+def _apply_entry(state: dict[str, Any], entry: StateJournalEntry) -> None:
+    """Apply a journal entry to the state."""
+
+    *parents, key = entry["path"]
+
+    if entry["op"] == "set":
+        for parent in parents:
+            state = state.setdefault(parent, {})
+        state[key] = entry["value"]
+    elif entry["op"] == "delete":
+        for parent in parents:
+            if parent not in state:
+                return
+            state = state[parent]
+        state.pop(key, None)
+    else:
+        raise BirdPlanError(f"Unsupported state journal operation '{entry['op']}'")
+
+
+def _chown(fd: int) -> None:
+    """Set the owner of a new journal the same way as the state file."""
+
+    with contextlib.suppress(KeyError):
+        os.fchown(fd, pwd.getpwnam("birdplan").pw_uid, grp.getgrnam("birdplan").gr_gid)
@@ -0,0 +1,99 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BirdPlan plan template cache."""
+
+import pathlib
+import threading
+
+import jinja2
+
+__all__ = ["TemplateBytecodeCache", "template_environment"]
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """
+    In-memory cache of compiled templates.
+
+    Buckets are keyed on the template filename and checked against its source, so a template included from several plans is
+    only compiled once, even when it is loaded through different environments.
+
+    """
+
+    _buckets: dict[str, bytes]
+
+    def __init__(self) -> None:
+        """Initialize object."""
+
+        self._buckets = {}
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Load the compiled template for a bucket, if we have it."""
+
+        data = self._buckets.get(bucket.key)
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Store the compiled template for a bucket."""
+
+        self._buckets[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        """Clear the cache."""
+
+        self._buckets.clear()
+
+
+# Compiled templates shared between all plans loaded by this process
+template_bytecode_cache = TemplateBytecodeCache()
+
+# Template environments, indexed by their search paths
+_template_environments: dict[tuple[pathlib.Path, ...], jinja2.Environment] = {}
+_template_environments_lock = threading.Lock()
+
+
+def template_environment(search_paths: list[pathlib.Path]) -> jinja2.Environment:
+    """
+    Return the template environment for a list of search paths.
+
+    Environments are reused between plans with the same search paths, templates which changed on disk are reloaded.
+
+    Parameters
+    ----------
+    search_paths : List[pathlib.Path]
+        Template search paths.
+
+    Returns
+    -------
+    jinja2.Environment
+        Template environment.
+
+    """
+
+    key = tuple(path.resolve() for path in search_paths)
+
+    with _template_environments_lock:
+        if key not in _template_environments:
+            _template_environments[key] = jinja2.Environment(  # noqa: S701
+                loader=jinja2.FileSystemLoader(searchpath=key),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                bytecode_cache=template_bytecode_cache,
+            )
+        return _template_environments[key]
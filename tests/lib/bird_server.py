@@ -0,0 +1,135 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Fake BIRD control socket server."""
+
+import pathlib
+import socket
+import threading
+from types import TracebackType
+from typing import Self
+
+__all__ = ["BIRD_WELCOME", "FakeBirdServer"]
+
+
+# Welcome message BIRD sends when a client connects
+BIRD_WELCOME = b"0001 BIRD 2.15 ready.\n"
+
+
+class FakeBirdServer:
+    """
+    Fake BIRD control socket server, answering each connection in its own thread.
+
+    Each connection gets the BIRD welcome message and a reply to its query, which is the reply of the longest query prefix
+    matching it, or "0000" if none match. Queries are recorded in the order they are received.
+
+    """
+
+    _bird_socket: pathlib.Path
+    _chunk_size: int | None
+    _replies: dict[str, bytes]
+    _server: socket.socket | None
+    _threads: list[threading.Thread]
+    queries: list[str]
+
+    def __init__(self, bird_socket: pathlib.Path, replies: dict[str, bytes] | None = None, chunk_size: int | None = None) -> None:
+        """
+        Initialize object.
+
+        Parameters
+        ----------
+        bird_socket : pathlib.Path
+            BIRD control socket path to listen on.
+
+        replies : Optional[Dict[str, bytes]]
+            Replies to send, keyed by query prefix.
+
+        chunk_size : Optional[int]
+            Send replies in chunks of this many bytes, to test reading partial replies.
+
+        """
+
+        self._bird_socket = bird_socket
+        self._chunk_size = chunk_size
+        self._replies = replies if replies is not None else {}
+        self._server = None
+        self._threads = []
+        self.queries = []
+
+    def __enter__(self) -> Self:
+        """Start the server when entering a context."""
+        self.start()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Stop the server when leaving a context."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start listening for connections."""
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(f"{self._bird_socket}")
+        self._server.listen(8)
+
+        self._threads = [threading.Thread(target=self._serve, args=(self._server,), daemon=True)]
+        self._threads[0].start()
+
+    def stop(self) -> None:
+        """Stop listening for connections, waiting for the queries in progress to be answered."""
+
+        if not self._server:
+            return
+
+        # Shutting down the socket wakes up the accept() call in the server thread
+        self._server.shutdown(socket.SHUT_RDWR)
+        self._server.close()
+        self._server = None
+
+        for thread in self._threads:
+            thread.join()
+
+    def reply(self, query: str) -> bytes:
+        """Return the reply to a query."""
+        matches = [prefix for prefix in self._replies if query.startswith(prefix)]
+        return self._replies[max(matches, key=len)] if matches else b"0000 \n"
+
+    def _serve(self, server: socket.socket) -> None:
+        """Accept connections until the server is stopped."""
+        while True:
+            try:
+                conn = server.accept()[0]
+            except OSError:
+                return
+            thread = threading.Thread(target=self._handle, args=(conn,), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Answer the query of a single connection."""
+        with conn:
+            conn.sendall(BIRD_WELCOME)
+            query = conn.makefile("rb").readline().decode().rstrip("\n")
+            self.queries.append(query)
+            reply = self.reply(query)
+            chunk_size = self._chunk_size or len(reply)
+            for i in range(0, len(reply), chunk_size):
+                conn.sendall(reply[i : i + chunk_size])
@@ -0,0 +1,53 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Attribute model tests."""
+
+import pickle
+
+import pytest
+
+from birdplan.bird_config.sections.protocols.bgp.peer.peer_attributes import BGPPeerAttributes
+
+__all__: list[str] = []
+
+
+def test_attributes_slotted() -> None:
+    """Test that attribute models reject unknown attributes."""
+    peer_attributes = BGPPeerAttributes()
+
+    assert not hasattr(peer_attributes, "__dict__")
+    with pytest.raises(AttributeError):
+        peer_attributes.neighbour4 = "192.0.2.1"  # type: ignore[attr-defined]
+    with pytest.raises(AttributeError):
+        peer_attributes.import_filter_policy.prefix = []  # type: ignore[attr-defined]
+
+
+def test_attributes_pickle() -> None:
+    """Test that slotted attribute models survive pickling."""
+    peer_attributes = BGPPeerAttributes()
+    peer_attributes.neighbor4 = "192.0.2.1"
+    peer_attributes.has_ipv4 = True
+    peer_attributes.import_filter_policy.as_sets = ["AS-EXAMPLE"]
+
+    copied = pickle.loads(pickle.dumps(peer_attributes))  # noqa: S301
+
+    assert copied.neighbor4 == "192.0.2.1"
+    assert copied.has_ipv4
+    assert not copied.has_ipv6
+    assert copied.import_filter_policy.as_sets == ["AS-EXAMPLE"]
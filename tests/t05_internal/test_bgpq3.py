@@ -0,0 +1,112 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test batching of BGPQ3 lookups."""
+
+import json
+import pathlib
+import sys
+
+import pytest
+
+from birdplan import bgpq3
+from birdplan.bgpq3 import BGPQ3
+
+__all__: list[str] = []
+
+
+# Fake bgpq3, which logs its arguments and returns the ASNs and prefixes for the objects it was given
+FAKE_BGPQ3 = """\
+import json
+import sys
+
+ASNS = {"AS-A": ["174", "3356"], "AS-B": ["3356", "6939"], "AS-C": ["1299"]}
+PREFIXES = {
+    "ipv4": {"AS-A": ["192.0.2.0/24"], "AS-B": ["198.51.100.0/24"], "AS-C": ["203.0.113.0/24"]},
+    "ipv6": {"AS-A": ["2001:db8::/32"], "AS-B": ["2001:db8::/32"], "AS-C": ["2001:db8:1::/48"]},
+}
+
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(json.dumps(sys.argv[1:]) + "\\n")
+
+name = sys.argv[sys.argv.index("-l") + 1]
+objects = [arg for arg in sys.argv[1:] if arg.startswith("AS-")]
+# Results for multiple objects are merged, like bgpq3 does
+if name == "asns":
+    result = list(dict.fromkeys(asn for obj in objects for asn in ASNS[obj]))
+else:
+    prefixes = dict.fromkeys(prefix for obj in objects for prefix in PREFIXES[name][obj])
+    result = [{"prefix": prefix, "exact": True} for prefix in prefixes]
+print(json.dumps({name: result}))
+"""
+
+
+@pytest.fixture
+def bgpq3_log(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Install our fake bgpq3 and return the file it logs its invocations to."""
+
+    exe = tmp_path / "bgpq3"
+    exe.write_text(f"#!{sys.executable}\n{FAKE_BGPQ3}")
+    exe.chmod(0o755)
+
+    monkeypatch.setenv("PATH", f"{tmp_path}")
+    monkeypatch.setattr(bgpq3, "bgpq3_cache", {})
+
+    return tmp_path / "bgpq3.log"
+
+
+def _invocations(bgpq3_log: pathlib.Path) -> list[list[str]]:
+    """Return the objects bgpq3 was invoked with."""
+    if not bgpq3_log.exists():
+        return []
+    return [[arg for arg in json.loads(line) if arg.startswith("AS-")] for line in bgpq3_log.read_text().splitlines()]
+
+
+def test_bgpq3_batching(bgpq3_log: pathlib.Path) -> None:
+    """Test all objects are looked up in a single invocation and the results are merged."""
+
+    asns = BGPQ3().get_asns(["AS-A", "AS-B"])
+    prefixes = BGPQ3().get_prefixes(["AS-A", "AS-B"])
+
+    assert asns == ["174", "3356", "6939"]
+    assert prefixes["ipv4"].to_list() == ["192.0.2.0/24", "198.51.100.0/24"]
+    assert prefixes["ipv6"].to_list() == ["2001:db8::/32"]
+    # One invocation for the ASNs and one per family for the prefixes
+    assert _invocations(bgpq3_log) == [["AS-A", "AS-B"], ["AS-A", "AS-B"], ["AS-A", "AS-B"]]
+
+    # The same group of objects is served from the cache
+    assert BGPQ3().get_asns(["AS-B", "AS-A"]) == asns
+    assert len(_invocations(bgpq3_log)) == 3  # noqa: PLR2004
+
+
+def test_bgpq3_batching_cached(bgpq3_log: pathlib.Path) -> None:
+    """Test objects cached on their own are not looked up again."""
+
+    assert BGPQ3().get_asns("AS-A") == ["174", "3356"]
+    prefixes = BGPQ3().get_prefixes("AS-C")
+    assert prefixes["ipv4"].to_list() == ["203.0.113.0/24"]
+
+    asns = BGPQ3().get_asns(["AS-A", "AS-C"])
+    prefixes = BGPQ3().get_prefixes(["AS-A", "AS-C"])
+
+    assert asns == ["174", "3356", "1299"]
+    assert prefixes["ipv4"].to_list() == ["192.0.2.0/24", "203.0.113.0/24"]
+    assert prefixes["ipv6"].to_list() == ["2001:db8::/32", "2001:db8:1::/48"]
+    # Only the objects we did not have cached were looked up
+    assert _invocations(bgpq3_log) == [["AS-A"], ["AS-C"], ["AS-C"], ["AS-C"], ["AS-A"], ["AS-A"]]
@@ -0,0 +1,242 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test refresh of cached IRR and PeeringDB information."""
+
+import copy
+import functools
+import json
+import pathlib
+import time
+from typing import Any
+
+import pytest
+
+import birdplan as birdplan_module
+from birdplan import BirdPlan
+from birdplan.cache_refresh import CacheRefresh, cache_refresh_jobs
+from birdplan.exceptions import BirdPlanError
+from birdplan.prefix_set import PrefixSet
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    c1:
+      asn: 65001
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.2
+      neighbor6: fc00::2
+      source_address4: 100.64.0.1
+      source_address6: fc00::1
+      import_filter:
+        as_sets: AS-C1
+    c2:
+      asn: 65002
+      description: BGP session to c2
+      type: customer
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.102.0/24
+    c3:
+      asn: 65003
+      description: BGP session to c3
+      type: customer
+      neighbor4: 100.64.0.4
+      source_address4: 100.64.0.1
+      import_filter:
+        prefixes: 100.64.103.0/24
+"""
+
+STATE = {
+    "bgp": {
+        "peers": {
+            "c1": {
+                "prefix_limit": {"peeringdb": {"ipv4": 100, "ipv6": 50}},
+                "import_filter": {"origin_asns": {"irr": ["65001"]}, "prefixes": {"irr": {"ipv4": ["100.64.100.0/23"]}}},
+            },
+            "c2": {"prefix_limit": {"static": {"ipv4": 100}}},
+        }
+    }
+}
+
+
+class _FakePeeringDB:
+    """Fake PeeringDB lookups."""
+
+    def __init__(self, prefixes4: int) -> None:
+        self.prefixes4 = prefixes4
+
+    def get_prefix_limits(self, asn: int) -> dict[str, Any]:  # noqa: ARG002
+        return {"info_prefixes4": self.prefixes4, "info_prefixes6": 60}
+
+
+class _FakeBGPQ3:
+    """Fake IRR lookups, which fail a number of times before succeeding."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def get_asns(self, as_sets: list[str]) -> list[str]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise BirdPlanError(f"Failed to query IRR ASNs from object '{as_sets[0]}'")
+        return ["65001", "65010"]
+
+    def get_prefixes(self, as_sets: list[str]) -> dict[str, PrefixSet]:  # noqa: ARG002
+        return {"ipv4": PrefixSet(["100.64.100.0/22"]), "ipv6": PrefixSet()}
+
+
+def _birdplan(tmp_path: pathlib.Path, state: dict[str, Any] | None = None) -> BirdPlan:
+    """Load our test plan, using the cached information."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    (tmp_path / "birdplan.state").write_text(json.dumps(state or STATE))
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.birdconf.birdconfig_globals.validate_only = True
+    birdplan.load(
+        plan_file=f"{tmp_path / 'birdplan.yaml'}",
+        state_file=f"{tmp_path / 'birdplan.state'}",
+        ignore_irr_changes=True,
+        ignore_peeringdb_changes=True,
+        use_cached=True,
+    )
+
+    return birdplan
+
+
+def test_cache_refresh(tmp_path: pathlib.Path) -> None:
+    """Test cached information is refreshed for configured peers using IRR or PeeringDB information."""
+
+    birdplan = _birdplan(tmp_path)
+
+    # c2 has no IRR or PeeringDB information and c3 has not been configured yet
+    jobs = cache_refresh_jobs(birdplan.birdconf, birdplan.state)
+    assert jobs == [
+        {
+            "peer": "c1",
+            "type": "customer",
+            "asn": 65001,
+            "as_sets": ["AS-C1"],
+            "peeringdb": ["ipv4", "ipv6"],
+            "irr_change_limits": {},
+        }
+    ]
+
+    result = CacheRefresh(bgpq3=_FakeBGPQ3(), peeringdb=_FakePeeringDB(150)).run(jobs, birdplan.state)
+
+    assert result["peers"]["c1"]["refreshed"] == ["peeringdb", "irr"]
+    assert result["peers"]["c1"]["errors"] == {}
+    assert ["bgp", "peers", "c1", "import_filter", "prefixes", "irr", "ipv4"] in result["peers"]["c1"]["updated"]
+    assert result["peers"]["c1"]["irr_changes"] == {"ipv4": {"added": 1, "removed": 1, "covered": 0}}
+
+    peer_state = birdplan.state["bgp"]["peers"]["c1"]
+    assert peer_state["prefix_limit"]["peeringdb"] == {"ipv4": 150, "ipv6": 60}
+    assert peer_state["import_filter"]["origin_asns"]["irr"] == ["65001", "65010"]
+    # Families without prefixes are not cached
+    assert peer_state["import_filter"]["prefixes"]["irr"] == {"ipv4": ["100.64.100.0/22"]}
+
+    assert "c3" not in birdplan.state["bgp"]["peers"]
+
+
+def test_cache_refresh_removed_family(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cached prefixes are removed when a family no longer has any IRR prefixes."""
+
+    state = copy.deepcopy(STATE)
+    state["bgp"]["peers"]["c1"]["import_filter"]["prefixes"]["irr"]["ipv6"] = ["fc00:100::/48"]
+    birdplan = _birdplan(tmp_path, state)
+
+    monkeypatch.setattr(
+        birdplan_module, "CacheRefresh", functools.partial(CacheRefresh, bgpq3=_FakeBGPQ3(), peeringdb=_FakePeeringDB(150))
+    )
+    result = birdplan.state_cache_refresh(ignore_irr_changes=True)
+    birdplan.commit_state()
+
+    assert ["bgp", "peers", "c1", "import_filter", "prefixes", "irr", "ipv6"] in result["peers"]["c1"]["updated"]
+    assert birdplan.state["bgp"]["peers"]["c1"]["import_filter"]["prefixes"]["irr"] == {"ipv4": ["100.64.100.0/22"]}
+
+    # The removal is journaled, so the cached prefixes are gone the next time the state is loaded
+    journal = (tmp_path / "birdplan.state.journal").read_text().splitlines()
+    assert {"op": "delete", "path": ["bgp", "peers", "c1", "import_filter", "prefixes", "irr", "ipv6"]} in [
+        json.loads(line) for line in journal[1:]
+    ]
+    birdplan.load_state()
+    assert "ipv6" not in birdplan.state["bgp"]["peers"]["c1"]["import_filter"]["prefixes"]["irr"]
+
+
+def test_cache_refresh_change_guards(tmp_path: pathlib.Path) -> None:
+    """Test substantial changes are not cached, without holding up the other source."""
+
+    birdplan = _birdplan(tmp_path)
+    jobs = cache_refresh_jobs(birdplan.birdconf, birdplan.state)
+
+    result = CacheRefresh(bgpq3=_FakeBGPQ3(), peeringdb=_FakePeeringDB(300)).run(jobs, birdplan.state)
+
+    assert result["peers"]["c1"]["refreshed"] == ["irr"]
+    assert result["peers"]["c1"]["errors"]["peeringdb"] == (
+        "PeeringDB IPv4 prefix limit for peer 'c1' with type 'customer' increased substantially from previous run: "
+        "last=100, now=300"
+    )
+    assert birdplan.state["bgp"]["peers"]["c1"]["prefix_limit"]["peeringdb"] == {"ipv4": 100, "ipv6": 50}
+
+    result = CacheRefresh(bgpq3=_FakeBGPQ3(), peeringdb=_FakePeeringDB(300)).run(
+        jobs, birdplan.state, ignore_peeringdb_changes=True
+    )
+
+    assert result["peers"]["c1"]["errors"] == {}
+    assert birdplan.state["bgp"]["peers"]["c1"]["prefix_limit"]["peeringdb"] == {"ipv4": 300, "ipv6": 60}
+
+
+def test_cache_refresh_backoff(tmp_path: pathlib.Path) -> None:
+    """Test failed lookups are retried with exponential backoff."""
+
+    birdplan = _birdplan(tmp_path)
+    jobs = cache_refresh_jobs(birdplan.birdconf, birdplan.state)
+
+    bgpq3 = _FakeBGPQ3(failures=2)
+    started = time.monotonic()
+    result = CacheRefresh(backoff=0.05, bgpq3=bgpq3, peeringdb=_FakePeeringDB(150)).run(jobs, birdplan.state)
+
+    # Backing off 0.05s and then 0.1s
+    assert time.monotonic() - started >= 0.15
+    assert result["peers"]["c1"]["refreshed"] == ["peeringdb", "irr"]
+
+    result = CacheRefresh(retries=1, backoff=0, bgpq3=_FakeBGPQ3(failures=2), peeringdb=_FakePeeringDB(150)).run(
+        jobs, birdplan.state
+    )
+
+    assert result["peers"]["c1"]["refreshed"] == ["peeringdb"]
+    assert result["peers"]["c1"]["errors"] == {"irr": "Failed to query IRR ASNs from object 'AS-C1'"}
+
+
+def test_cache_refresh_invalid() -> None:
+    """Test invalid refresh limits."""
+
+    with pytest.raises(BirdPlanError, match="concurrency must be at least 1"):
+        CacheRefresh(concurrency=0, bgpq3=_FakeBGPQ3(), peeringdb=_FakePeeringDB(1))
@@ -0,0 +1,117 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test BIRD configuration size accounting and budgets."""
+
+import logging
+import pathlib
+
+import pytest
+
+from birdplan import BirdPlan
+from birdplan.bird_config.config_stats import config_stats_summary
+from birdplan.exceptions import BirdPlanConfigError, BirdPlanError
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+{budget}
+  peers:
+    c1:
+      asn: 65001
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 1000
+      import_filter:
+        prefixes:
+{prefixes}
+    c2:
+      asn: 65002
+      description: BGP session to c2
+      type: customer
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.65.0.0/24
+"""
+
+
+def _configure(tmp_path: pathlib.Path, budget: str = "") -> tuple[BirdPlan, str]:
+    """Return a BirdPlan object and the configuration it generated."""
+
+    prefixes = "\n".join(f"          - 100.64.{i}.0/24" for i in range(200))
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG.format(budget=budget, prefixes=prefixes))
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{tmp_path / 'birdplan.yaml'}", state_file=f"{tmp_path / 'birdplan.state'}")
+    return birdplan, birdplan.configure()
+
+
+def test_config_stats(tmp_path: pathlib.Path) -> None:
+    """Test the bytes and lines of each section and peer add up to the configuration generated."""
+
+    birdplan, config = _configure(tmp_path)
+    lines = config.split("\n")
+    stats = birdplan.birdconf.config_stats
+
+    assert stats is not None
+    assert stats["total"] == {"bytes": len(config) + 1, "lines": len(lines)}
+    counters = list(stats["sections"].values()) + list(stats["peers"].values())
+    assert sum(counter["lines"] for counter in counters) == len(lines)
+    assert sum(counter["bytes"] for counter in counters) == stats["total"]["bytes"]
+    assert "BGP Functions" in stats["sections"]
+    assert sorted(stats["peers"]) == ["c1", "c2"]
+
+    # Each peer is broken down into the blocks it is made up of
+    c1 = stats["peers"]["c1"]
+    assert sum(block["bytes"] for block in c1["blocks"].values()) == c1["bytes"]
+    assert c1["blocks"]["prefix_lists"]["lines"] > 200
+    assert {"filters", "protocols"} <= set(c1["blocks"])
+    assert c1["blocks"]["prefix_lists"]["bytes"] > stats["peers"]["c2"]["blocks"]["prefix_lists"]["bytes"]
+
+    summary = config_stats_summary(stats, 3)
+    assert len(summary) == 4
+    assert summary[0] == f"total: {stats['total']['bytes']} bytes, {stats['total']['lines']} lines"
+
+
+def test_config_budget(tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Test peers exceeding the configuration budget fail or warn."""
+
+    with pytest.raises(BirdPlanError, match=r"BGP peer 'c1' configuration exceeds budget: lines=[0-9]+, limit=200"):
+        _configure(tmp_path, "  config_budget:\n    peer_lines: 200")
+
+    with caplog.at_level(logging.WARNING):
+        _configure(tmp_path, "  config_budget:\n    peer_bytes: 8000\n    action: warn")
+    assert "BGP peer 'c1' configuration exceeds budget: bytes=" in caplog.text
+    assert "BGP peer 'c2'" not in caplog.text
+
+
+@pytest.mark.parametrize("budget", ["peer_lines: 0", "peer_bytes: many", "action: ignore", "peers: 10"])
+def test_config_budget_invalid(tmp_path: pathlib.Path, budget: str) -> None:
+    """Test invalid configuration budgets are rejected."""
+    with pytest.raises(BirdPlanConfigError, match="bgp:config_budget"):
+        _configure(tmp_path, f"  config_budget:\n    {budget}")
@@ -0,0 +1,152 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Monitor event and output tests."""
+
+import copy
+import json
+import pathlib
+import socket
+
+import pytest
+
+import birdplan.cmdline
+from birdplan.exceptions import BirdPlanUsageError
+from birdplan.monitor_events import monitor_events, write_monitor_events
+from birdplan.plugins.cmdline.monitor import BirdPlanCmdlineMonitor
+
+__all__: list[str] = []
+
+
+MONITOR_STATUS = {
+    "bgp": {
+        "e1": {
+            "name": "e1",
+            "asn": 65001,
+            "protocols": {
+                "ipv4": {"name": "bgp4_AS65001_e1", "status": {"state": "up", "info": "established"}},
+                "ipv6": {"name": "bgp6_AS65001_e1", "status": {"state": "up", "info": "established"}},
+            },
+        },
+    },
+    "ospf": {"ospf4": {"state": "up", "info": "running"}},
+}
+
+
+def test_monitor_events() -> None:
+    """Test state transitions between monitor snapshots."""
+
+    current = copy.deepcopy(MONITOR_STATUS)
+    current["bgp"]["e1"]["protocols"]["ipv4"]["status"] = {"state": "start", "info": "active"}
+    del current["ospf"]["ospf4"]
+    current["ospf"]["ospf6"] = {"state": "up", "info": "running"}
+
+    events = monitor_events(MONITOR_STATUS, current, timestamp=1)
+
+    assert monitor_events(None, current) == []
+    assert monitor_events(MONITOR_STATUS, MONITOR_STATUS) == []
+    assert events == [
+        {
+            "timestamp": 1,
+            "protocol": "bgp",
+            "name": "bgp4_AS65001_e1",
+            "event": "state",
+            "peer": "e1",
+            "ipv": "ipv4",
+            "previous": {"state": "up", "info": "established"},
+            "current": {"state": "start", "info": "active"},
+        },
+        {
+            "timestamp": 1,
+            "protocol": "ospf",
+            "name": "ospf6",
+            "event": "added",
+            "previous": None,
+            "current": {"state": "up", "info": "running"},
+        },
+        {
+            "timestamp": 1,
+            "protocol": "ospf",
+            "name": "ospf4",
+            "event": "removed",
+            "previous": {"state": "up", "info": "running"},
+            "current": None,
+        },
+    ]
+
+
+def test_write_monitor_events(tmp_path: pathlib.Path) -> None:
+    """Test writing monitor events to a log and a socket."""
+
+    events = [{"timestamp": 1, "protocol": "ospf", "name": "ospf4", "event": "removed"}]
+    event_log = tmp_path / "events.jsonl"
+    event_socket = tmp_path / "events.sock"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(f"{event_socket}")
+        server.listen(1)
+        write_monitor_events(events, event_log=event_log, event_socket=f"{event_socket}")
+        write_monitor_events(events, event_log=event_log)
+        with server.accept()[0] as conn:
+            received = conn.makefile().readlines()
+
+    assert [json.loads(line) for line in event_log.read_text().splitlines()] == events * 2
+    assert [json.loads(line) for line in received] == events
+    # Nothing listening should not be fatal
+    write_monitor_events(events, event_socket=f"{tmp_path / 'missing.sock'}")
+
+
+def test_write_monitor_file(tmp_path: pathlib.Path) -> None:
+    """Test the monitor file is only written when it changes."""
+
+    monitor = BirdPlanCmdlineMonitor()
+    monitor.output_filename = tmp_path / "monitor.json"
+
+    assert monitor._write_monitor_file(MONITOR_STATUS) is None
+    inode = monitor.output_filename.stat().st_ino
+
+    assert monitor._write_monitor_file(MONITOR_STATUS) == MONITOR_STATUS
+    assert monitor.output_filename.stat().st_ino == inode
+
+    current = copy.deepcopy(MONITOR_STATUS)
+    current["ospf"] = {}
+    assert monitor._write_monitor_file(current) == MONITOR_STATUS
+    assert json.loads(monitor.output_filename.read_text()) == current
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["monitor.json"]
+
+
+def test_monitor_events_require_monitor_file(tmp_path: pathlib.Path) -> None:
+    """Test state transitions can't be written when outputting to stdout, as there is no previous snapshot."""
+
+    (tmp_path / "birdplan.yaml").write_text("router_id: 0.0.0.1\n")
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+    with pytest.raises(BirdPlanUsageError, match="require a monitor output file"):
+        bplan.run(
+            [
+                "-i",
+                f"{tmp_path / 'birdplan.yaml'}",
+                "-s",
+                f"{tmp_path / 'birdplan.state'}",
+                "monitor",
+                "--output-file",
+                "-",
+                "--event-log",
+                f"{tmp_path / 'events.log'}",
+            ]
+        )
@@ -0,0 +1,157 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Multiple instance monitor tests."""
+
+import json
+import pathlib
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from birdplan.exceptions import BirdPlanError
+from birdplan.monitor_instances import MonitorInstance, MonitorInstances
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+"""
+
+
+class _FakeInstance(MonitorInstance):
+    """Monitored instance returning canned status."""
+
+    __slots__ = ("delay", "polls", "release", "state")
+
+    def __init__(self, name: str, delay: float = 0, release: threading.Event | None = None) -> None:
+        """Initialize object."""
+        super().__init__(name, f"{name}.yaml", f"{name}.state", f"{name}.ctl")
+        self.delay = delay
+        self.polls = 0
+        self.release = release
+        self.state = "up"
+
+    def load(self) -> None:
+        """Skip loading a plan and state."""
+
+    def poll(self) -> dict[str, Any]:
+        """Return canned status."""
+        self.polls += 1
+        time.sleep(self.delay)
+        if self.release:
+            self.release.wait()
+        if self.state == "error":
+            raise BirdPlanError("BIRD is not running")
+        return {"bgp": {}, "ospf": {"ospf4": {"state": self.state, "info": "running"}}}
+
+
+def test_monitor_instances_concurrent() -> None:
+    """Test instances are polled concurrently and transitions are tagged with the instance."""
+
+    instances = [_FakeInstance("vrf1", delay=0.3), _FakeInstance("vrf2", delay=0.3)]
+    monitor = MonitorInstances(instances, stale_after=60)
+
+    started = time.monotonic()
+    assert monitor.poll() == []
+    assert time.monotonic() - started < 0.55  # noqa: PLR2004
+
+    instances[1].state = "down"
+    events = monitor.poll()
+    assert [(event["instance"], event["name"], event["current"]["state"]) for event in events] == [("vrf2", "ospf4", "down")]
+
+    merged = monitor.merged_status()
+    assert merged["vrf1"]["status"]["ospf"]["ospf4"]["state"] == "up"
+    assert not merged["vrf1"]["stale"]
+    assert merged["vrf1"]["last_error"] is None
+
+    monitor.shutdown()
+
+
+def test_monitor_instances_stale() -> None:
+    """Test slow and failing instances are marked stale without holding up the others."""
+
+    release = threading.Event()
+    slow = _FakeInstance("slow", release=release)
+    failing = _FakeInstance("failing")
+    failing.state = "error"
+    monitor = MonitorInstances([_FakeInstance("fast"), slow, failing], stale_after=60)
+
+    monitor.poll(timeout=0.2)
+    monitor.poll(timeout=0.2)
+    merged = monitor.merged_status()
+
+    assert merged["fast"]["last_update"] is not None
+    assert merged["slow"]["stale"]
+    assert merged["failing"]["stale"]
+    assert merged["failing"]["last_error"] == "BIRD is not running"
+    # The slow instance is not polled again while its first poll is in progress
+    assert slow.polls == 1
+    assert monitor.merged_status(timestamp=time.time() + 120)["fast"]["stale"]
+
+    release.set()
+    monitor.poll(timeout=1)
+    assert not monitor.merged_status()["slow"]["stale"]
+
+    monitor.shutdown()
+
+
+def test_monitor_instance_from_arg(tmp_path: pathlib.Path) -> None:
+    """Test parsing instances from the commandline."""
+
+    (tmp_path / "vrf1.yaml").write_text(BIRDPLAN_CONFIG)
+
+    instance = MonitorInstance.from_arg(f"vrf1={tmp_path / 'vrf1.yaml'},{tmp_path / 'vrf1.state'},/run/bird/vrf1.ctl")
+
+    assert instance.name == "vrf1"
+    assert instance.bird_socket == "/run/bird/vrf1.ctl"
+    with pytest.raises(BirdPlanError, match="Invalid monitor instance"):
+        MonitorInstance.from_arg("vrf1=/etc/birdplan/vrf1.yaml")
+    with pytest.raises(BirdPlanError, match="must be unique"):
+        MonitorInstances([instance, instance], stale_after=60)
+
+
+def test_monitor_instance_load(tmp_path: pathlib.Path) -> None:
+    """Test the plan and state are only loaded again when they change."""
+
+    plan_file = tmp_path / "vrf1.yaml"
+    state_file = tmp_path / "vrf1.state"
+    plan_file.write_text(BIRDPLAN_CONFIG)
+
+    instance = MonitorInstance("vrf1", f"{plan_file}", f"{state_file}", f"{tmp_path / 'bird.ctl'}")
+    birdplan = instance.birdplan
+
+    # Nothing changed, so polling uses the plan and state we already loaded
+    assert instance.poll() == {"bgp": {}, "ospf": {}}
+    assert instance.birdplan is birdplan
+
+    # Writing out the state loads the plan and state again
+    state_file.write_text(json.dumps({"apply": {"mode": "configure"}}))
+    assert instance.poll() == {"bgp": {}, "ospf": {}}
+    assert instance.birdplan is not birdplan
+    assert instance.birdplan.state == {"apply": {"mode": "configure"}}
+
+    # So does changing the plan
+    birdplan = instance.birdplan
+    plan_file.write_text(BIRDPLAN_CONFIG.replace("0.0.0.1", "0.0.0.10"))
+    instance.poll()
+    assert instance.birdplan is not birdplan
+    assert instance.birdplan.config["router_id"] == "0.0.0.10"
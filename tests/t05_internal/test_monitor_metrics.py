@@ -0,0 +1,125 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Monitor metrics exporter tests."""
+
+import urllib.request
+
+from birdplan.monitor_metrics import MonitorMetrics
+
+__all__: list[str] = []
+
+
+MONITOR_STATUS = {
+    "bgp": {
+        "e1": {
+            "name": "e1",
+            "asn": 65001,
+            "description": 'BGP "session" to e1',
+            "protocols": {
+                "ipv4": {
+                    "name": "bgp4_AS65001_e1",
+                    "status": {
+                        "state": "up",
+                        "info": "established",
+                        "since": "2024-01-01 00:00:00",
+                        "routes_imported": 80,
+                        "routes_exported": 2,
+                    },
+                },
+                "ipv6": {"name": "bgp6_AS65001_e1"},
+            },
+            "prefix_limit": {"static": {"ipv4": 100}, "peeringdb": {"ipv6": 50}},
+        },
+    },
+    "ospf": {
+        "ospf4": {"state": "down", "routes_imported": 0, "routes_exported": 0},
+    },
+}
+
+
+def test_monitor_metrics() -> None:
+    """Test rendering the monitor metrics."""
+
+    metrics = MonitorMetrics()
+    metrics.update(MONITOR_STATUS, timestamp=1704067260)
+
+    lines = metrics.snapshot.decode().splitlines()
+
+    assert 'birdplan_bgp_peer_up{peer="e1",asn="65001",ipv="ipv4"} 1' in lines
+    assert 'birdplan_bgp_peer_up{peer="e1",asn="65001",ipv="ipv6"} 0' in lines
+    assert 'birdplan_bgp_peer_routes_imported{peer="e1",asn="65001",ipv="ipv4"} 80' in lines
+    assert 'birdplan_bgp_peer_prefix_limit{peer="e1",asn="65001",ipv="ipv4"} 100' in lines
+    assert 'birdplan_bgp_peer_prefix_limit{peer="e1",asn="65001",ipv="ipv6"} 50' in lines
+    assert 'birdplan_bgp_peer_prefix_limit_headroom{peer="e1",asn="65001",ipv="ipv4"} 20' in lines
+    assert 'birdplan_ospf_protocol_up{protocol="ospf4"} 0' in lines
+    assert "# TYPE birdplan_bgp_peer_uptime_seconds gauge" in lines
+    assert lines[-1] == "# EOF"
+
+
+def test_monitor_metrics_precision() -> None:
+    """Test large counters and timestamps are not rounded."""
+
+    status = {
+        "bgp": {
+            "t1": {
+                "name": "t1",
+                "asn": 65010,
+                "protocols": {
+                    "ipv4": {
+                        "name": "bgp4_AS65010_t1",
+                        "status": {"state": "up", "info": "established", "routes_imported": 1234567, "routes_exported": 3},
+                    },
+                },
+                "prefix_limit": {"static": {"ipv4": 2000000}},
+            },
+        },
+    }
+
+    metrics = MonitorMetrics()
+    metrics.update(status, timestamp=1792412345.25)
+    metrics.update_instances({"vrf1": {"status": status, "last_update": 1792412345, "stale": False}}, timestamp=1792412345.25)
+
+    lines = metrics.snapshot.decode().splitlines()
+
+    assert "birdplan_monitor_last_update_timestamp_seconds 1792412345.25" in lines
+    assert 'birdplan_monitor_instance_last_update_timestamp_seconds{instance="vrf1"} 1792412345' in lines
+    assert 'birdplan_bgp_peer_routes_imported{instance="vrf1",peer="t1",asn="65010",ipv="ipv4"} 1234567' in lines
+    assert 'birdplan_bgp_peer_prefix_limit{instance="vrf1",peer="t1",asn="65010",ipv="ipv4"} 2000000' in lines
+    assert 'birdplan_bgp_peer_prefix_limit_headroom{instance="vrf1",peer="t1",asn="65010",ipv="ipv4"} 765433' in lines
+
+
+def test_monitor_metrics_serve() -> None:
+    """Test scrapes return the last snapshot."""
+
+    metrics = MonitorMetrics()
+    metrics.serve("127.0.0.1:0")
+    try:
+        port = metrics._server.server_address[1]  # type: ignore[union-attr]
+        url = f"http://127.0.0.1:{port}/metrics"
+
+        with urllib.request.urlopen(url) as response:  # noqa: S310
+            assert response.read() == b"# EOF\n"
+
+        metrics.update(MONITOR_STATUS)
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text"})  # noqa: S310
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert response.read() == metrics.snapshot
+    finally:
+        metrics.shutdown()
@@ -0,0 +1,67 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Override matcher tests."""
+
+import fnmatch
+
+import pytest
+
+from birdplan.override_matcher import OverrideMatcher
+
+__all__: list[str] = []
+
+
+OVERRIDES = {
+    "p1": False,
+    "p*": True,
+    "p1*": False,
+    "p1[0-9]*": True,
+    "*2": False,
+    "e?*": True,
+    "[!p]*x": False,
+    "*.*": True,
+}
+
+
+def _fnmatch_override(name: str) -> bool | None:
+    """Get the override value by checking each pattern in turn."""
+    if name in OVERRIDES:
+        return OVERRIDES[name]
+    value = None
+    for item in sorted(OVERRIDES):
+        if "*" not in item:
+            continue
+        if fnmatch.fnmatch(name, item):
+            value = OVERRIDES[item]
+    return value
+
+
+@pytest.mark.parametrize("name", ["p1", "p10", "p11x", "p12", "p2", "px", "e1", "e", "x2", "ax", "a.b", "p1.2", "unmatched", "P1"])
+def test_override_matcher(name: str) -> None:
+    """Test the last sorted pattern to match wins, the same as checking each pattern in turn."""
+    assert OverrideMatcher(OVERRIDES).get(name) == _fnmatch_override(name)
+
+
+def test_override_matcher_empty() -> None:
+    """Test an empty override matcher."""
+    matcher = OverrideMatcher()
+    assert not matcher
+    assert matcher.get("p1") is None
+    # Exact names which are not patterns are never used as patterns
+    assert OverrideMatcher({"p?": True}).get("p1") is None
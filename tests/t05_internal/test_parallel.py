@@ -0,0 +1,56 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test parallel construction of BGP peers."""
+
+import pathlib
+
+import pytest
+
+from birdplan import BirdPlan
+from birdplan.exceptions import BirdPlanError
+
+__all__: list[str] = []
+
+
+BIRDPLAN_PEER = """\
+    {name}:
+      asn: 65001
+      description: BGP session to {name}
+      type: {peer_type}
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+"""
+
+
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_construct_peers_error(tmp_path: pathlib.Path, workers: int) -> None:
+    """Test the error of the first failing peer is raised, whatever the number of workers."""
+
+    # Peers c10 and c20 are route servers, which can't have a prefix limit
+    peers = [BIRDPLAN_PEER.format(name=f"c{i:02}", peer_type="routeserver" if i in (10, 20) else "customer") for i in range(24)]
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text("router_id: 0.0.0.1\n\nbgp:\n  asn: 65000\n  peers:\n" + "".join(peers))
+
+    birdplan = BirdPlan(test_mode=True)
+    with pytest.raises(BirdPlanError, match="for peer 'c10' with type 'routeserver' makes no sense"):
+        birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True, workers=workers)
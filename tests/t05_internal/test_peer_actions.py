@@ -0,0 +1,124 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test BGP peer action functions."""
+
+import pathlib
+import re
+
+from birdplan import BirdPlan
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    c1:
+      asn: 65001
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      neighbor6: fc00::2
+      source_address6: fc00::1
+      prefix_limit4: 100
+      prefix_limit6: 100
+      import_filter:
+        prefixes:
+          - 100.64.101.0/24
+          - fc00:101::/48
+      actions:
+        - type: import
+          matches:
+            origin_asn:
+              - 65001
+              - "!65002"
+            prefix:
+              - 100.64.101.0/24
+              - "!100.64.101.128/25"
+              - fc00:101::/48
+              - "!fc00:101:1::/64"
+          action:
+            remove_extended_community: (rt, 65000, 1)
+"""
+
+
+def _action_function(bird_config: str) -> str:
+    """Return the import action function from a BIRD configuration."""
+    start = bird_config.index("# BGP peer import action\n")
+    return bird_config[start : bird_config.index("\n}\n", start)]
+
+
+def test_peer_action_function(tmp_path: pathlib.Path) -> None:
+    """Test the matches and actions of a BGP peer action function."""
+
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text(BIRDPLAN_CONFIG)
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+    bird_config = birdplan.configure()
+    function = _action_function(bird_config)
+    lines = function.splitlines()
+    name = lines[1].split(" ")[1].split("(")[0].removesuffix("_import")
+
+    # The function body is a valid BIRD block, previously the prefix blocks were output with doubled braces
+    assert "{{" not in function
+    assert "}}" not in function
+    assert "  if (net.type = NET_IP4) then {" in lines
+    assert "  if (net.type = NET_IP6) then {" in lines
+    assert lines.count("  }") == 2  # noqa: PLR2004
+
+    # The action is skipped when the origin ASN is not one we match, or is one we don't match, previously a negated origin ASN
+    # was checked using "!~", the same as a straight match
+    assert [line for line in lines if "bgp_path.first" in line] == [
+        f"  if (bgp_path.first !~ {name}_match_origin_asn) then return true;",
+        f"  if (bgp_path.first ~ {name}_match_origin_asn_not) then return true;",
+    ]
+
+    # Routes in a negated prefix list skip the action
+    match_prefix = [line.strip().split(" ")[2:4] for line in lines if line.strip().startswith("if (net ")]
+    assert match_prefix == [
+        ["!~", f"{name}_match_prefix_v4)"],
+        ["~", f"{name}_match_prefix_not_v4)"],
+        ["!~", f"{name}_match_prefix_v6)"],
+        ["~", f"{name}_match_prefix_not_v6)"],
+    ]
+
+    # Negated prefixes only end up in the negated prefix lists, previously every prefix was in both lists
+    match_lists = {
+        list_name: value.split()
+        for list_name, value in re.findall(r"define bgp_action_\w+?_match_(\w+) = \[\n(.*?)\n\];", bird_config, re.DOTALL)
+    }
+    assert match_lists == {
+        "origin_asn": ["65001"],
+        "origin_asn_not": ["65002"],
+        "prefix_v4": ["100.64.101.0/24"],
+        "prefix_not_v4": ["100.64.101.128/25"],
+        "prefix_v6": ["fc00:101::/48"],
+        "prefix_not_v6": ["fc00:101:1::/64"],
+    }
+
+    # Extended communities are removed from the BIRD "bgp_ext_community" attribute, there is no "bgp_extended_community"
+    assert "  bgp_ext_community.remove((rt, 65000, 1));" in lines
+    assert "bgp_extended_community" not in function
@@ -0,0 +1,171 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test BGP peer indexes."""
+
+import json
+import pathlib
+
+from birdplan import BirdPlan
+from birdplan.peer_index import BGPPeerIndex
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    p1:
+      asn: 65001
+      description: BGP session to p1
+      type: peer
+      neighbor4: 100.64.0.2
+      neighbor6: fc00::2
+      source_address4: 100.64.0.1
+      source_address6: fc00::1
+    p2:
+      asn: 65001
+      description: BGP session to p2
+      type: peer
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+    c1:
+      asn: 65010
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.4
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.104.0/24
+"""
+
+STATE = {
+    "bgp": {
+        "+quarantine": {"p*": True},
+        "peers": {
+            "p1": {
+                "asn": 65001,
+                "description": "BGP session to p1",
+                "type": "peer",
+                "protocols": {"ipv4": {"name": "bgp4_AS65001_p1"}, "ipv6": {"name": "bgp6_AS65001_p1"}},
+            },
+            "c1": {
+                "asn": 65009,
+                "description": "BGP session to c1",
+                "type": "customer",
+                "protocols": {"ipv4": {"name": "bgp4_AS65009_c1"}},
+            },
+            "old": {
+                "asn": 65020,
+                "description": "BGP session to old",
+                "type": "transit",
+                "quarantine": True,
+                "protocols": {"ipv4": {"name": "bgp4_AS65020_old"}},
+            },
+        },
+    }
+}
+
+
+def _birdplan(tmp_path: pathlib.Path) -> BirdPlan:
+    """Return a BirdPlan object with the configuration and state loaded."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    (tmp_path / "birdplan.state").write_text(json.dumps(STATE))
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.birdconf.birdconfig_globals.validate_only = True
+    birdplan.load(plan_file=f"{tmp_path / 'birdplan.yaml'}", state_file=f"{tmp_path / 'birdplan.state'}", use_cached=True)
+
+    return birdplan
+
+
+def test_peer_index(tmp_path: pathlib.Path) -> None:
+    """Test peers can be looked up by ASN, protocol name and peer type from both the state and configuration."""
+
+    birdplan = _birdplan(tmp_path)
+    index = birdplan.bgp_peer_index
+
+    assert len(index) == 4
+    assert "old" in index
+    assert index.asn(65001) == ["p1", "p2"]
+    assert index.asn(65099) == []
+    # Peers can be found by both their configured ASN and the ASN they were last configured with
+    assert index.asn(65010) == ["c1"]
+    assert index.asn(65009) == ["c1"]
+    assert index.asn(65020) == ["old"]
+    assert index.protocol("bgp6_AS65001_p1") == ("p1", "ipv6")
+    assert index.protocol("bgp4_AS65010_c1") == ("c1", "ipv4")
+    assert index.protocol("bgp4_AS65009_c1") == ("c1", "ipv4")
+    assert index.protocol("static4") is None
+    assert index.peer_type("peer") == ["p1", "p2"]
+    assert index.peer_type("transit") == ["old"]
+
+    # The indexes are only rebuilt when the peers change
+    assert birdplan.bgp_peer_index is index
+    birdplan.state["bgp"]["peers"]["new"] = {"asn": 65030, "type": "peer", "protocols": {}}
+    assert birdplan.bgp_peer_index is not index
+    assert birdplan.bgp_peer_index.asn(65030) == ["new"]
+
+
+def test_peer_index_add() -> None:
+    """Test peers added more than once are only indexed once."""
+
+    index = BGPPeerIndex()
+    index.add("p1", 65001, "peer", {"ipv4": "bgp4_AS65001_p1"})
+    index.add("p1", 65001, "peer", {"ipv4": "bgp4_AS65001_p1"})
+    index.add("p2", 65001, None, {})
+
+    assert len(index) == 2
+    assert index.asn(65001) == ["p1", "p2"]
+    assert index.peer_type("peer") == ["p1"]
+
+
+def test_peer_index_add_protocol_kept() -> None:
+    """Test a protocol which is already indexed keeps its existing entry."""
+
+    index = BGPPeerIndex()
+    index.add("p1", 65001, "peer", {"ipv4": "bgp4_AS65001_p1"})
+    index.add("p1", 65001, "peer", {"ipv4": "bgp4_AS65001_p1", "ipv6": "bgp6_AS65001_p1"})
+    index.add("p2", 65002, "peer", {"ipv6": "bgp4_AS65001_p1"})
+
+    assert index.protocol("bgp4_AS65001_p1") == ("p1", "ipv4")
+    assert index.protocol("bgp6_AS65001_p1") == ("p1", "ipv6")
+
+
+def test_quarantine_status_only(tmp_path: pathlib.Path) -> None:
+    """Test the quarantine status of a single AS is looked up using the indexes."""
+
+    birdplan = _birdplan(tmp_path)
+
+    status = birdplan.state_bgp_peer_quarantine_status(peers=birdplan.bgp_peer_index.asn(65001))
+    assert status["current"] == {"p1": False}
+    assert status["pending"] == {"p1": True, "p2": True}
+
+    status = birdplan.state_bgp_peer_quarantine_status(peers=["old"])
+    assert status["current"] == {"old": True}
+    assert status["pending"] == {}
+
+    status = birdplan.state_bgp_peer_quarantine_status()
+    assert sorted(status["current"]) == ["c1", "old", "p1"]
+    assert sorted(status["pending"]) == ["c1", "p1", "p2"]
@@ -0,0 +1,207 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""BGP peer table retention tests."""
+
+# pylint: disable=redefined-outer-name
+
+import pathlib
+
+import pytest
+
+from birdplan import BirdPlan
+from birdplan.bird_config.sections.protocols.bgp.rib_estimate import rib_prefix_count, rib_route_count
+from birdplan.exceptions import BirdPlanConfigError
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peertype_constraints:
+    transit:
+      import_table: false
+  peers:
+    c1:
+      asn: 65001
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+    r1:
+      asn: 65002
+      description: BGP session to r1
+      type: routeserver
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      import_filter:
+        prefixes:
+          - 100.64.102.0/24
+          - 100.64.103.0/24
+      constraints:
+        export_table: false
+    t1:
+      asn: 65003
+      description: BGP session to t1
+      type: transit
+      neighbor4: 100.64.0.4
+      source_address4: 100.64.0.1
+"""
+
+
+@pytest.fixture
+def plan_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a plan file."""
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text(BIRDPLAN_CONFIG)
+    return plan_file
+
+
+def _protocol(bird_config: str, name: str) -> str:
+    """Return a protocol block from a BIRD configuration."""
+    start = bird_config.index(f"protocol bgp {name} {{")
+    return bird_config[start : bird_config.index("\n}\n", start)]
+
+
+def test_peer_tables(plan_file: pathlib.Path) -> None:
+    """Test which tables we keep and the estimate of their size."""
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+    bird_config = birdplan.configure()
+
+    # Tables are kept by default, the peer type and the peer can override this
+    assert "import table;" in _protocol(bird_config, "bgp4_AS65001_c1")
+    assert "export table;" in _protocol(bird_config, "bgp4_AS65001_c1")
+    assert "import table;" in _protocol(bird_config, "bgp4_AS65002_r1")
+    assert "export table;" not in _protocol(bird_config, "bgp4_AS65002_r1")
+    assert "import table;" not in _protocol(bird_config, "bgp4_AS65003_t1")
+    assert "export table;" in _protocol(bird_config, "bgp4_AS65003_t1")
+
+    # Imports come from the prefix limit or prefix list, exports from the routes imported from the peer types we redistribute
+    estimate = birdplan.bgp_table_estimate()
+    assert estimate["ipv4"]["peers"]["c1"]["import_routes"] == 100
+    assert estimate["ipv4"]["peers"]["r1"]["import_routes"] == 2
+    assert estimate["ipv4"]["peers"]["t1"]["import_routes"] is None
+    assert estimate["ipv4"]["peers"]["c1"]["export_routes"] is None
+    assert estimate["ipv4"]["peers"]["r1"]["export_routes"] == 100
+    assert estimate["ipv4"]["peers"]["t1"]["export_routes"] == 100
+    assert estimate["ipv4"]["total"] == {
+        "import_table": {"kept": 102, "saved": 0, "unknown": 1},
+        "export_table": {"kept": 100, "saved": 100, "unknown": 1},
+    }
+    assert not estimate["ipv6"]["peers"]
+
+
+def test_rib_route_counts() -> None:
+    """Test counting routes and distinct prefixes received from a number of peers."""
+
+    routes: dict[str, dict[str, int | None]] = {
+        "customer": {"c1": 100, "c2": 50},
+        "peer": {"p1": 1000},
+        "routeserver": {"r1": 2000},
+        "transit": {"t1": 900000, "t2": 950000},
+    }
+
+    # Every path counts towards the routes, but transit providers cover the other peers when counting prefixes
+    assert rib_route_count(routes) == 1853150
+    assert rib_prefix_count(routes) == 950150
+
+    routes["transit"]["t2"] = None
+    assert rib_route_count(routes) is None
+    assert rib_prefix_count(routes) is None
+
+
+def test_peer_tables_invalid(plan_file: pathlib.Path) -> None:
+    """Test table retention must be a boolean."""
+
+    plan_file.write_text(BIRDPLAN_CONFIG.replace("import_table: false", "import_table: 'no'"))
+
+    birdplan = BirdPlan(test_mode=True)
+    with pytest.raises(BirdPlanConfigError, match="must be a boolean"):
+        birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+
+
+def test_peer_flat_table(plan_file: pathlib.Path) -> None:
+    """Test peers using a flat table import straight into the main BGP table."""
+
+    plan_file.write_text(
+        BIRDPLAN_CONFIG.replace("        export_table: false\n", "        export_table: false\n      flat_table: true\n")
+    )
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+    bird_config = birdplan.configure()
+
+    # The main BGP table is sorted so we can export the next best route when the best is rejected
+    assert "ipv4 table t_bgp4 sorted;" in bird_config
+    # There is no peer table, pipe or pipe filters for the flat peer
+    assert "t_bgp4_AS65002_r1_peer" not in bird_config
+    assert "f_bgp_AS65002_r1_peer_bgp_" not in bird_config
+    # But the other peers still have theirs
+    assert "protocol pipe p_bgp4_AS65001_c1_peer_to_bgp4 {" in bird_config
+
+    protocol = _protocol(bird_config, "bgp4_AS65002_r1")
+    assert "    table t_bgp4;" in protocol
+    assert "    secondary;" in protocol
+    # Filtered routes are kept so they can be inspected
+    assert "    import keep filtered on;" in protocol
+
+    # The fused import filter rejects filtered routes before accepting into the main BGP table
+    import_filter = bird_config[bird_config.index("filter f_bgp_AS65002_r1_peer_import\n") :]
+    import_filter = import_filter[: import_filter.index("\n};\n")]
+    assert import_filter.endswith("  bgp_peer_reject_filtered(filter_name);\n  bgp_peer_accept(filter_name);")
+
+    # The fused export filter does the redistribution checks
+    export_filter = bird_config[bird_config.index("filter f_bgp_AS65002_r1_peer_export\n") :]
+    export_filter = export_filter[: export_filter.index("\n};\n")]
+    assert 'if (proto = "bgp4_AS65002_r1" || proto = "bgp6_AS65002_r1") then reject;' in export_filter
+    assert "bgp_peer_redistribute_bgp_customer(filter_name, true)" in export_filter
+
+    assert birdplan.state["bgp"]["peers"]["r1"]["tables"] == {"ipv4": "t_bgp4"}
+    assert birdplan.state["bgp"]["peers"]["r1"]["flat_table"]
+    assert "flat_table" not in birdplan.state["bgp"]["peers"]["c1"]
+
+
+def test_peer_flat_table_prefix_limit(plan_file: pathlib.Path) -> None:
+    """Test peers using a flat table count filtered routes towards their prefix limit."""
+
+    plan_file.write_text(
+        BIRDPLAN_CONFIG.replace("      prefix_limit4: 100\n", "      prefix_limit4: 100\n      flat_table: true\n")
+    )
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+    bird_config = birdplan.configure()
+
+    # The import filter rejects filtered routes, so the import limit would no longer count them
+    protocol = _protocol(bird_config, "bgp4_AS65001_c1")
+    assert "    receive limit 100 action restart;" in protocol
+    assert "import limit" not in protocol
+
+    # Peers with a peer table still use an import limit, as filtered routes are accepted into the peer table
+    plan_file.write_text(BIRDPLAN_CONFIG)
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=None, use_cached=True)
+    assert "    import limit 100 action restart;" in _protocol(birdplan.configure(), "bgp4_AS65001_c1")
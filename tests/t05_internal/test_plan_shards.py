@@ -0,0 +1,110 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Sharded plan directory tests."""
+
+# pylint: disable=redefined-outer-name
+
+import pathlib
+
+import pytest
+
+from birdplan import BirdPlan
+from birdplan.exceptions import BirdPlanError
+from birdplan.plan_shards import PlanShardCache, load_plan_shards
+from birdplan.yaml import YAML
+
+__all__: list[str] = []
+
+
+BIRDPLAN_PEER = """\
+bgp:
+  peers:
+    {name}:
+      asn: {asn}
+      description: BGP session to {name}
+      type: customer
+      neighbor4: {neighbor4}
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+"""
+
+
+@pytest.fixture
+def plan_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a sharded plan directory."""
+
+    plan_dir = tmp_path / "plan.d"
+    (plan_dir / "peers").mkdir(parents=True)
+    (plan_dir / "00-global.yaml").write_text("router_id: {{ '0.0.0.1' }}\n")
+    (plan_dir / "bgp.yaml").write_text("bgp:\n  asn: 65000\n")
+    (plan_dir / "peers" / "e1.yaml").write_text(BIRDPLAN_PEER.format(name="e1", asn=65001, neighbor4="100.64.0.2"))
+    (plan_dir / "peers" / "e2.yaml").write_text(BIRDPLAN_PEER.format(name="e2", asn=65002, neighbor4="100.64.0.3"))
+
+    return plan_dir
+
+
+def test_plan_shards(plan_dir: pathlib.Path) -> None:
+    """Test loading a sharded plan directory."""
+
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_dir}", state_file=None, use_cached=True, workers=2)
+
+    assert birdplan.config["router_id"] == "0.0.0.1"
+    assert birdplan.config["bgp"]["asn"] == 65000
+    assert list(birdplan.config["bgp"]["peers"]) == ["e1", "e2"]
+    assert "protocol bgp bgp4_AS65002_e2" in birdplan.configure()
+
+
+def test_plan_shards_cache(plan_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only shards that changed are parsed again."""
+
+    yaml = YAML()
+    load_plan_shards(plan_dir, yaml)
+    assert (plan_dir / ".birdplan-cache").exists()
+
+    # Keep track of what we parse from here on
+    parsed: list[str] = []
+    load = yaml.load
+    monkeypatch.setattr(yaml, "load", lambda data: parsed.append(data) or load(data))
+
+    plan = load_plan_shards(plan_dir, yaml)
+    assert not parsed
+    assert plan["bgp"]["peers"]["e2"]["asn"] == 65002  # noqa: PLR2004
+
+    (plan_dir / "peers" / "e2.yaml").write_text(BIRDPLAN_PEER.format(name="e2", asn=65003, neighbor4="100.64.0.3"))
+    plan = load_plan_shards(plan_dir, yaml)
+    assert len(parsed) == 1
+    assert plan["bgp"]["peers"]["e2"]["asn"] == 65003  # noqa: PLR2004
+
+    # Shards that are no longer used are dropped from the cache
+    cache = PlanShardCache(plan_dir)
+    assert len(cache._entries) == 4  # noqa: PLR2004,SLF001
+
+
+def test_plan_shards_conflict(plan_dir: pathlib.Path) -> None:
+    """Test a shard redefining a value set by another shard."""
+
+    (plan_dir / "peers" / "e3.yaml").write_text(BIRDPLAN_PEER.format(name="e2", asn=65003, neighbor4="100.64.0.4"))
+
+    with pytest.raises(
+        BirdPlanError, match=r"'peers/e3\.yaml' redefines 'bgp:peers:e2:asn' which is already set in plan shard 'peers/e2\.yaml'"
+    ):
+        load_plan_shards(plan_dir, YAML())
@@ -0,0 +1,142 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compact prefix set tests."""
+
+# pylint: disable=redefined-outer-name
+
+import json
+
+import pytest
+
+from birdplan.bgpq3 import BGPQ3, _PrefixStreamParser
+from birdplan.bird_config import util
+from birdplan.bird_config.sections.protocols.bgp.peer.change_guards import check_irr_prefix_changes
+from birdplan.exceptions import BirdPlanError
+from birdplan.prefix_set import PrefixSet
+
+__all__: list[str] = []
+
+
+@pytest.fixture
+def prefixes() -> list[str]:
+    """Test prefixes."""
+    return ["100.64.0.0/22", "100.64.128.0/19{24,24}", "0.0.0.0/0{8,24}", "fc00::/46", "fc00:10::/43{48,48}", "fc00::1/128"]
+
+
+def test_round_trip(prefixes: list[str]) -> None:
+    """Test prefixes are returned in the same format they were added."""
+    prefix_set = PrefixSet(prefixes)
+    assert len(prefix_set) == len(prefixes)
+    assert prefix_set.to_list() == prefixes
+
+
+def test_network_count(prefixes: list[str]) -> None:
+    """Test network count matches the string based network count."""
+    assert PrefixSet(prefixes).network_count() == util.network_count(prefixes)
+
+
+def test_forms() -> None:
+    """Test the plus and minus forms are kept and matched as a length range."""
+    prefix_set = PrefixSet(["100.64.0.0/24+", "100.64.0.0/24-", "100.64.0.0/24{24,32}"])
+    assert prefix_set.to_list() == ["100.64.0.0/24+", "100.64.0.0/24-", "100.64.0.0/24{24,32}"]
+    # The range form matches the same as the plus form, so is a duplicate
+    assert prefix_set.sorted().to_list() == ["100.64.0.0/24-", "100.64.0.0/24+"]
+
+
+def test_sorted() -> None:
+    """Test prefixes are sorted numerically by family, address and length with duplicates removed."""
+    prefix_set = PrefixSet(["fc00:10::/43", "100.64.10.0/24", "fc00::/46", "100.64.9.0/24", "100.64.9.0/24", "100.64.0.0/16"])
+    assert prefix_set.sorted().to_list() == ["100.64.0.0/16", "100.64.9.0/24", "100.64.10.0/24", "fc00::/46", "fc00:10::/43"]
+
+
+def test_family(prefixes: list[str]) -> None:
+    """Test prefixes are split by family."""
+    prefix_set = PrefixSet(prefixes)
+    assert prefix_set.family(4).to_list() == prefixes[:3]
+    assert prefix_set.family("6").to_list() == prefixes[3:]
+
+
+def test_blackholes_difference() -> None:
+    """Test blackholes and difference."""
+    static = PrefixSet(["100.64.0.0/22", "100.64.128.0/19{24,24}", "100.65.0.0/16-"])
+    irr = PrefixSet(["100.64.0.0/22", "100.64.0.0/22{22,24}", "100.66.0.0/16"])
+    assert static.blackholes().to_list() == ["100.64.0.0/22+", "100.64.128.0/19+", "100.65.0.0/16+"]
+    assert irr.difference(static).to_list() == ["100.64.0.0/22{22,24}", "100.66.0.0/16"]
+    assert irr.blackholes().sorted().difference(static.blackholes()).to_list() == ["100.66.0.0/16+"]
+
+
+def test_changes() -> None:
+    """Test prefixes added, removed and removed but still covered by a shorter prefix."""
+    previous = PrefixSet(["100.64.0.0/22", "100.64.1.0/24", "100.64.8.0/24", "100.65.0.0/24", "fc00::/48", "fc00:0:1::/48"])
+    current = PrefixSet(["fc00::/32{32,48}", "100.64.0.0/22", "100.64.0.0/22{22,24}", "100.66.0.0/16"])
+    changes = current.changes(previous)
+    assert changes["added"].to_list() == ["100.64.0.0/22{22,24}", "100.66.0.0/16", "fc00::/32{32,48}"]
+    assert changes["removed"].to_list() == ["100.64.8.0/24", "100.65.0.0/24"]
+    assert changes["covered"].to_list() == ["100.64.1.0/24", "fc00::/48", "fc00:0:1::/48"]
+    # Nothing changes when comparing against ourselves
+    assert all(not prefix_set for prefix_set in current.changes(current).values())
+
+
+def test_irr_prefix_changes() -> None:
+    """Test IRR prefix change limits, either as a number of prefixes or a percentage of the previous run."""
+    previous = PrefixSet([f"100.64.{i}.0/24" for i in range(10)])
+    current = PrefixSet([f"100.64.{i}.0/24" for i in range(2, 12)])
+    changes = check_irr_prefix_changes("p1", "peer", "4", previous, current, {"added": 2, "removed": "20%"})
+    assert changes == {"added": 2, "removed": 2, "covered": 0}
+    with pytest.raises(BirdPlanError, match="IRR IPv4 prefixes removed for peer 'p1' with type 'peer' exceeds limit of 10%"):
+        check_irr_prefix_changes("p1", "peer", "4", previous, current, {"removed": "10%"})
+    with pytest.raises(BirdPlanError, match="IRR IPv4 prefixes added .* last=10, added=2"):
+        check_irr_prefix_changes("p1", "peer", "4", previous, current, {"added": 1})
+
+
+@pytest.mark.parametrize("prefix", ["100.64.0.0/33", "100.64.0.0/24{24,33}", "100.64.0.0", "fc00::/24{a,b}", "invalid/24"])
+def test_invalid(prefix: str) -> None:
+    """Test invalid prefixes are rejected."""
+    with pytest.raises(BirdPlanError):
+        PrefixSet([prefix])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_stream_parser(chunk_size: int) -> None:
+    """Test streaming of BGPQ3 JSON output."""
+    data = {
+        "ipv4": [
+            {"prefix": "100.64.0.0/22", "exact": True},
+            {"prefix": "100.64.128.0/19", "exact": False, "greater-equal": 24, "less-equal": 24},
+            {"prefix": "100.65.0.0/16", "exact": False, "less-equal": 24},
+        ],
+        "ipv6": [],
+    }
+    raw = json.dumps(data, indent=4)
+
+    parser = _PrefixStreamParser(BGPQ3()._add_prefix)  # pylint: disable=protected-access
+    for pos in range(0, len(raw), chunk_size):
+        parser.feed(raw[pos : pos + chunk_size])
+    result = parser.close()
+
+    assert result["ipv4"].to_list() == ["100.64.0.0/22", "100.64.128.0/19{24,24}", "100.65.0.0/16{16,24}"]
+    assert not result["ipv6"]
+
+
+def test_stream_parser_truncated() -> None:
+    """Test streaming of truncated BGPQ3 JSON output."""
+    parser = _PrefixStreamParser(BGPQ3()._add_prefix)  # pylint: disable=protected-access
+    parser.feed('{"ipv4": [{"prefix": "100.64.0.0/22", "exact": true}')
+    with pytest.raises(json.JSONDecodeError):
+        parser.close()
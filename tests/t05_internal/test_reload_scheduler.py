@@ -0,0 +1,84 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test staggered reload of BGP peers."""
+
+import pathlib
+import time
+
+import pytest
+
+from birdplan.exceptions import BirdPlanError
+from birdplan.reload_scheduler import ReloadScheduler, reload_jobs
+
+from ..lib.bird_server import FakeBirdServer
+
+__all__: list[str] = []
+
+
+STATE = {
+    "bgp": {
+        "peers": {
+            "c1": {"prefix_limit": {"static": {"ipv4": 100, "ipv6": 50}}},
+            "c2": {"prefix_limit": {"peeringdb": {"ipv4": 10}, "static": {"ipv4": 1000}}},
+            "t1": {},
+        }
+    }
+}
+
+
+def test_reload_jobs() -> None:
+    """Test peers are reloaded smallest first and peers without a prefix limit last."""
+
+    jobs = reload_jobs(STATE, {"t1": ["bgp4_AS65003_t1"], "c1": ["bgp4_AS65001_c1", "bgp6_AS65001_c1"], "c2": ["bgp4_AS65002_c2"]})
+
+    assert [(job["peer"], job["routes"]) for job in jobs] == [("c2", 10), ("c1", 150), ("t1", None)]
+
+
+def test_reload_scheduler(tmp_path: pathlib.Path) -> None:
+    """Test reloads are rate limited and a failing peer does not stop the others."""
+
+    # Fail reloads of protocols starting with "bad"
+    bird = FakeBirdServer(tmp_path / "bird.ctl", {"reload in bad": b"9001 There is no protocol named bad\n"})
+    bird.start()
+
+    jobs = reload_jobs(STATE, {"c1": ["bgp4_AS65001_c1", "bgp6_AS65001_c1"], "c2": ["bad4_c2", "bgp4_AS65002_c2"], "t1": ["t1"]})
+
+    scheduler = ReloadScheduler(f"{tmp_path / 'bird.ctl'}", rate=20)
+    started = time.monotonic()
+    result = scheduler.run(jobs, direction="in")
+    bird.stop()
+
+    # Four commands at 20 per second take at least 0.15s
+    assert time.monotonic() - started >= 0.15
+    # Peers are reloaded one command at a time, smallest first
+    assert bird.queries == ["reload in bad4_c2", "reload in bgp4_AS65001_c1", "reload in bgp6_AS65001_c1", "reload in t1"]
+    assert list(result["peers"]) == ["c2", "c1", "t1"]
+    assert "no protocol named bad" in result["peers"]["c2"]["error"]
+    assert result["peers"]["c2"]["commands"] == ["reload in bad4_c2"]
+    assert result["peers"]["c1"] == {"commands": ["reload in bgp4_AS65001_c1", "reload in bgp6_AS65001_c1"], "error": None}
+
+
+def test_reload_scheduler_invalid() -> None:
+    """Test invalid scheduler limits and directions."""
+
+    with pytest.raises(BirdPlanError, match="rate must be greater than 0"):
+        ReloadScheduler(rate=0)
+    with pytest.raises(BirdPlanError, match="Invalid reload direction 'sideways'"):
+        ReloadScheduler().run([], direction="sideways")
@@ -0,0 +1,144 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""State journal tests."""
+
+# pylint: disable=redefined-outer-name
+
+import json
+import pathlib
+
+import pytest
+
+from birdplan import BirdPlan
+from birdplan.state_journal import StateJournal
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+"""
+
+
+@pytest.fixture
+def plan_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a plan file."""
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text(BIRDPLAN_CONFIG)
+    return plan_file
+
+
+def _birdplan(plan_file: pathlib.Path) -> BirdPlan:
+    """Load a plan with the state file next to it."""
+    birdplan = BirdPlan(test_mode=True)
+    birdplan.load(plan_file=f"{plan_file}", state_file=f"{plan_file.parent / 'birdplan.state'}", use_cached=True)
+    return birdplan
+
+
+def test_state_journal(plan_file: pathlib.Path) -> None:
+    """Test override changes are journaled, replayed and compacted."""
+
+    state_file = plan_file.parent / "birdplan.state"
+    journal_file = plan_file.parent / "birdplan.state.journal"
+
+    # Write out the state in full
+    birdplan = _birdplan(plan_file)
+    birdplan.configure()
+    birdplan.commit_state()
+    state_stat = state_file.stat()
+    assert not journal_file.exists()
+
+    # Overrides are appended to the journal, without touching the state file
+    birdplan = _birdplan(plan_file)
+    birdplan.state_bgp_peer_quarantine_set("e1", True)  # noqa: FBT003
+    birdplan.state_ospf_set_interface_cost("0", "eth0", 10)
+    birdplan.commit_state()
+    birdplan = _birdplan(plan_file)
+    birdplan.state_bgp_peer_graceful_shutdown_set("e*", True)  # noqa: FBT003
+    birdplan.state_ospf_remove_interface_cost("0", "eth0")
+    birdplan.commit_state()
+
+    assert state_file.stat().st_mtime_ns == state_stat.st_mtime_ns
+    assert len(journal_file.read_text().splitlines()) == 5
+
+    # The journal is replayed when the state is loaded
+    birdplan = _birdplan(plan_file)
+    assert birdplan.state["bgp"]["+quarantine"] == {"e1": True}
+    assert birdplan.state["bgp"]["+graceful_shutdown"] == {"e*": True}
+    assert "+interfaces" not in birdplan.state["ospf"]["areas"]["0"]
+    assert "e1" in birdplan.state["bgp"]["peers"]
+
+    # A full configure compacts the journal into the state file
+    birdplan.configure()
+    birdplan.commit_state()
+    assert not journal_file.exists()
+    state = json.loads(state_file.read_text())
+    assert state["bgp"]["+quarantine"] == {"e1": True}
+    assert state["bgp"]["+graceful_shutdown"] == {"e*": True}
+
+
+def test_state_journal_incomplete_entry(tmp_path: pathlib.Path) -> None:
+    """Test an entry that was not completely written is discarded."""
+
+    state_journal = StateJournal(f"{tmp_path / 'birdplan.state'}")
+    state_journal.append([{"op": "set", "path": ["bgp", "+quarantine"], "value": {"e1": True}}])
+    with state_journal.journal_file.open("a") as journal:
+        journal.write('{"op": "set", "path": ["bgp", "+qua')
+
+    state: dict = {}
+    assert state_journal.replay(state) == 1
+    assert state == {"bgp": {"+quarantine": {"e1": True}}}
+
+    # Appending drops the incomplete entry first
+    state_journal.append([{"op": "delete", "path": ["bgp", "+quarantine"]}])
+    assert len(state_journal.journal_file.read_text().splitlines()) == 3
+    assert state_journal.replay(state) == 2
+    assert state == {"bgp": {}}
+
+
+def test_state_journal_stale(tmp_path: pathlib.Path) -> None:
+    """Test a journal is ignored once the state file it belongs to was replaced."""
+
+    state_file = tmp_path / "birdplan.state"
+    state_file.write_text("{}")
+
+    state_journal = StateJournal(f"{state_file}")
+    state_journal.append([{"op": "set", "path": ["bgp", "+quarantine"], "value": {"e1": True}}])
+
+    # Replace the state file, as if the journal was compacted and we stopped before removing it
+    state_file_new = tmp_path / "birdplan.state.new"
+    state_file_new.write_text('{"bgp": {}}')
+    state_file_new.replace(state_file)
+
+    state: dict = {"bgp": {}}
+    assert state_journal.replay(state) == 0
+    assert state == {"bgp": {}}
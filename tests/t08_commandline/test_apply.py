@@ -0,0 +1,188 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test apply command."""
+
+import json
+import pathlib
+
+import pytest
+
+import birdplan.cmdline
+from birdplan.exceptions import BirdPlanError
+
+from ..lib.bird_server import FakeBirdServer
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+    e2:
+      asn: 65002
+      description: BGP session to e2
+      type: customer
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.102.0/24
+"""
+
+
+def _run(tmp_path: pathlib.Path, args: list[str]) -> birdplan.cmdline.BirdPlanCommandlineResult:
+    """Run a birdplan apply command."""
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+    return bplan.run(
+        [
+            "-i",
+            f"{tmp_path / 'birdplan.yaml'}",
+            "-s",
+            f"{tmp_path / 'birdplan.state'}",
+            "-b",
+            f"{tmp_path / 'bird.ctl'}",
+            "apply",
+            "-o",
+            f"{tmp_path / 'bird.conf'}",
+            *args,
+        ]
+    )
+
+
+@pytest.fixture
+def plan_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create a plan file."""
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    return tmp_path
+
+
+def test_apply(plan_dir: pathlib.Path) -> None:
+    """Test only changes are applied, reloading the peers that changed."""
+
+    bird_socket = plan_dir / "bird.ctl"
+    bird_config = f"{(plan_dir / 'bird.conf').resolve()}"
+    replies = {"configure check": b"0020 Configuration OK\n", "configure soft": b"0003 Reconfigured\n"}
+
+    bird = FakeBirdServer(bird_socket, replies)
+    bird.start()
+
+    # The first time round everything changed
+    res = _run(plan_dir, ["--mode", "reload"])
+    assert res.data["applied"]
+    assert res.data["mode"] == "configure"
+    assert res.data["changes"]["global"]
+    assert res.data["changes"]["peers"]["added"] == ["e1", "e2"]
+    assert bird.queries == [f'configure check "{plan_dir.resolve() / ".bird.conf.tmp"}"', f'configure "{bird_config}"']
+    assert "protocol bgp bgp4_AS65001_e1" in (plan_dir / "bird.conf").read_text()
+    assert not (plan_dir / ".bird.conf.tmp").exists()
+
+    # Nothing changed, so BIRD is left alone
+    bird.queries.clear()
+    res = _run(plan_dir, ["--mode", "reload"])
+    assert not res.data["applied"]
+    assert res.as_text() == "BIRD configuration unchanged, nothing applied\n"
+    assert not bird.queries
+
+    # Changing a peer only reloads its protocols
+    (plan_dir / "birdplan.yaml").write_text(BIRDPLAN_CONFIG.replace("100.64.102.0/24", "100.64.103.0/24"))
+    res = _run(plan_dir, ["--mode", "reload"])
+    assert res.data["applied"]
+    assert res.data["mode"] == "reload"
+    assert res.data["changes"]["peers"] == {"added": [], "changed": ["e2"], "removed": []}
+    assert bird.queries[1:] == [
+        f'configure soft "{bird_config}"',
+        "reload bgp4_AS65002_e2",
+        "reload p_bgp4_AS65002_e2_peer_to_bgp4",
+    ]
+    assert "peers changed: e2, protocols reloaded: bgp4_AS65002_e2, p_bgp4_AS65002_e2_peer_to_bgp4" in res.as_text()
+
+    bird.stop()
+
+    state = json.loads((plan_dir / "birdplan.state").read_text())
+    assert state["apply"]["mode"] == "reload"
+    assert state["apply"]["seconds"] >= 0
+    assert "e2" in state["apply"]["fingerprints"]["peers"]
+
+
+def test_apply_check_failed(plan_dir: pathlib.Path) -> None:
+    """Test a configuration which fails the check does not replace the current one."""
+
+    bird_socket = plan_dir / "bird.ctl"
+    (plan_dir / "bird.conf").write_text("# Current configuration\n")
+
+    bird = FakeBirdServer(bird_socket, {"configure check": b"8002 bird.conf, line 1: syntax error\n"})
+    bird.start()
+
+    with pytest.raises(BirdPlanError, match="BIRD configuration check failed: .*syntax error"):
+        _run(plan_dir, [])
+
+    bird.stop()
+
+    assert len(bird.queries) == 1
+    assert (plan_dir / "bird.conf").read_text() == "# Current configuration\n"
+    assert not (plan_dir / ".bird.conf.tmp").exists()
+    assert not (plan_dir / "birdplan.state").exists()
+
+
+def test_apply_reload_failed(plan_dir: pathlib.Path) -> None:
+    """Test what we applied is recorded when a peer fails to reload, so it is reloaded again next time."""
+
+    bird_socket = plan_dir / "bird.ctl"
+    replies = {
+        "configure check": b"0020 Configuration OK\n",
+        "configure soft": b"0003 Reconfigured\n",
+        "reload bgp4_AS65002_e2": b"8003 No protocols match\n",
+    }
+
+    bird = FakeBirdServer(bird_socket, replies)
+    bird.start()
+
+    _run(plan_dir, [])
+
+    # BIRD loads the configuration, but e2 fails to reload
+    (plan_dir / "birdplan.yaml").write_text(BIRDPLAN_CONFIG.replace("100.64.102.0/24", "100.64.103.0/24"))
+    with pytest.raises(BirdPlanError, match=r"Failed to reload 1 BGP peer\(s\):\n  e2: .*No protocols match"):
+        _run(plan_dir, ["--mode", "reload"])
+
+    state = json.loads((plan_dir / "birdplan.state").read_text())
+    assert state["apply"]["mode"] == "reload"
+    assert state["apply"]["fingerprints"]["peers"]["e2"]["fingerprint"] is None
+    assert state["apply"]["fingerprints"]["peers"]["e1"]["fingerprint"]
+
+    # Next time round e2 is reloaded again
+    replies.pop("reload bgp4_AS65002_e2")
+    bird.queries.clear()
+    res = _run(plan_dir, ["--mode", "reload"])
+    assert res.data["changes"]["peers"] == {"added": [], "changed": ["e2"], "removed": []}
+    assert "reload bgp4_AS65002_e2" in bird.queries
+
+    bird.stop()
@@ -0,0 +1,142 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test streaming BGP peer routes from the BIRD control socket."""
+
+import json
+import pathlib
+
+import pytest
+
+import birdplan.cmdline
+from birdplan.exceptions import BirdPlanError
+
+from ..lib.bird_server import FakeBirdServer
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      neighbor6: fc00:100::2
+      source_address6: fc00:100::1
+      prefix_limit4: 100
+      prefix_limit6: 100
+      import_filter:
+        prefixes:
+          - 100.64.101.0/24
+          - fc00:101::/48
+"""
+
+BIRD_REPLY = (
+    b"1007-Table t_bgp4_AS65001_e1_peer:\n"
+    b"1007-100.64.101.0/24      unicast [bgp4_AS65001_e1 2024-01-01] * (100) [AS65001i]\n"
+    b" \tvia 100.64.0.2 on eth0\n"
+    b"1008-\tType: BGP univ\n"
+    b"1012-\tBGP.origin: IGP\n"
+    b" \tBGP.as_path: 65001\n"
+    b" \tBGP.next_hop: 100.64.0.2\n"
+    b" \tBGP.large_community: (65000, 3, 1) (65000, 1101, 1)\n"
+    b" \t\t(65000, 1101, 2)\n"
+    b"1007-                     unicast [bgp4_AS65001_e1 2024-01-01 from 100.64.0.3] (100) [AS65001i]\n"
+    b" \tvia 100.64.0.3 on eth0\n"
+    b"1008-\tType: BGP univ\n"
+    b"1012-\tBGP.origin: IGP\n"
+    b" \tBGP.as_path: 65001 65001\n"
+    b"0000 \n"
+)
+
+
+def _run(tmp_path: pathlib.Path, args: list[str]) -> birdplan.cmdline.BirdPlanCommandlineResult:
+    """Run a birdplan command."""
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+    return bplan.run(["-i", f"{tmp_path / 'birdplan.yaml'}", "-s", f"{tmp_path / 'birdplan.state'}", *args])
+
+
+def test_bgp_peer_routes(tmp_path: pathlib.Path) -> None:
+    """Test streaming BGP peer routes."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    bird_socket = tmp_path / "bird.ctl"
+
+    _run(tmp_path, ["configure", "-o", f"{tmp_path / 'bird.conf'}"])
+
+    bird = FakeBirdServer(bird_socket, {"show route": BIRD_REPLY}, chunk_size=7)
+    bird.start()
+    res = _run(tmp_path, ["-b", f"{bird_socket}", "bgp", "peer", "routes", "--ipv4", "--filtered", "e1"])
+    routes = [json.loads(line) for line in res.as_json().splitlines()]
+    bird.stop()
+
+    assert bird.queries == ["show route table t_bgp4_AS65001_e1_peer filtered all"]
+    assert len(routes) == 2
+    assert routes[0]["prefix"] == "100.64.101.0/24"
+    assert routes[0]["primary"]
+    assert routes[0]["nexthops"] == ["via 100.64.0.2 on eth0"]
+    assert routes[0]["route_type"] == "BGP univ"
+    assert routes[0]["attributes"]["BGP.as_path"] == "65001"
+    assert routes[0]["attributes"]["BGP.large_community"] == "(65000, 3, 1) (65000, 1101, 1) (65000, 1101, 2)"
+    assert routes[1]["prefix"] == "100.64.101.0/24"
+    assert not routes[1]["primary"]
+    assert routes[1]["from"] == "100.64.0.3"
+    assert routes[1]["attributes"] == {"BGP.origin": "IGP", "BGP.as_path": "65001 65001"}
+
+
+def test_bgp_peer_routes_error(tmp_path: pathlib.Path) -> None:
+    """Test BIRD control socket errors are raised."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    bird_socket = tmp_path / "bird.ctl"
+
+    _run(tmp_path, ["configure", "-o", f"{tmp_path / 'bird.conf'}"])
+
+    bird = FakeBirdServer(bird_socket, {"show route": b"8001 Table not found\n"}, chunk_size=7)
+    bird.start()
+    res = _run(tmp_path, ["-b", f"{bird_socket}", "bgp", "peer", "routes", "--ipv6", "e1"])
+    with pytest.raises(BirdPlanError, match="Table not found"):
+        res.as_text()
+    bird.stop()
+
+    assert bird.queries == ["show route table t_bgp6_AS65001_e1_peer all"]
+
+
+def test_bgp_peer_routes_flat_table(tmp_path: pathlib.Path) -> None:
+    """Test streaming BGP peer routes for a peer using the main BGP table."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG.replace("  peers:\n", "  flat_table: true\n  peers:\n"))
+    bird_socket = tmp_path / "bird.ctl"
+
+    _run(tmp_path, ["configure", "-o", f"{tmp_path / 'bird.conf'}"])
+
+    bird = FakeBirdServer(bird_socket, {"show route": BIRD_REPLY}, chunk_size=7)
+    bird.start()
+    res = _run(tmp_path, ["-b", f"{bird_socket}", "bgp", "peer", "routes", "--ipv4", "e1"])
+    routes = [json.loads(line) for line in res.as_json().splitlines()]
+    bird.stop()
+
+    assert bird.queries == ["show route table t_bgp4 protocol bgp4_AS65001_e1 all"]
+    assert len(routes) == 2
@@ -0,0 +1,169 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test fleet configure command."""
+
+# pylint: disable=redefined-outer-name
+
+import json
+import pathlib
+
+import pytest
+
+import birdplan.cmdline
+from birdplan.exceptions import BirdPlanError
+from birdplan.fleet import fleet_lookups
+
+__all__: list[str] = []
+
+
+BIRDPLAN_PEERS = """\
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+"""
+
+BIRDPLAN_CONFIG = """\
+router_id: {router_id}
+
+bgp:
+  asn: 65000
+  peers:
+{{% include "peers.yaml" %}}
+"""
+
+
+@pytest.fixture
+def fleet_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create plans for two routers sharing an include."""
+
+    (tmp_path / "peers.yaml").write_text(BIRDPLAN_PEERS)
+    (tmp_path / "r1.yaml").write_text(BIRDPLAN_CONFIG.format(router_id="0.0.0.1"))
+    (tmp_path / "r2.yaml").write_text(BIRDPLAN_CONFIG.format(router_id="0.0.0.2"))
+
+    return tmp_path
+
+
+def test_fleet_configure(fleet_dir: pathlib.Path) -> None:
+    """Test configuring two routers in worker processes."""
+
+    (fleet_dir / "routers").write_text(f"# Routers\nr2={fleet_dir / 'r2.yaml'},{fleet_dir / 'r2.state'},{fleet_dir / 'r2.conf'}\n")
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    res = bplan.run(
+        [
+            "fleet",
+            "configure",
+            "--workers",
+            "2",
+            "-r",
+            f"r1={fleet_dir / 'r1.yaml'},{fleet_dir / 'r1.state'},{fleet_dir / 'r1.conf'}",
+            "--router-file",
+            f"{fleet_dir / 'routers'}",
+        ]
+    )
+
+    assert list(res.data) == ["r1", "r2"]
+    assert not any(result["error"] for result in res.data.values())
+
+    for name, router_id in (("r1", "0.0.0.1"), ("r2", "0.0.0.2")):
+        bird_config = (fleet_dir / f"{name}.conf").read_text()
+        assert f"router id {router_id};" in bird_config
+        assert "protocol bgp bgp4_AS65001_e1" in bird_config
+        state = json.loads((fleet_dir / f"{name}.state").read_text())
+        assert "e1" in state["bgp"]["peers"]
+
+
+def test_fleet_configure_failed_router(fleet_dir: pathlib.Path) -> None:
+    """Test a router that fails to configure does not stop the others."""
+
+    (fleet_dir / "bad.yaml").write_text("router_id: 0.0.0.3\nunknown: 1\n")
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    with pytest.raises(BirdPlanError, match=r"Failed to configure 1 of 2 fleet router\(s\):\n  bad: The config item 'unknown'"):
+        bplan.run(
+            [
+                "fleet",
+                "configure",
+                "--workers",
+                "1",
+                "-r",
+                f"bad={fleet_dir / 'bad.yaml'},{fleet_dir / 'bad.state'},{fleet_dir / 'bad.conf'}",
+                "-r",
+                f"r1={fleet_dir / 'r1.yaml'},{fleet_dir / 'r1.state'},{fleet_dir / 'r1.conf'}",
+            ]
+        )
+
+    assert (fleet_dir / "r1.conf").exists()
+    assert not (fleet_dir / "bad.conf").exists()
+
+
+def test_fleet_configure_invalid_router() -> None:
+    """Test an invalid router argument."""
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    with pytest.raises(BirdPlanError, match=r"Invalid fleet router 'r1=plan\.yaml'"):
+        bplan.run(["fleet", "configure", "-r", "r1=plan.yaml"])
+
+
+def test_fleet_lookups() -> None:
+    """Test working out the IRR objects and PeeringDB ASNs used by the plans."""
+
+    plans = [
+        {
+            "bgp": {
+                "peers": {
+                    "c1": {"asn": 65001, "type": "customer", "neighbor4": "192.0.2.1", "import_filter": {"as_sets": "AS-C1"}},
+                    "p1": {"asn": 65002, "type": "peer", "neighbor6": "2001:db8::1", "prefix_limit6": 10},
+                },
+            },
+        },
+        {
+            "bgp": {
+                "peers": {
+                    "c1": {
+                        "asn": 65001,
+                        "type": "customer",
+                        "neighbor4": "192.0.2.1",
+                        "import_filter": {"as_sets": ["AS-C1", "AS-X"]},
+                    },
+                    "t1": {"asn": 65003, "type": "transit", "neighbor4": "192.0.2.3"},
+                    # The "filter" alias of "import_filter"
+                    "c4": {
+                        "asn": 65004,
+                        "type": "customer",
+                        "neighbor4": "192.0.2.4",
+                        "prefix_limit4": 10,
+                        "filter": {"as_sets": "AS-FOO"},
+                    },
+                },
+            },
+        },
+        {"router_id": "0.0.0.1"},
+    ]
+
+    assert fleet_lookups(plans) == ({"AS-C1", "AS-FOO", "AS-X"}, {65001})
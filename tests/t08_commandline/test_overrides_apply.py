@@ -0,0 +1,98 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test applying graceful shutdown and quarantine overrides to the BIRD configuration."""
+
+import pathlib
+
+import pytest
+
+import birdplan.cmdline
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes:
+          - 100.64.101.0/24
+    e2:
+      asn: 65002
+      description: BGP session to e2
+      type: peer
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+"""
+
+
+def _run(tmp_path: pathlib.Path, args: list[str]) -> birdplan.cmdline.BirdPlanCommandlineResult:
+    """Run a birdplan command."""
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+    return bplan.run(["-i", f"{tmp_path / 'birdplan.yaml'}", "-s", f"{tmp_path / 'birdplan.state'}", *args])
+
+
+@pytest.mark.parametrize(
+    ("command", "peer_types"),
+    [
+        (["graceful-shutdown", "set", "--apply"], [["e1", "true"], ["e*", "true"]]),
+        (["quarantine", "set", "--apply"], [["e2", "true"], ["e*", "true"]]),
+    ],
+)
+def test_overrides_apply(tmp_path: pathlib.Path, command: list[str], peer_types: list[list[str]]) -> None:
+    """Test applying overrides gives the same configuration as a full configure."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    config_file = tmp_path / "bird.conf"
+    reference_file = tmp_path / "bird.conf.reference"
+
+    _run(tmp_path, ["configure", "-o", f"{config_file}"])
+
+    for peer_args in peer_types:
+        res = _run(tmp_path, ["bgp", "peer", *command, "-o", f"{config_file}", *peer_args])
+        assert "BIRD configuration updated" in res.data
+        # Check the configuration matches a full configure, ignoring the order of shared functions
+        _run(tmp_path, ["--no-write-state", "configure", "-o", f"{reference_file}"])
+        assert sorted(config_file.read_text().splitlines()) == sorted(reference_file.read_text().splitlines())
+
+
+def test_overrides_apply_unchanged(tmp_path: pathlib.Path) -> None:
+    """Test applying an override that changes no peers."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+    config_file = tmp_path / "bird.conf"
+
+    _run(tmp_path, ["configure", "-o", f"{config_file}"])
+    bird_config = config_file.read_text()
+
+    res = _run(tmp_path, ["bgp", "peer", "graceful-shutdown", "set", "--apply", "-o", f"{config_file}", "e1", "false"])
+
+    assert res.data.endswith("BIRD configuration updated for 0 peer(s)")
+    assert config_file.read_text() == bird_config
@@ -0,0 +1,89 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Test plan capacity command."""
+
+import pathlib
+
+import birdplan.cmdline
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    c1:
+      asn: 65001
+      description: BGP session to c1
+      type: customer
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      prefix_limit4: 100
+      import_filter:
+        prefixes: 100.64.101.0/24
+    r1:
+      asn: 65002
+      description: BGP session to r1
+      type: routeserver
+      neighbor4: 100.64.0.3
+      source_address4: 100.64.0.1
+      flat_table: true
+      import_filter:
+        prefixes:
+          - 100.64.102.0/24
+          - 100.64.103.0/24
+"""
+
+
+def test_plan_capacity(tmp_path: pathlib.Path) -> None:
+    """Test estimating table sizes and memory use."""
+
+    (tmp_path / "birdplan.yaml").write_text(BIRDPLAN_CONFIG)
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    res = bplan.run(
+        ["-i", f"{tmp_path / 'birdplan.yaml'}", "-s", f"{tmp_path / 'birdplan.state'}", "plan", "capacity", "--use-cached"]
+    )
+
+    # The main tables hold the routes from both peers, the flat peer has no peer table
+    assert res.data["ipv4"]["tables"] == {
+        "t_bgp4": 102,
+        "master4": 102,
+        "t_kernel4": 102,
+        "t_bgp4_AS65001_c1_peer": 102,
+    }
+    assert res.data["ipv4"]["adj_rib_in"] == 102
+    assert res.data["ipv4"]["adj_rib_out"] == 102
+    assert res.data["ipv4"]["routes"] == 612
+    assert res.data["ipv4"]["unknown"] == []
+    # Import and blackhole prefix sets for c1 and the import prefix set for r1
+    assert res.data["ipv4"]["prefix_sets"] == 4
+    assert res.data["ipv6"]["routes"] == 0
+    assert res.data["routes"] == 612
+    assert res.data["rss"] == 16 * 1024 * 1024 + 612 * 160 + 102 * 128 + 4 * 48
+
+    assert "Route entries: 612\n" in res.as_text()
+
+    # Planning does not touch the state
+    assert not (tmp_path / "birdplan.state").exists()
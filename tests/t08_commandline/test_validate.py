@@ -0,0 +1,73 @@
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# Copyright (c) 2019-2025, AllWorldIT
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Test validate command."""
+
+# pylint: disable=redefined-outer-name
+
+import pathlib
+
+import pytest
+
+import birdplan.cmdline
+from birdplan.exceptions import BirdPlanError
+
+__all__: list[str] = []
+
+
+BIRDPLAN_CONFIG = """\
+router_id: 0.0.0.1
+
+bgp:
+  asn: 65000
+  peers:
+    e1:
+      asn: 65001
+      description: BGP session to e1
+      type: {peer_type}
+      neighbor4: 100.64.0.2
+      source_address4: 100.64.0.1
+      import_filter:
+        as_sets: AS-TEST
+"""
+
+
+def test_validate(tmp_path: pathlib.Path) -> None:
+    """Test validating a plan with IRR lookups and no cached information."""
+
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text(BIRDPLAN_CONFIG.format(peer_type="customer"))
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    res = bplan.run(["-i", f"{plan_file}", "-s", f"{tmp_path / 'birdplan.state'}", "validate"])
+
+    assert res.data == "BirdPlan configuration is valid"
+    assert not (tmp_path / "birdplan.state").exists()
+
+
+def test_validate_invalid(tmp_path: pathlib.Path) -> None:
+    """Test validating an invalid plan."""
+
+    plan_file = tmp_path / "birdplan.yaml"
+    plan_file.write_text(BIRDPLAN_CONFIG.format(peer_type="unknown"))
+
+    bplan = birdplan.cmdline.BirdPlanCommandLine(test_mode=True)
+
+    with pytest.raises(BirdPlanError, match="has invalid value 'unknown'"):
+        bplan.run(["-i", f"{plan_file}", "-s", f"{tmp_path / 'birdplan.state'}", "validate"])